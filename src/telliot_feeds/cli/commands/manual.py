@@ -0,0 +1,70 @@
+import json
+from typing import Tuple
+
+import click
+
+from telliot_feeds.queries.query_catalog import query_catalog
+from telliot_feeds.utils.manual_inbox import get_manual_inbox
+from telliot_feeds.utils.manual_inbox import normalize_query_id
+
+
+def resolve_query_id(query: str) -> str:
+    """Query id of a catalog query tag, or the query id itself"""
+    entries = query_catalog.find(tag=query)
+    if entries:
+        return normalize_query_id(entries[0].query_id)
+    query_id = normalize_query_id(query)
+    try:
+        if len(bytes.fromhex(query_id[2:])) != 32:
+            raise ValueError
+    except ValueError:
+        raise click.BadParameter(f"{query} is neither a query tag nor a query id", param_hint="QUERY")
+    return query_id
+
+
+@click.group()
+def manual() -> None:
+    """Stage values for manual feeds, used by the reporter instead of prompting."""
+    pass
+
+
+@manual.command()
+@click.argument("query", type=str)
+@click.argument("answers", type=str, nargs=-1, required=True)
+def stage(query: str, answers: Tuple[str, ...]) -> None:
+    """Stage the answers to a manual feed's prompts.
+
+    QUERY is a query tag from the catalog or a query id. ANSWERS are the values
+    the feed prompts for, in order (e.g. two prices for a DIVA Protocol pool).
+    """
+    query_id = resolve_query_id(query)
+    get_manual_inbox().put(query_id, answers[0] if len(answers) == 1 else list(answers))
+    click.echo(f"Staged {list(answers)} for query {query_id}")
+
+
+@manual.command("stage-file")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+def stage_file(path: str) -> None:
+    """Stage answers for many queries from a JSON file mapping query tags or ids to answers."""
+    with open(path) as f:
+        values = json.load(f)
+    if not isinstance(values, dict):
+        raise click.BadParameter("File must contain a JSON object mapping queries to answers", param_hint="PATH")
+    inbox = get_manual_inbox()
+    for query, answers in values.items():
+        inbox.put(resolve_query_id(query), answers)
+    click.echo(f"Staged values for {len(values)} queries")
+
+
+@manual.command("list")
+def list_staged() -> None:
+    """List the staged values not used yet."""
+    for query_id, answers in get_manual_inbox().pending().items():
+        click.echo(f"{query_id} {answers}")
+
+
+@manual.command()
+def clear() -> None:
+    """Remove all staged values."""
+    get_manual_inbox().clear()
+    click.echo("Cleared staged values")
@@ -1,4 +1,5 @@
 from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import Union, Tuple
 
@@ -23,12 +24,18 @@ from telliot_feeds.feeds.tellor_rng_feed import assemble_rng_datafeed
 from telliot_feeds.integrations.diva_protocol import DIVA_DIAMOND_ADDRESS
 from telliot_feeds.integrations.diva_protocol import DIVA_TELLOR_MIDDLEWARE_ADDRESS
 from telliot_feeds.integrations.diva_protocol.report import DIVAProtocolReporter
+from telliot_feeds.pricing.gather import default_gather_settings
+from telliot_feeds.pricing.price_cache import DEFAULT_PRICE_CACHE_TTL
+from telliot_feeds.pricing.price_cache import price_cache
 from telliot_feeds.reporters.flashbot import FlashbotsReporter
+from telliot_feeds.reporters.gas_oracle import PRIORITY_FEE_MODELS
 from telliot_feeds.reporters.rng_interval import RNGReporter
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
 from telliot_feeds.utils.cfg import check_endpoint
 from telliot_feeds.utils.cfg import setup_config
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import serve_metrics
+from telliot_feeds.utils.metrics import write_metrics_periodically
 from telliot_feeds.utils.reporter_utils import create_custom_contract
 from telliot_feeds.utils.reporter_utils import prompt_for_abi
 
@@ -98,6 +105,14 @@ def reporter() -> None:
     default=DIVA_TELLOR_MIDDLEWARE_ADDRESS,
     prompt=False,
 )
+@click.option(
+    "--diva-batch-size",
+    "diva_batch_size",
+    help="Number of DIVA Protocol pools to report back to back and settle together each loop",
+    nargs=1,
+    type=click.IntRange(min=1),
+    default=1,
+)
 @click.option(
     "--custom-token-contract",
     "-custom-token",
@@ -145,6 +160,69 @@ def reporter() -> None:
     help="optionaly ignore time based rewards in profit calculations. relevant only on eth-mainnet/eth-testnets",
     default=False,
 )
+@click.option(
+    "--price-cache-ttl",
+    "price_cache_ttl",
+    help="seconds a fetched price is shared between feeds querying the same source (0 disables the cache)",
+    type=float,
+    default=DEFAULT_PRICE_CACHE_TTL,
+)
+@click.option(
+    "--price-quorum",
+    "price_quorum",
+    help="use a feed's price once this many of its sources answered, instead of waiting for all of them",
+    type=click.IntRange(min=1),
+    default=None,
+)
+@click.option(
+    "--price-deadline",
+    "price_deadline",
+    help="seconds to wait for a feed's price sources, sources answering later are ignored",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+)
+@click.option(
+    "--price-hedge-factor",
+    "price_hedge_factor",
+    help="send a second request to a price source once its request took this many times its usual latency",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+)
+@click.option(
+    "--priority-fee-model",
+    "priority_fee_model",
+    help="estimate EIP-1559 priority fees from the chain's recent fee history ('percentile' or 'ewma'), "
+    "or use the node's suggestion ('node')",
+    type=click.Choice(["node", *PRIORITY_FEE_MODELS]),
+    default="percentile",
+)
+@click.option(
+    "--autopay-events/--no-autopay-events",
+    "listen_autopay_events",
+    help="keep funded feeds and tips up to date from autopay events instead of reading them every report",
+    default=True,
+)
+@click.option(
+    "--events-ws-url",
+    "events_ws_url",
+    help="websocket endpoint to subscribe to autopay events (polls eth_getLogs on the RPC endpoint otherwise)",
+    type=str,
+    default=None,
+)
+@click.option(
+    "--metrics-port",
+    "metrics_port",
+    help="serve Prometheus metrics of price sources and reports at http://127.0.0.1:<port>/metrics",
+    type=int,
+    default=None,
+)
+@click.option(
+    "--metrics-file",
+    "metrics_file",
+    help="write a JSON snapshot of the metrics of price sources and reports to this file every 15 seconds",
+    type=click.Path(dir_okay=False),
+    default=None,
+)
 @click.pass_context
 @async_run
 async def report(
@@ -163,6 +241,7 @@ async def report(
     reporting_diva_protocol: bool,
     diva_diamond_address: Optional[str],
     diva_middleware_address: Optional[str],
+    diva_batch_size: int,
     rng_timestamp: int,
     password: str,
     signature_password: str,
@@ -181,8 +260,21 @@ async def report(
     ignore_tbr: bool,
     unsafe: bool,
     skip_manual_feeds: bool,
+    price_cache_ttl: float,
+    price_quorum: Optional[int],
+    price_deadline: Optional[float],
+    price_hedge_factor: Optional[float],
+    priority_fee_model: str,
+    listen_autopay_events: bool,
+    events_ws_url: Optional[str],
+    metrics_port: Optional[int],
+    metrics_file: Optional[str],
 ) -> None:
     """Report values to Tellor oracle"""
+    price_cache.ttl = price_cache_ttl
+    default_gather_settings.quorum = price_quorum
+    default_gather_settings.deadline = price_deadline
+    default_gather_settings.hedge_factor = price_hedge_factor
     ctx.obj["ACCOUNT_NAME"] = account_str
     ctx.obj["SIGNATURE_ACCOUNT_NAME"] = signature_account
 
@@ -320,8 +412,11 @@ async def report(
             "use_random_feeds": use_random_feeds,
             "gas_multiplier": gas_multiplier,
             "max_priority_fee_range": max_priority_fee_range,
+            "priority_fee_model": priority_fee_model,
             "ignore_tbr": ignore_tbr,
             "skip_manual_feeds": skip_manual_feeds,
+            "listen_autopay_events": listen_autopay_events,
+            "events_ws_url": events_ws_url,
         }
         reporter: Union[FlashbotsReporter, RNGReporter, Tellor360Reporter]
         if sig_acct_addr:
@@ -335,21 +430,29 @@ async def report(
                 **common_reporter_kwargs,
             )
         elif reporting_diva_protocol:
-            diva_reporter_kwargs = {}
+            diva_reporter_kwargs: Dict[str, Any] = {"batch_size": diva_batch_size}
             if diva_diamond_address is not None:
                 diva_reporter_kwargs["diva_diamond_address"] = diva_diamond_address
             if diva_middleware_address is not None:
                 diva_reporter_kwargs["middleware_address"] = diva_middleware_address
             reporter = DIVAProtocolReporter(
                 **common_reporter_kwargs,
-                **diva_reporter_kwargs,  # type: ignore
+                **diva_reporter_kwargs,
             )
         else:
             reporter = Tellor360Reporter(
                 **common_reporter_kwargs,
             )
 
-        if submit_once:
-            _, _ = await reporter.report_once()
-        else:
-            await reporter.report()
+        metrics_server = serve_metrics(metrics_port) if metrics_port is not None else None
+        stop_metrics_writer = write_metrics_periodically(metrics_file) if metrics_file is not None else None
+        try:
+            if submit_once:
+                _, _ = await reporter.report_once()
+            else:
+                await reporter.report()
+        finally:
+            if metrics_server is not None:
+                metrics_server.shutdown()
+            if stop_metrics_writer is not None:
+                stop_metrics_writer.set()
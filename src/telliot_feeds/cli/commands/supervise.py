@@ -0,0 +1,140 @@
+from typing import Optional
+from typing import Tuple
+
+import click
+from click.core import Context
+from telliot_core.cli.utils import async_run
+
+from telliot_feeds.cli.utils import common_options
+from telliot_feeds.cli.utils import common_reporter_options
+from telliot_feeds.cli.utils import get_accounts_from_name
+from telliot_feeds.feeds import CATALOG_FEEDS
+from telliot_feeds.pricing.price_cache import DEFAULT_PRICE_CACHE_TTL
+from telliot_feeds.pricing.price_cache import price_cache
+from telliot_feeds.reporters.supervisor import ReporterSupervisor
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@click.group()
+def reporter_supervisor() -> None:
+    """Run reporters for several accounts and chains."""
+    pass
+
+
+@reporter_supervisor.command()
+@common_options
+@common_reporter_options
+@click.option(
+    "--chain",
+    "-c",
+    "chains",
+    help="chain id to report on (repeatable), defaults to all chains of each account",
+    type=int,
+    multiple=True,
+)
+@click.option(
+    "--restart-delay",
+    "restart_delay",
+    help="seconds to wait before restarting a reporter that crashed",
+    type=float,
+    default=30.0,
+)
+@click.option(
+    "--price-cache-ttl",
+    "price_cache_ttl",
+    help="seconds a fetched price is shared between feeds querying the same source (0 disables the cache)",
+    type=float,
+    default=DEFAULT_PRICE_CACHE_TTL,
+)
+@click.pass_context
+@async_run
+async def supervise(
+    ctx: Context,
+    query_tag: str,
+    tx_type: int,
+    gas_limit: int,
+    base_fee_per_gas: Optional[float],
+    priority_fee_per_gas: Optional[float],
+    max_fee_per_gas: Optional[float],
+    legacy_gas_price: Optional[int],
+    expected_profit: Tuple[float, float],
+    submit_once: bool,
+    wait_period: int,
+    password: str,
+    min_native_token_balance: float,
+    stake: float,
+    account_str: str,
+    check_rewards: bool,
+    gas_multiplier: int,
+    max_priority_fee_range: int,
+    unsafe: bool,
+    skip_manual_feeds: bool,
+    chains: Tuple[int, ...],
+    restart_delay: float,
+    price_cache_ttl: float,
+) -> None:
+    """Report values to Tellor oracles with several accounts and chains in one process
+
+    Pass a comma separated list of account names to --account. A reporter is
+    started for every chain of each account (or only the chains passed with --chain).
+    """
+    price_cache.ttl = price_cache_ttl
+
+    datafeed = None
+    if query_tag is not None:
+        datafeed = CATALOG_FEEDS.get(query_tag)
+        if datafeed is None:
+            raise click.UsageError(f"No corresponding datafeed found for query tag: {query_tag}")
+
+    supervisor = ReporterSupervisor(restart_delay=restart_delay)
+    reporter_kwargs = {
+        "datafeed": datafeed,
+        "gas_limit": gas_limit,
+        "base_fee_per_gas": base_fee_per_gas,
+        "priority_fee_per_gas": priority_fee_per_gas,
+        "max_fee_per_gas": max_fee_per_gas,
+        "legacy_gas_price": legacy_gas_price,
+        "wait_period": wait_period,
+        "expected_profit": expected_profit,
+        "stake": stake,
+        "transaction_type": tx_type,
+        "min_native_token_balance": int(min_native_token_balance * 10**18),
+        "check_rewards": check_rewards,
+        "gas_multiplier": gas_multiplier,
+        "max_priority_fee_range": max_priority_fee_range,
+        "skip_manual_feeds": skip_manual_feeds,
+    }
+
+    for account_name in [name.strip() for name in account_str.split(",") if name.strip()]:
+        accounts = get_accounts_from_name(account_name)
+        if not accounts:
+            return
+        account = accounts[0]
+        if not account.is_unlocked:
+            account.unlock(password)
+
+        account_chains = [chain_id for chain_id in account.chains if not chains or chain_id in chains]
+        if not account_chains:
+            click.echo(f"Account {account_name} has none of the selected chains: {chains}")
+        for chain_id in account_chains:
+            try:
+                supervisor.add_reporter(account, chain_id, **reporter_kwargs)
+            except (ValueError, ConnectionError) as e:
+                click.echo(f"Unable to start reporter for {account_name} on chain {chain_id}: {e}")
+                return
+
+    click.echo(f"Reporters: {', '.join(r.name for r in supervisor.reporters)}")
+    click.echo(f"Query tag: {query_tag or 'synchronized queries'}")
+    click.echo(f"Transaction type: {tx_type}")
+    click.echo(f"Gas Limit: {gas_limit}")
+    click.echo(f"Desired stake amount: {stake}")
+    click.echo(f"Minimum native token balance (e.g. ETH if on Ethereum mainnet): {min_native_token_balance}")
+    click.echo("\n")
+
+    if not unsafe:
+        _ = input("Press [ENTER] to confirm settings.")
+
+    await supervisor.run(report_count=1 if submit_once else None)
@@ -14,11 +14,13 @@ from telliot_feeds.cli.commands.conditional import conditional
 from telliot_feeds.cli.commands.config import config
 from telliot_feeds.cli.commands.integrations import integrations
 from telliot_feeds.cli.commands.liquity import liquity
+from telliot_feeds.cli.commands.manual import manual
 from telliot_feeds.cli.commands.query import query
 from telliot_feeds.cli.commands.report import report
 from telliot_feeds.cli.commands.request_withdraw_stake import request_withdraw
 from telliot_feeds.cli.commands.settle import settle
 from telliot_feeds.cli.commands.stake import stake
+from telliot_feeds.cli.commands.supervise import supervise
 from telliot_feeds.cli.commands.withdraw import withdraw
 from telliot_feeds.utils.log import get_logger
 
@@ -43,6 +45,7 @@ def main(
 
 
 main.add_command(report)
+main.add_command(supervise)
 main.add_command(query)
 main.add_command(catalog)
 main.add_command(settle)
@@ -55,6 +58,7 @@ main.add_command(request_withdraw)
 main.add_command(withdraw)
 main.add_command(conditional)
 main.add_command(ampleforth)
+main.add_command(manual)
 
 if __name__ == "__main__":
     main()
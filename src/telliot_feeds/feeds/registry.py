@@ -0,0 +1,53 @@
+"""Lazily resolved feed registries
+
+Importing a feed module instantiates its sources, and some sources read the
+telliot config or create web3 clients at import time. Registries map keys to
+feed attribute names of the :mod:`telliot_feeds.feeds` package, so a feed's
+module is only imported the first time that feed is looked up.
+"""
+import importlib
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Mapping
+
+from telliot_feeds.datafeed import DataFeed
+
+
+class LazyFeedRegistry(Mapping[str, DataFeed[Any]]):
+    """Read-only mapping of keys to data feeds that imports each feed on first access
+
+    Membership tests, ``len`` and key iteration never import feed modules.
+    """
+
+    def __init__(self, feed_names: Dict[str, str], package: str = "telliot_feeds.feeds") -> None:
+        """
+        Args:
+        - feed_names: mapping of registry keys to feed attribute names in `package`
+        - package: package that exposes the feeds as (lazy) attributes
+        """
+        self._feed_names = feed_names
+        self._package = package
+        self._resolved: Dict[str, DataFeed[Any]] = {}
+
+    def __getitem__(self, key: str) -> DataFeed[Any]:
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        feed_name = self._feed_names[key]
+        feed: DataFeed[Any] = getattr(importlib.import_module(self._package), feed_name)
+        self._resolved[key] = feed
+        return feed
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._feed_names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._feed_names)
+
+    def __len__(self) -> int:
+        return len(self._feed_names)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._feed_names)})"
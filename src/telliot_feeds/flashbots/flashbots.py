@@ -3,6 +3,7 @@
 # EIP-1559 subbport by @lekhovitsky
 # https://github.com/lekhovitsky
 # type: ignore
+import asyncio
 import time
 from functools import reduce
 from typing import Any
@@ -68,6 +69,11 @@ class FlashbotsTransactionResponse:
         while self.w3.eth.blockNumber < self.target_block_number:
             time.sleep(1)
 
+    async def async_wait(self, poll_interval: float = 1.0) -> None:
+        """Waits until the target block has been reached without blocking the event loop"""
+        while await asyncio.to_thread(lambda: self.w3.eth.blockNumber) < self.target_block_number:
+            await asyncio.sleep(poll_interval)
+
     def receipts(self) -> List[Union[_Hash32, HexBytes, HexStr]]:
         """Returns all the transaction receipts from the submitted bundle"""
         self.wait()
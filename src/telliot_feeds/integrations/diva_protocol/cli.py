@@ -1,7 +1,6 @@
 import click
 
-from telliot_feeds.integrations.diva_protocol.utils import get_reported_pools
-from telliot_feeds.integrations.diva_protocol.utils import update_reported_pools
+from telliot_feeds.integrations.diva_protocol.pool_store import get_pool_store
 
 
 @click.group()
@@ -12,14 +11,14 @@ def diva() -> None:
 
 @diva.group()
 def cache() -> None:
-    """Commands for interacting with reported/settled pools cache (pickle file)."""
+    """Commands for interacting with reported/settled pools cache (SQLite database)."""
     pass
 
 
 @cache.command()
 def view() -> None:
     """View reported/settled pools cache."""
-    cache = get_reported_pools()
+    cache = get_pool_store().all()
     if cache:
         click.echo("Reported/Settled Pools Cache:")
     else:
@@ -36,6 +35,6 @@ def view() -> None:
 def clear() -> None:
     """Clear reported/settled pools cache.
 
-    Creates and saves an empty dict as a pickle file in the telliot default dir."""
-    update_reported_pools({})
+    Removes all pools from the reported pools database in the telliot default dir."""
+    get_pool_store().replace({})
     click.echo("Cleared reported/settled pools cache")
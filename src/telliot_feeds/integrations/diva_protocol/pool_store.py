@@ -0,0 +1,162 @@
+"""Reported DIVA Protocol pools and their settle status
+
+Pools are kept in a SQLite database in the telliot home directory, indexed by
+settle status and report time, so checking whether a pool was reported and
+finding the pools due for settlement don't read every reported pool, and each
+update only writes the pools it changes. Writes are transactions, so a crash
+mid-write leaves the previous state intact.
+
+Pools from the pickle file used before are imported the first time the database
+is created.
+"""
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+NOT_SETTLED = "not settled"
+SETTLED = "settled"
+ERROR = "error"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reported_pools (
+    pool_id TEXT PRIMARY KEY,
+    time_submitted INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reported_pools_due ON reported_pools (status, time_submitted);
+"""
+
+
+class ReportedPoolsStore:
+    """Reported pools with the time their report was submitted and their settle status"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Args:
+        - path: SQLite database file, in memory only if None
+        """
+        self.path = path
+        database = ":memory:"
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            database = str(path)
+        self._db = sqlite3.connect(database)
+        if path is not None:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM reported_pools").fetchone()[0])
+
+    def __contains__(self, pool_id: object) -> bool:
+        row = self._db.execute("SELECT 1 FROM reported_pools WHERE pool_id = ?", (pool_id,)).fetchone()
+        return row is not None
+
+    def get(self, pool_id: str) -> Optional[Tuple[int, str]]:
+        """Time the pool's report was submitted and its settle status, None if it wasn't reported"""
+        row = self._db.execute(
+            "SELECT time_submitted, status FROM reported_pools WHERE pool_id = ?", (pool_id,)
+        ).fetchone()
+        return None if row is None else (int(row[0]), str(row[1]))
+
+    def reported(self, pool_ids: Iterable[str]) -> Set[str]:
+        """The given pools that were reported"""
+        pool_ids = list(pool_ids)
+        reported: Set[str] = set()
+        # stay below SQLite's limit on the number of query parameters
+        for i in range(0, len(pool_ids), 500):
+            chunk = pool_ids[i : i + 500]  # noqa: E203
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(f"SELECT pool_id FROM reported_pools WHERE pool_id IN ({placeholders})", chunk)
+            reported.update(row[0] for row in rows)
+        return reported
+
+    def add(self, pool_id: str, time_submitted: int, status: str = NOT_SETTLED) -> None:
+        """Add a reported pool, or replace it if it was already added"""
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO reported_pools VALUES (?, ?, ?)", (pool_id, time_submitted, status)
+            )
+
+    def set_status(self, pool_id: str, status: str) -> None:
+        with self._db:
+            self._db.execute("UPDATE reported_pools SET status = ? WHERE pool_id = ?", (status, pool_id))
+
+    def remove(self, pool_ids: Iterable[str]) -> None:
+        with self._db:
+            self._db.executemany("DELETE FROM reported_pools WHERE pool_id = ?", ((p,) for p in pool_ids))
+
+    def count_unsettled(self) -> int:
+        """Number of reported pools that weren't settled yet (excluding pools that failed to settle)"""
+        row = self._db.execute("SELECT COUNT(*) FROM reported_pools WHERE status = ?", (NOT_SETTLED,)).fetchone()
+        return int(row[0])
+
+    def due(self, reported_before: int) -> List[Tuple[str, int]]:
+        """Unsettled pools reported before the timestamp, as (pool id, time submitted), oldest first"""
+        rows = self._db.execute(
+            "SELECT pool_id, time_submitted FROM reported_pools WHERE status = ? AND time_submitted < ? "
+            "ORDER BY time_submitted",
+            (NOT_SETTLED, reported_before),
+        )
+        return [(str(pool_id), int(time_submitted)) for pool_id, time_submitted in rows]
+
+    def all(self) -> Dict[str, List[Any]]:
+        """All reported pools, as {pool id: [time submitted, status]}"""
+        rows = self._db.execute("SELECT pool_id, time_submitted, status FROM reported_pools ORDER BY time_submitted")
+        return {str(pool_id): [int(time_submitted), str(status)] for pool_id, time_submitted, status in rows}
+
+    def replace(self, pools: Dict[str, List[Any]]) -> None:
+        """Replace all reported pools, given as {pool id: [time submitted, status]}"""
+        with self._db:
+            self._db.execute("DELETE FROM reported_pools")
+            self._db.executemany(
+                "INSERT INTO reported_pools VALUES (?, ?, ?)",
+                ((pool_id, int(entry[0]), str(entry[1])) for pool_id, entry in pools.items()),
+            )
+
+    def import_pickle(self, pickle_path: Path) -> int:
+        """Import pools from the pickle file used before the store, returns the number of imported pools"""
+        try:
+            with open(pickle_path, "rb") as f:
+                pools = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Unable to import reported pools from {pickle_path}: {e}")
+            return 0
+        self.replace(pools)
+        logger.info(f"Imported {len(pools)} reported pools from {pickle_path}")
+        return len(pools)
+
+
+_stores: Dict[Path, ReportedPoolsStore] = {}
+
+
+def get_pool_store() -> ReportedPoolsStore:
+    """Get the reported pools store in the telliot home directory"""
+    homedir = Path(default_homedir())
+    path = homedir / "reported_pools.sqlite"
+    store = _stores.get(path)
+    if store is None:
+        created = not path.exists()
+        store = ReportedPoolsStore(path=path)
+        pickle_path = homedir / "reported_pools.pickle"
+        if created and pickle_path.exists():
+            store.import_pickle(pickle_path)
+        _stores[path] = store
+    return store
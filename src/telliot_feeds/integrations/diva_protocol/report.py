@@ -3,16 +3,16 @@ DIVA Protocol Reporter
 """
 import asyncio
 import time
+from collections import deque
 from typing import Any
+from typing import Deque
 from typing import Dict
 from typing import Optional
 from typing import Tuple
 
 from hexbytes import HexBytes
-from telliot_core.utils.key_helpers import lazy_unlock_account
 from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
-from web3.types import TxReceipt
 
 from telliot_feeds.datafeed import DataFeed
 from telliot_feeds.integrations.diva_protocol import DIVA_DIAMOND_ADDRESS
@@ -22,12 +22,16 @@ from telliot_feeds.integrations.diva_protocol.feed import assemble_diva_datafeed
 from telliot_feeds.integrations.diva_protocol.pool import DivaPool
 from telliot_feeds.integrations.diva_protocol.pool import fetch_from_subgraph
 from telliot_feeds.integrations.diva_protocol.pool import query_valid_pools
+from telliot_feeds.integrations.diva_protocol.pool_store import ERROR
+from telliot_feeds.integrations.diva_protocol.pool_store import get_pool_store
+from telliot_feeds.integrations.diva_protocol.pool_store import SETTLED
 from telliot_feeds.integrations.diva_protocol.utils import filter_valid_pools
-from telliot_feeds.integrations.diva_protocol.utils import get_reported_pools
-from telliot_feeds.integrations.diva_protocol.utils import update_reported_pools
 from telliot_feeds.queries.diva_protocol import DIVAProtocol
+from telliot_feeds.reporters.reporter_state import fetch_report_counts
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+from telliot_feeds.reporters.transactions import PendingTransaction
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.manual_inbox import fetch_datapoint
 
 
 logger = get_logger(__name__)
@@ -44,12 +48,17 @@ class DIVAProtocolReporter(Tellor360Reporter):
         diva_diamond_address: str = DIVA_DIAMOND_ADDRESS,
         extra_undisputed_time: int = 30,
         wait_before_settle: int = 30,
+        batch_size: int = 1,
         *args,
         **kwargs,
     ) -> None:
         super().__init__(*args, **kwargs)
         self.extra_undisputed_time = extra_undisputed_time
         self.wait_before_settle = wait_before_settle
+        # number of pools reported back to back, and settled together, per loop
+        self.batch_size = batch_size
+        # datafeeds of pools to report, assembled together
+        self.report_queue: Deque[DataFeed[Any]] = deque()
         self.settle_period: Optional[int] = None
         self.diva_diamond_address = diva_diamond_address
         self.middleware_contract = DivaOracleTellorContract(
@@ -59,23 +68,39 @@ class DIVAProtocolReporter(Tellor360Reporter):
         self.middleware_contract.address = middleware_address
         self.middleware_contract.connect()
 
-    async def filter_unreported_pools(self, pools: list[DivaPool]) -> list[DivaPool]:
+    async def filter_unreported_pools(self, pools: list[DivaPool], limit: Optional[int] = 1) -> list[DivaPool]:
         """
-        Retrieves first unreported pool.
+        Retrieves unreported pools, at most `limit` (all if None).
+
+        Report counts of all candidate pools are read in one multicall.
         """
         # also check against local cache of reported pools
-        local_stored_reported = get_reported_pools()
-        unreported_pools = []
+        local_stored_reported = get_pool_store().reported(pool.pool_id for pool in pools)
+        # pools whose report transaction isn't mined yet, or that are queued to be reported
+        pending_pools = {tx.context.get("pool_id") for tx in self.tx_manager.pending.values()}
+        queued_pools = {feed.query.poolId.hex() for feed in self.report_queue}
+        candidates = []
         for pool in pools:
             if pool.pool_id in local_stored_reported:
                 logger.info(f"Pool {pool.pool_id} already reported. Checked against local storage.")
                 continue
+            if pool.pool_id in pending_pools:
+                logger.info(f"Pool {pool.pool_id} report is pending confirmation.")
+                continue
+            if pool.pool_id in queued_pools:
+                continue
+            candidates.append(pool)
 
-            query = DIVAProtocol(
+        query_ids = [
+            DIVAProtocol(
                 poolId=HexBytes(pool.pool_id), divaDiamond=self.diva_diamond_address, chainId=self.endpoint.chain_id
-            )
-            report_count, read_status = await self.get_num_reports_by_id(query.query_id)
+            ).query_id
+            for pool in candidates
+        ]
+        report_counts = await self.get_report_counts(query_ids)
 
+        unreported_pools = []
+        for pool, (report_count, read_status) in zip(candidates, report_counts):
             if not read_status.ok:
                 logger.error(f"Unable to read from tellor oracle: {read_status.error}")
                 continue
@@ -85,10 +110,27 @@ class DIVAProtocolReporter(Tellor360Reporter):
                 continue
 
             unreported_pools.append(pool)
-            if len(unreported_pools) > 0:
+            if limit is not None and len(unreported_pools) >= limit:
                 break
         return unreported_pools
 
+    async def get_report_counts(self, query_ids: list[bytes]) -> list[Tuple[int, ResponseStatus]]:
+        """Report counts of queries, read in one multicall if the chain supports it"""
+        if len(query_ids) > 1:
+            counts, status = await fetch_report_counts(self.oracle, query_ids)
+            if counts is not None:
+                results = []
+                for query_id in query_ids:
+                    count = counts[query_id]
+                    if count is None:
+                        results.append((0, error_status(f"Unable to read report count for {query_id.hex()}")))
+                    else:
+                        results.append((count, ResponseStatus()))
+                return results
+            # counts are read one by one instead
+            logger.debug(status.error)
+        return list(await asyncio.gather(*(self.get_num_reports_by_id(query_id) for query_id in query_ids)))
+
     async def fetch_unfiltered_pools(self, query: str, network: str) -> Optional[list[dict[str, Any]]]:
         """
         Fetch unfiltered derivates pools.
@@ -98,8 +140,8 @@ class DIVAProtocolReporter(Tellor360Reporter):
             network=network,
         )
 
-    async def fetch_datafeed(self) -> Optional[DataFeed[Any]]:
-        """Fetch datafeed"""
+    async def fetch_unreported_pools(self, limit: Optional[int] = 1) -> list[DivaPool]:
+        """Fetch valid pools from the DIVA subgraph that haven't been reported yet"""
         # fetch pools from DIVA subgraph
         query = query_valid_pools(
             data_provider=self.middleware_contract.address,
@@ -111,12 +153,75 @@ class DIVAProtocolReporter(Tellor360Reporter):
         )
         if pools is None or len(pools) == 0:
             logger.info("No pools found from subgraph query")
-            return None
+            return []
 
         # filter for supported pools & pools that haven't been reported for yet
         valid_pools = filter_valid_pools(pools)
-        unreported_pools = await self.filter_unreported_pools(valid_pools)
-        if unreported_pools is None or len(unreported_pools) == 0:
+        return await self.filter_unreported_pools(valid_pools, limit=limit)
+
+    async def queue_pools(self) -> int:
+        """Assemble datafeeds for a batch of unreported pools and queue them to be reported
+
+        The pools' historical prices are fetched concurrently, so pools with the same
+        expiry share their price requests.
+
+        Returns the number of queued pools.
+        """
+        pools = await self.fetch_unreported_pools(limit=self.batch_size)
+        feeds = []
+        for pool in pools:
+            datafeed = assemble_diva_datafeed(
+                pool=pool,
+                diva_diamond=self.diva_diamond_address,
+                chain_id=self.endpoint.chain_id,
+            )
+            if datafeed is None:
+                error_status(
+                    note=f"Unable to assemble DIVA Protocol datafeed for pool {pool.pool_id}", log=logger.warning
+                )
+                continue
+            feeds.append(datafeed)
+
+        values = await asyncio.gather(*(fetch_datapoint(feed) for feed in feeds))
+        for feed, (value, _) in zip(feeds, values):
+            if value is None:
+                logger.warning(f"Unable to fetch value for pool {feed.query.poolId.hex()}, not queued")
+                continue
+            self.report_queue.append(feed)
+        logger.info(f"Queued {len(self.report_queue)} pools to report")
+        return len(self.report_queue)
+
+    async def drop_reported_pools(self) -> None:
+        """Remove queued pools that were reported since they were queued, e.g. by another reporter
+
+        Report counts of all queued pools are read in one multicall.
+        """
+        if not self.report_queue:
+            return
+        feeds = list(self.report_queue)
+        report_counts = await self.get_report_counts([feed.query.query_id for feed in feeds])
+        self.report_queue.clear()
+        for feed, (report_count, read_status) in zip(feeds, report_counts):
+            if read_status.ok and report_count > 0:
+                logger.info(f"Pool {feed.query.poolId.hex()} reported since it was queued, not reporting")
+                continue
+            self.report_queue.append(feed)
+
+    async def fetch_datafeed(self) -> Optional[DataFeed[Any]]:
+        """Fetch datafeed"""
+        if self.batch_size > 1:
+            await self.drop_reported_pools()
+            if not self.report_queue:
+                await self.queue_pools()
+            if not self.report_queue:
+                logger.info("No pools found to report to")
+                return None
+            self.datafeed = self.report_queue.popleft()
+            logger.info(f"Current query: {self.datafeed.query}")
+            return self.datafeed
+
+        unreported_pools = await self.fetch_unreported_pools()
+        if len(unreported_pools) == 0:
             logger.info("No pools found to report to")
             return None
 
@@ -157,18 +262,66 @@ class DIVAProtocolReporter(Tellor360Reporter):
             msg = f"Unable to settle pool: {pool_id}"
             return error_status(note=msg, log=logger.warning)
 
+    async def settle_pools_batch(self, pool_ids: list[str]) -> list[ResponseStatus]:
+        """Settle pools by sending all settle transactions at once, then waiting for them to be mined
+
+        Transactions use consecutive nonces, so they're mined within a few blocks.
+        """
+        status = self.update_gas_fees()
+        if not status.ok:
+            status = error_status("unable to generate gas fees", log=logger.error)
+            return [status] * len(pool_ids)
+
+        sent: list[Tuple[Optional[PendingTransaction], ResponseStatus]] = []
+        for pool_id in pool_ids:
+            sent.append(await self.send_settle_transaction(pool_id))
+
+        statuses = []
+        for pool_id, (pending, status) in zip(pool_ids, sent):
+            if pending is not None:
+                await pending.wait()
+                status = pending.status or error_status("Failed to confirm transaction", log=logger.error)
+            if status.ok:
+                logger.info(f"Pool {pool_id} settled.")
+            else:
+                error_status(f"Unable to settle pool: {pool_id}", log=logger.warning)
+            statuses.append(status)
+        return statuses
+
+    async def send_settle_transaction(self, pool_id: str) -> Tuple[Optional[PendingTransaction], ResponseStatus]:
+        """Send a pool's setFinalReferenceValue transaction without waiting for it to be mined"""
+        try:
+            contract_function = self.middleware_contract.contract.get_function_by_name("setFinalReferenceValue")(
+                _poolId=pool_id, _tippingTokens=[], _claimDIVAReward=False
+            )
+        except Exception as e:
+            return None, error_status("Error assembling setFinalReferenceValue function", e, logger.error)
+        built_tx, status = await asyncio.to_thread(self.finalize_transaction, contract_function)
+        if built_tx is None:
+            return None, status
+        return await self.send_transaction(built_tx, on_receipt=self.on_settle_receipt, context={})
+
+    def on_settle_receipt(self, pending: PendingTransaction) -> ResponseStatus:
+        """Check that a settle transaction succeeded once it's mined"""
+        tx_receipt = pending.receipt
+        if tx_receipt is None:
+            return pending.status or error_status("Failed to confirm transaction", log=logger.error)
+        if tx_receipt["status"] == 0:
+            msg = f"Transaction reverted. ({self.endpoint.explorer}/tx/{pending.tx_hash.hex()})"
+            return error_status(msg, log=logger.error)
+        return ResponseStatus()
+
     async def settle_pools(self) -> ResponseStatus:
         """
         Settle pools
 
-        Fetch available pools to settle from pickled dictionary,
-        settle them by calling setFinalReferenceValue, & update
-        pickled dictionary.
+        Fetch pools due for settlement from the reported pools store,
+        settle them by calling setFinalReferenceValue, & update their
+        settle status in the store.
         """
         logger.info("Settling pools...")
-        # Get pools to settle
-        reported_pools = get_reported_pools()
-        if reported_pools is None or len(reported_pools) == 0:
+        store = get_pool_store()
+        if store.count_unsettled() == 0:
             return error_status(note="No pools to settle", log=logger.info)
 
         if self.settle_period is None:
@@ -177,77 +330,62 @@ class DIVAProtocolReporter(Tellor360Reporter):
             return error_status(note="Unable to get min period undisputed from middleware contract", log=logger.warning)
 
         # Settle pools
-        pools_settled = []
-        for pool_id, (time_submitted, pool_status) in reported_pools.items():
-            if pool_status == "settled":
-                continue
-            if pool_status == "error":
+        cur_time = int(time.time())
+        pools_due = []
+        for pool_id, time_submitted in store.due(cur_time - self.settle_period - self.extra_undisputed_time):
+            logger.info(
+                f"Settling pool {pool_id} reported at {time_submitted} given "
+                f"current time {cur_time} and settle period {self.settle_period} "
+                f"plus {self.extra_undisputed_time} seconds"
+            )
+            pools_due.append(pool_id)
+
+        if self.batch_size > 1 and len(pools_due) > 1:
+            statuses = await self.settle_pools_batch(pools_due)
+        else:
+            statuses = [await self.settle_pool(pool_id) for pool_id in pools_due]
+
+        pools_settled = 0
+        for pool_id, status in zip(pools_due, statuses):
+            if not status.ok:
+                logger.error(f"Unable to settle pool {status.error}")
+                store.set_status(pool_id, ERROR)
                 continue
-            cur_time = int(time.time())
-            if (time_submitted + self.settle_period + self.extra_undisputed_time) < cur_time:
-                logger.info(
-                    f"Settling pool {pool_id} reported at {time_submitted} given "
-                    f"current time {cur_time} and settle period {self.settle_period} "
-                    f"plus {self.extra_undisputed_time} seconds"
-                )
-                status = await self.settle_pool(pool_id)
-                if not status.ok:
-                    logger.error(f"Unable to settle pool {status.error}")
-                    reported_pools[pool_id] = [time_submitted, "error"]
-                    continue
-                pools_settled.append(pool_id)
-
-        # Update pickled dictionary
-        for pool_id in pools_settled:
-            reported_pools[pool_id][1] = "settled"
-
-        if len(pools_settled) > 0:
-            logger.info(f"Settled {len(pools_settled)} pools")
+            store.set_status(pool_id, SETTLED)
+            pools_settled += 1
+
+        if pools_settled > 0:
+            logger.info(f"Settled {pools_settled} pools")
         else:
             logger.info("No pools settled")
-        # Update pickled dictionary
-        update_reported_pools(pools=reported_pools)
         return ResponseStatus()
 
-    def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
-        """Send a signed transaction to the blockchain and wait for confirmation
-
-        Params:
-            tx_signed: The signed transaction object
-
-        Returns a tuple of the transaction receipt and a ResponseStatus object
-        """
-        lazy_unlock_account(self.account)
-        local_account = self.account.local_account
-        tx_signed = local_account.sign_transaction(built_tx)
-        try:
-            logger.debug("Sending submitValue transaction")
-            tx_hash = self.web3.eth.send_raw_transaction(tx_signed.rawTransaction)
-        except Exception as e:
-            note = "Send transaction failed"
-            return None, error_status(note, log=logger.error, e=e)
-
-        try:
-            # Confirm transaction
-            tx_receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=360)
-
-            tx_url = f"{self.endpoint.explorer}/tx/{tx_hash.hex()}"
-
-            if tx_receipt["status"] == 0:
-                msg = f"Transaction reverted. ({tx_url})"
-                return tx_receipt, error_status(msg, log=logger.error)
-
-            logger.info(f"View reported data: \n{tx_url}")
-            # Update reported pools
-            pools = get_reported_pools()
-            cur_time = int(time.time())
-            if self.datafeed is not None:
-                update_reported_pools(pools=pools, add=[[self.datafeed.query.poolId.hex(), [cur_time, "not settled"]]])
-                logger.info(f"View reported data at timestamp {cur_time}: \n{tx_url}")
-            return tx_receipt, ResponseStatus()
-        except Exception as e:
-            note = "Failed to confirm transaction"
-            return None, error_status(note, log=logger.error, e=e)
+    def transaction_context(self) -> Dict[str, Any]:
+        context = super().transaction_context()
+        if self.datafeed is not None:
+            context["pool_id"] = self.datafeed.query.poolId.hex()
+        return context
+
+    def on_receipt(self, pending: PendingTransaction) -> ResponseStatus:
+        """Add the reported pool to the pools to settle once the report is mined"""
+        tx_receipt = pending.receipt
+        if tx_receipt is None:
+            return pending.status or error_status("Failed to confirm transaction", log=logger.error)
+
+        tx_url = f"{self.endpoint.explorer}/tx/{pending.tx_hash.hex()}"
+
+        if tx_receipt["status"] == 0:
+            msg = f"Transaction reverted. ({tx_url})"
+            return error_status(msg, log=logger.error)
+
+        logger.info(f"View reported data: \n{tx_url}")
+        # Update reported pools
+        cur_time = int(time.time())
+        pool_id = pending.context.get("pool_id")
+        if pool_id is not None:
+            get_pool_store().add(pool_id, cur_time)
+            logger.info(f"View reported data at timestamp {cur_time}: \n{tx_url}")
+        return ResponseStatus()
 
     async def report(self, report_count: Optional[int] = None) -> None:
         """Report values for pool reference assets & settle pools."""
@@ -257,7 +395,12 @@ class DIVAProtocolReporter(Tellor360Reporter):
                 logger.warning("Unable to connect to the internet!")
             else:
                 if self.has_native_token():
-                    _, _ = await self.report_once()
+                    # pools are settled while the report's confirmation is pending
+                    _, status = await self.report_once(wait_for_receipt=False)
+                    # queued pools are reported back to back, each once the previous report is confirmed
+                    while status.ok and self.report_queue:
+                        logger.info(f"{len(self.report_queue)} pools left to report")
+                        _, status = await self.report_once(wait_for_receipt=False)
                     if self.wait_before_settle > 0:
                         logger.info(f"Sleeping for {self.wait_before_settle} seconds before settling pools")
                     await asyncio.sleep(self.wait_before_settle)
@@ -267,3 +410,5 @@ class DIVAProtocolReporter(Tellor360Reporter):
             await asyncio.sleep(self.wait_period)
             if report_count is not None:
                 report_count -= 1
+
+        await self.tx_manager.wait_all()
@@ -1,12 +1,10 @@
-import pickle
 from typing import Any
 from typing import Optional
 
-from telliot_core.utils.home import default_homedir
-
 from telliot_feeds.integrations.diva_protocol import SUPPORTED_COLLATERAL_TOKEN_SYMBOLS
 from telliot_feeds.integrations.diva_protocol import SUPPORTED_HISTORICAL_PRICE_PAIRS
 from telliot_feeds.integrations.diva_protocol.pool import DivaPool
+from telliot_feeds.integrations.diva_protocol.pool_store import get_pool_store
 from telliot_feeds.utils.log import get_logger
 
 
@@ -72,28 +70,23 @@ def filter_valid_pools(pools: list[dict[str, Any]]) -> list[DivaPool]:
 
 def get_reported_pools() -> Any:
     """
-    Retrieve dictionary of reoprted pools from telliot default dir
+    Retrieve dictionary of reported pools from the reported pools store
+    in telliot default dir
     """
-    pools_file = str(default_homedir()) + "/reported_pools.pickle"
-
-    try:
-        reported_pools = pickle.load(open(pools_file, "rb"))
-    except OSError:
-        reported_pools = {}
-        pickle.dump(reported_pools, open(pools_file, "wb"))
-
-    return reported_pools
+    return get_pool_store().all()
 
 
 def update_reported_pools(
-    pools: dict[str, int], add: Optional[list[Any]] = None, remove: Optional[list[str]] = None
+    pools: dict[str, Any], add: Optional[list[Any]] = None, remove: Optional[list[str]] = None
 ) -> None:
     """
-    Remove settled pools from reported pools dict & save to pickle file in
-    telliot default dir
-    """
-    pools_file = str(default_homedir()) + "/reported_pools.pickle"
+    Replace the reported pools in the reported pools store in telliot
+    default dir, adding & removing the given pools
 
+    Rewrites every pool, use the store from get_pool_store to update
+    single pools.
+    """
+    pools = dict(pools)
     if add:
         for pool in add:
             # pool is a tuple of pool_id and [expiry_time, "not settled"]
@@ -102,4 +95,4 @@ def update_reported_pools(
         for pool_id in remove:
             del pools[pool_id]
 
-    pickle.dump(pools, open(pools_file, "wb"))
+    get_pool_store().replace(pools)
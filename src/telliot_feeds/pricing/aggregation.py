@@ -0,0 +1,257 @@
+"""Outlier-robust, weighted aggregation of source prices
+
+A feed's price is the median or mean of its sources' prices, where each price
+can be weighted by
+- its source's weight (e.g. the exchange's share of volume or liquidity)
+- its age, halving every `staleness_half_life` seconds
+- its source's history of deviating from the aggregate (`DeviationHistory`)
+
+and prices far from the others can be rejected first, by their distance to the
+median in median absolute deviations (MAD) or by Tukey's fences on the
+interquartile range (IQR). With equal weights and no outlier filter, the result
+is the plain median or mean.
+"""
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Literal
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from telliot_feeds.datasource import DataSource
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+Algorithm = Literal["median", "mean"]
+OutlierFilter = Literal["mad", "iqr"]
+
+FloatArray = npt.NDArray[np.float64]
+
+#: Scale of the MAD to estimate the standard deviation of normally distributed prices
+MAD_SCALE = 1.4826
+
+#: Default number of (scaled) MADs, or IQRs beyond the quartiles, a price may be away from the others
+DEFAULT_OUTLIER_THRESHOLDS: Dict[str, float] = {"mad": 3.0, "iqr": 1.5}
+
+#: Minimum number of prices to look for outliers in
+MIN_PRICES_FOR_OUTLIERS = 3
+
+#: Minimum spread (MAD or IQR) relative to the median, so prices close to many identical ones aren't rejected
+MIN_RELATIVE_SPREAD = 0.001
+
+#: Weight of the latest deviation in a source's deviation history
+DEVIATION_SMOOTHING = 0.1
+
+#: Typical relative deviation from the aggregate, a source deviating this much on average has half the weight
+DEVIATION_TOLERANCE = 0.005
+
+
+def weighted_median(values: FloatArray, weights: FloatArray) -> float:
+    """Median of values with weights, the plain median if all weights are equal
+
+    If the weights below and above a value are exactly half of the total weight,
+    the result is the midpoint of that value and the next one.
+    """
+    order = np.argsort(values)
+    values, weights = values[order], weights[order]
+    cumulative = np.cumsum(weights)
+    half = cumulative[-1] / 2
+    i = int(np.searchsorted(cumulative, half))
+    if i < len(values) - 1 and math.isclose(cumulative[i], half, rel_tol=1e-9):
+        return float((values[i] + values[i + 1]) / 2)
+    return float(values[i])
+
+
+def outlier_mask(values: FloatArray, method: OutlierFilter, threshold: Optional[float] = None) -> npt.NDArray[np.bool_]:
+    """Mask of values that aren't outliers
+
+    Args:
+    - values: prices
+    - method: "mad" to keep values within `threshold` scaled MADs of the median,
+    "iqr" to keep values within `threshold` IQRs beyond the quartiles
+    - threshold: defaults to `DEFAULT_OUTLIER_THRESHOLDS` of the method
+
+    The MAD or IQR is at least `MIN_RELATIVE_SPREAD` of the median, e.g. if
+    most prices are identical, prices only slightly different are kept.
+    """
+    if threshold is None:
+        threshold = DEFAULT_OUTLIER_THRESHOLDS[method]
+    if len(values) < MIN_PRICES_FOR_OUTLIERS:
+        return np.ones(len(values), dtype=bool)
+    median = np.median(values)
+    min_spread = MIN_RELATIVE_SPREAD * abs(median)
+    if method == "mad":
+        distance = np.abs(values - median)
+        mad = MAD_SCALE * max(np.median(distance), min_spread)
+        mask: npt.NDArray[np.bool_] = distance <= threshold * mad
+    elif method == "iqr":
+        q1, q3 = np.percentile(values, [25, 75])
+        iqr = max(q3 - q1, min_spread)
+        mask = (values >= q1 - threshold * iqr) & (values <= q3 + threshold * iqr)
+    else:
+        raise ValueError(f"Unknown outlier filter: {method}")
+    return mask
+
+
+class DeviationHistory:
+    """Exponentially weighted mean of each source's relative deviation from the aggregate
+
+    Sources are identified by a hashable key, e.g. their price service's cache key,
+    so the history is shared by all feeds using the same source.
+    """
+
+    def __init__(self, smoothing: float = DEVIATION_SMOOTHING, tolerance: float = DEVIATION_TOLERANCE) -> None:
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self._deviations: Dict[Hashable, float] = {}
+
+    def get(self, key: Hashable) -> Optional[float]:
+        return self._deviations.get(key)
+
+    def record(self, keys: Sequence[Optional[Hashable]], deviations: FloatArray) -> None:
+        for key, deviation in zip(keys, deviations.tolist()):
+            if key is None:
+                continue
+            previous = self._deviations.get(key)
+            self._deviations[key] = (
+                deviation if previous is None else previous + self.smoothing * (deviation - previous)
+            )
+
+    def weights(self, keys: Sequence[Optional[Hashable]]) -> FloatArray:
+        """Weights of sources, 1 for sources without history, smaller the more a source deviated"""
+        deviations = np.array([self._deviations.get(key, 0.0) if key is not None else 0.0 for key in keys])
+        weights: FloatArray = 1 / (1 + deviations / self.tolerance)
+        return weights
+
+    def clear(self) -> None:
+        self._deviations.clear()
+
+
+#: Process-wide deviation history of price sources
+deviation_history = DeviationHistory()
+
+
+@dataclass
+class Aggregation:
+    """How source prices are aggregated
+
+    - algorithm: "median" or "mean", weighted if prices have different weights
+    - outlier_filter: "mad" or "iqr" to reject outliers before aggregating, None keeps all prices
+    - outlier_threshold: number of MADs or IQRs, defaults to `DEFAULT_OUTLIER_THRESHOLDS`
+    - staleness_half_life: seconds after which a price's weight is halved, None ignores timestamps
+    - max_age: seconds after which prices are left out, None keeps prices of any age
+    - penalize_deviation: weight sources down by their history of deviating from the aggregate
+    """
+
+    algorithm: Algorithm = "median"
+    outlier_filter: Optional[OutlierFilter] = None
+    outlier_threshold: Optional[float] = None
+    staleness_half_life: Optional[float] = None
+    max_age: Optional[float] = None
+    penalize_deviation: bool = False
+
+    def __post_init__(self) -> None:
+        if self.algorithm not in ("median", "mean"):
+            raise ValueError(f"Unknown aggregation algorithm: {self.algorithm}")
+        if self.outlier_filter is not None and self.outlier_filter not in DEFAULT_OUTLIER_THRESHOLDS:
+            raise ValueError(f"Unknown outlier filter: {self.outlier_filter}")
+
+    def aggregate(
+        self,
+        prices: Sequence[float],
+        timestamps: Optional[Sequence[float]] = None,
+        weights: Optional[Sequence[float]] = None,
+        keys: Optional[Sequence[Optional[Hashable]]] = None,
+        now: Optional[float] = None,
+        history: Optional[DeviationHistory] = None,
+    ) -> Optional[float]:
+        """Aggregate prices
+
+        Args:
+        - prices: source prices
+        - timestamps: unix time of each price (NaN if unknown), required for staleness weighting and max_age
+        - weights: weight of each price's source, 1 if None
+        - keys: identifiers of the sources, to record their deviation from the result in the
+        deviation history, None for sources without history
+        - now: unix time prices' ages are relative to, defaults to the current time
+        - history: deviation history, defaults to the process-wide `deviation_history`
+
+        Returns the aggregate price, None if no price is left
+        """
+        values = np.asarray(prices, dtype=np.float64)
+        w = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+        source_keys = list(keys) if keys is not None else [None] * len(values)
+        history = deviation_history if history is None else history
+        keep = np.isfinite(values) & (w > 0)
+
+        if timestamps is not None and (self.staleness_half_life is not None or self.max_age is not None):
+            age = (time.time() if now is None else now) - np.asarray(timestamps, dtype=np.float64)
+            # prices without a timestamp count as fresh
+            age = np.where(np.isnan(age), 0.0, age)
+            if self.max_age is not None:
+                keep &= age <= self.max_age
+            if self.staleness_half_life is not None:
+                w = w * np.power(0.5, np.maximum(age, 0) / self.staleness_half_life)
+
+        if self.penalize_deviation:
+            w = w * history.weights(source_keys)
+
+        if self.outlier_filter is not None:
+            kept = np.flatnonzero(keep)
+            mask = outlier_mask(values[kept], self.outlier_filter, self.outlier_threshold)
+            if not mask.all():
+                logger.info(f"Rejected outlier prices: {values[kept[~mask]].tolist()}")
+            keep[kept[~mask]] = False
+
+        if not keep.any():
+            return None
+        values_kept, weights_kept = values[keep], w[keep]
+        if self.algorithm == "median":
+            if np.all(weights_kept == weights_kept[0]):
+                result = float(np.median(values_kept))
+            else:
+                result = weighted_median(values_kept, weights_kept)
+        else:
+            result = float(np.average(values_kept, weights=weights_kept))
+
+        if keys is not None and result != 0:
+            valid = np.flatnonzero(np.isfinite(values))
+            history.record([source_keys[i] for i in valid], np.abs(values[valid] - result) / abs(result))
+        return result
+
+
+def source_prices(
+    sources: Sequence[DataSource[float]], datapoints: Sequence[OptionalDataPoint[float]]
+) -> Tuple[List[float], List[float], List[float], List[Optional[Hashable]]]:
+    """Valid prices of sources, with their timestamps, source weights and source keys
+
+    Sources are keyed by their price service's cache key, other data sources have no key.
+    """
+    prices: List[float] = []
+    timestamps: List[float] = []
+    weights: List[float] = []
+    keys: List[Optional[Hashable]] = []
+    for source, (v, t) in zip(sources, datapoints):
+        # Check for valid answers
+        if v is None or not isinstance(v, float):
+            continue
+        prices.append(v)
+        timestamps.append(math.nan if t is None else t.timestamp())
+        if isinstance(source, PriceSource):
+            weights.append(source.weight)
+            keys.append(source.service.cache_key(source.asset, source.currency))
+        else:
+            weights.append(1.0)
+            keys.append(None)
+    return prices, timestamps, weights, keys
@@ -0,0 +1,190 @@
+"""Deadline, quorum and hedged requests when fetching prices from many sources
+
+Waiting for every source of an aggregate price makes the feed as slow as its
+slowest exchange. `gather_prices` can instead return once a quorum of sources
+answered or a deadline passed, cancelling the sources that didn't answer yet, so
+the feed's latency follows its k-th fastest source.
+
+Sources whose request takes much longer than usual can be hedged: after
+`hedge_factor` times the source's typical latency, a second request is sent to
+the same price service and the first answer of the two is used.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from telliot_feeds.datasource import DataSource
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_cache import price_cache
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Weight of the latest request in a source's typical latency
+LATENCY_SMOOTHING = 0.2
+
+#: Minimum number of seconds to wait before hedging a request
+MIN_HEDGE_DELAY = 0.1
+
+
+@dataclass
+class GatherSettings:
+    """How long to wait for the sources of an aggregate price
+
+    - quorum: return once this many sources answered with a price, None waits for all sources
+    - deadline: seconds to wait for sources, None waits until the quorum is reached
+    - hedge_factor: send a second request to a source once its request took this many times
+    its typical latency, None disables hedged requests
+    """
+
+    quorum: Optional[int] = None
+    deadline: Optional[float] = None
+    hedge_factor: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.quorum is not None and self.quorum < 1:
+            raise ValueError("quorum must be at least 1")
+        if self.deadline is not None and self.deadline <= 0:
+            raise ValueError("deadline must be positive")
+        if self.hedge_factor is not None and self.hedge_factor <= 0:
+            raise ValueError("hedge_factor must be positive")
+
+
+#: Settings of aggregators that don't set their own (set by the CLI)
+default_gather_settings = GatherSettings()
+
+
+class LatencyTracker:
+    """Typical request latency of each price service, asset and currency
+
+    Latencies are exponentially weighted moving averages, shared by all
+    aggregators using the same price service.
+    """
+
+    def __init__(self, smoothing: float = LATENCY_SMOOTHING) -> None:
+        self.smoothing = smoothing
+        self._latencies: Dict[Hashable, float] = {}
+
+    def get(self, key: Hashable) -> Optional[float]:
+        return self._latencies.get(key)
+
+    def record(self, key: Hashable, seconds: float) -> None:
+        latency = self._latencies.get(key)
+        self._latencies[key] = seconds if latency is None else latency + self.smoothing * (seconds - latency)
+
+    def clear(self) -> None:
+        self._latencies.clear()
+
+
+#: Process-wide latencies of price requests
+latencies = LatencyTracker()
+
+
+def _name(source: DataSource[float]) -> str:
+    if isinstance(source, PriceSource):
+        return f"{source.service.name} {source.asset}/{source.currency}"
+    return type(source).__name__
+
+
+def _has_price(datapoint: OptionalDataPoint[float]) -> bool:
+    return datapoint[0] is not None and datapoint[1] is not None
+
+
+async def _fetch_hedged(source: PriceSource, delay: float) -> OptionalDataPoint[float]:
+    """Fetch from a price source, sending a second request if the first takes longer than delay"""
+    first = asyncio.ensure_future(source.fetch_new_datapoint())
+    requests = {first}
+    try:
+        done, _ = await asyncio.wait(requests, timeout=delay)
+        if done:
+            return first.result()
+
+        logger.debug(f"Sending hedged request to {source.service.name} for {source.asset}/{source.currency}")
+        # sent to the service directly, the cache would join the request already in flight
+        hedge = asyncio.ensure_future(source.service.get_price(source.asset, source.currency))
+        requests.add(hedge)
+        datapoint: OptionalDataPoint[float] = (None, None)
+        while requests:
+            done, requests = await asyncio.wait(requests, return_when=asyncio.FIRST_COMPLETED)
+            for request in done:
+                if not request.cancelled() and request.exception() is None and _has_price(request.result()):
+                    datapoint = request.result()
+            if _has_price(datapoint):
+                break
+        v, t = datapoint
+        if v is not None and t is not None:
+            source.store_datapoint((v, t))
+        return datapoint
+    finally:
+        for request in requests:
+            request.cancel()
+        await asyncio.gather(*requests, return_exceptions=True)
+
+
+async def _fetch(source: DataSource[float], hedge_factor: Optional[float]) -> OptionalDataPoint[float]:
+    if not isinstance(source, PriceSource):
+        return await source.fetch_new_datapoint()
+
+    key = source.service.cache_key(source.asset, source.currency)
+    if price_cache.ttl > 0 and _has_price(price_cache.get(key)):
+        # cache hits don't tell how long the service takes
+        return await source.fetch_new_datapoint()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    latency = latencies.get(key)
+    if hedge_factor is None or latency is None:
+        datapoint = await source.fetch_new_datapoint()
+    else:
+        datapoint = await _fetch_hedged(source, max(hedge_factor * latency, MIN_HEDGE_DELAY))
+    if _has_price(datapoint):
+        latencies.record(key, loop.time() - start)
+    return datapoint
+
+
+async def gather_prices(
+    sources: Sequence[DataSource[float]], settings: GatherSettings
+) -> List[OptionalDataPoint[float]]:
+    """Fetch new datapoints from sources
+
+    Returns a datapoint for each source, in the same order, (None, None) for
+    sources that failed or didn't answer before the quorum or deadline was reached.
+    """
+    if settings.quorum is None and settings.deadline is None and settings.hedge_factor is None:
+        return list(await asyncio.gather(*[source.fetch_new_datapoint() for source in sources]))
+
+    datapoints: List[OptionalDataPoint[float]] = [(None, None)] * len(sources)
+    quorum = len(sources) if settings.quorum is None else min(settings.quorum, len(sources))
+    tasks = {asyncio.ensure_future(_fetch(source, settings.hedge_factor)): i for i, source in enumerate(sources)}
+    pending = set(tasks)
+    loop = asyncio.get_running_loop()
+    deadline = None if settings.deadline is None else loop.time() + settings.deadline
+    answered = 0
+    try:
+        while pending and answered < quorum:
+            timeout = None if deadline is None else deadline - loop.time()
+            if timeout is not None and timeout <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    logger.error(f"Error fetching from {_name(sources[tasks[task]])}: {task.exception()}")
+                    continue
+                datapoints[tasks[task]] = task.result()
+                if _has_price(task.result()):
+                    answered += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if pending:
+        slow = ", ".join(_name(sources[tasks[task]]) for task in pending)
+        logger.info(f"Using {answered} of {len(sources)} sources, cancelled sources that didn't answer in time: {slow}")
+    return datapoints
@@ -0,0 +1,96 @@
+"""Shared cache for price service requests
+
+Many feeds query the same upstream ticker (e.g. ETH/USD from CoinGecko is
+used by the ETH/USD median feed, several LST derived feeds and the native
+token profitability check). The cache stores each (service, asset, currency)
+price for a short time-to-live and coalesces concurrent requests for the
+same key into a single request to the price service.
+"""
+import asyncio
+import time
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Tuple
+
+from telliot_feeds.dtypes.datapoint import DataPoint
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+
+
+#: Default number of seconds a fetched price is reused
+DEFAULT_PRICE_CACHE_TTL = 10.0
+
+
+class PriceCache:
+    """TTL cache with single-flight request coalescing
+
+    Only successful (non-None) datapoints are cached, so a failed request
+    is retried by the next caller.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PRICE_CACHE_TTL) -> None:
+        #: Number of seconds a cached datapoint is valid, 0 disables caching
+        self.ttl = ttl
+        self._values: Dict[Hashable, Tuple[float, DataPoint[float]]] = {}
+        self._inflight: Dict[Hashable, "asyncio.Task[OptionalDataPoint[float]]"] = {}
+
+    def get(self, key: Hashable) -> OptionalDataPoint[float]:
+        """Return the cached datapoint for a key if it has not expired"""
+        cached = self._values.get(key)
+        if cached is not None:
+            stored_at, datapoint = cached
+            if time.monotonic() - stored_at < self.ttl:
+                return datapoint
+            del self._values[key]
+        return None, None
+
+    def clear(self) -> None:
+        """Remove all cached datapoints"""
+        self._values.clear()
+
+    async def fetch(
+        self, key: Hashable, fetch_func: Callable[[], Awaitable[OptionalDataPoint[float]]]
+    ) -> OptionalDataPoint[float]:
+        """Get a datapoint from the cache, or fetch it
+
+        If a request for the same key is already in flight, wait for its
+        result instead of sending another request.
+
+        Args:
+            key: Cache key identifying the price request
+            fetch_func: Coroutine function that requests a new datapoint
+
+        Returns:
+            Cached or newly fetched datapoint
+        """
+        if self.ttl <= 0:
+            return await fetch_func()
+
+        v, t = self.get(key)
+        if v is not None and t is not None:
+            return v, t
+
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch_and_store(key, fetch_func))
+            self._inflight[key] = task
+
+        # shield the shared request so one cancelled caller doesn't cancel it for everyone
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(
+        self, key: Hashable, fetch_func: Callable[[], Awaitable[OptionalDataPoint[float]]]
+    ) -> OptionalDataPoint[float]:
+        try:
+            v, t = await fetch_func()
+            if v is not None and t is not None:
+                self._values[key] = (time.monotonic(), (v, t))
+            return v, t
+        finally:
+            self._inflight.pop(key, None)
+
+
+#: Process-wide cache shared by all price sources
+price_cache = PriceCache()
@@ -1,13 +1,60 @@
+import asyncio
+import json
 from abc import ABC
 from abc import abstractmethod
 from typing import Any
 from typing import Dict
+from typing import Hashable
+from typing import Optional
 
-import requests
+import aiohttp
 
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 
 
+#: Maximum number of simultaneous connections in the shared pool
+POOL_SIZE = 100
+
+#: Maximum number of simultaneous connections to a single host
+POOL_SIZE_PER_HOST = 10
+
+# Process-wide HTTP session shared by every web price service.
+# aiohttp sessions are bound to the event loop they were created in,
+# so the session is recreated if a different loop is running.
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP client session for the running event loop
+
+    The session keeps a keep-alive connection pool per host, so repeated
+    requests to the same API reuse open connections instead of performing
+    a new TCP/TLS handshake for every price query.
+
+    Must be called from within a coroutine.
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(limit=POOL_SIZE, limit_per_host=POOL_SIZE_PER_HOST, ttl_dns_cache=300)
+        _session = aiohttp.ClientSession(connector=connector)
+        _session_loop = loop
+
+    return _session
+
+
+async def close_client_session() -> None:
+    """Close the shared HTTP client session, if one is open"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed and _session_loop is asyncio.get_running_loop():
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
 class PriceServiceInterface(ABC):
     """Price Service Interface
 
@@ -43,32 +90,87 @@ class WebPriceService(PriceServiceInterface):
         self.url = url
         self.timeout = timeout
 
-    def get_url(self, url: str = "") -> Dict[str, Any]:
+    def cache_key(self, asset: str, currency: str) -> Hashable:
+        """Key identifying a price request in the shared price cache
+
+        Includes the service type and its scalar settings (url, timestamp
+        for historical services, etc.) so differently configured services
+        never share cached prices.
+        """
+        settings = tuple(
+            sorted((k, v) for k, v in vars(self).items() if isinstance(v, (str, int, float, bool, type(None))))
+        )
+        return type(self), settings, asset.lower(), currency.lower()
+
+    async def get_url(
+        self,
+        url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """Helper function to get URL JSON response while handling exceptions
 
         Args:
             url: URL to fetch
+            headers: Optional request headers
+            params: Optional query string parameters
 
         Returns:
             A dictionary with the following (optional) keys:
                 json (dict or list): Result, if no error occurred
+                status (int): HTTP status code, if a response was received
                 error (str): A description of the error, if one occurred
                 exception (Exception): The exception, if one occurred
         """
+        return await self._request("GET", url, headers=headers, params=params)
 
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
+    async def post_url(
+        self,
+        url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        json_data: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Helper function to post a JSON body (e.g. a GraphQL query) and get the
+        JSON response while handling exceptions
 
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except requests.exceptions.JSONDecodeError as e:
-                return {"error": "JSON Decode Error", "exception": e}
+        Args:
+            url: URL to post to
+            headers: Optional request headers
+            json_data: JSON serializable request body
 
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
+        Returns:
+            A dictionary with the same keys as `get_url`
+        """
+        return await self._request("POST", url, headers=headers, json_data=json_data)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        request_url = self.url + url
+        session = get_client_session()
+
+        try:
+            async with session.request(
+                method,
+                request_url,
+                headers=headers,
+                params=params,
+                json=json_data,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as r:
+                text = await r.text()
+                return {"response": json.loads(text), "status": r.status}
+
+        except asyncio.TimeoutError as e:
+            return {"error": "Timeout Error", "exception": e}
+
+        except json.JSONDecodeError as e:
+            return {"error": "JSON Decode Error", "exception": e}
+
+        except Exception as e:
+            return {"error": str(type(e)), "exception": e}
@@ -1,9 +1,16 @@
+import time
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Any
+from typing import Dict
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_cache import price_cache
 from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.utils.metrics import source_errors
+from telliot_feeds.utils.metrics import source_fetch_seconds
+from telliot_feeds.utils.metrics import source_staleness_seconds
 
 
 @dataclass
@@ -12,6 +19,10 @@ class PriceSource(DataSource[float]):
 
     The Current Asset Price data source retrieves the price of a asset
     in the specified current from a `WebPriceService`.
+
+    Prices are shared between sources through the process-wide price
+    cache, so sources querying the same service, asset and currency
+    within the cache TTL send a single request.
     """
 
     #: Asset symbol
@@ -23,15 +34,37 @@ class PriceSource(DataSource[float]):
     #: Price Service
     service: WebPriceService = field(default_factory=WebPriceService)  # type: ignore
 
+    #: Weight of the source's price in aggregates, e.g. the exchange's share of volume or liquidity
+    weight: float = 1.0
+
     async def fetch_new_datapoint(self) -> OptionalDataPoint[float]:
         """Update current value with time-stamped value fetched from source
 
         Returns:
             New datapoint
         """
-        datapoint = await self.service.get_price(self.asset, self.currency)
+        labels: Dict[str, Any] = {
+            "source": self.service.name,
+            "asset": self.asset.lower(),
+            "currency": self.currency.lower(),
+        }
+
+        async def fetch() -> OptionalDataPoint[float]:
+            # only requests sent to the service are timed, not cache hits
+            with source_fetch_seconds.time(**labels):
+                return await self.service.get_price(self.asset, self.currency)
+
+        key = self.service.cache_key(self.asset, self.currency)
+        try:
+            datapoint = await price_cache.fetch(key, fetch)
+        except Exception:
+            source_errors.inc(**labels)
+            raise
         v, t = datapoint
         if v is not None and t is not None:
             self.store_datapoint((v, t))
+            source_staleness_seconds.set(time.time() - t.timestamp(), **labels)
+        else:
+            source_errors.inc(**labels)
 
         return datapoint
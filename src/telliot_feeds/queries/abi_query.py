@@ -1,4 +1,6 @@
 import codecs
+from functools import lru_cache
+from typing import Any
 from typing import ClassVar
 from typing import Optional
 
@@ -11,7 +13,9 @@ from eth_abi.encoding import TextStringEncoder
 from eth_abi.utils.numeric import ceil32
 from eth_abi.utils.padding import zpad_right
 
+from telliot_feeds.queries.query import freeze
 from telliot_feeds.queries.query import OracleQuery
+from telliot_feeds.queries.query import QUERY_CACHE_SIZE
 from telliot_feeds.utils.log import get_logger
 
 
@@ -62,24 +66,15 @@ class AbiQuery(OracleQuery):
         """Encode the query type and parameters to create the query data.
 
         This method uses ABI encoding to encode the query's parameter values.
+        Encodings are memoized by query type and current parameter values.
         """
-        # If the query has parameters
-        if self.abi:
-            param_values = [getattr(self, p["name"]) for p in self.abi]
-            param_types = [p["type"] for p in self.abi]
-            encoded_params = encode_abi(param_types, param_values)
-
-        # If the query has no real parameters, and only the default "phantom" parameter
-        else:
-            # By default, the queries with no real parameters have a phantom parameter with
-            # a consistent value of empty bytes. The encoding of these empty bytese in
-            # Python does not match the encoding in Solidity, so the bytes are generated
-            # manually like so:
-            left_side = b"\0 ".rjust(32, b"\0")
-            right_side = b"\0".rjust(32, b"\0")
-            encoded_params = left_side + right_side
-
-        return encode_abi(["string", "bytes"], [type(self).__name__, encoded_params])
+        param_types = tuple(p["type"] for p in self.abi)
+        param_values = tuple(freeze(getattr(self, p["name"])) for p in self.abi)
+        try:
+            return _encode_query_data(type(self).__name__, param_types, param_values)
+        except TypeError:
+            # unhashable parameter value, encode without caching
+            return _encode_query_data.__wrapped__(type(self).__name__, param_types, param_values)
 
     @staticmethod
     def get_query_from_data(query_data: bytes) -> Optional[OracleQuery]:
@@ -102,3 +97,23 @@ class AbiQuery(OracleQuery):
         params = dict(zip(param_names, param_values))
 
         return deserialize({"type": query_type, **params})  # type: ignore
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _encode_query_data(query_type: str, param_types: tuple[str, ...], param_values: tuple[Any, ...]) -> bytes:
+    """ABI-encode a query type and its parameter values"""
+    # If the query has parameters
+    if param_types:
+        encoded_params = encode_abi(list(param_types), list(param_values))
+
+    # If the query has no real parameters, and only the default "phantom" parameter
+    else:
+        # By default, the queries with no real parameters have a phantom parameter with
+        # a consistent value of empty bytes. The encoding of these empty bytese in
+        # Python does not match the encoding in Solidity, so the bytes are generated
+        # manually like so:
+        left_side = b"\0 ".rjust(32, b"\0")
+        right_side = b"\0".rjust(32, b"\0")
+        encoded_params = left_side + right_side
+
+    return encode_abi(["string", "bytes"], [query_type, encoded_params])
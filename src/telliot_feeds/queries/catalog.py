@@ -1,7 +1,9 @@
 import json
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Any
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 
@@ -41,11 +43,27 @@ class Catalog(Base):
     """Query Catalog
 
     The query catalog contains one `CatalogEntry` object for each valid query in the Tellor network.
-    It is stored as a mapping of query names (i.e. tags) to `CatalogEntry` objects.
+    It is stored as a mapping of query names (i.e. tags) to `CatalogEntry` objects,
+    with additional indexes by query id and query type for constant time lookups.
     """
 
     _entries: Dict[str, CatalogEntry] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        self._by_query_id: Dict[str, List[CatalogEntry]] = {}
+        self._by_query_type: Dict[str, List[CatalogEntry]] = {}
+        for entry in self._entries.values():
+            self._index(entry)
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore the catalog from its state and rebuild the indexes"""
+        super().restore_state(state)
+        self.__post_init__()
+
+    def _index(self, entry: CatalogEntry) -> None:
+        self._by_query_id.setdefault(entry.query_id.lower(), []).append(entry)
+        self._by_query_type.setdefault(entry.query_type.lower(), []).append(entry)
+
     def add_entry(self, tag: str, title: str, q: OracleQuery, active: bool = True) -> None:
         """Add a new entry to the catalog."""
 
@@ -68,6 +86,11 @@ class Catalog(Base):
         )
 
         self._entries[tag] = entry
+        self._index(entry)
+
+    def get(self, tag: str) -> Optional[CatalogEntry]:
+        """Get the catalog entry with exactly matching tag"""
+        return self._entries.get(tag)
 
     def find(
         self,
@@ -77,22 +100,30 @@ class Catalog(Base):
         query_type: Optional[str] = None,
         active: Optional[bool] = None,
     ) -> List[OracleQuery]:
-        """Search the query catalog for matching entries."""
+        """Search the query catalog for matching entries.
+
+        Query id and query type filters are resolved through the indexes;
+        the tag filter matches substrings, so it's applied to the remaining candidates.
+        """
+
+        candidates: Iterable[CatalogEntry] = self._entries.values()
+        if query_id is not None:
+            # Add 0x if necessary for match
+            if query_id[:2] not in ["0x", "0X"]:
+                query_id = "0x" + query_id
+            candidates = self._by_query_id.get(query_id.lower(), [])
+        if query_type is not None:
+            query_type = query_type.lower()
+            if query_id is None:
+                candidates = self._by_query_type.get(query_type, [])
+            else:
+                candidates = [entry for entry in candidates if entry.query_type.lower() == query_type]
 
         entries = []
-        for entry in self._entries.values():
+        for entry in candidates:
             if tag is not None:
                 if tag not in entry.tag:  # includes search for substring
                     continue
-            if query_id is not None:
-                # Add 0x if necessary for match
-                if query_id[:2] not in ["0x", "0X"]:
-                    query_id = "0x" + query_id
-                if query_id.lower() != entry.query_id.lower():
-                    continue
-            if query_type is not None:
-                if query_type.lower() != entry.query_type.lower():
-                    continue
             if active is not None:
                 if active != entry.active:
                     continue
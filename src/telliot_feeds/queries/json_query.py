@@ -1,6 +1,17 @@
+from dataclasses import fields
+from dataclasses import is_dataclass
+from typing import Any
+from typing import Dict
+from typing import Tuple
+
+from telliot_feeds.queries.query import freeze
 from telliot_feeds.queries.query import OracleQuery
+from telliot_feeds.queries.query import QUERY_CACHE_SIZE
 from telliot_feeds.queries.query import query_from_descriptor
 
+# query data memoized by query type and parameter values
+_query_data_cache: Dict[Tuple[Any, ...], bytes] = {}
+
 
 class JsonQuery(OracleQuery):
     """An Oracle Query that uses JSON-encoding to compute the query_data."""
@@ -10,8 +21,25 @@ class JsonQuery(OracleQuery):
         """Encode the query `descriptor` to create the query `data` field for
         use in the ``TellorX.Oracle.tipQuery()`` contract call.
 
+        Encodings are memoized by query type and current parameter values.
         """
-        return self.descriptor.encode("utf-8")
+        if not is_dataclass(self):
+            return self.descriptor.encode("utf-8")
+
+        key = (type(self), tuple(freeze(getattr(self, f.name)) for f in fields(self)))
+        try:
+            return _query_data_cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable parameter value, encode without caching
+            return self.descriptor.encode("utf-8")
+
+        query_data = self.descriptor.encode("utf-8")
+        if len(_query_data_cache) >= QUERY_CACHE_SIZE:
+            _query_data_cache.clear()
+        _query_data_cache[key] = query_data
+        return query_data
 
     @staticmethod
     def get_query_from_data(query_data: bytes) -> OracleQuery:
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from typing import Any
 from typing import Dict
 from typing import Optional
@@ -14,6 +15,30 @@ from web3 import Web3
 
 from telliot_feeds.dtypes.value_type import ValueType
 
+#: Maximum number of distinct queries whose encodings are memoized
+QUERY_CACHE_SIZE = 4096
+
+
+def freeze(value: Any) -> Any:
+    """Convert a query parameter into a hashable equivalent
+
+    Lists become tuples and dicts become sorted item tuples (recursively),
+    so the current parameter values can key the encoding caches. Since the
+    key is built from the values at access time, mutating a query never
+    returns a stale encoding.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    return value
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def query_id_from_data(query_data: bytes) -> bytes:
+    """Compute (and memoize) the query id for query data"""
+    return bytes(Web3.keccak(query_data))
+
 
 class OracleQuery(Serializable):
     """Oracle Query
@@ -75,8 +100,10 @@ class OracleQuery(Serializable):
         """Returns the query ``id`` for use with the
         ``TellorX.Oracle.tipQuery()`` and ``TellorX.Oracle.submitValue()``
         contract calls.
+
+        Memoized on the query data, which subclasses cache by parameter values.
         """
-        return bytes(Web3.keccak(self.query_data))
+        return query_id_from_data(self.query_data)
 
     @property
     def query_data(self) -> bytes:
@@ -2,7 +2,9 @@
 
 Example of a subclassed Reporter.
 """
+import asyncio
 from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import Tuple
 
@@ -13,12 +15,12 @@ from eth_utils import to_checksum_address
 from requests.exceptions import HTTPError
 from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
-from web3.exceptions import TransactionNotFound
-from web3.types import TxReceipt
 
 from telliot_feeds.flashbots import flashbot  # type: ignore
 from telliot_feeds.flashbots.provider import get_default_endpoint  # type: ignore
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+from telliot_feeds.reporters.transactions import PendingTransaction
+from telliot_feeds.reporters.transactions import ReceiptHandler
 from telliot_feeds.utils.log import get_logger
 
 
@@ -42,8 +44,17 @@ class FlashbotsReporter(Tellor360Reporter):
         logger.info(f"Flashbots provider endpoint: {flashbots_uri}")
         flashbot(self.endpoint._web3, self.signature_account, flashbots_uri)
 
-    def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
-        status = ResponseStatus()
+    async def send_transaction(
+        self,
+        built_tx: Any,
+        on_receipt: Optional[ReceiptHandler] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Optional[PendingTransaction], ResponseStatus]:
+        """Send a bundle of the signed transaction to be executed in the next block
+
+        Whether the bundle was executed is checked in the background once the
+        target block is reached, and handled by `on_receipt` (defaults to `on_receipt`).
+        """
         # Create bundle of one pre-signed, EIP-1559 (type 2) transaction
         tx_signed = self.account.local_account.sign_transaction(built_tx)
         bundle = [
@@ -51,36 +62,37 @@ class FlashbotsReporter(Tellor360Reporter):
         ]
 
         # Send bundle to be executed in the next block
-        block = self.endpoint._web3.eth.block_number
-        # results = []
-        # for target_block in [block + k for k in [1, 2, 3, 4, 5]]:
-        #     results.append(
-        #         self.endpoint._web3.flashbots.send_bundle(
-        #             bundle, target_block_number=target_block
-        #         )
-        #     )
-        # result = results[-1]
         try:
-            result = self.endpoint._web3.flashbots.send_bundle(bundle, target_block_number=block + 1)
+            block = await asyncio.to_thread(lambda: self.endpoint._web3.eth.block_number)
+            result = await asyncio.to_thread(
+                self.endpoint._web3.flashbots.send_bundle, bundle, target_block_number=block + 1
+            )
         except HTTPError as e:
             msg = "Unable to send bundle to miners due to HTTP error"
             return None, error_status(note=msg, e=e, log=logger.error)
 
         logger.info(f"Bundle sent to miners in block {block}")
 
-        # Wait for transaction confirmation
-        result.wait()
-        try:
-            tx_receipt = result.receipts()[0]
-            print(f"Bundle was executed in block {tx_receipt.blockNumber}")
-        except TransactionNotFound as e:
-            status.error = "Bundle was not executed: " + str(e)
-            logger.error(status.error)
-            status.e = e
-            return None, status
-
+        # Check for the receipt once the target block is reached
+        pending = self.tx_manager.track(
+            result.bundle[0]["hash"],
+            nonce=built_tx.get("nonce"),
+            on_receipt=on_receipt or self.on_receipt,
+            context=self.transaction_context() if context is None else context,
+            wait_for=result.async_wait(),
+            timeout=0,
+        )
+        return pending, ResponseStatus()
+
+    def on_receipt(self, pending: PendingTransaction) -> ResponseStatus:
+        tx_receipt = pending.receipt
+        if tx_receipt is None:
+            reason = pending.status.error if pending.status is not None else None
+            return error_status(f"Bundle was not executed: {reason}", log=logger.error)
+
+        logger.info(f"Bundle was executed in block {tx_receipt['blockNumber']}")
         tx_hash = tx_receipt["transactionHash"].hex()
         # Point to relevant explorer
         logger.info(f"View reported data: \n{self.endpoint.explorer}/tx/{tx_hash}")
 
-        return tx_receipt, status
+        return ResponseStatus()
@@ -17,8 +17,12 @@ from web3.contract import ContractFunction
 from web3.types import FeeHistory
 from web3.types import Wei
 
+from telliot_feeds.reporters.gas_oracle import GasOracle
+from telliot_feeds.reporters.gas_oracle import get_gas_oracle
+from telliot_feeds.reporters.gas_oracle import PRIORITY_FEE_MODELS
 from telliot_feeds.reporters.types import GasParams
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.reporter_utils import clamp_priority_fee
 from telliot_feeds.utils.reporter_utils import fee_history_priority_fee_estimate
 
 
@@ -101,6 +105,8 @@ class GasFees:
         reward_percentile: Optional[List[float]] = None,
         block_count: int = 10,  # Number of blocks to use for gas price calculation
         min_native_token_balance: int = 0,  # Minimum native token balance to be considered for gas price calculation
+        # "node" to use the node's priority fee suggestion, or a model of the chain's shared gas oracle
+        priority_fee_model: str = "node",
     ):
         self.endpoint = endpoint
         self.account = account
@@ -115,10 +121,19 @@ class GasFees:
         self.reward_percentile = reward_percentile or [25.0, 50.0, 75.0]
         self.block_count = block_count
         self.min_native_token_balance = min_native_token_balance
+        if priority_fee_model != "node" and priority_fee_model not in PRIORITY_FEE_MODELS:
+            raise ValueError(f"Unknown priority fee model: {priority_fee_model}")
+        self.priority_fee_model = priority_fee_model
 
         self.acct_address = to_checksum_address(account.address)
         self.web3: Web3 = endpoint._web3
         assert self.web3 is not None, f"Web3 is not initialized, check endpoint {endpoint}"
+        # base fee and priority fee estimates from the fee history shared by reporters on the chain
+        self.gas_oracle: Optional[GasOracle] = None
+        if priority_fee_model != "node":
+            self.gas_oracle = get_gas_oracle(endpoint.chain_id, self.web3)
+        # per instance gas info, so reporters running in the same process don't share fees
+        self._reset_gas_info()
 
     def set_gas_info(self, fees: FEES) -> None:
         """Set class variable gas_info keys to values in fees"""
@@ -218,6 +233,7 @@ class GasFees:
     def get_max_priority_fee(self, fee_history: Optional[FeeHistory] = None) -> Tuple[Optional[Wei], ResponseStatus]:
         """Return the max priority fee for a type 2 (EIP1559) transaction
         if priority fee is provided then return the provided priority fee
+        else if a priority fee model is set and its estimate isn't 0 then return the gas oracle's estimate
         else try to fetch a priority fee suggestion from the node using Eth._max_priority_fee method
         with a fallback that returns the max priority fee based on the fee history
 
@@ -232,12 +248,16 @@ class GasFees:
         max_range = self.max_priority_fee_range
         if priority_fee is not None:
             return priority_fee, ResponseStatus()
-        else:
-            try:
-                max_priority_fee = self.web3.eth._max_priority_fee()
-                return max_priority_fee if max_priority_fee < max_range else max_range, ResponseStatus()
-            except ValueError:
-                logger.warning("unable to fetch max priority fee from node using eth._max_priority_fee_per_gas method.")
+        if self.gas_oracle is not None:
+            estimate = self.gas_oracle.priority_fee(self.priority_fee_model)
+            # recent blocks are all empty on quiet chains, use the node's suggestion instead of bidding 0
+            if estimate:
+                return clamp_priority_fee(estimate, max_range), ResponseStatus()
+        try:
+            max_priority_fee = self.web3.eth._max_priority_fee()
+            return max_priority_fee if max_priority_fee < max_range else max_range, ResponseStatus()
+        except ValueError:
+            logger.warning("unable to fetch max priority fee from node using eth._max_priority_fee_per_gas method.")
         if fee_history is not None:
             return fee_history_priority_fee_estimate(fee_history, max_range), ResponseStatus()
         else:
@@ -251,11 +271,19 @@ class GasFees:
     def get_base_fee(self) -> Tuple[Optional[Union[Wei, FeeHistory]], ResponseStatus]:
         """Return the base fee for a type 2 (EIP1559) transaction.
         if base fee is provided then return the provided base fee
+        else if a priority fee model is set then return the next block's base fee from the gas oracle
         else return the base fee based on the Eth.feed_history method response
         """
         base_fee = self.base_fee_per_gas
         if base_fee is not None:
             return base_fee, ResponseStatus()
+        elif self.gas_oracle is not None:
+            status = self.gas_oracle.refresh()
+            oracle_base_fee = self.gas_oracle.base_fee()
+            if not status.ok or oracle_base_fee is None:
+                msg = "unable to fetch history to set base fee"
+                return None, error_status(msg, e=status.error, log=logger.error)
+            return oracle_base_fee, ResponseStatus()
         else:
             fee_history, status = self.fee_history()
             if fee_history is None:
@@ -0,0 +1,253 @@
+"""Shared per-chain gas fee oracle
+
+Reporters on the same chain share a `GasOracle`, which keeps the fee history of
+the last `HISTORY_SIZE` blocks in a ring buffer. A background thread updates it
+with one eth_feeHistory request for the blocks mined since the last update, so
+setting the gas fees of a transaction reads the next block's base fee and a
+priority fee estimate from the buffer without any JSON-RPC request. The thread
+stops once the oracle wasn't refreshed for `max_age` seconds (e.g. during the
+reporter lock), and is started again by the next refresh.
+
+Priority fee models, both based on each block's median priority fee and
+ignoring empty blocks:
+- "percentile": a percentile (the median by default) over the last `window` blocks
+- "ewma": exponentially weighted moving average over the whole history, so
+  recent blocks weigh more without a single block moving the estimate much
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+from web3.types import FeeHistory
+from web3.types import Wei
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Priority fee percentiles of each block's transactions kept in the history
+REWARD_PERCENTILES = (10.0, 25.0, 50.0, 75.0, 90.0)
+
+#: Number of blocks kept in the history
+HISTORY_SIZE = 128
+
+#: Number of blocks requested per update once the history is filled
+UPDATE_BLOCK_COUNT = 16
+
+#: Seconds between background updates
+POLL_INTERVAL = 3.0
+
+#: Seconds after which the history is updated before it's used, and background
+#: updates stop if the oracle wasn't refreshed
+MAX_AGE = 30.0
+
+#: Priority fee models of `GasOracle.priority_fee`
+PRIORITY_FEE_MODELS = ("percentile", "ewma")
+
+
+@dataclass(frozen=True)
+class BlockFees:
+    """Base fee, gas used ratio and priority fees (at `REWARD_PERCENTILES`) of a block"""
+
+    number: int
+    base_fee: int
+    gas_used_ratio: float
+    rewards: Tuple[int, ...]
+
+    @property
+    def empty(self) -> bool:
+        return not any(self.rewards)
+
+    def reward(self, percentile: float) -> int:
+        return self.rewards[REWARD_PERCENTILES.index(percentile)]
+
+
+def percentile_of(values: List[int], percentile: float) -> int:
+    """Percentile of values, interpolated between the closest ranks"""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percentile / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low))
+
+
+def ewma(values: List[int], smoothing: float) -> int:
+    """Exponentially weighted moving average of values, oldest first"""
+    average = float(values[0])
+    for value in values[1:]:
+        average = smoothing * value + (1 - smoothing) * average
+    return round(average)
+
+
+class GasOracle:
+    """Rolling fee history of a chain, and base fee and priority fee estimates from it"""
+
+    def __init__(
+        self,
+        w3: Web3,
+        size: int = HISTORY_SIZE,
+        poll_interval: float = POLL_INTERVAL,
+        max_age: float = MAX_AGE,
+    ) -> None:
+        self.w3 = w3
+        self.size = size
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.blocks: Deque[BlockFees] = deque(maxlen=size)
+        #: base fee of the block after the newest block in the history
+        self.next_base_fee: Optional[int] = None
+        self.updated_at = 0.0
+        #: time of the last refresh, ie. the last time gas fees were set from the oracle
+        self.refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def newest_block(self) -> Optional[int]:
+        return self.blocks[-1].number if self.blocks else None
+
+    def _fetch(self, count: int, newest: Union[int, str]) -> Optional[FeeHistory]:
+        return self.w3.eth.fee_history(count, newest, list(REWARD_PERCENTILES))  # type: ignore
+
+    def _add(self, history: FeeHistory, latest: bool) -> None:
+        """Add blocks of a fee history, replacing blocks fetched before (e.g. after a reorg)"""
+        oldest = int(history["oldestBlock"])
+        rewards = history.get("reward") or []
+        blocks = [
+            BlockFees(
+                number=oldest + i,
+                base_fee=int(base_fee),
+                gas_used_ratio=float(ratio),
+                rewards=tuple(int(r) for r in rewards[i]) if i < len(rewards) else (0,) * len(REWARD_PERCENTILES),
+            )
+            for i, (base_fee, ratio) in enumerate(zip(history["baseFeePerGas"], history["gasUsedRatio"]))
+        ]
+        with self._lock:
+            merged: Dict[int, BlockFees] = {b.number: b for b in self.blocks}
+            if latest and blocks:
+                # blocks past the chain head were reorged out
+                merged = {n: b for n, b in merged.items() if n <= blocks[-1].number}
+            merged.update((b.number, b) for b in blocks)
+            self.blocks = deque((merged[n] for n in sorted(merged)), maxlen=self.size)
+            if latest:
+                self.next_base_fee = int(history["baseFeePerGas"][-1])
+
+    def update(self) -> ResponseStatus:
+        """Add the fee history of the blocks mined since the last update"""
+        with self._update_lock:
+            newest = self.newest_block
+            try:
+                history = self._fetch(self.size if newest is None else min(UPDATE_BLOCK_COUNT, self.size), "latest")
+                if history is None:
+                    return error_status("unable to fetch fee history from node", log=logger.warning)
+                oldest = int(history["oldestBlock"])
+                if newest is not None and oldest > newest + 1:
+                    # more blocks were mined since the last update than requested, fill the gap
+                    gap = self._fetch(min(oldest - newest - 1, self.size), oldest - 1)
+                    if gap is not None:
+                        self._add(gap, latest=False)
+                self._add(history, latest=True)
+            except Exception as e:
+                return error_status("Error updating gas oracle fee history", e=e, log=logger.warning)
+            self.updated_at = time.monotonic()
+        return ResponseStatus()
+
+    def fresh(self) -> bool:
+        return self.next_base_fee is not None and time.monotonic() - self.updated_at < self.max_age
+
+    def refresh(self) -> ResponseStatus:
+        """Keep the history updated in the background, updating it now if it's stale"""
+        self.refreshed_at = time.monotonic()
+        self.start()
+        if self.fresh():
+            return ResponseStatus()
+        return self.update()
+
+    def start(self) -> None:
+        """Start updating the history in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gas-oracle", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def idle(self) -> bool:
+        return time.monotonic() - self.refreshed_at > self.max_age
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            if self.idle():
+                logger.debug("Gas oracle not used recently, stopping background updates")
+                return
+            self.update()
+
+    def base_fee(self) -> Optional[Wei]:
+        """Base fee of the next block"""
+        return None if self.next_base_fee is None else Wei(self.next_base_fee)
+
+    def rewards(self, window: Optional[int] = None, reward_percentile: float = 50.0) -> List[int]:
+        """Priority fees at a percentile of the non-empty blocks among the last `window` blocks, oldest first"""
+        with self._lock:
+            blocks = list(self.blocks)
+        if window is not None:
+            blocks = blocks[-window:]
+        return [b.reward(reward_percentile) for b in blocks if not b.empty]
+
+    def priority_fee(
+        self,
+        model: str = "percentile",
+        window: int = 20,
+        percentile: float = 50.0,
+        smoothing: float = 0.2,
+    ) -> Optional[Wei]:
+        """Estimate the priority fee for inclusion in the next blocks
+
+        Args:
+        - model: "percentile" or "ewma"
+        - window: number of recent blocks used by the percentile model
+        - percentile: percentile of the blocks' median priority fees used by the percentile model
+        - smoothing: weight of each new block in the ewma model
+
+        Returns None if there's no fee history yet, and 0 if all blocks in it are empty.
+        """
+        if model not in PRIORITY_FEE_MODELS:
+            raise ValueError(f"Unknown priority fee model: {model}")
+        if not self.blocks:
+            return None
+        if model == "percentile":
+            fees = self.rewards(window)
+            return Wei(percentile_of(fees, percentile) if fees else 0)
+        fees = self.rewards()
+        return Wei(ewma(fees, smoothing) if fees else 0)
+
+
+_oracles: Dict[Tuple[int, int], GasOracle] = {}
+
+
+def get_gas_oracle(chain_id: int, w3: Web3) -> GasOracle:
+    """Get the gas oracle shared by all reporters on a chain, using the chain's web3 instance"""
+    key = (chain_id, id(w3))
+    oracle = _oracles.get(key)
+    if oracle is None or oracle.w3 is not w3:
+        oracle = GasOracle(w3)
+        _oracles[key] = oracle
+    return oracle
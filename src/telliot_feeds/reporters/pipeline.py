@@ -0,0 +1,124 @@
+"""Concurrent execution of reporting steps with an explicit dependency graph
+
+A report is split into steps that each declare the steps they depend on. A step
+starts as soon as all of its dependencies succeeded, so independent steps (e.g.
+checking the staker status, fetching the datafeed value and updating gas fees)
+overlap instead of running one after another.
+
+Errors are reported as if the steps had run one after another in the order they
+were declared: once a step fails, steps declared after it are cancelled, while
+steps declared before it keep running and their errors take precedence.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import report_step_errors
+from telliot_feeds.utils.metrics import report_step_seconds
+
+
+logger = get_logger(__name__)
+
+#: Results of the steps completed so far, by step name
+StepResults = Dict[str, Any]
+
+
+@dataclass
+class PipelineStep:
+    """A step of a reporting pipeline
+
+    - name: unique name of the step, its result is stored under this name
+    - run: coroutine function called with the results of the completed steps,
+    returns the step's result and a ResponseStatus
+    - requires: names of the steps that must succeed before this one starts
+    """
+
+    name: str
+    run: Callable[[StepResults], Coroutine[Any, Any, Tuple[Any, ResponseStatus]]]
+    requires: Tuple[str, ...] = ()
+
+
+class ReportPipeline:
+    """Run pipeline steps concurrently as their dependencies complete"""
+
+    def __init__(self, steps: List[PipelineStep]) -> None:
+        """
+        Args:
+        - steps: steps in the order their errors take precedence, each
+        step's dependencies must be declared before it
+        """
+        self.steps = steps
+        self.order: Dict[str, int] = {}
+        for i, step in enumerate(steps):
+            if step.name in self.order:
+                raise ValueError(f"Duplicate pipeline step: {step.name}")
+            unknown = [name for name in step.requires if name not in self.order]
+            if unknown:
+                raise ValueError(f"Pipeline step {step.name} requires undeclared steps: {unknown}")
+            self.order[step.name] = i
+
+    async def _run_step(self, step: PipelineStep, results: StepResults) -> Tuple[Any, ResponseStatus]:
+        """Run a step, recording its duration and failure in the report step metrics"""
+        start = time.perf_counter()
+        value, status = await step.run(results)
+        report_step_seconds.observe(time.perf_counter() - start, step=step.name)
+        if not status.ok:
+            report_step_errors.inc(step=step.name)
+        return value, status
+
+    async def run(self) -> Tuple[StepResults, ResponseStatus]:
+        """Run all steps
+
+        Returns:
+        - results of the steps that succeeded, by step name
+        - status of the first failed step (in declaration order), ok if all steps succeeded
+        """
+        results: StepResults = {}
+        failures: Dict[str, ResponseStatus] = {}
+        running: Dict[asyncio.Task[Tuple[Any, ResponseStatus]], str] = {}
+        not_started = list(self.steps)
+
+        try:
+            while True:
+                # steps declared after the first failure won't affect the outcome
+                cutoff = min((self.order[name] for name in failures), default=len(self.steps))
+                for task, name in running.items():
+                    if self.order[name] > cutoff:
+                        task.cancel()
+
+                for step in list(not_started):
+                    if self.order[step.name] < cutoff and all(name in results for name in step.requires):
+                        not_started.remove(step)
+                        logger.debug(f"Starting report step: {step.name}")
+                        running[asyncio.create_task(self._run_step(step, dict(results)))] = step.name
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    if task.cancelled():
+                        continue
+                    value, status = task.result()
+                    if status.ok:
+                        results[name] = value
+                    else:
+                        failures[name] = status
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        if failures:
+            return results, failures[min(failures, key=self.order.__getitem__)]
+        return results, ResponseStatus()
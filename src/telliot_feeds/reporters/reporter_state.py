@@ -0,0 +1,152 @@
+"""Read a reporter's on-chain state in one multicall
+
+Instead of separate requests for the stake amount, staker info, time-based reward
+parameters, report count and native token balance, all of them are read with one
+`eth_call` to the chain's multicall contract. Report counts of many queries (e.g.
+DIVA pools to report) are read the same way.
+"""
+from dataclasses import fields
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from eth_typing import ChecksumAddress
+from multicall import Call
+from multicall import Multicall
+from multicall.constants import GAS_LIMIT
+from multicall.constants import MULTICALL2_ADDRESSES
+from multicall.constants import MULTICALL3_ADDRESSES
+from multicall.utils import chain_id
+from telliot_core.tellor.tellor360.oracle import Tellor360OracleContract
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+
+from telliot_feeds.reporters.types import ReporterState
+from telliot_feeds.reporters.types import StakerInfo
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+STAKER_INFO_FIELDS = [f"staker_info_{f.name}" for f in fields(StakerInfo)]
+
+
+def reporter_state_calls(
+    oracle_address: str,
+    multicall_address: str,
+    account: ChecksumAddress,
+    query_id: Optional[bytes] = None,
+) -> List[Call]:
+    """Calls reading a reporter's state from the oracle and the multicall contract"""
+    staker_info_types = ",".join(["uint256"] * (len(STAKER_INFO_FIELDS) - 1) + ["bool"])
+    calls = [
+        Call(oracle_address, "getStakeAmount()(uint256)", [["stake_amount", None]]),
+        Call(
+            oracle_address,
+            [f"getStakerInfo(address)({staker_info_types})", account],
+            [[name, None] for name in STAKER_INFO_FIELDS],
+        ),
+        Call(oracle_address, "timeOfLastDistribution()(uint256)", [["time_of_last_distribution", None]]),
+        Call(oracle_address, "timeBasedReward()(uint256)", [["time_based_reward", None]]),
+        Call(multicall_address, ["getEthBalance(address)(uint256)", account], [["native_balance", None]]),
+    ]
+    if query_id is not None:
+        calls.append(
+            Call(oracle_address, ["getNewValueCountbyQueryId(bytes32)(uint256)", query_id], [["report_count", None]])
+        )
+    return calls
+
+
+def parse_reporter_state(response: Any, query_id: Optional[bytes] = None) -> ReporterState:
+    """Build the reporter state from a multicall response, failed calls are None"""
+    staker_info = None
+    staker_values = [response.get(name) for name in STAKER_INFO_FIELDS]
+    if all(value is not None for value in staker_values):
+        staker_info = StakerInfo(*staker_values)
+    return ReporterState(
+        stake_amount=response.get("stake_amount"),
+        staker_info=staker_info,
+        time_of_last_distribution=response.get("time_of_last_distribution"),
+        time_based_reward=response.get("time_based_reward"),
+        query_id=query_id,
+        report_count=response.get("report_count"),
+        native_balance=response.get("native_balance"),
+    )
+
+
+def multicall_contract_address(w3: Web3) -> Tuple[Optional[str], ResponseStatus]:
+    """Address of the multicall contract the Multicall class uses on the web3 instance's chain"""
+    try:
+        chain = chain_id(w3)
+    except Exception as e:
+        return None, error_status("Unable to fetch chain id for multicall", e=e, log=logger.warning)
+    multicall_address = MULTICALL3_ADDRESSES.get(chain) or MULTICALL2_ADDRESSES.get(chain)
+    if multicall_address is None:
+        msg = f"Multicall not supported on chain {chain}, unable to batch reads"
+        return None, error_status(msg, log=logger.info)
+    return multicall_address, ResponseStatus()
+
+
+async def fetch_reporter_state(
+    oracle: Tellor360OracleContract,
+    account: ChecksumAddress,
+    query_id: Optional[bytes] = None,
+    gas_limit: int = GAS_LIMIT,
+) -> Tuple[Optional[ReporterState], ResponseStatus]:
+    """Read a reporter's state in one multicall
+
+    Args:
+    - oracle: the oracle contract
+    - account: reporter's address
+    - query_id: query to read the report count for, if any
+    - gas_limit: gas limit of the multicall
+
+    Returns:
+    - (ReporterState, ResponseStatus) calls that failed are None in the state,
+    the status is only an error if the multicall itself failed
+    """
+    w3 = oracle.node._web3
+    multicall_address, status = multicall_contract_address(w3)
+    if multicall_address is None:
+        return None, status
+
+    calls = reporter_state_calls(oracle.address, multicall_address, account, query_id)
+    try:
+        response = await Multicall(calls=calls, _w3=w3, require_success=False, gas_limit=gas_limit).coroutine()
+    except Exception as e:
+        return None, error_status("Unable to fetch reporter state with multicall", e=e, log=logger.warning)
+
+    return parse_reporter_state(response, query_id), ResponseStatus()
+
+
+async def fetch_report_counts(
+    oracle: Tellor360OracleContract,
+    query_ids: List[bytes],
+    gas_limit: int = GAS_LIMIT,
+) -> Tuple[Optional[Dict[bytes, Optional[int]]], ResponseStatus]:
+    """Read the report counts of many queries in one multicall
+
+    Returns:
+    - (dict, ResponseStatus) report count by query id, None for calls that failed,
+    the status is only an error if the multicall itself failed
+    """
+    w3 = oracle.node._web3
+    multicall_address, status = multicall_contract_address(w3)
+    if multicall_address is None:
+        return None, status
+    if not query_ids:
+        return {}, ResponseStatus()
+
+    calls = [
+        Call(oracle.address, ["getNewValueCountbyQueryId(bytes32)(uint256)", query_id], [[query_id.hex(), None]])
+        for query_id in query_ids
+    ]
+    try:
+        response = await Multicall(calls=calls, _w3=w3, require_success=False, gas_limit=gas_limit).coroutine()
+    except Exception as e:
+        return None, error_status("Unable to fetch report counts with multicall", e=e, log=logger.warning)
+
+    return {query_id: response.get(query_id.hex()) for query_id in query_ids}, ResponseStatus()
@@ -1,4 +1,6 @@
 """Utilities for calculating time-based rewards (TBR)"""
+from typing import Optional
+
 from telliot_core.tellor.tellor360.oracle import Tellor360OracleContract
 from telliot_core.utils.timestamp import TimeStamp
 
@@ -7,6 +9,21 @@ from telliot_feeds.utils.log import get_logger
 logger = get_logger(__name__)
 
 
+def calculate_time_based_rewards(
+    time_of_last_distribution: int, time_based_reward: int, now: Optional[int] = None
+) -> int:
+    """Reward accrued since the last distribution
+
+    Args:
+    - time_of_last_distribution: oracle's timeOfLastDistribution
+    - time_based_reward: oracle's timeBasedReward, amount of tokens (5e17) dispersed every five min (300 sec)
+    - now: timestamp to calculate the reward at, defaults to the current time
+    """
+    if now is None:
+        now = TimeStamp.now().ts
+    return int((now - time_of_last_distribution) * time_based_reward / 300)
+
+
 async def get_time_based_rewards(oracle: Tellor360OracleContract) -> int:
     """
     Reward that will be given if a reporter submits now:
@@ -14,21 +31,13 @@ async def get_time_based_rewards(oracle: Tellor360OracleContract) -> int:
     started accruing and the total rewards balance available in the contract since thats
     what will be dispersed if the reward is < than whats available in the contract
     """
-    tbr: int
-    reward: int
-
     time_of_last_new_value, last_val_status = await oracle.read("timeOfLastDistribution")
-    #tbr, tbr_status = await oracle.read("getTotalTimeBasedRewardsBalance")
+    time_based_reward, tbr_status = await oracle.read("timeBasedReward")
 
-    #if any call fails return 0 and a msg that tbr can't calc'd
-    #if not tbr_status.ok or not last_val_status.ok:
-    if not last_val_status.ok:
-        error = last_val_status.error
+    # if any call fails return 0 and a msg that tbr can't calc'd
+    if not last_val_status.ok or not tbr_status.ok:
+        error = last_val_status.error if not last_val_status.ok else tbr_status.error
         logger.warning(f"Unable to calculate time-based rewards for reporter: {error}")
         return 0
-    current_year = await oracle.read("timeBasedReward")
-    reward = (
-        (TimeStamp.now().ts - time_of_last_new_value) * (await oracle.read("timeBasedReward"))[0]
-    ) / 300  # amount of tokens (5e17) dispersed every five min (300 sec)
 
-    return reward #if reward < tbr else tbr
+    return calculate_time_based_rewards(time_of_last_new_value, time_based_reward)
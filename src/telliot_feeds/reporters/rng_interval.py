@@ -1,6 +1,12 @@
 """TellorRNG auto submitter.
 submits TellorRNG values at a fixed time interval
+
+The value of an interval depends on the first Bitcoin block mined after the
+interval opens. While reporting, a precomputer polls for it in the background
+from the moment the interval opens and keeps it in the RNG store, waking the
+reporter as soon as it's ready.
 """
+import asyncio
 import calendar
 import time
 from typing import Any
@@ -13,7 +19,9 @@ from telliot_feeds.datafeed import DataFeed
 from telliot_feeds.feeds.tellor_rng_feed import assemble_rng_datafeed
 from telliot_feeds.queries.tellor_rng import TellorRNG
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+from telliot_feeds.sources.blockhash_aggregator import get_rng_value
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.rng_store import get_rng_store
 
 
 logger = get_logger(__name__)
@@ -21,6 +29,12 @@ logger = get_logger(__name__)
 INTERVAL = 60 * 30  # 30 minutes
 START_TIME = 1653350400  # 2022-5-24 00:00:00 GMT
 
+#: Seconds between attempts to compute an interval's value while its blocks aren't mined yet
+PRECOMPUTE_POLL_INTERVAL = 30
+
+#: Number of past intervals whose values are kept in the RNG store
+KEEP_INTERVALS = 48 * 7
+
 
 def get_next_timestamp() -> int:
     """get next target timestamp"""
@@ -29,10 +43,77 @@ def get_next_timestamp() -> int:
     return target_ts
 
 
+class RNGPrecomputer:
+    """Computes the TellorRNG value of each interval in the background
+
+    Polls for the value of the current interval until its blocks are mined, stores
+    it in the RNG store and sets `ready`, then waits for the next interval to open.
+    """
+
+    def __init__(self, poll_interval: float = PRECOMPUTE_POLL_INTERVAL) -> None:
+        self.poll_interval = poll_interval
+        self.ready = asyncio.Event()
+
+    async def precompute(self, timestamp: int) -> bool:
+        """Compute and store the value of a timestamp, returns whether it's available"""
+        try:
+            return await get_rng_value(timestamp) is not None
+        except Exception as e:
+            logger.warning(f"Unable to precompute random number for timestamp {timestamp}: {e}")
+            return False
+
+    async def run(self) -> None:
+        while True:
+            timestamp = get_next_timestamp()
+            if await self.precompute(timestamp):
+                logger.info(f"Random number for timestamp {timestamp} is ready")
+                self.ready.set()
+                get_rng_store().prune(timestamp - KEEP_INTERVALS * INTERVAL)
+                # the next interval's value depends on blocks mined after it opens
+                delay: float = timestamp + INTERVAL - calendar.timegm(time.gmtime())
+            else:
+                delay = self.poll_interval
+            await asyncio.sleep(max(delay, 0))
+
+
 class RNGReporter(Tellor360Reporter):
     """Reports TellorRNG values at a fixed interval to TellorFlex
     on Polygon."""
 
+    #: Background precomputer of interval values, running while `report` runs
+    precomputer: Optional[RNGPrecomputer] = None
+
+    async def report(self, report_count: Optional[int] = None) -> None:
+        """Submit TellorRNG values, precomputing each interval's value in the background."""
+        self.precomputer = RNGPrecomputer()
+        task = asyncio.ensure_future(self.precomputer.run())
+        try:
+            await super().report(report_count)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            self.precomputer = None
+
+    def uses_autopay_events(self) -> bool:
+        # reports the current interval's value, not the feeds with the highest tips
+        return False
+
+    def get_idle_period(self) -> float:
+        # each interval has a value to report, keep checking at the wait period
+        return self.idle_period if self.idle_period is not None else self.wait_period
+
+    async def wait_for_next_report(self) -> None:
+        """Wait between reports, waking up as soon as the next interval's value is ready
+
+        Without a precomputer, wakes up when the next interval opens.
+        """
+        if self.precomputer is None:
+            self.scheduler.add_wakeup(get_next_timestamp() + INTERVAL)
+            return await super().wait_for_next_report()
+        ready = self.precomputer.ready
+        await self.scheduler.sleep(self.wait_period, self.get_idle_period(), wake_on=[ready])
+        ready.clear()
+
     async def fetch_datafeed(self) -> Optional[DataFeed[Any]]:
         status = ResponseStatus()
 
@@ -52,6 +133,10 @@ class RNGReporter(Tellor360Reporter):
             logger.info(status.error)
             return None
 
+        if self.precomputer is not None and get_rng_store().get(rng_timestamp) is None:
+            logger.info(f"Random number for timestamp {rng_timestamp} not ready yet, blocks may not be mined")
+            return None
+
         datafeed = await assemble_rng_datafeed(timestamp=rng_timestamp)
         if datafeed is None:
             msg = "Unable to assemble RNG datafeed"
@@ -0,0 +1,139 @@
+"""Scheduling of a reporter's report attempts
+
+Instead of checking for something to report every few seconds, a reporter
+sleeps until the next time it may have something to report:
+- when its reporter lock expires, if it's locked (nothing can be reported before);
+  the lock is read from the chain or started by a mined report
+- shortly after its last report, if it sent one (more may be reportable right away,
+  and a report that reverts or isn't mined is retried)
+- when the next submission window of a funded autopay feed opens
+- at times registered with `add_wakeup` (e.g. TellorRNG interval boundaries)
+- after the idle period at the latest, for tips that became eligible or
+  profitable otherwise (price thresholds, token and gas prices)
+and wakes up early when `notify` is called (e.g. on a new tip event) unless
+it's locked.
+"""
+import asyncio
+import math
+import time
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Default idle period of a reporter, in multiples of its wait period
+IDLE_MULTIPLIER = 10
+
+
+def next_window_start(feed: FeedDetails, now: float) -> Optional[int]:
+    """Start of a feed's first submission window opening after now, None if the feed has no windows"""
+    if feed.interval <= 0:
+        return None
+    if now < feed.startTime:
+        return feed.startTime
+    return feed.startTime + (math.floor((now - feed.startTime) / feed.interval) + 1) * feed.interval
+
+
+class ReportScheduler:
+    """Next time a reporter may have something to report"""
+
+    def __init__(self) -> None:
+        #: time the reporter lock expires, None if unknown
+        self.lock_ends: Optional[float] = None
+        #: reporter lock duration in seconds, None if unknown
+        self.lock_duration: Optional[float] = None
+        #: whether the last report attempt submitted a value
+        self.reported = False
+        self.feeds: List[FeedDetails] = []
+        self._wakeups: List[float] = []
+        self._notified = False
+        self._event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def set_reporter_lock(self, last_report_time: float, lock_duration: float) -> None:
+        self.lock_duration = lock_duration
+        self.lock_ends = last_report_time + lock_duration
+
+    def record_report(self, ok: bool) -> None:
+        """Record the outcome of a report attempt, ok if a submitValue transaction was sent"""
+        self.reported = ok
+
+    def record_mined_report(self, timestamp: Optional[float] = None) -> None:
+        """Start the reporter lock once a submitted value is mined"""
+        if self.lock_duration is not None:
+            self.lock_ends = (time.time() if timestamp is None else timestamp) + self.lock_duration
+
+    def set_feed_windows(self, feeds: Iterable[FeedDetails]) -> None:
+        """Set the funded autopay feeds whose submission windows to wake up for"""
+        self.feeds = list(feeds)
+
+    def add_wakeup(self, timestamp: float) -> None:
+        if timestamp not in self._wakeups:
+            self._wakeups.append(timestamp)
+
+    def notify(self) -> None:
+        """Wake up the sleeping reporter (e.g. on a new tip), may be called from any thread"""
+        self._notified = True
+        if self._loop is not None and self._event is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._event.set)
+            except RuntimeError:  # loop closed
+                pass
+
+    def locked(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return self.lock_ends is not None and self.lock_ends > now
+
+    def next_wakeup(self, wait_period: float, idle_period: float, now: Optional[float] = None) -> float:
+        """Time of the next report attempt
+
+        Args:
+        - wait_period: seconds to wait after a submitted value
+        - idle_period: maximum seconds to wait when there was nothing to report
+        """
+        now = time.time() if now is None else now
+        self._wakeups = [t for t in self._wakeups if t > now]
+        if self.lock_ends is not None and self.lock_ends > now:
+            return self.lock_ends
+        if self.reported:
+            return now + wait_period
+        candidates = [now + idle_period, *self._wakeups]
+        for feed in self.feeds:
+            start = next_window_start(feed, now)
+            if start is not None:
+                candidates.append(start)
+        return min(candidates)
+
+    async def sleep(self, wait_period: float, idle_period: float, wake_on: Sequence[asyncio.Event] = ()) -> None:
+        """Sleep until the next report attempt, or until notified or one of the `wake_on` events is set"""
+        now = time.time()
+        delay = max(self.next_wakeup(wait_period, idle_period, now) - now, 0)
+        if self.locked(now):
+            logger.info(f"Sleeping for {delay:.0f} seconds until the reporter lock expires")
+            self._notified = False
+            await asyncio.sleep(delay)
+            return
+
+        loop = asyncio.get_running_loop()
+        if self._event is None or self._loop is not loop:
+            self._loop = loop
+            self._event = asyncio.Event()
+        self._event.clear()
+        if self._notified:
+            self._notified = False
+            return
+        logger.info(f"Sleeping for {delay:.0f} seconds or until a new tip")
+        waiters = [asyncio.ensure_future(e.wait()) for e in (self._event, *wake_on)]
+        try:
+            await asyncio.wait(waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            self._notified = False
@@ -0,0 +1,144 @@
+"""Run several reporters, one per (account, chain), in a single process
+
+Reporters run as asyncio tasks on one event loop, so the feed catalog is imported
+once and the process-wide state is shared between them: the price cache, the HTTP
+connection pool, the per chain block resolvers and the tip index of each autopay
+contract. Reporters on the same chain also share one RPC connection.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from chained_accounts import ChainedAccount
+from telliot_core.apps.core import Tellor360ContractSet
+from telliot_core.apps.telliot_config import TelliotConfig
+from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.tellor.tellor360.autopay import Tellor360AutopayContract
+from telliot_core.tellor.tellor360.oracle import Tellor360OracleContract
+from telliot_core.tellor.tellorflex.token import TokenContract
+
+from telliot_feeds.pricing.price_service import close_client_session
+from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SupervisedReporter:
+    """A reporter run by the supervisor
+
+    - name: name used in logs, e.g. account@chain_id
+    - reporter: the reporter
+    - restarts: number of times the reporter was restarted after crashing
+    """
+
+    name: str
+    reporter: Tellor360Reporter
+    restarts: int = 0
+
+
+class ReporterSupervisor:
+    """Run reporters for several accounts and chains as asyncio tasks"""
+
+    def __init__(self, config: Optional[TelliotConfig] = None, restart_delay: float = 30.0) -> None:
+        """
+        Args:
+        - config: telliot config the RPC endpoints are read from
+        - restart_delay: number of seconds before restarting a reporter that crashed
+        """
+        self.config = config or TelliotConfig()
+        self.restart_delay = restart_delay
+        self.reporters: List[SupervisedReporter] = []
+        self._endpoints: Dict[int, RPCEndpoint] = {}
+
+    def endpoint(self, chain_id: int) -> RPCEndpoint:
+        """Get the connected RPC endpoint shared by all reporters on a chain"""
+        endpoint = self._endpoints.get(chain_id)
+        if endpoint is None:
+            endpoints = self.config.endpoints.find(chain_id=chain_id)
+            if not endpoints:
+                raise ValueError(f"No endpoint configured for chain id: {chain_id}")
+            endpoint = endpoints[0]
+            if not endpoint.connect():
+                raise ConnectionError(f"Could not connect to endpoint: {endpoint.url}")
+            self._endpoints[chain_id] = endpoint
+        return endpoint
+
+    def contracts(self, chain_id: int, account: ChainedAccount) -> Tellor360ContractSet:
+        """Create the Tellor360 contracts for an account on a chain, using the chain's shared endpoint"""
+        endpoint = self.endpoint(chain_id)
+
+        oracle = Tellor360OracleContract(node=endpoint, account=account)
+        oracle.connect()
+
+        autopay = Tellor360AutopayContract(node=endpoint, account=account)
+        autopay.connect()
+
+        token = TokenContract(node=endpoint, account=account)
+        token.connect()
+
+        return Tellor360ContractSet(oracle=oracle, autopay=autopay, token=token)
+
+    def add_reporter(self, account: ChainedAccount, chain_id: int, **reporter_kwargs: Any) -> Tellor360Reporter:
+        """Create a reporter for an account on a chain
+
+        Args:
+        - account: reporting account, must be unlocked
+        - chain_id: chain to report on
+        - reporter_kwargs: other Tellor360Reporter arguments (gas settings, datafeed, etc.)
+        """
+        contracts = self.contracts(chain_id, account)
+        reporter = Tellor360Reporter(
+            endpoint=self.endpoint(chain_id),
+            account=account,
+            chain_id=chain_id,
+            oracle=contracts.oracle,
+            autopay=contracts.autopay,
+            token=contracts.token,
+            **reporter_kwargs,
+        )
+        self.add(reporter, name=f"{account.name}@{chain_id}")
+        return reporter
+
+    def add(self, reporter: Tellor360Reporter, name: Optional[str] = None) -> None:
+        """Add an already created reporter"""
+        self.reporters.append(SupervisedReporter(name=name or f"reporter-{len(self.reporters)}", reporter=reporter))
+
+    async def _supervise(self, supervised: SupervisedReporter, report_count: Optional[int]) -> None:
+        """Run a reporter, restarting it if it crashes while reporting continuously"""
+        while True:
+            try:
+                logger.info(f"Starting reporter {supervised.name}")
+                await supervised.reporter.report(report_count)
+                return
+            except Exception as e:
+                if report_count is not None:
+                    logger.error(f"Reporter {supervised.name} failed: {e!r}")
+                    return
+                supervised.restarts += 1
+                logger.error(f"Reporter {supervised.name} crashed, restarting in {self.restart_delay} seconds: {e!r}")
+                await asyncio.sleep(self.restart_delay)
+
+    async def run(self, report_count: Optional[int] = None) -> None:
+        """Run all reporters until they're done (forever if report_count is None)
+
+        Args:
+        - report_count: number of reports each reporter attempts
+        """
+        if not self.reporters:
+            logger.warning("No reporters to run")
+            return
+        logger.info(f"Running {len(self.reporters)} reporters: {', '.join(r.name for r in self.reporters)}")
+        tasks = [asyncio.create_task(self._supervise(r, report_count)) for r in self.reporters]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await close_client_session()
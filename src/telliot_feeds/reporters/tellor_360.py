@@ -24,13 +24,33 @@ from telliot_feeds.constants import CHAINS_WITH_TBR
 from telliot_feeds.feeds import DataFeed
 from telliot_feeds.feeds.trb_usd_feed import trb_usd_median_feed
 from telliot_feeds.feeds.fetch_usd_feed import fetch_usd_median_feed
+from telliot_feeds.reporters.pipeline import PipelineStep
+from telliot_feeds.reporters.pipeline import ReportPipeline
+from telliot_feeds.reporters.pipeline import StepResults
+from telliot_feeds.reporters.reporter_state import fetch_reporter_state
+from telliot_feeds.reporters.rewards.time_based_rewards import calculate_time_based_rewards
 from telliot_feeds.reporters.rewards.time_based_rewards import get_time_based_rewards
+from telliot_feeds.reporters.scheduler import IDLE_MULTIPLIER
+from telliot_feeds.reporters.scheduler import ReportScheduler
 from telliot_feeds.reporters.stake import Stake
+from telliot_feeds.reporters.tips.listener.autopay_events import AutopayEvents
+from telliot_feeds.reporters.tips.listener.autopay_events import get_autopay_events
+from telliot_feeds.reporters.tips.listener.tip_index import get_tip_index
 from telliot_feeds.reporters.tips.suggest_datafeed import get_feed_and_tip
 from telliot_feeds.reporters.tips.tip_amount import fetch_feed_tip
+from telliot_feeds.reporters.transactions import PendingTransaction
+from telliot_feeds.reporters.transactions import ReceiptHandler
+from telliot_feeds.reporters.transactions import TransactionManager
 from telliot_feeds.reporters.types import GasParams
+from telliot_feeds.reporters.types import ReporterState
 from telliot_feeds.reporters.types import StakerInfo
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.manual_inbox import consume_staged_values
+from telliot_feeds.utils.manual_inbox import fetch_datapoint
+from telliot_feeds.utils.metrics import count_rpc_requests
+from telliot_feeds.utils.metrics import instrument_web3
+from telliot_feeds.utils.metrics import report_rpc_requests
+from telliot_feeds.utils.metrics import report_step_seconds
 from telliot_feeds.utils.reporter_utils import get_native_token_feed
 from telliot_feeds.utils.reporter_utils import has_native_token_funds
 from telliot_feeds.utils.reporter_utils import is_online
@@ -57,6 +77,9 @@ class Tellor360Reporter(Stake):
         stake: float = 0,
         use_random_feeds: bool = False,
         skip_manual_feeds: bool = False,
+        idle_period: Optional[int] = None,
+        listen_autopay_events: bool = True,
+        events_ws_url: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
@@ -72,9 +95,27 @@ class Tellor360Reporter(Stake):
         self.autopaytip = 0
         self.ignore_tbr = ignore_tbr
         self.wait_period = wait_period
+        # maximum seconds between attempts when there's nothing to report, IDLE_MULTIPLIER wait periods if None
+        self.idle_period = idle_period
+        # when to attempt the next report, see wait_for_next_report
+        self.scheduler = ReportScheduler()
         self.chain_id = chain_id
         self.acct_addr = to_checksum_address(self.account.address)
         logger.info(f"Reporting with account: {self.acct_addr}")
+        # autopay reports and tip claim status, synced incrementally every loop
+        # (shared with other reporters using the same autopay contract in this process)
+        self.tip_index = get_tip_index(self.chain_id, self.autopay.address)
+        # funded feeds and tips kept up to date from autopay events while reporting, see uses_autopay_events
+        self.listen_autopay_events = listen_autopay_events
+        # websocket endpoint to subscribe to autopay events, eth_getLogs is polled if None
+        self.events_ws_url = events_ws_url
+        self.autopay_events: Optional[AutopayEvents] = None
+        # sends transactions and tracks their receipts in the background
+        self.tx_manager = TransactionManager(self.web3, self.acct_address)
+        # count JSON-RPC requests for the metrics
+        instrument_web3(self.web3)
+        # on-chain state read in one multicall at the start of a report, None outside of report_once
+        self.reporter_state: Optional[ReporterState] = None
         
         self.discord_notification_data = {
             "account": self.acct_addr,
@@ -94,6 +135,8 @@ class Tellor360Reporter(Stake):
         Returns:
         - (int, ResponseStatus) the current stake amount in TellorFlex
         """
+        if self.reporter_state is not None and self.reporter_state.stake_amount is not None:
+            return self.reporter_state.stake_amount, ResponseStatus()
         stake_amount: int
         stake_amount, status = await self.oracle.read("getStakeAmount")
         if not status.ok:
@@ -107,6 +150,8 @@ class Tellor360Reporter(Stake):
         Returns:
         - (StakerInfo, ResponseStatus) the staker details for the account
         """
+        if self.reporter_state is not None and self.reporter_state.staker_info is not None:
+            return self.reporter_state.staker_info, ResponseStatus()
         response, status = await self.oracle.read("getStakerInfo", _stakerAddress=self.acct_addr)
         if not status.ok:
             msg = f"Unable to read account staker info: {status.error}"
@@ -198,6 +243,7 @@ class Tellor360Reporter(Stake):
             self.discord_notification_data['reporter_lock_time'] = reporter_lock
         except ZeroDivisionError:  # Tellor Playground contract's stakeAmount is 0
             reporter_lock = 0
+        self.scheduler.set_reporter_lock(self.stake_info.last_report_time, reporter_lock)
         time_remaining = round(self.stake_info.last_report_time + reporter_lock - time.time())
         if time_remaining > 0:
             hr_min_sec = str(timedelta(seconds=time_remaining))
@@ -219,7 +265,12 @@ class Tellor360Reporter(Stake):
             return self.autopaytip
         elif self.chain_id in CHAINS_WITH_TBR:
             logger.info("Fetching time based rewards")
-            time_based_rewards = await get_time_based_rewards(self.oracle)
+            state = self.reporter_state
+            last_distribution = state.time_of_last_distribution if state is not None else None
+            if state is not None and last_distribution is not None and state.time_based_reward is not None:
+                time_based_rewards = calculate_time_based_rewards(last_distribution, state.time_based_reward)
+            else:
+                time_based_rewards = await get_time_based_rewards(self.oracle)
             logger.info(f"Time based rewards: {self.to_ether(time_based_rewards):.04f}")
             if time_based_rewards is not None:
                 self.autopaytip += time_based_rewards
@@ -252,7 +303,13 @@ class Tellor360Reporter(Stake):
 
         # Fetch datafeed based on whichever is most funded in the AutoPay contract
         if self.datafeed is None:
-            suggested_feed, tip_amount = await get_feed_and_tip(self.autopay, self.skip_manual_feeds)
+            suggested_feed, tip_amount = await get_feed_and_tip(
+                self.autopay,
+                self.skip_manual_feeds,
+                tip_index=self.tip_index,
+                scheduler=self.scheduler,
+                autopay_events=self.autopay_events,
+            )
 
             if suggested_feed is not None and tip_amount is not None:
                 logger.info(f"Most funded datafeed in Autopay: {suggested_feed.query.type}")
@@ -271,10 +328,10 @@ class Tellor360Reporter(Stake):
             return status
 
         tip = self.to_ether(self.autopaytip)
-        # Fetch token prices in USD
+        # Fetch token prices in USD (served from the shared price cache if
+        # they were prefetched while the report was being prepared)
+        await self.fetch_token_prices()
         native_token_feed = get_native_token_feed(self.chain_id)
-        price_feeds = [native_token_feed, fetch_usd_median_feed]
-        _ = await asyncio.gather(*[feed.source.fetch_new_datapoint() for feed in price_feeds])
         price_native_token = native_token_feed.source.latest[0]
         price_fetch_usd = fetch_usd_median_feed.source.latest[0]
 
@@ -349,7 +406,31 @@ class Tellor360Reporter(Stake):
 
         return status
 
+    async def fetch_token_prices(self) -> None:
+        """Update the native token and FETCH prices used in the profitability check"""
+        price_feeds = [get_native_token_feed(self.chain_id), fetch_usd_median_feed]
+        _ = await asyncio.gather(*[feed.source.fetch_new_datapoint() for feed in price_feeds])
+
+    async def get_reporter_state(self) -> Tuple[Optional[ReporterState], ResponseStatus]:
+        """Read the stake amount, staker info, time-based reward parameters, native token balance
+        and the selected datafeed's report count in one multicall
+
+        Other methods use the returned state until it's cleared at the end of report_once.
+        """
+        query_id = None
+        if self.datafeed is not None:
+            try:
+                query_id = self.datafeed.query.query_id
+            except EncodingTypeError:
+                logger.warning(f"Unable to generate data/id for query: {self.datafeed.query}")
+        state, status = await fetch_reporter_state(self.oracle, self.acct_addr, query_id)
+        self.reporter_state = state
+        return state, status
+
     async def get_num_reports_by_id(self, query_id: bytes) -> Tuple[int, ResponseStatus]:
+        state = self.reporter_state
+        if state is not None and state.query_id == query_id and state.report_count is not None:
+            return state.report_count, ResponseStatus()
         count, read_status = await self.oracle.read(func_name="getNewValueCountbyQueryId", _queryId=query_id)
         return count, read_status
 
@@ -360,8 +441,8 @@ class Tellor360Reporter(Stake):
 
         Returns a tuple of the web3 function object and a ResponseStatus object
         """
-        # Update datafeed value
-        await datafeed.source.fetch_new_datapoint()
+        # Update datafeed value, manual sources may use values staged for the query
+        await fetch_datapoint(datafeed)
         latest_data = datafeed.source.latest
         if latest_data[0] is None:
             msg = "Unable to retrieve updated datafeed value."
@@ -413,6 +494,11 @@ class Tellor360Reporter(Stake):
         if not status.ok:
             return None, error_status("Error setting gas parameters", status.e, logger.error)
 
+        return self.finalize_transaction(contract_function)
+
+    def finalize_transaction(self, contract_function: ContractFunction) -> Tuple[Optional[TxParams], ResponseStatus]:
+        """Estimate gas for a contract function and build its transaction
+        using the gas fees that are currently set"""
         _, status = self.estimate_gas_amount(contract_function)
         if not status.ok:
             return None, error_status(f"Error estimating gas for function: {contract_function}", status.e, logger.error)
@@ -422,21 +508,35 @@ class Tellor360Reporter(Stake):
         if params is None:
             return None, error_status("Error getting transaction parameters", status.e, logger.error)
 
-        return contract_function.buildTransaction(params), ResponseStatus()  # type: ignore
+        return contract_function.buildTransaction(params), ResponseStatus()
 
-    def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
-        """Send a signed transaction to the blockchain and wait for confirmation
+    async def send_transaction(
+        self,
+        built_tx: Any,
+        on_receipt: Optional[ReceiptHandler] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Optional[PendingTransaction], ResponseStatus]:
+        """Sign and send a transaction without waiting for it to be mined
+
+        The receipt is tracked in the background and handled by `on_receipt`.
 
         Params:
-            tx_signed: The signed transaction object
+            built_tx: The built transaction
+            on_receipt: receipt handler, defaults to `on_receipt`
+            context: data passed on to the receipt handler, defaults to `transaction_context()`
 
-        Returns a tuple of the transaction receipt and a ResponseStatus object
+        Returns a tuple of the pending transaction and a ResponseStatus object
         """
         lazy_unlock_account(self.account)
         local_account = self.account.local_account
         tx_signed = local_account.sign_transaction(built_tx)
         try:
-            tx_hash = self.web3.eth.send_raw_transaction(tx_signed.rawTransaction)
+            pending = await self.tx_manager.send_raw_transaction(
+                tx_signed.rawTransaction,
+                nonce=built_tx.get("nonce"),
+                on_receipt=on_receipt or self.on_receipt,
+                context=self.transaction_context() if context is None else context,
+            )
         except Exception as e:
             note = "Send transaction failed"
             msg = f"Transaction failed:\n     {e}"
@@ -444,31 +544,69 @@ class Tellor360Reporter(Stake):
             logger.info(response)
             return None, error_status(note, log=logger.error, e=e)
 
-        try:
-            # Confirm transaction
-            tx_receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=360)
+        logger.info(f"Transaction sent: {pending.tx_hash.hex()}")
+        return pending, ResponseStatus()
 
-            tx_url = f"{self.endpoint.explorer}#/tx/{tx_hash.hex()}"
+    def transaction_context(self) -> Dict[str, Any]:
+        """Data about the current report needed to handle its transaction receipt
+
+        The next report may start before the receipt arrives, so this is a snapshot.
+        """
+        return {"discord_notification_data": dict(self.discord_notification_data)}
 
-            if tx_receipt["status"] == 0:
-                msg = f"Transaction reverted:\n ({tx_url})"
-                response = submit_or_not(msg)
-                logger.info(response)
-                return tx_receipt, error_status(msg, log=logger.error)
+    def on_receipt(self, pending: PendingTransaction) -> ResponseStatus:
+        """Handle the receipt of a sent transaction
 
-            logger.info(f"View reported data: \n{tx_url}")
-            self.discord_notification_data['transaction_url'] = tx_url
-            response = submit_or_not(self.discord_notification_data)
+        Returns the outcome of the transaction
+        """
+        tx_receipt = pending.receipt
+        if tx_receipt is None:
+            # the reason confirmation failed was logged while tracking the receipt
+            return pending.status or error_status("Failed to confirm transaction", log=logger.error)
+
+        tx_url = f"{self.endpoint.explorer}#/tx/{pending.tx_hash.hex()}"
+
+        if tx_receipt["status"] == 0:
+            msg = f"Transaction reverted:\n ({tx_url})"
+            response = submit_or_not(msg)
             logger.info(response)
-            return tx_receipt, ResponseStatus()
-        except Exception as e:
-            note = "Failed to confirm transaction"
-            return None, error_status(note, log=logger.error, e=e)
+            return error_status(msg, log=logger.error)
+
+        logger.info(f"View reported data: \n{tx_url}")
+        notification_data = pending.context.get("discord_notification_data", self.discord_notification_data)
+        notification_data["transaction_url"] = tx_url
+        response = submit_or_not(notification_data)
+        logger.info(response)
+        return ResponseStatus()
+
+    def on_report_receipt(self, pending: PendingTransaction) -> ResponseStatus:
+        """Handle the receipt of a submitValue transaction, a mined report starts the reporter lock"""
+        status = self.on_receipt(pending)
+        if status.ok:
+            self.scheduler.record_mined_report()
+        return status
+
+    async def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Send a signed transaction to the blockchain and wait for confirmation
+
+        Waiting doesn't block the event loop.
+
+        Params:
+            built_tx: The built transaction
+
+        Returns a tuple of the transaction receipt and a ResponseStatus object
+        """
+        pending, status = await self.send_transaction(built_tx)
+        if pending is None:
+            return None, status
+
+        tx_receipt = await pending.wait()
+        return tx_receipt, pending.status or ResponseStatus()
 
     def get_acct_nonce(self) -> Tuple[Optional[int], ResponseStatus]:
         """Get the nonce for the account"""
         try:
-            return self.web3.eth.get_transaction_count(self.acct_address), ResponseStatus()
+            return self.tx_manager.next_nonce(), ResponseStatus()
         except ValueError as e:
             return None, error_status("Account nonce request timed out", e=e, log=logger.warning)
         except Exception as e:
@@ -488,68 +626,202 @@ class Tellor360Reporter(Stake):
     def has_native_token(self) -> bool:
         """Check if account has native token funds for a network for gas fees
         of at least min_native_token_balance that is set in the cli"""
-        return has_native_token_funds(self.acct_addr, self.web3, min_balance=self.min_native_token_balance)
+        balance = self.reporter_state.native_balance if self.reporter_state is not None else None
+        return has_native_token_funds(
+            self.acct_addr, self.web3, min_balance=self.min_native_token_balance, balance=balance
+        )
+
+    def report_pipeline(self) -> ReportPipeline:
+        """Steps of a report and the steps each one depends on
+
+        Steps without a path between them run concurrently:
+
+            confirmations ──┬──> state ──> staked ──┬──> lock ───────┐
+                            │                       │                ├──> params ──┐
+                            └──> datafeed ──────────┼────────────────┘             ├──> transaction ──┐
+                                                    └──> gas_fees ─────────────────┘                  │
+            token_prices ─────────────────────────────────────────────────────────────────────────────┴──> profitable
+
+        Transactions sent by the previous report must be confirmed before the reporter's
+        state (staker info, report count, etc.) is read and the next datafeed is suggested,
+        so the suggestion doesn't pick a tip the pending report is about to take. Without
+        pending transactions, confirmations completes right away. The datafeed's value is
+        only fetched (which may prompt for manual values) once the reporter is known to be
+        staked and not locked.
+
+        Steps are declared in the order the report was checked when the steps ran
+        one after another, so the same error is returned when several steps fail.
+        """
+
+        async def confirmations(_: StepResults) -> Tuple[None, ResponseStatus]:
+            await self.tx_manager.wait_all()
+            return None, ResponseStatus()
+
+        async def state(_: StepResults) -> Tuple[Optional[ReporterState], ResponseStatus]:
+            reporter_state, status = await self.get_reporter_state()
+            if not status.ok:
+                # values are read one by one instead
+                logger.debug(status.error)
+            if not self.has_native_token():
+                return None, error_status("Insufficient native token funds", log=logger.info)
+            return reporter_state, ResponseStatus()
+
+        async def staked(_: StepResults) -> Tuple[bool, ResponseStatus]:
+            is_staked, status = await self.ensure_staked()
+            if not is_staked and status.ok:
+                return False, error_status("Account is not staked", log=logger.info)
+            return is_staked, status
+
+        async def lock(_: StepResults) -> Tuple[None, ResponseStatus]:
+            return None, await self.check_reporter_lock()
+
+        async def datafeed(_: StepResults) -> Tuple[Optional[DataFeed[Any]], ResponseStatus]:
+            # Get suggested datafeed if none provided
+            feed = await self.fetch_datafeed()
+            if not feed:
+                return None, error_status(note="Unable to suggest datafeed", log=logger.info)
+            return feed, ResponseStatus()
+
+        async def params(results: StepResults) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
+            txn_params, status = await self.submission_txn_params(results["datafeed"])
+            if status.ok and txn_params is None:
+                return None, error_status("Unable to assemble submitValue parameters", log=logger.info)
+            return txn_params, status
+
+        async def gas_fees(_: StepResults) -> Tuple[None, ResponseStatus]:
+            # set gas parameters globally, once staking transactions (if any) are done
+            status = await asyncio.to_thread(self.update_gas_fees)
+            logger.debug(status)
+            if not status.ok:
+                return None, error_status("Error setting gas parameters", status.e, logger.error)
+            return None, status
+
+        async def transaction(results: StepResults) -> Tuple[Optional[TxParams], ResponseStatus]:
+            contract_function, status = self.assemble_function("submitValue", **results["params"])
+            if contract_function is None:
+                return None, error_status("Error building function to estimate gas", status.e, logger.error)
+            return await asyncio.to_thread(self.finalize_transaction, contract_function)
+
+        async def token_prices(_: StepResults) -> Tuple[None, ResponseStatus]:
+            # warm the price cache for the profitability check
+            if self.check_rewards:
+                await self.fetch_token_prices()
+            return None, ResponseStatus()
+
+        async def profitable(_: StepResults) -> Tuple[None, ResponseStatus]:
+            # Check if profitable if not YOLO
+            status = await self.ensure_profitable()
+            logger.debug(f"Ensure profitibility method status: {status}")
+            return None, status
+
+        return ReportPipeline(
+            [
+                PipelineStep("confirmations", confirmations),
+                PipelineStep("state", state, requires=("confirmations",)),
+                PipelineStep("staked", staked, requires=("state",)),
+                PipelineStep("lock", lock, requires=("staked",)),
+                PipelineStep("datafeed", datafeed, requires=("confirmations",)),
+                PipelineStep("params", params, requires=("lock", "datafeed")),
+                PipelineStep("gas_fees", gas_fees, requires=("staked",)),
+                PipelineStep("transaction", transaction, requires=("lock", "params", "gas_fees")),
+                PipelineStep("token_prices", token_prices),
+                PipelineStep("profitable", profitable, requires=("datafeed", "transaction", "token_prices")),
+            ]
+        )
 
     async def report_once(
         self,
+        wait_for_receipt: bool = True,
     ) -> Tuple[Optional[TxReceipt], ResponseStatus]:
         """Report query value once
         This method checks to see if a user is able to submit
         values to the oracle, given their staker status
         and last submission time. Also, this method does not
-        submit values if doing so won't make a profit."""
-        # Check staker status
-        staked, status = await self.ensure_staked()
-        if not staked or not status.ok:
-            return None, status
+        submit values if doing so won't make a profit.
 
-        status = await self.check_reporter_lock()
-        if not status.ok:
-            return None, status
+        Independent checks run concurrently, see `report_pipeline`.
 
-        # Get suggested datafeed if none provided
-        datafeed = await self.fetch_datafeed()
-        if not datafeed:
-            msg = "Unable to suggest datafeed"
-            return None, error_status(note=msg, log=logger.info)
+        Params:
+            wait_for_receipt: wait for the submitValue transaction to be mined,
+            otherwise its receipt is handled in the background and None is returned
+        """
+        with count_rpc_requests() as rpc_count, report_step_seconds.time(step="report"):
+            try:
+                return await self._report_once(wait_for_receipt)
+            finally:
+                report_rpc_requests.observe(rpc_count.count)
 
-        params, status = await self.submission_txn_params(datafeed)
-        if not status.ok or params is None:
-            return None, status
+    async def _report_once(self, wait_for_receipt: bool) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        try:
+            results, status = await self.report_pipeline().run()
+            if not status.ok:
+                return None, status
+
+            logger.debug("Sending submitValue transaction")
+            tx_receipt = None
+            if wait_for_receipt:
+                tx_receipt, status = await self.sign_n_send_transaction(results["transaction"])
+            else:
+                _, status = await self.send_transaction(results["transaction"], on_receipt=self.on_report_receipt)
+            if status.ok:
+                # values staged in the manual inbox for the report are used up
+                consume_staged_values(results["datafeed"])
+            return tx_receipt, status
+        finally:
+            # read the state again next report
+            self.reporter_state = None
+            # reset datafeed for a new suggestion if qtag wasn't selected in cli
+            if self.qtag_selected is False:
+                self.datafeed = None
 
-        build_tx, status = self.build_transaction("submitValue", **params)
-        if not status.ok or build_tx is None:
-            return None, status
+    async def is_online(self) -> bool:
+        return await is_online()
 
-        # Check if profitable if not YOLO
-        status = await self.ensure_profitable()
-        logger.debug(f"Ensure profitibility method status: {status}")
-        if not status.ok:
-            return None, status
+    def get_idle_period(self) -> float:
+        return self.idle_period if self.idle_period is not None else self.wait_period * IDLE_MULTIPLIER
 
-        logger.debug("Sending submitValue transaction")
-        tx_receipt, status = self.sign_n_send_transaction(build_tx)
-        # reset datafeed for a new suggestion if qtag wasn't selected in cli
-        if self.qtag_selected is False:
-            self.datafeed = None
+    async def wait_for_next_report(self) -> None:
+        """Wait until the reporter may have something to report, see `ReportScheduler`
 
-        return tx_receipt, status
+        Subclasses may wake up early when a new value is ready.
+        """
+        await self.scheduler.sleep(self.wait_period, self.get_idle_period())
 
-    async def is_online(self) -> bool:
-        return await is_online()
+    def uses_autopay_events(self) -> bool:
+        """Whether the reporter picks feeds by autopay tips, kept up to date from events while reporting"""
+        return self.listen_autopay_events and not self.qtag_selected and not self.use_random_feeds
 
     async def report(self, report_count: Optional[int] = None) -> None:
         """Submit values to Tellor oracles on an interval."""
+        events_task = None
+        if self.uses_autopay_events():
+            self.autopay_events = get_autopay_events(self.chain_id, self.web3, self.autopay, self.oracle)
+            # wake up as soon as a new tip is added
+            self.autopay_events.on_new_tip(self.scheduler.notify)
+            # no need to follow tips while the reporter is locked, the listener catches up afterwards
+            events_task = asyncio.ensure_future(
+                self.autopay_events.run(self.events_ws_url, paused=self.scheduler.locked)
+            )
 
-        while report_count is None or report_count > 0:
-            if await self.is_online():
-                if self.has_native_token():
-                    _, _ = await self.report_once()
-            else:
-                logger.warning("Unable to connect to the internet!")
-
-            logger.info(f"Sleeping for {self.wait_period} seconds")
-            await asyncio.sleep(self.wait_period)
-
-            if report_count is not None:
-                report_count -= 1
+        try:
+            while report_count is None or report_count > 0:
+                if await self.is_online():
+                    # native token funds are checked with the rest of the reporter's state,
+                    # the receipt is handled in the background while waiting for the next report
+                    _, status = await self.report_once(wait_for_receipt=False)
+                    # the reporter lock starts once the report is mined, see on_report_receipt
+                    self.scheduler.record_report(status.ok)
+                else:
+                    logger.warning("Unable to connect to the internet!")
+
+                await self.wait_for_next_report()
+
+                if report_count is not None:
+                    report_count -= 1
+        finally:
+            if events_task is not None:
+                events_task.cancel()
+                await asyncio.gather(events_task, return_exceptions=True)
+                self.autopay_events = None
+
+        await self.tx_manager.wait_all()
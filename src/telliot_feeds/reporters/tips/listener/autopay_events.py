@@ -0,0 +1,411 @@
+"""Funded autopay feeds and one time tips, kept up to date from contract events
+
+Instead of reading `getFundedFeedDetails` and `getFundedSingleTipsInfo` and
+decoding the whole funded set every report, the listener reads them once, at
+a known block, and then applies the autopay and oracle events emitted after
+that block:
+- NewDataFeed: query data of a new feed
+- DataFeedFunded: feed details (including the new balance) of a funded feed
+- TipClaimed: feed balance paid out for a report
+- TipAdded: one time tip added to a query's current tip
+- NewReport: a report takes the query's current one time tip
+- OneTimeTipClaimed: one time tip paid out, already taken by a report
+
+Events are fetched with eth_getLogs for the blocks after the last block
+applied (the cursor), or received from an eth_subscribe logs subscription
+over a websocket. While subscribed, the blocks after the cursor are still
+fetched every `SUBSCRIPTION_SYNC_INTERVAL` seconds, which advances the cursor
+and catches logs the subscription missed. No requests are made while paused
+(e.g. while the reporter is locked), the blocks mined meanwhile are caught up
+from the cursor afterwards. The cursor and the funded set are
+checkpointed in the telliot home directory, so a restarted reporter catches
+up from its cursor. The whole funded set is read again every `resync_period`
+seconds, which corrects for reorged blocks and balances estimated from events.
+
+Reporters only use the funded set while it's up to date (see `synced`) and
+read the contract otherwise, e.g. while the node is unreachable.
+"""
+import asyncio
+import json
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import websockets
+from eth_utils import event_abi_to_log_topic
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+from telliot_core.contract.contract import Contract
+from telliot_core.utils.home import default_homedir
+from web3 import Web3
+from web3._utils.events import get_event_data
+from web3.types import LogReceipt
+
+from telliot_feeds.queries.query import query_id_from_data
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import get_feed_id
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+# bump when the pickled layout changes so stale checkpoints are discarded
+CHECKPOINT_VERSION = 1
+
+AUTOPAY_EVENTS = ("NewDataFeed", "DataFeedFunded", "TipClaimed", "TipAdded", "OneTimeTipClaimed")
+ORACLE_EVENTS = ("NewReport",)
+
+#: Seconds between eth_getLogs requests when not subscribed over a websocket
+POLL_INTERVAL = 4.0
+
+#: Seconds between eth_getLogs requests while subscribed over a websocket
+SUBSCRIPTION_SYNC_INTERVAL = 3 * POLL_INTERVAL
+
+#: Seconds after the last update the funded set is no longer used
+MAX_AGE = 8 * POLL_INTERVAL
+
+#: Maximum number of blocks per eth_getLogs request
+MAX_BLOCK_RANGE = 2_000
+
+#: Read the funded set again instead of catching up on more blocks than this
+MAX_CATCH_UP_BLOCKS = 50_000
+
+#: Events that may make a new tip available to reporters
+TIP_EVENTS = ("NewDataFeed", "DataFeedFunded", "TipAdded")
+
+#: Fields of an autopay feed, in the contract's order
+FeedFields = Tuple[int, ...]
+
+
+def _abi(contract: Contract) -> List[Dict[str, Any]]:
+    abi: List[Dict[str, Any]] = json.loads(contract.abi) if isinstance(contract.abi, str) else contract.abi
+    return abi
+
+
+def _format_log(log: Dict[str, Any]) -> Dict[str, Any]:
+    """Log of an eth_subscribe notification, formatted like web3's eth_getLogs results"""
+    return {
+        **log,
+        "address": to_checksum_address(log["address"]),
+        "topics": [HexBytes(t) for t in log["topics"]],
+        "data": HexBytes(log["data"]),
+        "blockNumber": int(log["blockNumber"], 16),
+        "logIndex": int(log["logIndex"], 16),
+        "transactionHash": HexBytes(log["transactionHash"]),
+        "blockHash": HexBytes(log["blockHash"]),
+    }
+
+
+class AutopayEvents:
+    """Funded feeds and one time tips of an autopay contract, updated from events"""
+
+    def __init__(
+        self,
+        w3: Web3,
+        autopay: Contract,
+        oracle: Contract,
+        path: Optional[Path] = None,
+        resync_period: int = 3_600,
+        max_age: float = MAX_AGE,
+    ) -> None:
+        """
+        Args:
+        - w3: web3 instance of the chain
+        - autopay, oracle: contracts whose events are applied
+        - path: file the cursor and funded set are checkpointed to, in memory only if None
+        - resync_period: number of seconds after which the funded set is read again
+        - max_age: number of seconds after the last update the funded set is no longer used
+        """
+        self.w3 = w3
+        self.path = path
+        self.resync_period = resync_period
+        self.max_age = max_age
+        self.autopay = w3.eth.contract(address=autopay.address, abi=_abi(autopay))
+        self.oracle = w3.eth.contract(address=oracle.address, abi=_abi(oracle))
+        self.events: Dict[bytes, Dict[str, Any]] = {}
+        for contract, names in ((self.autopay, AUTOPAY_EVENTS), (self.oracle, ORACLE_EVENTS)):
+            for abi in contract.abi:
+                if abi.get("type") == "event" and abi["name"] in names:
+                    self.events[event_abi_to_log_topic(abi)] = abi
+
+        #: all events up to and including this block are applied, None before the funded set is read
+        self.cursor: Optional[int] = None
+        self.last_full_sync = 0.0
+        #: time of the last successful update in this process, None until then
+        self.updated_at: Optional[float] = None
+        #: feed id -> feed details and query data
+        self.feeds: Dict[bytes, Tuple[FeedFields, bytes]] = {}
+        #: query id -> query data and current one time tip
+        self.tips: Dict[bytes, Tuple[bytes, int]] = {}
+        #: query id -> query data, of feeds and tips seen so far
+        self.query_data: Dict[bytes, bytes] = {}
+        # logs received from a subscription for blocks after the cursor
+        self._applied: set[Tuple[int, int]] = set()
+        self._lock = threading.RLock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.load()
+
+    @classmethod
+    def for_autopay(cls, chain_id: Optional[int], w3: Web3, autopay: Contract, oracle: Contract) -> "AutopayEvents":
+        """Create a listener checkpointed in the telliot home directory for an autopay contract"""
+        path = Path(default_homedir()) / "autopay_events" / f"{chain_id}_{autopay.address}.pickle"
+        return cls(w3, autopay, oracle, path=path)
+
+    @property
+    def synced(self) -> bool:
+        """Whether the funded set is up to date, ie. updated in this process within the last `max_age` seconds"""
+        return self.cursor is not None and self.updated_at is not None and time.time() - self.updated_at < self.max_age
+
+    def on_new_tip(self, callback: Callable[[], None]) -> None:
+        """Call a function (from any thread) whenever an event may make a new tip available"""
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def load(self) -> None:
+        """Load the checkpoint from disk, if it was saved"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("version") != CHECKPOINT_VERSION:
+                logger.info("Autopay events checkpoint format changed, reading funded feeds again")
+                return
+            self.cursor = state["cursor"]
+            self.last_full_sync = state["last_full_sync"]
+            self.feeds = state["feeds"]
+            self.tips = state["tips"]
+            self.query_data = state["query_data"]
+        except Exception as e:
+            logger.warning(f"Unable to load autopay events checkpoint from {self.path}: {e}")
+
+    def save(self) -> None:
+        """Checkpoint the cursor and funded set to disk"""
+        if self.path is None:
+            return
+        with self._lock:
+            state = {
+                "version": CHECKPOINT_VERSION,
+                "cursor": self.cursor,
+                "last_full_sync": self.last_full_sync,
+                "feeds": self.feeds,
+                "tips": self.tips,
+                "query_data": self.query_data,
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(".tmp")
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(state, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Unable to save autopay events checkpoint to {self.path}: {e}")
+
+    def funded_feeds(self) -> List[Tuple[FeedFields, bytes]]:
+        """Feed details and query data of funded feeds, like getFundedFeedDetails"""
+        with self._lock:
+            return [(details, query_data) for details, query_data in self.feeds.values() if details[1] > 0]
+
+    def funded_one_time_tips(self) -> List[Tuple[bytes, int]]:
+        """Query data and current one time tip of tipped queries, like getFundedSingleTipsInfo"""
+        with self._lock:
+            return [(query_data, tip) for query_data, tip in self.tips.values() if tip > 0]
+
+    def read_funded_set(self) -> None:
+        """Read the whole funded set at the latest block, and apply events after it from then on"""
+        block = self.w3.eth.block_number
+        funded_feeds = self.autopay.functions.getFundedFeedDetails().call(block_identifier=block)
+        funded_tips = self.autopay.functions.getFundedSingleTipsInfo().call(block_identifier=block)
+        feeds: Dict[bytes, Tuple[FeedFields, bytes]] = {}
+        for details, query_data in funded_feeds:
+            feed_id = get_feed_id(query_id_from_data(query_data), *details[:1], *details[2:7])
+            feeds[feed_id] = (tuple(details), bytes(query_data))
+        with self._lock:
+            self.feeds = feeds
+            self.tips = {query_id_from_data(q): (bytes(q), tip) for q, tip in funded_tips if q}
+            self.query_data.update({query_id_from_data(q): q for _, q in feeds.values()})
+            self.query_data.update({query_id: q for query_id, (q, _) in self.tips.items()})
+            self.cursor = block
+            self._applied.clear()
+            self.last_full_sync = time.time()
+        logger.info(f"Read {len(feeds)} funded feeds and {len(self.tips)} one time tips at block {block}")
+        self.updated_at = time.time()
+        self.save()
+
+    def _log_filter(self) -> Dict[str, Any]:
+        return {
+            "address": [self.autopay.address, self.oracle.address],
+            "topics": [[HexBytes(topic).hex() for topic in self.events]],
+        }
+
+    def sync(self) -> None:
+        """Apply the events of the blocks mined since the cursor, or read the whole funded set if due"""
+        latest = self.w3.eth.block_number
+        if (
+            self.cursor is None
+            or time.time() - self.last_full_sync >= self.resync_period
+            or latest - self.cursor > MAX_CATCH_UP_BLOCKS
+        ):
+            self.read_funded_set()
+            return
+        if latest <= self.cursor:
+            self.updated_at = time.time()
+            return
+        while self.cursor is not None and self.cursor < latest:
+            to_block = min(self.cursor + MAX_BLOCK_RANGE, latest)
+            log_filter = {**self._log_filter(), "fromBlock": self.cursor + 1, "toBlock": to_block}
+            logs = self.w3.eth.get_logs(log_filter)  # type: ignore
+            self.apply_logs(logs)
+            with self._lock:
+                self.cursor = to_block
+                self._applied = {key for key in self._applied if key[0] > to_block}
+        self.updated_at = time.time()
+        self.save()
+
+    def apply_logs(self, logs: Sequence[Union[LogReceipt, Dict[str, Any]]]) -> None:
+        """Apply logs in chain order, skipping logs applied before"""
+        new_tip = False
+        with self._lock:
+            for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+                key = (log["blockNumber"], log["logIndex"])
+                if (self.cursor is not None and key[0] <= self.cursor) or key in self._applied:
+                    continue
+                abi = self.events.get(bytes(log["topics"][0])) if log["topics"] else None
+                if abi is None:
+                    continue
+                event = get_event_data(self.w3.codec, abi, log)
+                self._apply(event["event"], event["args"])
+                self._applied.add(key)
+                new_tip = new_tip or event["event"] in TIP_EVENTS
+        if new_tip:
+            for callback in self._callbacks:
+                callback()
+
+    def _apply(self, name: str, args: Any) -> None:
+        query_id = bytes(args["_queryId"])
+        if name == "NewDataFeed":
+            self.query_data[query_id] = bytes(args["_queryData"])
+        elif name == "DataFeedFunded":
+            feed_id = bytes(args["_feedId"])
+            query_data = self.query_data.get(query_id)
+            if query_data is None:
+                logger.info(f"Query data of funded feed 0x{feed_id.hex()} unknown, reading funded feeds again")
+                self.last_full_sync = 0
+                return
+            self.feeds[feed_id] = (tuple(args["_feedDetails"]), query_data)
+        elif name == "TipClaimed":
+            feed_id = bytes(args["_feedId"])
+            if feed_id in self.feeds:
+                details, query_data = self.feeds[feed_id]
+                balance = max(details[1] - args["_amount"], 0)
+                self.feeds[feed_id] = ((details[0], balance, *details[2:]), query_data)
+        elif name == "TipAdded":
+            query_data = bytes(args["_queryData"])
+            self.query_data[query_id] = query_data
+            _, tip = self.tips.get(query_id, (query_data, 0))
+            self.tips[query_id] = (query_data, tip + args["_amount"])
+        elif name == "NewReport":
+            if query_id in self.tips:
+                self.tips[query_id] = (self.tips[query_id][0], 0)
+
+    async def sync_periodically(self, interval: float, paused: Optional[Callable[[], bool]] = None) -> None:
+        """Sync every `interval` seconds, until cancelled or paused"""
+        while paused is None or not paused():
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:
+                logger.warning(f"Unable to update funded feeds from autopay events: {e}")
+            await asyncio.sleep(interval)
+
+    async def subscribe(
+        self,
+        ws_url: str,
+        sync_interval: float = SUBSCRIPTION_SYNC_INTERVAL,
+        paused: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Apply events received from a websocket logs subscription, until the connection closes or paused
+
+        Meanwhile, sync every `sync_interval` seconds: this catches up on blocks mined
+        before the subscription started, advances and checkpoints the cursor (logs
+        received for blocks up to the cursor are skipped), and reads the funded set
+        again when due.
+        """
+        async with websockets.connect(ws_url) as ws:  # type: ignore
+            request = {"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["logs", self._log_filter()]}
+            await ws.send(json.dumps(request, default=str))
+            reply = json.loads(await ws.recv())
+            if "error" in reply:
+                raise ValueError(f"Unable to subscribe to autopay events: {reply['error']}")
+            logger.info(f"Subscribed to autopay events at {ws_url}")
+            receiving = asyncio.ensure_future(self._receive(ws))
+            # syncing stops once paused, which ends the subscription
+            syncing = asyncio.ensure_future(self.sync_periodically(sync_interval, paused))
+            try:
+                done, _ = await asyncio.wait({receiving, syncing}, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            finally:
+                receiving.cancel()
+                syncing.cancel()
+                await asyncio.gather(receiving, syncing, return_exceptions=True)
+
+    async def _receive(self, ws: Any) -> None:
+        async for message in ws:
+            log = json.loads(message).get("params", {}).get("result")
+            if not log:
+                continue
+            if log.get("removed"):
+                # reorged out, the funded set is read again next sync
+                self.last_full_sync = 0
+                continue
+            self.apply_logs([_format_log(log)])
+
+    async def run(
+        self,
+        ws_url: Optional[str] = None,
+        poll_interval: float = POLL_INTERVAL,
+        paused: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Keep the funded set up to date, subscribing to events if a websocket endpoint is given
+
+        Args:
+        - ws_url: websocket endpoint to subscribe to events at, events are polled if None
+        - poll_interval: number of seconds between polls, and between checks whether still paused
+        - paused: no requests are made while this returns True
+        """
+        while True:
+            if paused is not None and paused():
+                await asyncio.sleep(poll_interval)
+                continue
+            try:
+                if ws_url is not None:
+                    await self.subscribe(ws_url, paused=paused)
+                else:
+                    await asyncio.to_thread(self.sync)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Unable to update funded feeds from autopay events: {e}")
+            await asyncio.sleep(poll_interval)
+
+
+_listeners: Dict[Tuple[Optional[int], str], AutopayEvents] = {}
+
+
+def get_autopay_events(chain_id: Optional[int], w3: Web3, autopay: Contract, oracle: Contract) -> AutopayEvents:
+    """Get the autopay events listener shared by all reporters using an autopay contract"""
+    key = (chain_id, autopay.address.lower())
+    listener = _listeners.get(key)
+    if listener is None or listener.w3 is not w3:
+        listener = AutopayEvents.for_autopay(chain_id, w3, autopay, oracle)
+        _listeners[key] = listener
+    return listener
@@ -8,9 +8,11 @@ from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
 from telliot_core.utils.timestamp import TimeStamp
 
+from telliot_feeds.reporters.tips.listener.autopay_events import AutopayEvents
 from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
 from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+from telliot_feeds.reporters.tips.listener.tip_index import TipIndex
 from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.query_search_utils import feed_in_feed_builder_mapping
@@ -22,9 +24,21 @@ logger = get_logger(__name__)
 class FundedFeeds(FundedFeedFilter):
     """Fetch Feeds from autopay and filter"""
 
-    def __init__(self, autopay: TellorFlexAutopayContract, multi_call: MulticallAutopay) -> None:
+    def __init__(
+        self,
+        autopay: TellorFlexAutopayContract,
+        multi_call: MulticallAutopay,
+        tip_index: Optional[TipIndex] = None,
+        autopay_events: Optional[AutopayEvents] = None,
+    ) -> None:
         self.multi_call = multi_call
         self.autopay = self.multi_call.autopay = autopay
+        # if set, only reports and claim status that changed since the last call are fetched
+        self.tip_index = tip_index
+        # if set and synced, funded feeds are taken from autopay events instead of read from the contract
+        self.autopay_events = autopay_events
+        # all funded feeds with telliot support, set by get_funded_feed_queries
+        self.funded_feed_details: list[QueryIdandFeedDetails] = []
 
     async def get_funded_feed_queries(self) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
         """Call getFundedFeedDetails autopay function filter response data
@@ -33,7 +47,10 @@ class FundedFeeds(FundedFeedFilter):
         that exist in telliot registry
         """
         funded_feeds: list[tuple[FeedDetails, bytes]]
-        funded_feeds, status = await self.autopay.read("getFundedFeedDetails")
+        if self.autopay_events is not None and self.autopay_events.synced:
+            funded_feeds, status = self.autopay_events.funded_feeds(), ResponseStatus()  # type: ignore
+        else:
+            funded_feeds, status = await self.autopay.read("getFundedFeedDetails")
 
         if not status.ok or not funded_feeds:
             return None, error_status(note="No funded feeds returned by autopay function call")
@@ -52,6 +69,7 @@ class FundedFeeds(FundedFeedFilter):
             QueryIdandFeedDetails(params=FeedDetails(*feed_details), query_data=query_data)
             for feed_details, query_data in supported_funded_feeds
         ]
+        self.funded_feed_details = funded_feed_details
         return funded_feed_details, ResponseStatus()
 
     async def filtered_funded_feeds(
@@ -66,9 +84,17 @@ class FundedFeeds(FundedFeedFilter):
         qtype_supported_feeds = self.generate_ids(feeds=qtype_supported_feeds)
 
         # make the first multicall and values and timestamps for the past month
-        feeds_timestsamps_and_values_lis, status = await self.multi_call.month_of_timestamps_and_values(
-            feeds=qtype_supported_feeds, now_timestamp=now_timestamp, max_age=month_old_timestamp, max_count=40_000
-        )
+        if self.tip_index is not None:
+            feeds_timestsamps_and_values_lis, status = await self.multi_call.indexed_timestamps_and_values(
+                feeds=qtype_supported_feeds,
+                now_timestamp=now_timestamp,
+                max_age=month_old_timestamp,
+                tip_index=self.tip_index,
+            )
+        else:
+            feeds_timestsamps_and_values_lis, status = await self.multi_call.month_of_timestamps_and_values(
+                feeds=qtype_supported_feeds, now_timestamp=now_timestamp, max_age=month_old_timestamp, max_count=40_000
+            )
 
         if not status.ok or not feeds_timestsamps_and_values_lis:
             return None, status
@@ -83,9 +109,15 @@ class FundedFeeds(FundedFeedFilter):
         )
 
         # get claim status count for every query ids eligible timestamp
-        reward_claimed_status, status = await self.multi_call.rewards_claimed_status_call(
-            feeds=historical_timestamps_list_filtered
-        )
+        if self.tip_index is not None:
+            reward_claimed_status, status = await self.multi_call.indexed_rewards_claimed_status(
+                feeds=historical_timestamps_list_filtered, tip_index=self.tip_index
+            )
+            self.tip_index.save()
+        else:
+            reward_claimed_status, status = await self.multi_call.rewards_claimed_status_call(
+                feeds=historical_timestamps_list_filtered
+            )
 
         if reward_claimed_status is None:
             return historical_timestamps_list_filtered, ResponseStatus()
@@ -7,6 +7,7 @@ from web3 import Web3 as w3
 
 from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
+from telliot_feeds.queries.query import query_id_from_data
 from telliot_feeds.reporters.tips import TYPES_WITH_GENERIC_SOURCE
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
 from telliot_feeds.utils.log import get_logger
@@ -18,6 +19,24 @@ from telliot_feeds.utils.query_search_utils import query_from_query_catalog
 logger = get_logger(__name__)
 
 
+def get_feed_id(
+    query_id: bytes,
+    reward: int,
+    start_time: int,
+    interval: int,
+    window: int,
+    price_threshold: int,
+    reward_increase_per_second: int,
+) -> bytes:
+    """Autopay feed id
+
+    keccak(abi.encode(queryId,reward,startTime,interval,window,priceThreshold,rewardIncreasePerSecond)
+    """
+    feed_abi_types = ["bytes32", "uint256", "uint256", "uint256", "uint256", "uint256", "uint256"]
+    feed_values = [query_id, reward, start_time, interval, window, price_threshold, reward_increase_per_second]
+    return bytes(w3.keccak(encode_abi(feed_abi_types, feed_values)))
+
+
 class FundedFeedFilter:
     def generate_ids(self, feeds: list[QueryIdandFeedDetails]) -> list[QueryIdandFeedDetails]:
         """Hash feed details to generate query id and feed id
@@ -28,9 +47,8 @@ class FundedFeedFilter:
         - feed_id: keccak(abi.encode(queryId,reward,startTime,interval,window,priceThreshold,rewardIncreasePerSecond)
         """
         for feed in feeds:
-            feed.query_id = bytes(w3.keccak(feed.query_data))
-            feed_abi_types = ["bytes32", "uint256", "uint256", "uint256", "uint256", "uint256", "uint256"]
-            feed_values = [
+            feed.query_id = query_id_from_data(feed.query_data)
+            feed.feed_id = get_feed_id(
                 feed.query_id,
                 feed.params.reward,
                 feed.params.startTime,
@@ -38,9 +56,7 @@ class FundedFeedFilter:
                 feed.params.window,
                 feed.params.priceThreshold,
                 feed.params.rewardIncreasePerSecond,
-            ]
-            feed_id_encoded = encode_abi(feed_abi_types, feed_values)
-            feed.feed_id = bytes(w3.keccak(feed_id_encoded))
+            )
 
         return feeds
 
@@ -81,7 +97,7 @@ class FundedFeedFilter:
 
         Returns: float
         """
-        query_id = bytes(w3.keccak(query_data))
+        query_id = query_id_from_data(query_data)
         query_entry = query_from_query_catalog(qid=query_id.hex())
         if query_entry is not None:
             query = query_entry.query
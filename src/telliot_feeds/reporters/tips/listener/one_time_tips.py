@@ -2,21 +2,31 @@
 from typing import Optional
 
 from telliot_core.tellor.tellorflex.autopay import TellorFlexAutopayContract
+from telliot_core.utils.response import ResponseStatus
 
+from telliot_feeds.reporters.tips.listener.autopay_events import AutopayEvents
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.query_search_utils import qtype_name_in_registry
 
 logger = get_logger(__name__)
 
 
-async def get_funded_one_time_tips(autopay: TellorFlexAutopayContract) -> Optional[dict[bytes, int]]:
+async def get_funded_one_time_tips(
+    autopay: TellorFlexAutopayContract, autopay_events: Optional[AutopayEvents] = None
+) -> Optional[dict[bytes, int]]:
     """Trigger autopay call and filter response data
 
+    If autopay events are given and synced, tips are taken from them instead of read from the contract.
+
     Return: list of tuples of only query data and tips
     that exist in telliot registry
     """
     onetime_tips: Optional[list[tuple[bytes, int]]]
-    onetime_tips, status = await autopay.read("getFundedSingleTipsInfo")
+    if autopay_events is not None and autopay_events.synced:
+        onetime_tips = autopay_events.funded_one_time_tips()
+        status = ResponseStatus()
+    else:
+        onetime_tips, status = await autopay.read("getFundedSingleTipsInfo")
 
     if not status.ok or not onetime_tips:
         logger.info("No one time tip funded queries available")
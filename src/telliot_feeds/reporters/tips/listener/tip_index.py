@@ -0,0 +1,198 @@
+"""Persistent, incrementally updated index of autopay feed reports and tip claims
+
+The index keeps, per query id, the values and timestamps reported within the
+retention period (one month by default) and, per feed, the report timestamps
+whose tips are already claimed. After the first sync, only reports newer than
+the last synced timestamp are fetched, and claim status is only requested for
+timestamps that aren't yet known to be claimed.
+"""
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+# bump when the pickled layout changes so stale index files are discarded
+TIP_INDEX_VERSION = 1
+
+
+@dataclass
+class QueryIdReports:
+    """Reports for a query id, sorted by timestamp
+
+    - reports: list of reported values and their timestamps
+    - synced_to: all reports with a timestamp up to and including this one are indexed
+    """
+
+    reports: list[Values] = field(default_factory=list)
+    synced_to: int = 0
+
+
+class TipIndex:
+    """Index of autopay reports and tip claim status"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        retention: int = 2_592_000,
+        resync_period: int = 3_600,
+    ) -> None:
+        """
+        Args:
+        - path: file the index is persisted to, in memory only if None
+        - retention: number of seconds reports are kept in the index
+        - resync_period: number of seconds after which all reports are fetched again
+        (picks up reports removed by disputes)
+        """
+        self.path = path
+        self.retention = retention
+        self.resync_period = resync_period
+        self.query_reports: dict[bytes, QueryIdReports] = {}
+        self.claimed: dict[tuple[bytes, bytes], set[int]] = {}
+        self.last_full_sync = 0
+        self.load()
+
+    @classmethod
+    def for_autopay(cls, chain_id: Optional[int], autopay_address: str, **kwargs: Any) -> "TipIndex":
+        """Create a tip index persisted in the telliot home directory for an autopay contract"""
+        path = default_homedir() / "tip_index" / f"{chain_id}_{autopay_address}.pickle"
+        return cls(path=path, **kwargs)
+
+    def load(self) -> None:
+        """Load the index from disk, if it was persisted"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("version") != TIP_INDEX_VERSION:
+                logger.info("Tip index file format changed, resyncing")
+                return
+            self.query_reports = state["query_reports"]
+            self.claimed = state["claimed"]
+            self.last_full_sync = state["last_full_sync"]
+        except Exception as e:
+            logger.warning(f"Unable to load tip index from {self.path}, resyncing: {e}")
+
+    def save(self) -> None:
+        """Persist the index to disk
+
+        The index is written to a temporary file and moved into place, so a crash
+        mid-write never leaves a corrupt index behind.
+        """
+        if self.path is None:
+            return
+        state = {
+            "version": TIP_INDEX_VERSION,
+            "query_reports": self.query_reports,
+            "claimed": self.claimed,
+            "last_full_sync": self.last_full_sync,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Unable to save tip index to {self.path}: {e}")
+
+    def needs_full_sync(self, now_timestamp: Optional[int] = None) -> bool:
+        """Check if all reports should be fetched instead of only new ones"""
+        if now_timestamp is None:
+            now_timestamp = int(time.time())
+        return now_timestamp - self.last_full_sync >= self.resync_period
+
+    def synced_to(self, query_id: bytes) -> int:
+        """Timestamp up to which reports for a query id are indexed (0 if never synced)"""
+        entry = self.query_reports.get(query_id)
+        return entry.synced_to if entry is not None else 0
+
+    def update_reports(
+        self,
+        query_id: bytes,
+        values: list[bytes],
+        timestamps: list[int],
+        synced_to: int,
+        full: bool = False,
+    ) -> None:
+        """Add fetched reports for a query id
+
+        Args:
+        - query_id
+        - values: reported values, aligned with timestamps
+        - timestamps: report timestamps
+        - synced_to: all reports up to and including this timestamp are now indexed
+        - full: reports are a complete snapshot and replace the indexed ones
+        """
+        entry = self.query_reports.setdefault(query_id, QueryIdReports())
+        new_reports = [Values(value=v, timestamp=t) for v, t in zip(values, timestamps)]
+        if full:
+            entry.reports = new_reports
+        else:
+            known = {r.timestamp for r in entry.reports}
+            entry.reports.extend(r for r in new_reports if r.timestamp not in known)
+        entry.reports.sort(key=lambda r: r.timestamp)
+        entry.synced_to = synced_to
+        self.prune(synced_to)
+
+    def reports(self, query_id: bytes, min_timestamp: int = 0) -> list[Values]:
+        """Copy of indexed reports for a query id newer than min_timestamp"""
+        entry = self.query_reports.get(query_id)
+        if entry is None:
+            return []
+        return [Values(value=r.value, timestamp=r.timestamp) for r in entry.reports if r.timestamp > min_timestamp]
+
+    def latest_report(self, query_id: bytes) -> Optional[Values]:
+        """Most recent indexed report for a query id"""
+        entry = self.query_reports.get(query_id)
+        if entry is None or not entry.reports:
+            return None
+        return entry.reports[-1]
+
+    def unknown_claim_status(self, feed_id: bytes, query_id: bytes, timestamps: list[int]) -> list[int]:
+        """Filter timestamps down to those not yet known to be claimed"""
+        claimed = self.claimed.get((feed_id, query_id), set())
+        return [t for t in timestamps if t not in claimed]
+
+    def update_claim_status(self, feed_id: bytes, query_id: bytes, timestamps: list[int], statuses: list[bool]) -> None:
+        """Record claim status fetched for a feed's report timestamps
+
+        Only claimed timestamps are stored since a claimed tip stays claimed.
+        """
+        claimed = self.claimed.setdefault((feed_id, query_id), set())
+        claimed.update(t for t, is_claimed in zip(timestamps, statuses) if is_claimed)
+
+    def prune(self, now_timestamp: int) -> None:
+        """Drop reports and claim status older than the retention period"""
+        cutoff = now_timestamp - self.retention
+        for entry in self.query_reports.values():
+            entry.reports = [r for r in entry.reports if r.timestamp > cutoff]
+        for key, claimed in list(self.claimed.items()):
+            claimed.difference_update({t for t in claimed if t <= cutoff})
+            if not claimed:
+                del self.claimed[key]
+
+
+_tip_indexes: dict[tuple[Optional[int], str], TipIndex] = {}
+
+
+def get_tip_index(chain_id: Optional[int], autopay_address: str) -> TipIndex:
+    """Get the tip index shared by all reporters using an autopay contract"""
+    key = (chain_id, autopay_address.lower())
+    tip_index = _tip_indexes.get(key)
+    if tip_index is None:
+        tip_index = TipIndex.for_autopay(chain_id, autopay_address)
+        _tip_indexes[key] = tip_index
+    return tip_index
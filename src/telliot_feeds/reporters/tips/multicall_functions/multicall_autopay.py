@@ -8,6 +8,7 @@ from telliot_feeds.datafeed import DataFeed
 from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
 from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.listener.tip_index import TipIndex
 from telliot_feeds.reporters.tips.listener.utils import handler_func
 from telliot_feeds.reporters.tips.multicall_functions.call_functions import CallFunctions
 
@@ -102,6 +103,117 @@ class MulticallAutopay(CallFunctions):
 
         return reward_claimed_status_resp, status
 
+    async def indexed_timestamps_and_values(
+        self,
+        feeds: list[QueryIdandFeedDetails],
+        now_timestamp: int,
+        max_age: int,
+        tip_index: TipIndex,
+        max_count: int = 40_000,
+    ) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
+        """Like month_of_timestamps_and_values, but only fetches reports that are newer than
+        the ones already in the tip index
+
+        Args:
+        - feeds: list of QueryIdandFeedDetails
+        - now_timestamp: current time in unix timestamps
+        - max_age: oldest timestamp to consider (now_timestamp - 2_592_000)
+        - tip_index: index of previously fetched reports, updated in place
+
+        Return: a list of QueryIdandFeedDetails
+        """
+        full_sync = tip_index.needs_full_sync(now_timestamp)
+        unique_ids = {feed.query_id for feed in feeds}
+
+        calls = []
+        for qid in unique_ids:
+            since = max_age if full_sync else max(max_age, tip_index.synced_to(qid))
+            calls.append(
+                self.get_multiple_values_before(
+                    query_id=qid, now_timestamp=now_timestamp, max_age=now_timestamp - since, max_count=max_count
+                )
+            )
+        if not len(calls):
+            return None, error_status("Unable to assemble getMultipleValues Call object")
+
+        multiple_values_response, status = await self.multi_call(calls)
+
+        if not status.ok:
+            return None, status
+
+        if not multiple_values_response:
+            return None, error_status("No response returned from getMultipleValuesBefore batch multicall")
+
+        for qid in unique_ids:
+            values = multiple_values_response.get(("values_array", qid))
+            timestamps = multiple_values_response.get(("timestamps_array", qid))
+            # None means failed response and can't calculate tip accurately
+            if values is None or timestamps is None:
+                return None, error_status("getMultipleValuesBefore call failed")
+            # getMultipleValuesBefore only returns values reported strictly before now_timestamp
+            tip_index.update_reports(qid, values, timestamps, synced_to=now_timestamp - 1, full=full_sync)
+
+        if full_sync:
+            tip_index.last_full_sync = now_timestamp
+
+        for feed in feeds:
+            reports = tip_index.reports(feed.query_id, min_timestamp=max(max_age, feed.params.startTime - 1))
+            latest = tip_index.latest_report(feed.query_id)
+            feed.current_value_timestamp = reports[-1].timestamp if reports else 0
+            feed.current_queryid_value = latest.value if latest else b""
+            feed.queryid_timestamps_values_list = reports
+
+        return feeds, status
+
+    async def indexed_rewards_claimed_status(
+        self, feeds: list[QueryIdandFeedDetails], tip_index: TipIndex
+    ) -> tuple[Optional[dict[tuple[bytes, bytes], int]], ResponseStatus]:
+        """Like rewards_claimed_status_call, but only checks timestamps whose
+        tips aren't already known to be claimed
+
+        Args:
+        - feeds: list QueryIdandFeedDetails
+        - tip_index: index of known claimed timestamps, updated in place
+
+        Return: dict with count of unclaimed timestamps
+        """
+        calls = []
+        unclaimed_count: dict[tuple[bytes, bytes], int] = {}
+        pending: dict[tuple[bytes, bytes], list[int]] = {}
+        for feed in feeds:
+            if not feed.queryid_timestamps_values_list:
+                continue
+            key = (feed.feed_id, feed.query_id)
+            timestamps_lis = [values.timestamp for values in feed.queryid_timestamps_values_list]
+            unknown = tip_index.unknown_claim_status(feed.feed_id, feed.query_id, timestamps_lis)
+            unclaimed_count[key] = 0
+            if unknown:
+                pending[key] = unknown
+                calls.append(self.get_reward_claimed_status(feed.feed_id, feed.query_id, unknown))
+
+        if not unclaimed_count:
+            return None, error_status("No getRewardClaimStatusList Calls to assemble")
+
+        if not calls:
+            return unclaimed_count, ResponseStatus()
+
+        reward_claimed_status_resp, status = await self.multi_call(calls, success=True)
+
+        if not status.ok:
+            return None, status
+
+        if not reward_claimed_status_resp:
+            return None, error_status("No response returned from getRewardClaimStatusList batch multicall")
+
+        for key, timestamps_lis in pending.items():
+            claim_statuses = reward_claimed_status_resp.get(key)
+            if claim_statuses is None:
+                continue
+            tip_index.update_claim_status(key[0], key[1], timestamps_lis, claim_statuses)
+            unclaimed_count[key] = handler_func(claim_statuses)
+
+        return unclaimed_count, status
+
     async def currentfeeds_multiple_values_before(
         self, datafeed: DataFeed[Any], month_old_timestamp: int, now_timestamp: int
     ) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
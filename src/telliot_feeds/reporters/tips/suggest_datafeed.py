@@ -6,8 +6,11 @@ from telliot_core.tellor.tellorflex.autopay import TellorFlexAutopayContract
 from telliot_core.utils.timestamp import TimeStamp
 
 from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.reporters.scheduler import ReportScheduler
+from telliot_feeds.reporters.tips.listener.autopay_events import AutopayEvents
 from telliot_feeds.reporters.tips.listener.funded_feeds import FundedFeeds
 from telliot_feeds.reporters.tips.listener.one_time_tips import get_funded_one_time_tips
+from telliot_feeds.reporters.tips.listener.tip_index import TipIndex
 from telliot_feeds.reporters.tips.listener.utils import get_sorted_tips
 from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
 from telliot_feeds.utils.log import get_logger
@@ -22,13 +25,21 @@ logger = get_logger(__name__)
 # suggest a feed here not a query tag, because build feed portion
 # or check both mappings for type
 async def get_feed_and_tip(
-    autopay: TellorFlexAutopayContract, skip_manual_feeds: bool, current_timestamp: Optional[TimeStamp] = None
+    autopay: TellorFlexAutopayContract,
+    skip_manual_feeds: bool,
+    current_timestamp: Optional[TimeStamp] = None,
+    tip_index: Optional[TipIndex] = None,
+    scheduler: Optional[ReportScheduler] = None,
+    autopay_events: Optional[AutopayEvents] = None,
 ) -> Optional[Tuple[Optional[DataFeed[Any]], Optional[int]]]:
     """Fetch feeds with their tip and filter to get a feed suggestion with the max tip
 
     Args:
     - autopay contract object
     - current_timestamp
+    - tip_index: index of previously fetched reports and claim status (optional)
+    - scheduler: reporter scheduler to wake up when funded feeds' windows open (optional)
+    - autopay_events: funded feeds and tips kept up to date from events, instead of read (optional)
 
     Returns:
     - tuple of feed and tip amount
@@ -38,10 +49,14 @@ async def get_feed_and_tip(
 
     multi_call = MulticallAutopay()
 
-    funded_feeds = FundedFeeds(autopay=autopay, multi_call=multi_call)
+    funded_feeds = FundedFeeds(
+        autopay=autopay, multi_call=multi_call, tip_index=tip_index, autopay_events=autopay_events
+    )
 
     feed_tips = await funded_feeds.querydata_and_tip(current_time=current_timestamp)
-    onetime_tips = await get_funded_one_time_tips(autopay=autopay)
+    onetime_tips = await get_funded_one_time_tips(autopay=autopay, autopay_events=autopay_events)
+    if scheduler is not None:
+        scheduler.set_feed_windows(feed.params for feed in funded_feeds.funded_feed_details)
 
     if not feed_tips and not onetime_tips:
         logger.info("No tips available in autopay")
@@ -0,0 +1,219 @@
+"""Non-blocking transaction submission with background receipt tracking
+
+Transactions are sent without waiting for them to be mined. A background task
+polls for each sent transaction's receipt, so the reporter can keep preparing
+its next report (or settling DIVA pools) while confirmations are pending.
+
+Nonces are counted locally while transactions are pending, since a node may not
+include a just-sent transaction in the account's transaction count yet.
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+from typing import Dict
+from typing import Optional
+
+from hexbytes import HexBytes
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from web3.types import TxReceipt
+
+from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import report_step_errors
+from telliot_feeds.utils.metrics import report_step_seconds
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PendingTransaction:
+    """A sent transaction and the outcome of tracking its receipt
+
+    - tx_hash: transaction hash
+    - nonce: account nonce used by the transaction, if known
+    - context: data needed to handle the receipt (e.g. the reported pool)
+    - receipt: transaction receipt, None until confirmed or if confirmation timed out
+    - status: outcome of handling the receipt, None until the transaction is confirmed or timed out
+    """
+
+    tx_hash: HexBytes
+    nonce: Optional[int] = None
+    context: Dict[str, Any] = field(default_factory=dict)
+    sent_at: float = field(default_factory=time.time)
+    receipt: Optional[TxReceipt] = None
+    status: Optional[ResponseStatus] = None
+    task: Optional["asyncio.Task[Optional[TxReceipt]]"] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status is not None
+
+    async def wait(self) -> Optional[TxReceipt]:
+        """Wait for the transaction to be confirmed (or confirmation to time out)"""
+        if self.task is not None:
+            await asyncio.shield(self.task)
+        return self.receipt
+
+
+#: Called once a transaction is confirmed or confirmation failed (receipt is None, status
+#: holds the error), returns the outcome of the transaction
+ReceiptHandler = Callable[[PendingTransaction], ResponseStatus]
+
+
+class TransactionManager:
+    """Send an account's transactions and track their receipts in the background"""
+
+    def __init__(
+        self,
+        web3: Web3,
+        address: str,
+        timeout: float = 360,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """
+        Args:
+        - web3: connection the transactions are sent with
+        - address: address of the account sending the transactions
+        - timeout: number of seconds to wait for a transaction receipt
+        - poll_interval: number of seconds between receipt requests
+        """
+        self.web3 = web3
+        self.address = address
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.pending: Dict[HexBytes, PendingTransaction] = {}
+        self._nonce: Optional[int] = None
+        # nonces are read from transaction building code running in worker threads
+        self._nonce_lock = threading.Lock()
+
+    def next_nonce(self) -> int:
+        """Nonce for the account's next transaction
+
+        Read from the chain when no transactions are pending (picks up transactions
+        sent by other means, e.g. staking), otherwise counted locally.
+        """
+        with self._nonce_lock:
+            if self._nonce is None or not self.pending:
+                self._nonce = self.web3.eth.get_transaction_count(self.address, "pending")
+            return self._nonce
+
+    def reset_nonce(self) -> None:
+        """Read the nonce from the chain for the next transaction"""
+        with self._nonce_lock:
+            self._nonce = None
+
+    async def send_raw_transaction(
+        self,
+        raw_transaction: bytes,
+        nonce: Optional[int] = None,
+        on_receipt: Optional[ReceiptHandler] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> PendingTransaction:
+        """Send a signed transaction and track its receipt in the background
+
+        Raises the node's error if the transaction is rejected.
+        """
+        try:
+            with report_step_seconds.time(step="send"):
+                tx_hash = await asyncio.to_thread(self.web3.eth.send_raw_transaction, raw_transaction)
+        except Exception:
+            report_step_errors.inc(step="send")
+            # e.g. nonce too low after the account sent a transaction elsewhere
+            self.reset_nonce()
+            raise
+
+        if nonce is not None:
+            with self._nonce_lock:
+                self._nonce = max(self._nonce or 0, nonce + 1)
+        return self.track(tx_hash, nonce=nonce, on_receipt=on_receipt, context=context)
+
+    def track(
+        self,
+        tx_hash: bytes,
+        nonce: Optional[int] = None,
+        on_receipt: Optional[ReceiptHandler] = None,
+        context: Optional[Dict[str, Any]] = None,
+        wait_for: Optional[Coroutine[Any, Any, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> PendingTransaction:
+        """Track a sent transaction's receipt in the background
+
+        Args:
+        - tx_hash: hash of the sent transaction
+        - nonce: account nonce used by the transaction, if known
+        - on_receipt: handler called once the transaction is confirmed or confirmation timed out
+        - context: data passed on to the receipt handler
+        - wait_for: awaited before requesting the receipt (e.g. until a bundle's target block is reached)
+        - timeout: number of seconds to wait for the receipt, defaults to the manager's timeout
+
+        Must be called from within a coroutine.
+        """
+        pending = PendingTransaction(tx_hash=HexBytes(tx_hash), nonce=nonce, context=context or {})
+        self.pending[pending.tx_hash] = pending
+        pending.task = asyncio.create_task(self._confirm(pending, on_receipt, wait_for, timeout))
+        return pending
+
+    async def wait_for_receipt(self, tx_hash: bytes, timeout: Optional[float] = None) -> Optional[TxReceipt]:
+        """Poll for a transaction receipt without blocking the event loop
+
+        Returns None if the transaction isn't mined before the timeout.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            try:
+                return await asyncio.to_thread(self.web3.eth.get_transaction_receipt, HexBytes(tx_hash))
+            except TransactionNotFound:
+                pass
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(self.poll_interval)
+
+    async def _confirm(
+        self,
+        pending: PendingTransaction,
+        on_receipt: Optional[ReceiptHandler],
+        wait_for: Optional[Coroutine[Any, Any, Any]],
+        timeout: Optional[float],
+    ) -> Optional[TxReceipt]:
+        start = time.perf_counter()
+        try:
+            if wait_for is not None:
+                await wait_for
+            pending.receipt = await self.wait_for_receipt(pending.tx_hash, timeout)
+            report_step_seconds.observe(time.perf_counter() - start, step="confirm")
+            if pending.receipt is None:
+                status = error_status(f"Transaction {pending.tx_hash.hex()} not confirmed in time", log=logger.warning)
+            else:
+                status = ResponseStatus()
+        except Exception as e:
+            status = error_status("Failed to confirm transaction", e=e, log=logger.error)
+        finally:
+            self.pending.pop(pending.tx_hash, None)
+
+        if pending.receipt is None:
+            report_step_errors.inc(step="confirm")
+            # the transaction may have been dropped, so its nonce may be reused
+            self.reset_nonce()
+        pending.status = status
+        if on_receipt is not None:
+            try:
+                pending.status = on_receipt(pending)
+            except Exception as e:
+                pending.status = error_status("Error handling transaction receipt", e=e, log=logger.error)
+        return pending.receipt
+
+    async def wait_all(self) -> None:
+        """Wait until all pending transactions are confirmed or timed out"""
+        while self.pending:
+            tasks = [p.task for p in list(self.pending.values()) if p.task is not None]
+            if not tasks:
+                break
+            await asyncio.gather(*tasks, return_exceptions=True)
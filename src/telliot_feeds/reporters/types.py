@@ -30,6 +30,29 @@ class StakerInfo:
     in_total_stakers: bool
 
 
+@dataclass
+class ReporterState:
+    """On-chain state read by a reporter every loop, fetched in one multicall
+
+    Fields are None if the corresponding call failed.
+    - stake_amount: oracle's current stake amount
+    - staker_info: reporter's staker info
+    - time_of_last_distribution: time time-based rewards were last distributed
+    - time_based_reward: time-based reward dispersed every five minutes
+    - query_id: query the report count was read for, if any
+    - report_count: number of reports for query_id
+    - native_balance: reporter's native token balance (e.g. ETH on Ethereum mainnet)
+    """
+
+    stake_amount: Optional[int] = None
+    staker_info: Optional[StakerInfo] = None
+    time_of_last_distribution: Optional[int] = None
+    time_based_reward: Optional[int] = None
+    query_id: Optional[bytes] = None
+    report_count: Optional[int] = None
+    native_balance: Optional[int] = None
+
+
 class GasParams(TypedDict):
     maxPriorityFeePerGas: Optional[Wei]
     maxFeePerGas: Optional[Wei]
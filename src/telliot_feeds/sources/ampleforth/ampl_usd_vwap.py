@@ -11,6 +11,7 @@ from typing import Sequence
 from typing import Tuple
 from typing import TypeVar
 
+import aiohttp
 import requests
 from telliot_core.apps.telliot_config import TelliotConfig
 from telliot_core.utils.response import ResponseStatus
@@ -18,6 +19,7 @@ from telliot_core.utils.response import ResponseStatus
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_service import get_client_session
 from telliot_feeds.sources.ampleforth.bitfinex import get_value_from_bitfinex
 from telliot_feeds.sources.ampleforth.symbols import SYMBOLS
 from telliot_feeds.utils.log import get_logger
@@ -48,28 +50,24 @@ async def get_float_from_api(
 ) -> OptionalDataPoint[float]:
     """Helper function for retrieving datapoint values."""
 
-    with requests.Session() as s:
-        try:
-            r = None
-            if headers:
-                r = s.get(url, headers=headers)
-            else:
-                r = s.get(url)
-            data = r.json()
+    session = get_client_session()
+    try:
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as r:
+            data = await r.json(content_type=None)
 
-            for param in params:
-                data = data[param]
+        for param in params:
+            data = data[param]
 
-            timestamp = datetime_now_utc()
-            datapoint = (data, timestamp)
+        timestamp = datetime_now_utc()
+        datapoint = (data, timestamp)
 
-            return datapoint
+        return datapoint
 
-        except requests.exceptions.ConnectTimeout:
-            return (None, None)
+    except asyncio.TimeoutError:
+        return (None, None)
 
-        except Exception:
-            return (None, None)
+    except Exception:
+        return (None, None)
 
 
 @dataclass
@@ -3,9 +3,14 @@ import asyncio
 import logging
 from typing import Any
 
-import requests
+import aiohttp
 
+from telliot_feeds.pricing.price_service import get_client_session
 from telliot_feeds.sources.ampleforth.symbols import SYMBOLS
+from telliot_feeds.sources.ampleforth.vwap import bucket_trades
+from telliot_feeds.sources.ampleforth.vwap import cross_vwap
+from telliot_feeds.sources.ampleforth.vwap import TradeArray
+from telliot_feeds.sources.ampleforth.vwap import trades_vwap
 
 # import time
 
@@ -17,91 +22,71 @@ THOUSAND_MIN = 1000 * 60  # original JS names this variable "TEN_MINUTES"
 NO_TRADES_FOUND = "No trades found"
 
 
-def build_buckets(start: int, a_list: list[list[int]], bucket_size: int = THOUSAND_MIN) -> dict[int, dict[str, Any]]:
-    """Build buckets for VWAP calculation."""
-    vwap_per_slot: dict[int, dict[str, Any]] = {}
-    for i in a_list:
-        slot = (i[1] - start) // bucket_size
-        amount = i[2]
-        price = i[3]
-
-        vwap_bucket = vwap_per_slot.get(slot)
-        if vwap_bucket:
-            vwap_bucket["trades"] += abs(amount * price)
-            vwap_bucket["volume"] += abs(amount)
-        else:
-            vwap_bucket = {"timestamp": i[1], "trades": abs(amount * price), "volume": abs(amount)}
-            vwap_per_slot[slot] = vwap_bucket
-
-    for vwap_bucket in vwap_per_slot.values():
-        if vwap_bucket["trades"] == 0 or vwap_bucket["volume"] == 0:
-            vwap_bucket["vwap"] = 0
-        else:
-            vwap_bucket["vwap"] = vwap_bucket["trades"] / vwap_bucket["volume"]
-
-    return vwap_per_slot
-
-
-def merge_as_list(from_map: dict[int, dict[str, Any]], to_map: dict[int, dict[str, Any]]) -> list[dict[str, Any]]:
-    """Merge two maps into a list of trades."""
-    merged: list[dict[str, Any]] = []
-    for slot, from_slot in from_map.items():
-        s = slot
-        to_slot = None
-        while not to_slot:
-            if s < 0:
-                break
-            to_slot = to_map.get(s)
-            s = s - 1
-        if to_slot:
-            merged.append(
-                {
-                    "trades": abs((to_slot["vwap"] * from_slot["vwap"]) * from_slot["volume"]),
-                    "volume": from_slot["volume"],
-                }
-            )
-    return merged
-
-
-def volume_weighted_average_price(start: int, from_list: list[list[int]], to_list: list[list[int]]) -> dict[str, Any]:
+#: Maximum number of trades per Bitfinex request
+PAGE_SIZE = 10000
+
+
+def build_buckets(start: int, trades: TradeArray, bucket_size: int = THOUSAND_MIN) -> dict[int, dict[str, Any]]:
+    """Build buckets for VWAP calculation (used for debug output)."""
+    buckets = bucket_trades(trades, start, bucket_size)
+    return {
+        int(slot): {"timestamp": int(timestamp), "trades": float(value), "volume": float(volume), "vwap": float(vwap)}
+        for slot, timestamp, value, volume, vwap in zip(
+            buckets.slots, buckets.timestamps, buckets.trades, buckets.volume, buckets.vwap
+        )
+    }
+
+
+def volume_weighted_average_price(start: int, from_trades: TradeArray, to_trades: TradeArray) -> dict[str, Any]:
     """Calculate volume weighted average price."""
-    from_map = build_buckets(start, from_list)
-    to_map = build_buckets(start, to_list)
-    merged_list = merge_as_list(from_map, to_map)
-    sum_amount_and_prices = sum([m["trades"] for m in merged_list])
-    sum_volume = sum([m["volume"] for m in merged_list])
-    return {"vwap": sum_amount_and_prices / sum_volume, "volume": sum_volume}
+    vwap, volume = cross_vwap(
+        bucket_trades(from_trades, start, THOUSAND_MIN), bucket_trades(to_trades, start, THOUSAND_MIN)
+    )
+    return {"vwap": vwap, "volume": volume}
 
 
-def retrieve_bitfinex_trades(route: str, start: int, end: int) -> Any:
-    """Retrieve trades from Bitfinex API."""
+async def retrieve_bitfinex_trades(route: str, start: int, end: int) -> TradeArray:
+    """Retrieve trades from Bitfinex API, page by page, into a trade array."""
     # rate-limit: 30 req/min
-    url = f"https://api-pub.bitfinex.com/v2/trades/{route}/hist?limit=10000&sort=1&start={start}&end={end}"
-    try:
-        response = requests.get(url)
-    except Exception as e:
-        logger.error(f"Error when retrieving Bitfinex trades for {route}:", e)
-        return []
-
-    # convert response
-    all_trades = response.json()
-    if not all_trades:
-        logger.warning(f"Could not get Bitfinex trades for {route}")
-        return []
-
-    if len(all_trades) >= 10000:
+    url = f"https://api-pub.bitfinex.com/v2/trades/{route}/hist"
+    session = get_client_session()
+    trades = TradeArray()
+    # ids of the last page's trades at its last timestamp, fetched again with the next page
+    boundary_ids: set[int] = set()
+    while True:
+        params = {"limit": PAGE_SIZE, "sort": 1, "start": start, "end": end}
+        try:
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                page = await response.json()
+        except Exception as e:
+            logger.error(f"Error when retrieving Bitfinex trades for {route}: {e}")
+            break
+
+        if not page or not isinstance(page[0], list):
+            # no trades, or an error response, e.g. ["error", 10020, "limit: invalid"]
+            if not trades:
+                logger.warning(f"Could not get Bitfinex trades for {route}: {page}")
+            break
+
+        new_trades = [trade for trade in page if trade[0] not in boundary_ids]
+        trades.append(new_trades)
+
+        if len(page) < PAGE_SIZE or not new_trades:
+            break
         logger.warning(f"Bitfinex response too big, scrolling: {route} ({start} - {end})")
-        last_timestamp = all_trades[-1][1]
-        next_frame = retrieve_bitfinex_trades(route, last_timestamp, end)
-        all_trades.extend(next_frame)
-    logger.info(f"Bitfinex trades for {route}: {len(all_trades)}")
-    return all_trades
+        start = page[-1][1]
+        boundary_ids = {trade[0] for trade in page if trade[1] == start}
+
+    logger.info(f"Bitfinex trades for {route}: {len(trades)}")
+    return trades
 
 
-def calculate_all_single_via(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
+async def calculate_all_single_via(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Calculate VWAP for a single symbol via all exchanges."""
-    from_list = retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][0]]["bitFinexSymbol"], start, end)
-    to_list = retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][1]]["bitFinexSymbol"], start, end)
+    from_list, to_list = await asyncio.gather(
+        retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][0]]["bitFinexSymbol"], start, end),
+        retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][1]]["bitFinexSymbol"], start, end),
+    )
     result = {}
 
     if from_list and to_list:
@@ -121,21 +106,21 @@ def calculate_all_single_via(symbol: dict[str, Any], start: int, end: int, show_
     return result
 
 
-def calculate_vwap_direct(symbol_route: dict[str, Any], start: int, end: int) -> dict[str, Any]:
+async def calculate_vwap_direct(symbol_route: dict[str, Any], start: int, end: int) -> dict[str, Any]:
     """Calculate VWAP for a single symbol directly."""
-    response = retrieve_bitfinex_trades(symbol_route["bitFinexSymbol"], start, end)
-    if len(response) == 0:
+    trades = await retrieve_bitfinex_trades(symbol_route["bitFinexSymbol"], start, end)
+    if len(trades) == 0:
         raise Exception(f'No trades found for {symbol_route["bitFinexSymbol"]}')
-    sum_amount_and_prices = sum([abs(trade[2] * trade[3]) for trade in response])
-    sum_volume = sum([abs(trade[2]) for trade in response])
-    return {"vwap": sum_amount_and_prices / sum_volume, "volume": sum_volume}
+    vwap, volume = trades_vwap(trades)
+    return {"vwap": vwap, "volume": volume}
 
 
-def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
+async def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Calculate VWAP for a single symbol via all symbols."""
-    p_result = [calculate_vwap_direct(SYMBOLS[symbol["direct"]], start, end)]
-    for h in symbol["viaHops"]:
-        p_result.append(calculate_all_single_via(SYMBOLS[h], start, end, show_debug))
+    p_result: list[dict[str, Any]] = await asyncio.gather(
+        calculate_vwap_direct(SYMBOLS[symbol["direct"]], start, end),
+        *[calculate_all_single_via(SYMBOLS[h], start, end, show_debug) for h in symbol["viaHops"]],
+    )
     result = {"bitFinexVwapDirect": p_result[0]}
 
     if show_debug:
@@ -160,7 +145,7 @@ def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_de
 
 async def get_value_from_bitfinex(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Get VWAP for any symbol or group of symbols in SYMBOLS."""
-    result = calculate_vwap_via_all(symbol, start, end, show_debug)
+    result = await calculate_vwap_via_all(symbol, start, end, show_debug)
     return result
 
 
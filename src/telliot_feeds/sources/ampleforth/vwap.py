@@ -0,0 +1,139 @@
+"""Volume weighted average prices over arrays of trades
+
+Trades are kept in NumPy arrays (timestamp, amount, price) that pages of trades
+are appended to as they're received, so a day of trades is a few MB however many
+pages it's fetched in. Per bucket sums and VWAPs are computed with vectorized
+reductions instead of per trade Python loops.
+"""
+from dataclasses import dataclass
+from typing import Any
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+#: Initial number of trades a TradeArray has room for
+DEFAULT_CAPACITY = 10_000
+
+
+class TradeArray:
+    """Trades stored column-wise in preallocated arrays, grown as pages of trades are appended"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.size = 0
+        self._timestamps: npt.NDArray[np.int64] = np.empty(capacity, dtype=np.int64)
+        self._amounts: npt.NDArray[np.float64] = np.empty(capacity, dtype=np.float64)
+        self._prices: npt.NDArray[np.float64] = np.empty(capacity, dtype=np.float64)
+
+    @classmethod
+    def from_trades(cls, trades: Sequence[Sequence[Any]]) -> "TradeArray":
+        """Create from Bitfinex trades, i.e. [id, timestamp, amount, price] lists"""
+        array = cls(capacity=max(len(trades), 1))
+        array.append(trades)
+        return array
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def timestamps(self) -> npt.NDArray[np.int64]:
+        return self._timestamps[: self.size]
+
+    @property
+    def amounts(self) -> npt.NDArray[np.float64]:
+        return self._amounts[: self.size]
+
+    @property
+    def prices(self) -> npt.NDArray[np.float64]:
+        return self._prices[: self.size]
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._timestamps)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_timestamps", "_amounts", "_prices"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def append(self, trades: Sequence[Sequence[Any]]) -> None:
+        """Append a page of Bitfinex trades, i.e. [id, timestamp, amount, price] lists"""
+        if len(trades) == 0:
+            return
+        page = np.asarray(trades, dtype=np.float64)
+        start, end = self.size, self.size + len(page)
+        self._reserve(end)
+        self._timestamps[start:end] = page[:, 1]
+        self._amounts[start:end] = page[:, 2]
+        self._prices[start:end] = page[:, 3]
+        self.size = end
+
+
+@dataclass
+class Buckets:
+    """Trades summed per time bucket, ordered by bucket
+
+    - slots: bucket numbers, counted from the start time
+    - timestamps: timestamp of each bucket's first trade
+    - trades: sum of each bucket's absolute trade values (amount * price)
+    - volume: sum of each bucket's absolute trade amounts
+    - vwap: volume weighted average price of each bucket, 0 if the bucket has no volume
+    """
+
+    slots: npt.NDArray[np.int64]
+    timestamps: npt.NDArray[np.int64]
+    trades: npt.NDArray[np.float64]
+    volume: npt.NDArray[np.float64]
+    vwap: npt.NDArray[np.float64]
+
+
+def bucket_trades(trades: TradeArray, start: int, bucket_size: int) -> Buckets:
+    """Sum trades per bucket of bucket_size milliseconds from start"""
+    slot_of_trade = (trades.timestamps - start) // bucket_size
+    slots, first_trade, bucket_of_trade = np.unique(slot_of_trade, return_index=True, return_inverse=True)
+    # weighted bincounts are float64
+    value = np.asarray(
+        np.bincount(bucket_of_trade, weights=np.abs(trades.amounts * trades.prices), minlength=len(slots)),
+        dtype=np.float64,
+    )
+    volume = np.asarray(
+        np.bincount(bucket_of_trade, weights=np.abs(trades.amounts), minlength=len(slots)), dtype=np.float64
+    )
+    has_trades = (value != 0) & (volume != 0)
+    vwap = np.divide(value, volume, out=np.zeros_like(value), where=has_trades)
+    return Buckets(slots=slots, timestamps=trades.timestamps[first_trade], trades=value, volume=volume, vwap=vwap)
+
+
+def cross_vwap(from_buckets: Buckets, to_buckets: Buckets) -> Tuple[float, float]:
+    """VWAP of a pair traded via another asset, e.g. AMPL/USD from AMPL/BTC and BTC/USD buckets
+
+    Each from bucket is converted with the VWAP of the latest to bucket at or before it,
+    from buckets without an earlier to bucket are skipped.
+
+    Returns:
+    - (vwap, volume) volume is in the from pair's base asset
+    """
+    latest_to = np.searchsorted(to_buckets.slots, from_buckets.slots, side="right") - 1
+    matched = (latest_to >= 0) & (from_buckets.slots >= 0)
+    # trades before the start time aren't used for conversion
+    matched[matched] &= to_buckets.slots[latest_to[matched]] >= 0
+    to_vwap = to_buckets.vwap[latest_to[matched]]
+    volume = from_buckets.volume[matched]
+    value = np.abs(to_vwap * from_buckets.vwap[matched] * volume)
+    total_volume = float(volume.sum())
+    return float(value.sum()) / total_volume, total_volume
+
+
+def trades_vwap(trades: TradeArray) -> Tuple[float, float]:
+    """VWAP of all trades
+
+    Returns:
+    - (vwap, volume)
+    """
+    volume = float(np.abs(trades.amounts).sum())
+    return float(np.abs(trades.amounts * trades.prices).sum()) / volume, volume
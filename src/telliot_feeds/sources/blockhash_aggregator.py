@@ -13,12 +13,18 @@ from requests.adapters import HTTPAdapter
 from telliot_core.apps.telliot_config import TelliotConfig
 from urllib3.util import Retry
 from web3 import Web3
+from web3.types import BlockData
+from web3.types import BlockIdentifier
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.block_resolver import get_block_resolver
 from telliot_feeds.utils.input_timeout import input_timeout
 from telliot_feeds.utils.input_timeout import TimeoutOccurred
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.manual_inbox import manual_input
+from telliot_feeds.utils.rng_store import get_rng_store
+from telliot_feeds.utils.rng_store import RNGValue
 
 
 logger = get_logger(__name__)
@@ -86,8 +92,20 @@ def block_num_from_timestamp(timestamp: int) -> Optional[int]:
         return result
 
 
+def _get_block(w3: Web3, block_identifier: BlockIdentifier) -> Optional[BlockData]:
+    try:
+        return w3.eth.get_block(block_identifier)
+    except Exception as e:
+        logger.error(f"Unable to retrieve block {block_identifier!r}: {e}")
+        return None
+
+
 async def get_eth_hash(timestamp: int) -> Optional[str]:
     """Fetches next Ethereum blockhash after timestamp from API."""
+    return await asyncio.to_thread(_get_eth_hash, timestamp)
+
+
+def _get_eth_hash(timestamp: int) -> Optional[str]:
     w3 = get_mainnet_web3()
     if w3 is None:
         logger.warning("Web3 not connected")
@@ -103,7 +121,10 @@ async def get_eth_hash(timestamp: int) -> Optional[str]:
         logger.error(f"Timestamp {timestamp} is older than current block timestamp {this_block['timestamp']}")
         return None
 
-    block_num = block_num_from_timestamp(timestamp)
+    block_num = get_block_resolver(1).block_number_at(timestamp, lambda block_id: _get_block(w3, block_id))
+    if block_num is None:
+        logger.info("Unable to resolve block number from block headers, trying Etherscan API")
+        block_num = block_num_from_timestamp(timestamp)
     if block_num is None:
         logger.warning("Unable to retrieve block number from Etherscan API")
         return None
@@ -120,6 +141,10 @@ async def get_eth_hash(timestamp: int) -> Optional[str]:
 
 async def get_btc_hash(timestamp: int) -> Tuple[Optional[str], Optional[int]]:
     """Fetches next Bitcoin blockhash after timestamp from API."""
+    return await asyncio.to_thread(_get_btc_hash, timestamp)
+
+
+def _get_btc_hash(timestamp: int) -> Tuple[Optional[str], Optional[int]]:
     with requests.Session() as s:
         s.mount("https://", adapter)
         ts = timestamp + 480 * 60
@@ -161,6 +186,39 @@ async def get_btc_hash(timestamp: int) -> Tuple[Optional[str], Optional[int]]:
         return str(block["hash"]), block["time"]
 
 
+async def compute_rng_value(timestamp: int) -> Optional[RNGValue]:
+    """Compute the TellorRNG value of a timestamp from the Bitcoin and Ethereum blockhashes"""
+    btc_hash, btc_timestamp = await get_btc_hash(timestamp)
+
+    if btc_hash is None:
+        logger.warning("Unable to retrieve Bitcoin blockhash")
+        return None
+    if btc_timestamp is None:
+        logger.warning("Unable to retrieve Bitcoin timestamp")
+        return None
+    eth_hash = await get_eth_hash(btc_timestamp)
+    if eth_hash is None:
+        logger.warning("Unable to retrieve Ethereum blockhash")
+        return None
+
+    value = bytes(Web3.solidityKeccak(["string", "string"], [eth_hash, btc_hash]))
+    return RNGValue(timestamp, value, btc_hash, btc_timestamp, eth_hash)
+
+
+async def get_rng_value(timestamp: int) -> Optional[RNGValue]:
+    """Get the TellorRNG value of a timestamp from the RNG store, computing it if it isn't stored yet"""
+    store = get_rng_store()
+    async with store.lock(timestamp):
+        rng = store.get(timestamp)
+        if rng is not None:
+            logger.info(f"Using stored random number for timestamp {timestamp}")
+            return rng
+        rng = await compute_rng_value(timestamp)
+        if rng is not None:
+            store.add(rng)
+        return rng
+
+
 @dataclass
 class TellorRNGManualSource(DataSource[Any]):
     """DataSource for TellorRNG manually-entered timestamp."""
@@ -218,27 +276,18 @@ class TellorRNGManualSource(DataSource[Any]):
         """
         if not self.is_valid_timestamp(self.timestamp):
             try:
-                timestamp = self.parse_user_val()
+                timestamp = await manual_input(self.parse_user_val)
             except TimeoutOccurred:
                 logger.info("Timeout occurred while waiting for user input")
                 return None, None
         else:
             timestamp = self.timestamp
 
-        btc_hash, btc_timestamp = await get_btc_hash(timestamp)
-
-        if btc_hash is None:
-            logger.warning("Unable to retrieve Bitcoin blockhash")
-            return None, None
-        if btc_timestamp is None:
-            logger.warning("Unable to retrieve Bitcoin timestamp")
-            return None, None
-        eth_hash = await get_eth_hash(btc_timestamp)
-        if eth_hash is None:
-            logger.warning("Unable to retrieve Ethereum blockhash")
+        rng = await get_rng_value(timestamp)
+        if rng is None:
             return None, None
 
-        data = Web3.solidityKeccak(["string", "string"], [eth_hash, btc_hash])
+        data = rng.value
         dt = datetime.fromtimestamp(self.timestamp, tz=timezone.utc)
         datapoint = (data, dt)
 
@@ -1,14 +1,18 @@
-import asyncio
-import statistics
 from dataclasses import dataclass
 from dataclasses import field
-from typing import Callable
 from typing import List
 from typing import Literal
+from typing import Optional
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.aggregation import Aggregation
+from telliot_feeds.pricing.aggregation import OutlierFilter
+from telliot_feeds.pricing.aggregation import source_prices
+from telliot_feeds.pricing.gather import default_gather_settings
+from telliot_feeds.pricing.gather import gather_prices
+from telliot_feeds.pricing.gather import GatherSettings
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
 
@@ -31,20 +35,50 @@ class CustomPriceAggregator(DataSource[float]):
     # unit
     unit: str = ""
 
-    #: Callable algorithm that accepts an iterable of floats
+    #: Aggregation algorithm, weighted by source weights, staleness and deviation history if set
     algorithm: Literal["median", "mean"] = "median"
 
-    #: Private storage for actual algorithm function
-    _algorithm: Callable[..., float] = field(default=statistics.median, init=False, repr=False)
-
     #: Data feed sources
     sources: List[PriceSource] = field(default_factory=list)
 
+    #: Return once this many sources answered, defaults to `default_gather_settings` (all sources)
+    quorum: Optional[int] = None
+
+    #: Seconds to wait for sources, defaults to `default_gather_settings` (no deadline)
+    deadline: Optional[float] = None
+
+    #: Hedge requests taking this many times a source's typical latency,
+    #: defaults to `default_gather_settings` (no hedged requests)
+    hedge_factor: Optional[float] = None
+
+    #: Reject outlier prices before aggregating, "mad" or "iqr" (see `Aggregation`), None keeps all prices
+    outlier_filter: Optional[OutlierFilter] = None
+
+    #: Number of MADs or IQRs a price may be away from the others, defaults per outlier filter
+    outlier_threshold: Optional[float] = None
+
+    #: Seconds after which a price's weight is halved, None ignores price timestamps
+    staleness_half_life: Optional[float] = None
+
+    #: Seconds after which prices are left out, None keeps prices of any age
+    max_age: Optional[float] = None
+
+    #: Weight sources down by how much they deviated from the aggregate before
+    penalize_deviation: bool = False
+
     def __post_init__(self) -> None:
-        if self.algorithm == "median":
-            self._algorithm = statistics.median
-        elif self.algorithm == "mean":
-            self._algorithm = statistics.mean
+        # validate the aggregation settings
+        self.aggregation()
+
+    def aggregation(self) -> Aggregation:
+        return Aggregation(
+            algorithm=self.algorithm,
+            outlier_filter=self.outlier_filter,
+            outlier_threshold=self.outlier_threshold,
+            staleness_half_life=self.staleness_half_life,
+            max_age=self.max_age,
+            penalize_deviation=self.penalize_deviation,
+        )
 
     def __str__(self) -> str:
         """Human-readable representation."""
@@ -56,19 +90,21 @@ class CustomPriceAggregator(DataSource[float]):
     async def update_sources(self) -> List[OptionalDataPoint[float]]:
         """Update data feed sources
 
+        Waits for all sources unless a quorum or deadline is set, see `gather_prices`.
+
         Returns:
-            Dictionary of updated source values, mapping data source UID
-            to the time-stamped answer for that data source
+            Time-stamped answers of the sources, in the order of `sources`
         """
 
-        async def gather_inputs() -> List[OptionalDataPoint[float]]:
-            sources = self.sources
-            datapoints = await asyncio.gather(*[source.fetch_new_datapoint() for source in sources])
-            return datapoints
+        return await gather_prices(self.sources, self.gather_settings())
 
-        inputs = await gather_inputs()
-
-        return inputs
+    def gather_settings(self) -> GatherSettings:
+        """Quorum, deadline and hedging of source requests, where unset taken from `default_gather_settings`"""
+        return GatherSettings(
+            quorum=self.quorum if self.quorum is not None else default_gather_settings.quorum,
+            deadline=self.deadline if self.deadline is not None else default_gather_settings.deadline,
+            hedge_factor=self.hedge_factor if self.hedge_factor is not None else default_gather_settings.hedge_factor,
+        )
 
     async def fetch_new_datapoint(self) -> OptionalDataPoint[float]:
         """Update current value with time-stamped value fetched from source
@@ -82,20 +118,17 @@ class CustomPriceAggregator(DataSource[float]):
         """
         datapoints = await self.update_sources()
 
-        prices = []
-        for datapoint in datapoints:
-            v, _ = datapoint  # Ignore input timestamps
-            # Check for valid answers
-            if v is not None and isinstance(v, float):
-                prices.append(v)
-
+        prices, timestamps, weights, keys = source_prices(self.sources, datapoints)
         if not prices:
             logger.warning(f"No prices retrieved for {self}.")
             return None, None
 
         # Run the algorithm on all valid prices
         logger.info(f"Running {self.algorithm} on {prices}")
-        result = self._algorithm(prices)
+        result = self.aggregation().aggregate(prices, timestamps=timestamps, weights=weights, keys=keys)
+        if result is None:
+            logger.warning(f"No prices left to aggregate for {self}.")
+            return None, None
         datapoint = (result, datetime_now_utc())
         self.store_datapoint(datapoint)
 
@@ -7,13 +7,13 @@ from requests.adapters import HTTPAdapter
 from telliot_core.apps.telliot_config import TelliotConfig
 from urllib3.util import Retry
 from web3 import Web3
-from web3.exceptions import ExtraDataLengthError
-from web3.middleware import geth_poa_middleware
-from web3.types import BlockData
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.block_resolver import get_block_resolver
+from telliot_feeds.utils.chain_client import block_param
+from telliot_feeds.utils.chain_client import get_chain_client
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.source_utils import update_web3
 
@@ -38,37 +38,19 @@ class EVMBalanceSource(DataSource[Any]):
     cfg: TelliotConfig = TelliotConfig()
     web3: Optional[Web3] = None
 
-    def get_block(self, w3: Web3, block_number: int, full_transaction: bool = False) -> Optional[BlockData]:
-        """Get block info with error handling for POA chains"""
-        try:
-            block = w3.eth.get_block(block_number, full_transaction)
-        except ExtraDataLengthError as e:
-            logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {e}")
-            try:
-                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            except ValueError as e:
-                logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
-            block = w3.eth.get_block(block_number, full_transaction)
-        except Exception as e:
-            logger.error(f"Error fetching block info: {e}")
-            block = None
-        return block
-
-    def get_balance(self, w3: Web3, address: str, block_number: int) -> Optional[int]:
+    async def get_balance(self, address: str, block_number: int) -> Optional[int]:
         """Get balance of address at block number"""
+        if not self.web3:
+            raise ValueError("Web3 not instantiated")
+        if not self.chainId:
+            raise ValueError("EVM chain ID not provided")
+        client = get_chain_client(self.chainId, self.web3)
         try:
-            balance = w3.eth.get_balance(address, block_identifier=block_number)
-        except ExtraDataLengthError as e:
-            logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {e}")
-            try:
-                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            except ValueError as e:
-                logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
-            balance = w3.eth.get_balance(address, block_identifier=block_number)
+            balance: str = await client.request("eth_getBalance", [address, block_param(block_number)])
         except Exception as e:
             logger.error(f"Error fetching balance: {e}")
-            balance = None
-        return balance
+            return None
+        return int(balance, 16)
 
     async def get_response(self) -> Optional[Any]:
         """gets balance of evm address at specific timestamp using web3.py"""
@@ -93,13 +75,16 @@ class EVMBalanceSource(DataSource[Any]):
         if not self.web3:
             raise ValueError("Web3 not instantiated")
 
-        balance = self.get_balance(self.web3, self.evmAddress, block_num)
+        balance = await self.get_balance(self.evmAddress, block_num)
         if balance is None:
             return None
         return balance
 
     async def search_block_by_timestamp(self) -> Optional[int]:
-        """Binary search for the block closest to the target timestamp
+        """Search for the block closest to the target timestamp
+
+        Uses the block resolver and the chain client shared by all sources on the
+        chain, which reuse previously fetched block headers.
 
         Returns:
             The closest block number less than or equal to the target timestamp
@@ -108,38 +93,12 @@ class EVMBalanceSource(DataSource[Any]):
             raise ValueError("Web3 not instantiated")
         if not self.timestamp:
             raise ValueError("Timestamp not provided")
+        if not self.chainId:
+            raise ValueError("EVM chain ID not provided")
 
-        left_block_number = 0
-        right_block_number: int = self.web3.eth.block_number
-        mid_block_number = (left_block_number + right_block_number) // 2
-        target_timestamp = self.timestamp
-
-        while right_block_number - left_block_number > 2:
-            mid_block = self.get_block(self.web3, mid_block_number)
-            if not mid_block:
-                return None
-            mid_block_timestamp = mid_block["timestamp"]
-
-            # Check for exact match
-            if mid_block_timestamp == target_timestamp:
-                return mid_block_number
-
-            if mid_block_timestamp < target_timestamp:
-                left_block_number = mid_block_number
-            else:
-                right_block_number = mid_block_number
-            mid_block_number = (left_block_number + right_block_number) // 2
-
-        mid_block = self.get_block(self.web3, mid_block_number)
-        if not mid_block:
-            return None
-        mid_block_timestamp = mid_block["timestamp"]
-        if mid_block_timestamp <= target_timestamp:
-            return mid_block_number
-        else:
-            if left_block_number == 0:
-                return None
-            return left_block_number
+        client = get_chain_client(self.chainId, self.web3)
+        resolver = get_block_resolver(self.chainId)
+        return resolver.block_number_at(self.timestamp, client.get_block)
 
     async def fetch_new_datapoint(self) -> OptionalDataPoint[int]:
         """Fetch balance of EVM address at a given timestamp
@@ -6,13 +6,14 @@ from requests.adapters import HTTPAdapter
 from telliot_core.apps.telliot_config import TelliotConfig
 from urllib3.util import Retry
 from web3 import Web3
-from web3.exceptions import ExtraDataLengthError
-from web3.middleware import geth_poa_middleware
-from web3.types import BlockData
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.chain_client import block_param
+from telliot_feeds.utils.chain_client import get_block_call
+from telliot_feeds.utils.chain_client import get_chain_client
+from telliot_feeds.utils.chain_client import result_or_raise
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.source_utils import update_web3
 
@@ -37,40 +38,11 @@ class EVMBalanceCurrentSource(DataSource[Any]):
     cfg: TelliotConfig = TelliotConfig()
     web3: Optional[Web3] = None
 
-    def get_block(self, w3: Web3, block_number: int, full_transaction: bool = False) -> Optional[BlockData]:
-        """Get block info with error handling for POA chains"""
-        try:
-            block = w3.eth.get_block(block_number, full_transaction)
-        except ExtraDataLengthError as e:
-            logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {e}")
-            try:
-                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            except ValueError as e:
-                logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
-            block = w3.eth.get_block(block_number, full_transaction)
-        except Exception as e:
-            logger.error(f"Error fetching block info: {e}")
-            block = None
-        return block
-
-    def get_balance(self, w3: Web3, address: str, block_number: int) -> Optional[int]:
-        """Get balance of address at block number"""
-        try:
-            balance = w3.eth.get_balance(address, block_identifier=block_number)
-        except ExtraDataLengthError as e:
-            logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {e}")
-            try:
-                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            except ValueError as e:
-                logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
-            balance = w3.eth.get_balance(address, block_identifier=block_number)
-        except Exception as e:
-            logger.error(f"Error fetching balance: {e}")
-            balance = None
-        return balance
-
     async def get_response(self) -> Optional[Any]:
-        """gets balance of evm address at specific timestamp using web3.py"""
+        """gets balance of evm address and the timestamp of the block `block_delay` blocks behind the latest
+
+        The balance and the block header are requested from the node in a single batch request.
+        """
         if not self.chainId:
             raise ValueError("EVM chain ID not provided")
         if not self.evmAddress:
@@ -86,11 +58,20 @@ class EVMBalanceCurrentSource(DataSource[Any]):
         if not self.web3:
             raise ValueError("Web3 not instantiated")
 
-        balance = self.get_balance(self.web3, self.evmAddress, block_num)
-        if balance is None:
+        client = get_chain_client(self.chainId, self.web3)
+        balance_response, block_response = await client.request_batch(
+            [("eth_getBalance", [self.evmAddress, block_param(block_num)]), get_block_call(block_num)]
+        )
+        try:
+            balance = int(result_or_raise("eth_getBalance", balance_response), 16)
+        except Exception as e:
+            logger.error(f"Error fetching balance: {e}")
             return None, None
-
-        block_timestamp = await self.get_block_timestamp_by_number(block_num)
+        try:
+            block_timestamp = int(result_or_raise("eth_getBlockByNumber", block_response)["timestamp"], 16)
+        except Exception as e:
+            logger.error(f"Error fetching block info: {e}")
+            return balance, None
         return (balance, block_timestamp)
 
     async def get_current_block_num_minus_delay(self) -> Optional[int]:
@@ -105,22 +86,13 @@ class EVMBalanceCurrentSource(DataSource[Any]):
         if self.block_delay is None:
             raise ValueError("Block delay not provided")
 
-        current_block = self.web3.eth.block_number
-        return current_block - self.block_delay
-
-    async def get_block_timestamp_by_number(self, block_num: int) -> Optional[int]:
-        """Fetches the timestamp of a block from the EVM chain."""
-        if not self.web3:
-            raise ValueError("Web3 not instantiated")
-        if not self.chainId:
-            raise ValueError("Chain ID not provided")
-        if not block_num:
-            raise ValueError("Block number not provided")
-
-        block = self.get_block(self.web3, block_num)
-        if block is None:
+        client = get_chain_client(self.chainId, self.web3)
+        try:
+            current_block = int(await client.request("eth_blockNumber", []), 16)
+        except Exception as e:
+            logger.error(f"Error fetching block number: {e}")
             return None
-        return block["timestamp"]
+        return current_block - self.block_delay
 
     async def fetch_new_datapoint(self) -> OptionalDataPoint[list[int]]:
         """Fetch balance of EVM address at a given timestamp
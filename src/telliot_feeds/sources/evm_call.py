@@ -1,19 +1,26 @@
 from dataclasses import dataclass
 from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 
 from hexbytes import HexBytes
 from telliot_core.apps.telliot_config import TelliotConfig
-from web3 import middleware
 from web3 import Web3
 from web3.exceptions import ContractLogicError
-from web3.exceptions import ExtraDataLengthError
+from web3.types import BlockData
 from web3.types import BlockIdentifier
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.chain_client import block_param
+from telliot_feeds.utils.chain_client import ChainClient
+from telliot_feeds.utils.chain_client import get_block_call
+from telliot_feeds.utils.chain_client import get_chain_client
+from telliot_feeds.utils.chain_client import result_or_raise
+from telliot_feeds.utils.chain_client import RPCCall
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.source_utils import update_web3
 
@@ -40,6 +47,8 @@ class EVMCallSource(DataSource[Any]):
         - calldata with length of less than four bytes
         - contract address that returns zero length bytecode
         - function selector that isn't available in the bytecode
+
+        The block header and the call are sent to the node in a single batch request.
         """
         if not self.contractAddress:
             raise ValueError("Contract address not provided")
@@ -48,38 +57,72 @@ class EVMCallSource(DataSource[Any]):
         if not self.web3:
             raise ValueError("Web3 not provided")
 
-        empty_bytes = HexBytes(bytes(32))
+        client = self._client()
+        if client.poa is None:
+            # detect once per chain whether web3 needs the POA middleware
+            client.get_block(block_number)
+        header, calls = self._calls(client, block_number)
+        return self._parse_responses(client, header, client.batch(calls))
 
-        try:
-            self.web3.eth.get_block(block_number)
-        except ExtraDataLengthError as e:
-            logger.info(f"EVMCall to POA chain detected. Injecting POA middleware in response to exception: {e}")
+    async def get_response_batched(self, block_number: BlockIdentifier = "latest") -> Optional[Tuple[HexBytes, int]]:
+        """Same as `get_response`, but the requests are batched with those of other sources on the chain"""
+        if not self.contractAddress:
+            raise ValueError("Contract address not provided")
+        if not self.calldata:
+            raise ValueError("Calldata not provided")
+        if not self.web3:
+            raise ValueError("Web3 not provided")
 
-            try:
-                self.web3.middleware_onion.inject(middleware.geth_poa_middleware, layer=0)
-            except ValueError as e:
-                logger.warning(f"Unable to inject web3 middleware for POA chain connection: {e}")
+        client = self._client()
+        header, calls = self._calls(client, block_number)
+        return self._parse_responses(client, header, await client.request_batch(calls))
 
-        try:
-            block = self.web3.eth.get_block(block_number)
-            ts = int(block["timestamp"])
-        except Exception as e:
-            logger.warning(f"Unable to retrieve current block timestamp: {e}")
-            return None
+    def _client(self) -> ChainClient:
+        assert self.web3 is not None
+        chain_id = self.chainId if self.chainId is not None else self.web3.eth.chain_id
+        return get_chain_client(chain_id, self.web3)
 
+    def _calls(self, client: ChainClient, block_number: BlockIdentifier) -> Tuple[Optional[BlockData], List[RPCCall]]:
+        """Cached block header if any, and the requests for the header (unless cached) and the call"""
+        assert self.web3 is not None and self.contractAddress is not None and self.calldata is not None
         self.contractAddress = self.web3.toChecksumAddress(self.contractAddress)
+        calls: List[RPCCall] = []
+        header = client.cached_header(block_number) if isinstance(block_number, int) else None
+        if header is None:
+            calls.append(get_block_call(block_number))
+        # A function selector is 4 bytes long, so calldata must be at least of length 4
+        if len(self.calldata) >= 4:
+            tx = {"gasPrice": "0x0", "to": self.contractAddress, "data": HexBytes(self.calldata).hex()}
+            calls.append(("eth_call", [tx, block_param(block_number)]))
+        return header, calls
+
+    def _parse_responses(
+        self, client: ChainClient, header: Optional[BlockData], responses: List[Dict[str, Any]]
+    ) -> Optional[Tuple[HexBytes, int]]:
+        """Validate the responses to the requests of `_calls`, see `get_response`"""
+        assert self.contractAddress is not None and self.calldata is not None
+        empty_bytes = HexBytes(bytes(32))
+
+        if header is not None:
+            ts = int(header["timestamp"])
+        else:
+            block_response, *responses = responses
+            try:
+                block = result_or_raise("eth_getBlockByNumber", block_response)
+                ts = int(block["timestamp"], 16)
+            except Exception as e:
+                logger.warning(f"Unable to retrieve current block timestamp: {e}")
+                return None
 
-        if len(self.calldata) < 4:  # A function selector is 4 bytes long, so calldata must be at least of length 4
+        if len(self.calldata) < 4:
             logger.info(f"Invalid calldata: {self.calldata!r}, too short, submitting empty bytes")
             return (empty_bytes, ts)
         try:
-            result = self.web3.eth.call(
-                {"gasPrice": 0, "to": self.contractAddress, "data": self.calldata}, block_number
-            )
+            result = HexBytes(result_or_raise("eth_call", responses[0]))
         # Is there a scenario where a contract call for a view/pure function would revert when the callData is valid?
         except ContractLogicError as e:
-            bytecode = self.web3.eth.getCode(self.contractAddress)
-            if self.calldata[:4] not in bytecode:
+            bytecode = client.get_code(self.contractAddress)
+            if self.calldata[:4] not in bytes(bytecode):
                 logger.info(f"function selector: {self.calldata!r}, not found in bytecode, submitting empty bytes")
                 return (empty_bytes, ts)
             else:
@@ -88,19 +131,11 @@ class EVMCallSource(DataSource[Any]):
                 # know if there are cases where you shouldn't so consider submitting manually based on reason
                 logger.warning(f"ContractLogicError read exception for reason: {e}")
                 return None
-        except Exception as e:
-            if e.__module__.startswith("web3"):
-                logger.warning(f"Web3 exception occurred: {e}")
-                return None
-            raise e
-
-        if result is None or not isinstance(result, HexBytes):
-            raise ValueError(f"Result is not bytes: {str(result)}")
 
         if result == HexBytes("0x"):
             # A Non-contract address returns zero bytes so we check here to see
             # if thats the reason for the zero bytes result; if so submit empty bytes to oracle
-            bytecode = self.web3.eth.getCode(self.contractAddress)
+            bytecode = client.get_code(self.contractAddress)
             if len(bytecode) <= 0:  # if no code means address isn't a contractAddress
                 logger.info(f"Invalid contract address: {self.contractAddress}, no bytecode, submitting empty bytes")
                 return (empty_bytes, ts)
@@ -126,7 +161,7 @@ class EVMCallSource(DataSource[Any]):
             return None, None
 
         try:
-            val = self.get_response(block_number=block_number)
+            val = await self.get_response_batched(block_number=block_number)
             if val is None:
                 logger.warning("Call to contract failed to return a response")
                 return None, None
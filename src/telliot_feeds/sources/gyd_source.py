@@ -4,8 +4,6 @@ from dataclasses import field
 from typing import Any
 from typing import Optional
 
-import requests
-from requests import Session
 from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -94,28 +92,19 @@ class gydSpotPriceService(WebPriceService):
 
         request_url = f"{baseURL}/api/subgraphs/id/C4ayEZP2yTXRAB8vSaTrgN4m9anTe9Mdm2ViyiAuV9TV"
 
-        session = Session()
+        headers = {"Accepts": "application/json"}
         if API_KEY != "":
-            headers = {"Accepts": "application/json", "Authorization": f"Bearer {API_KEY}"}
-            session.headers.update(headers)
-        if API_KEY == "":
+            headers["Authorization"] = f"Bearer {API_KEY}"
+        else:
             logger.warning("No Graph API key found for Balancer data!")
 
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-            except requests.exceptions.ConnectTimeout:
-                logger.warning("Timeout Error, No data retrieved from Balancer subgraph")
-                return []
-
-            except Exception as e:
-                logger.warning(f"No data retrieved from Balancer subgraph {e}")
-                return []
+        data = await self.post_url(request_url, headers=headers, json_data=json_data)
 
         if "error" in data:
-            logger.error(data)
+            if data["error"] == "Timeout Error":
+                logger.warning("Timeout Error, No data retrieved from Balancer subgraph")
+            else:
+                logger.warning(f"No data retrieved from Balancer subgraph {data['exception']}")
             return []
 
         elif "response" in data:
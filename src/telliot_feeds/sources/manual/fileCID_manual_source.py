@@ -6,28 +6,30 @@ from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.utils.input_timeout import input_timeout
 from telliot_feeds.utils.input_timeout import TimeoutOccurred
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.manual_inbox import manual_input
 
 
 logger = get_logger(__name__)
 
 
 class fileCIDManualSource(DataSource[Optional[str]]):
-    async def fetch_new_datapoint(self) -> OptionalDataPoint[str]:
-
+    def parse_user_val(self) -> str:
+        """Parse file CID from user input."""
         print("enter CID:\n")
 
-        try:
-            usr_inpt = input_timeout()
-        except TimeoutOccurred:
-            logger.info("Timeout occurred while waiting for user input")
-            return None, None
+        usr_inpt: str = input_timeout()
 
         print(f"\nCID to be submitted to oracle->: {usr_inpt}")
         print("Press [ENTER] to confirm.")
+        _ = input_timeout()
+
+        return usr_inpt
+
+    async def fetch_new_datapoint(self) -> OptionalDataPoint[str]:
         try:
-            _ = input_timeout()
+            usr_inpt = await manual_input(self.parse_user_val)
         except TimeoutOccurred:
-            logger.info("Timeout occurred while waiting for user to confirm")
+            logger.info("Timeout occurred while waiting for user input")
             return None, None
 
         datapoint = (usr_inpt, datetime_now_utc())
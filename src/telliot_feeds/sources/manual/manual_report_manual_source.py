@@ -6,18 +6,23 @@ from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.utils.input_timeout import input_timeout
 from telliot_feeds.utils.input_timeout import TimeoutOccurred
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.manual_inbox import manual_input
 
 
 logger = get_logger(__name__)
 
 
 class ManualReportManualSource(DataSource[Optional[str]]):
-    async def fetch_new_datapoint(self) -> OptionalDataPoint[str]:
-
+    def parse_user_val(self) -> str:
+        """Parse value from user input."""
         print("Value:\n")
 
+        usr_inpt: str = input_timeout()
+        return usr_inpt
+
+    async def fetch_new_datapoint(self) -> OptionalDataPoint[str]:
         try:
-            usr_inpt = input_timeout()
+            usr_inpt = await manual_input(self.parse_user_val)
         except TimeoutOccurred:
             logger.info("Timeout occurred while waiting for user input")
             return None, None
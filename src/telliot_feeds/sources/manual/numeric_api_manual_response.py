@@ -6,6 +6,7 @@ from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.utils.input_timeout import input_timeout
 from telliot_feeds.utils.input_timeout import TimeoutOccurred
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.manual_inbox import manual_input
 
 
 logger = get_logger(__name__)
@@ -50,7 +51,7 @@ class NumericApiManualResponse(DataSource[float]):
             Current time-stamped value
         """
         try:
-            response = self.parse_user_val()
+            response = await manual_input(self.parse_user_val)
         except TimeoutOccurred:
             logger.info("Timeout occurred while waiting for user input")
             return None, None
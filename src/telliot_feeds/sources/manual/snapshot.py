@@ -7,6 +7,7 @@ from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.utils.input_timeout import input_timeout
 from telliot_feeds.utils.input_timeout import TimeoutOccurred
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.manual_inbox import manual_input
 
 
 logger = get_logger(__name__)
@@ -45,7 +46,7 @@ class ManualSnapshotInputSource(DataSource[float]):
             Current time-stamped value
         """
         try:
-            vote = self.parse_user_val()
+            vote = await manual_input(self.parse_user_val)
         except TimeoutOccurred:
             logger.info("Timeout occurred while waiting for user input")
             return None, None
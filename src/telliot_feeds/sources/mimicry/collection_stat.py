@@ -17,7 +17,7 @@ from urllib3.util import Retry
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
-from telliot_feeds.sources.mimicry.tami import tami
+from telliot_feeds.sources.mimicry.sales_history import SalesHistory
 from telliot_feeds.sources.mimicry.types import Transaction
 from telliot_feeds.sources.mimicry.utils import sort_transactions
 from telliot_feeds.utils.log import get_logger
@@ -76,13 +76,18 @@ class MimicryCollectionStatSource(DataSource[float]):
 
         return sum(values)
 
-    async def request_historical_sales_data(self, contract: str, all: bool = True) -> Optional[TransactionList]:
+    _sales_history: Optional[SalesHistory] = field(default=None, init=False, repr=False)
+
+    async def request_historical_sales_data(
+        self, contract: str, all: bool = True, start_timestamp: Optional[int] = None
+    ) -> Optional[TransactionList]:
         """Requests historical sales
          data of the selected collection.
          Data retrieved from Reservoir.
 
         Agruments:
             all (bool): if True, see all data for the selected collection (if False, only 12 months)
+            start_timestamp (int): if set, only sales from this timestamp on (overrides `all`)
 
         Returns:
             TransactionList: formatted historical sales data of a collection retrieved from Reservoir
@@ -95,7 +100,9 @@ class MimicryCollectionStatSource(DataSource[float]):
             headers = {"accept": "*/*", "x-api-key": "demo-api-key"}
             with requests.Session() as s:
                 s.mount("https://", adapter)
-                if not all:
+                if start_timestamp is not None:
+                    url += f"&startTimestamp={start_timestamp}"
+                elif not all:
                     one_year_ago = datetime.utcnow() - relativedelta(years=1)
                     start_timestamp = int(one_year_ago.timestamp())
                     url += f"&startTimestamp={start_timestamp}"
@@ -164,6 +171,27 @@ class MimicryCollectionStatSource(DataSource[float]):
 
         return tx_list
 
+    async def fetch_sales_history(self) -> Optional[TransactionList]:
+        """All sales of the collection, only requesting sales newer than the stored ones
+
+        Returns:
+            TransactionList: all sales of the collection (and its floor price if needed for the metric)
+        """
+        if self.collectionAddress is None:
+            return None
+        if self._sales_history is None:
+            self._sales_history = SalesHistory.for_collection(self.chainId, self.collectionAddress)
+        history = self._sales_history
+
+        new_sales = await self.request_historical_sales_data(
+            contract=self.collectionAddress, start_timestamp=history.cursor
+        )
+        if new_sales is None:
+            return None
+        added = history.add(new_sales.transactions)
+        logger.debug(f"Mimicry: {added} new sales for collection {self.collectionAddress}")
+        return TransactionList(transactions=history.transactions, floor_price=new_sales.floor_price)
+
     async def fetch_new_datapoint(
         self,
     ) -> OptionalDataPoint[Any]:
@@ -179,9 +207,11 @@ class MimicryCollectionStatSource(DataSource[float]):
             return None, None
 
         if self.metric == 0:
-            past_year_sales_data = await self.request_historical_sales_data(contract=self.collectionAddress, all=True)
-            if past_year_sales_data:
-                tami_value = tami(past_year_sales_data.transactions)
+            past_year_sales_data = await self.fetch_sales_history()
+            if past_year_sales_data and self._sales_history is not None:
+                # only sales added since the last report are processed
+                tami_value = self._sales_history.tami()
+                self._sales_history.save()
 
                 if not tami_value:
                     logger.info(
@@ -200,7 +230,9 @@ class MimicryCollectionStatSource(DataSource[float]):
                 return None, None
 
         elif self.metric == 1:
-            all_sales_data = await self.request_historical_sales_data(contract=self.collectionAddress)
+            all_sales_data = await self.fetch_sales_history()
+            if self._sales_history is not None:
+                self._sales_history.save()
             if all_sales_data:
                 market_cap = self.get_collection_market_cap(all_sales_data)
 
@@ -0,0 +1,156 @@
+"""Persistent sales history of an NFT collection
+
+Sales fetched from Reservoir are kept, with a cursor (the latest sale timestamp),
+in a per-collection file in the telliot home directory, so later requests only
+fetch sales newer than the cursor.
+
+The TAMI index is checkpointed along with the history. As long as the set of items
+with valid transactions doesn't change, new sales are only appended to the valid
+transactions, so the index resumes from the checkpoint and only processes new
+sales. Otherwise (e.g. an item gets its second sale of the year, or had no sale in
+the last six months) the index is rebuilt, which is linear in the number of sales.
+"""
+import json
+import os
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.sources.mimicry.tami import TamiIndex
+from telliot_feeds.sources.mimicry.types import Transaction
+from telliot_feeds.sources.mimicry.utils import filter_valid_transactions
+from telliot_feeds.sources.mimicry.utils import sort_transactions
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+# bump when the file layout changes so stale history files are discarded
+SALES_HISTORY_VERSION = 1
+
+SaleKey = Tuple[Union[float, int, str], Union[float, int], float]
+
+
+def _sale_key(transaction: Transaction) -> SaleKey:
+    return transaction.itemId, transaction.price, transaction.date.timestamp()
+
+
+class SalesHistory:
+    """Sales of a collection sorted by date, with a checkpointed TAMI index"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Args:
+        - path: file the history is persisted to, in memory only if None
+        """
+        self.path = path
+        self.transactions: List[Transaction] = []
+        self._tami_checkpoint: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def for_collection(cls, chain_id: Optional[int], collection_address: str) -> "SalesHistory":
+        """Create a sales history persisted in the telliot home directory for a collection"""
+        return cls(path=default_homedir() / "mimicry" / f"{chain_id}_{collection_address.lower()}.json")
+
+    @property
+    def cursor(self) -> int:
+        """Timestamp of the latest sale, sales from this timestamp on need to be fetched"""
+        return int(self.transactions[-1].date.timestamp()) if self.transactions else 0
+
+    def load(self) -> None:
+        """Load the history from disk, if it was persisted"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+            if state.get("version") != SALES_HISTORY_VERSION:
+                logger.info(f"Sales history file format changed, fetching all sales again: {self.path}")
+                return
+            self.transactions = [
+                Transaction(itemId=item_id, price=price, date=datetime.fromtimestamp(timestamp, tz=timezone.utc))
+                for item_id, price, timestamp in state["sales"]
+            ]
+            self._tami_checkpoint = state.get("tami")
+        except Exception as e:
+            logger.warning(f"Unable to load sales history from {self.path}: {e}")
+            self.transactions = []
+            self._tami_checkpoint = None
+
+    def save(self) -> None:
+        """Persist the history to disk if it changed"""
+        if self.path is None or not self._dirty:
+            return
+        state = {
+            "version": SALES_HISTORY_VERSION,
+            "sales": [list(_sale_key(t)) for t in self.transactions],
+            "tami": self._tami_checkpoint,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Unable to save sales history to {self.path}: {e}")
+
+    def add(self, transactions: List[Transaction]) -> int:
+        """Add fetched sales, skipping sales already in the history
+
+        Returns the number of new sales."""
+        cursor = self.cursor
+        # sales at the cursor timestamp are fetched again
+        known: Set[SaleKey] = set()
+        for transaction in reversed(self.transactions):
+            if transaction.date.timestamp() < cursor:
+                break
+            known.add(_sale_key(transaction))
+
+        new = sort_transactions([t for t in transactions if _sale_key(t) not in known])
+        if not new:
+            return 0
+        if new[0].date.timestamp() < cursor:
+            # older sales than expected, the index can't resume from its checkpoint
+            self.transactions = sort_transactions(self.transactions + new)
+            self._tami_checkpoint = None
+        else:
+            self.transactions.extend(new)
+        self._dirty = True
+        return len(new)
+
+    def tami(self) -> Optional[float]:
+        """TAMI of the collection, resuming the index from its checkpoint if possible"""
+        valid_transactions = filter_valid_transactions(self.transactions)
+        valid_items = sorted({str(t.itemId) for t in valid_transactions})
+
+        index = None
+        checkpoint = self._tami_checkpoint
+        if checkpoint is not None and checkpoint["items"] == valid_items:
+            if checkpoint["index"]["count"] <= len(valid_transactions):
+                index = TamiIndex.from_checkpoint(checkpoint["index"])
+        if index is None:
+            logger.debug("Building TAMI index from all sales")
+            index = TamiIndex()
+
+        processed = index.count
+        new_transactions = valid_transactions[processed:]
+        for transaction in new_transactions:
+            index.add(transaction)
+
+        if checkpoint is None or new_transactions or checkpoint["items"] != valid_items:
+            self._tami_checkpoint = {"items": valid_items, "index": index.checkpoint()}
+            self._dirty = True
+        return index.tami()
@@ -1,3 +1,5 @@
+from datetime import datetime
+from datetime import timezone
 from typing import Any
 from typing import Dict
 from typing import List
@@ -10,63 +12,101 @@ from telliot_feeds.sources.mimicry.utils import filter_valid_transactions
 from telliot_feeds.sources.mimicry.utils import sort_transactions
 
 
-def create_index_value_history(transaction_history: List[Transaction]) -> List[IndexValueHistoryItem]:
-    """Given a list of transactions, this creates a list that contains the index value at the
-    time of each transaction, and includes the transaction as well.
+class TamiIndex:
+    """Index value over a collection's transactions, updated one transaction at a time
 
-    Args:
-    - transaction_history: A list of transactions sorted by date.
+    Keeps a running sum of each item's last sale price, the divisor and each item's
+    last sale with the index value at the time of that sale, so adding a transaction
+    is O(1) and the TAMI of all transactions added so far is O(items).
 
-    Returns:
-    - A list of IndexValueHistoryItem objects (itemId, price, indexValue, Transaction)."""
-    transaction_map: Dict[Union[float, int, str], Transaction] = {}
-
-    last_index_value = 0.0
-    last_divisor = 1.0
-
-    result = []
-
-    for i in range(len(transaction_history)):
-        transaction = transaction_history[i]
+    The state can be saved with `checkpoint` and restored with `from_checkpoint`
+    to add later transactions without processing earlier ones again.
+    """
 
-        is_first_sale = transaction_map.get(transaction.itemId) is None
+    def __init__(self) -> None:
+        # last sale of each item, in order of each item's first sale
+        self.last_sales: Dict[Union[float, int, str], IndexValueHistoryItem] = {}
+        self.last_sold_value_sum: Union[float, int] = 0
+        self.divisor = 1.0
+        self.index_value: Union[float, int] = 0.0
+        #: number of transactions added
+        self.count = 0
 
-        transaction_map[transaction.itemId] = transaction
+    def add(self, transaction: Transaction) -> IndexValueHistoryItem:
+        """Add the next transaction (in chronological order) and return the index value at its time"""
+        previous_sale = self.last_sales.get(transaction.itemId)
+        is_first_sale = previous_sale is None
 
-        item_count = len(transaction_map)
+        previous_price = 0 if previous_sale is None else previous_sale.price
+        self.last_sold_value_sum += transaction.price - previous_price
+        item_count = len(self.last_sales) + (1 if is_first_sale else 0)
 
-        all_last_sold_value = sum([transaction_map[item].price for item in transaction_map])
+        index_value = self.last_sold_value_sum / (item_count * self.divisor)
 
-        index_value = all_last_sold_value / (item_count * last_divisor)
+        if self.count > 0 and is_first_sale:
+            # new items don't move the index
+            self.divisor = self.divisor * (index_value / self.index_value)
+            index_value = self.last_sold_value_sum / (item_count * self.divisor)
 
-        if i == 0:
-            last_index_value = index_value
+        self.index_value = index_value
+        self.count += 1
 
-            result.append(
-                IndexValueHistoryItem(
-                    itemId=transaction.itemId, price=transaction.price, indexValue=index_value, transaction=transaction
-                )
+        history_item = IndexValueHistoryItem(
+            itemId=transaction.itemId, price=transaction.price, indexValue=index_value, transaction=transaction
+        )
+        self.last_sales[transaction.itemId] = history_item
+        return history_item
+
+    def tami(self) -> Optional[float]:
+        """Time Adjusted Market Index of the transactions added so far, None if there are none"""
+        if not self.last_sales:
+            return None
+        time_adjusted_values = [self.index_value * (item.price / item.indexValue) for item in self.last_sales.values()]
+        time_adjusted_market_index: float = sum(time_adjusted_values)
+        return time_adjusted_market_index
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """JSON serializable state of the index"""
+        return {
+            "last_sales": [
+                [item.itemId, item.price, item.indexValue, item.transaction.date.timestamp()]
+                for item in self.last_sales.values()
+            ],
+            "last_sold_value_sum": self.last_sold_value_sum,
+            "divisor": self.divisor,
+            "index_value": self.index_value,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any]) -> "TamiIndex":
+        """Restore an index from its `checkpoint`"""
+        index = cls()
+        for item_id, price, index_value, timestamp in checkpoint["last_sales"]:
+            transaction = Transaction(
+                itemId=item_id, price=price, date=datetime.fromtimestamp(timestamp, tz=timezone.utc)
             )
+            index.last_sales[item_id] = IndexValueHistoryItem(
+                itemId=item_id, price=price, indexValue=index_value, transaction=transaction
+            )
+        index.last_sold_value_sum = checkpoint["last_sold_value_sum"]
+        index.divisor = checkpoint["divisor"]
+        index.index_value = checkpoint["index_value"]
+        index.count = checkpoint["count"]
+        return index
 
-            continue
-
-        next_divisor = last_divisor * (index_value / last_index_value) if is_first_sale else last_divisor
-
-        weighted_index_value = all_last_sold_value / (item_count * next_divisor)
 
-        last_index_value = weighted_index_value
-        last_divisor = next_divisor
+def create_index_value_history(transaction_history: List[Transaction]) -> List[IndexValueHistoryItem]:
+    """Given a list of transactions, this creates a list that contains the index value at the
+    time of each transaction, and includes the transaction as well.
 
-        result.append(
-            IndexValueHistoryItem(
-                itemId=transaction.itemId,
-                price=transaction.price,
-                indexValue=weighted_index_value,
-                transaction=transaction,
-            )
-        )
+    Args:
+    - transaction_history: A list of transactions sorted by date.
 
-    return result
+    Returns:
+    - A list of IndexValueHistoryItem objects (itemId, price, indexValue, Transaction)."""
+    index = TamiIndex()
+    return [index.add(transaction) for transaction in transaction_history]
 
 
 def get_index_value(index_value_history: List[IndexValueHistoryItem]) -> Union[float, int]:
@@ -95,13 +135,7 @@ def tami(transaction_history: List[Transaction]) -> Optional[float]:
     """
     sorted_transactions = sort_transactions(transaction_history)
     valid_transactions = filter_valid_transactions(sorted_transactions)
-    index_value_history = create_index_value_history(valid_transactions)
-
-    if len(index_value_history) == 0:
-        return None
-
-    index_value = get_index_value(index_value_history)
-    index_ratios = get_index_ratios(index_value_history)
-    time_adjusted_values = [index_value * item["indexRatio"] for item in index_ratios]
-    time_adjusted_market_index: float = sum(time_adjusted_values)
-    return time_adjusted_market_index
+    index = TamiIndex()
+    for transaction in valid_transactions:
+        index.add(transaction)
+    return index.tami()
@@ -1,3 +1,5 @@
+import math
+import time
 from dataclasses import dataclass
 from typing import Any
 from urllib.parse import urlencode
@@ -9,6 +11,8 @@ from telliot_feeds.sources.price.spot.coingecko import coingecko_coin_id
 from telliot_feeds.sources.price.spot.coingecko import CoinGeckoSpotPriceService
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.stdev_calculator import stdev_calculator
+from telliot_feeds.utils.volatility import get_daily_close_series
+from telliot_feeds.utils.volatility import SECONDS_PER_DAY
 
 
 logger = get_logger(__name__)
@@ -35,10 +39,16 @@ class CoingeckoDailyHistoricalPriceService(CoinGeckoSpotPriceService):
         if not coin_id:
             raise Exception("Asset not supported: {}".format(asset))
 
-        url_params = urlencode({"vs_currency": currency, "days": self.days, "interval": "daily"})
+        # daily closes are cached, only prices since the latest cached one are requested
+        series = get_daily_close_series("coingecko", asset, currency)
+        now = int(time.time())
+        fetch_start = series.fetch_start(now - self.days * SECONDS_PER_DAY)
+        days = max(math.ceil((now - fetch_start) / SECONDS_PER_DAY), 1)
+
+        url_params = urlencode({"vs_currency": currency, "days": days, "interval": "daily"})
         request_url = f"/api/v3/coins/{coin_id}/market_chart?{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             if "api.coingecko.com used Cloudflare to restrict access" in str(d["exception"]):
@@ -49,12 +59,14 @@ class CoingeckoDailyHistoricalPriceService(CoinGeckoSpotPriceService):
         elif "response" in d:
             response = d["response"]
 
-            if len(response["prices"]) < self.days + 1:
-                logger.error(f"Not enough data to generate a {self.days} volatility index")
-                return None, None
-
             try:
-                close_prices = [float(i[1]) for i in response["prices"]]
+                # daily prices are at midnight UTC, i.e. the close of the day before,
+                # except for the latest one, which is the current price
+                series.update((int(i[0]) // 1000 - 1, float(i[1])) for i in response["prices"])
+                close_prices = series.latest(self.days + 1)
+                if len(close_prices) < self.days + 1:
+                    logger.error(f"Not enough data to generate a {self.days} volatility index")
+                    return None, None
                 volatility = stdev_calculator(close_prices)
                 return volatility, datetime_now_utc()
             except KeyError as e:
@@ -5,12 +5,12 @@ from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.candle_store import get_candle_store
+from telliot_feeds.utils.candle_store import SeriesKey
 from telliot_feeds.utils.log import get_logger
 
 
@@ -20,6 +20,9 @@ logger = get_logger(__name__)
 # Hardcoded supported asset/currency pairs
 CRYPTOWATCH_PAIRS = {"ethusd", "btcusd"}
 
+#: Candle length used for prices at a timestamp, in seconds
+CANDLE_PERIOD = 60
+
 
 class CryptowatchHistoricalPriceService(WebPriceService):
     """Cryptowatch Historical Price Service"""
@@ -36,33 +39,6 @@ class CryptowatchHistoricalPriceService(WebPriceService):
         self.ts = ts
         self.timeout = timeout
 
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
-
     async def get_candles(
         self,
         asset: str,
@@ -100,7 +76,7 @@ class CryptowatchHistoricalPriceService(WebPriceService):
 
         request_url = f"markets/coinbase-pro/{pair}/ohlc?{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
         candles = None
 
         if "error" in d:
@@ -133,24 +109,41 @@ class CryptowatchHistoricalPriceService(WebPriceService):
         Documentation for Cryptowatch API:
         https://docs.cryptowat.ch/rest-api/markets/ohlc
         """
-        candles, dt = await self.get_candles(asset=asset, currency=currency, ts=ts, period=period)
+        if ts is None:
+            ts = self.ts
 
-        if candles is not None:
-            try:
-                if len(candles) == 0:
-                    logger.warning(
-                        f"No candle data from Cryptowatch historical price source for given timestamp: {ts}."
-                    )
+        # candles in the period are fetched once and stored, so pools or queries
+        # with the same timestamp don't fetch them again
+        start = ts - period
+        key = SeriesKey("cryptowatch", f"{asset.lower()}{currency.lower()}", CANDLE_PERIOD)
+        store = get_candle_store()
+        dt: Optional[datetime] = datetime_now_utc()
+        async with store.lock(key):
+            for fetch_start, fetch_end in store.missing(key, start, ts):
+                candles, dt = await self.get_candles(
+                    asset=asset,
+                    currency=currency,
+                    ts=fetch_end,
+                    period=fetch_end - fetch_start,
+                    candle_periods=CANDLE_PERIOD,
+                )
+                if candles is None:
+                    return None, None
+                try:
+                    # candle timestamps are close times
+                    store.add(key, ((c[0], c[4]) for c in candles), start=fetch_start, end=fetch_end)
+                except (IndexError, TypeError, ValueError) as e:
+                    msg = f"Error parsing Cryptowatch API candle data: {e}"
+                    logger.critical(msg)
                     return None, None
 
-                # Price from last candle in period
-                return float(candles[-1][4]), dt
-
-            except KeyError as e:
-                msg = f"Error parsing Cryptowatch API candle data: KeyError: {e}"
-                logger.critical(msg)
+        last = store.last(key, ts, start=start)
+        if last is None:
+            logger.warning(f"No candle data from Cryptowatch historical price source for given timestamp: {ts}.")
+            return None, None
 
-        return None, None
+        # Price from last candle in period
+        return last[1], dt
 
 
 @dataclass
@@ -1,11 +1,14 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.sources.price.historical.cryptowatch import CryptowatchHistoricalPriceService
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.stdev_calculator import stdev_calculator
+from telliot_feeds.utils.volatility import get_daily_close_series
+from telliot_feeds.utils.volatility import SECONDS_PER_DAY
 
 
 logger = get_logger(__name__)
@@ -32,28 +35,46 @@ class CryptowatchHistoricalOHLCPriceService(CryptowatchHistoricalPriceService):
         Documentation for Cryptowatch API:
         https://docs.cryptowat.ch/rest-api/markets/ohlc
         """
-        candles, dt = await self.get_candles(
-            asset=asset, currency=currency, ts=ts, period=period, candle_periods=candle_periods
-        )
-        if candles is not None:
+        if ts is None:
+            ts = self.ts
+        if candle_periods != SECONDS_PER_DAY:
+            candles, dt = await self.get_candles(
+                asset=asset, currency=currency, ts=ts, period=period, candle_periods=candle_periods
+            )
+            if candles is None or len(candles) < 30:
+                logger.warning("Not enough data to calculate volatility.")
+                return None, None
+            return stdev_calculator([i[4] for i in candles]), dt
+
+        # daily closes are cached, only candles since the latest cached one are requested
+        series = get_daily_close_series("cryptowatch", asset, currency)
+        after = series.fetch_start(ts - period)
+        dt = datetime_now_utc()
+        # cached candles are stored a second before their close time
+        if after + 1 < ts:
+            candles, dt = await self.get_candles(
+                asset=asset, currency=currency, ts=ts, period=ts - after, candle_periods=candle_periods
+            )
+            if candles is None:
+                return None, None
             try:
-                if len(candles) < 30:
-                    logger.warning("Not enough data to calculate volatility.")
-                    return None, None
-                close_prices = [i[4] for i in candles]
-
-                volatility = stdev_calculator(close_prices)
-
-                return volatility, dt
-
+                # candle timestamps are close times, i.e. the midnight after the candle's day
+                series.update((int(i[0]) - 1, float(i[4])) for i in candles)
             except IndexError as e:
                 msg = f"Error parsing Cryptowatch API candle data: IndexError: {e}"
                 logger.error(msg)
-
+                return None, None
             except Exception as e:
                 logger.error(e)
+                return None, None
+
+        close_prices = series.closes(start=ts - period, end=ts)
+        if len(close_prices) < 30:
+            logger.warning("Not enough data to calculate volatility.")
+            return None, None
 
-        return None, None
+        volatility = stdev_calculator(close_prices)
+        return volatility, dt
 
 
 @dataclass
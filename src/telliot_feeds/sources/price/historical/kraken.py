@@ -5,12 +5,13 @@ from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.candle_store import get_candle_store
+from telliot_feeds.utils.candle_store import SeriesKey
+from telliot_feeds.utils.candle_store import TRADES
 from telliot_feeds.utils.log import get_logger
 
 
@@ -23,6 +24,15 @@ logger = get_logger(__name__)
 kraken_assets = {"ETH", "XBT"}
 kraken_currencies = {"USD"}
 
+#: Oldest trade used as the price at a timestamp, in seconds before it
+MAX_PRICE_AGE = 900
+
+#: Maximum number of trades returned by the Kraken trades endpoint
+TRADES_PAGE_SIZE = 1000
+
+#: Maximum number of trades requests per missing range
+MAX_PAGES = 5
+
 
 class KrakenHistoricalPriceService(WebPriceService):
     """Kraken Historical Price Service"""
@@ -39,33 +49,6 @@ class KrakenHistoricalPriceService(WebPriceService):
         self.ts = ts
         self.timeout = timeout
 
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
-
     def get_request_url(self, asset: str, currency: str, period_start: int) -> str:
         """Assemble Kraken historical trades request url."""
         asset = asset.upper()
@@ -118,20 +101,43 @@ class KrakenHistoricalPriceService(WebPriceService):
         if ts is None:
             ts = self.ts
 
-        # fetch trades data for a minute before expiry,
-        # if no trades found, then fetch trades for 2 minutes before expiry, etc.
-        # break after checking fifteen minutes before expiry
-        for i in range(15):
-            period = 60 * (i + 1)
-            trades, dt = await self.get_trades(asset, currency, period, ts)
-            if not trades:
-                continue
-            price = float(trades[-1][0])
-            logger.info(f"Price found up to {i+1} min before expiry: {price}")
-            return price, dt
-
-        logger.info("No trades found up to 15 minutes before expiry.")
-        return None, None
+        # trades up to fifteen minutes before expiry are fetched once and stored,
+        # so pools or queries with the same expiry don't fetch them again
+        start = ts - MAX_PRICE_AGE
+        key = SeriesKey("kraken", f"{asset.lower()}{currency.lower()}", TRADES)
+        store = get_candle_store()
+        dt: Optional[datetime] = datetime_now_utc()
+        async with store.lock(key):
+            for fetch_start, fetch_end in store.missing(key, start, ts):
+                for _ in range(MAX_PAGES):
+                    trades, dt = await self.get_trades(asset, currency, fetch_end - fetch_start, fetch_end)
+                    if trades is None:
+                        return None, None
+                    try:
+                        prices = [(float(t[2]), float(t[0])) for t in trades]
+                    except (IndexError, TypeError, ValueError) as e:
+                        logger.error(f"Error parsing Kraken trades: {e}")
+                        return None, None
+                    # Kraken returns at most a page of trades since the start
+                    truncated = len(prices) >= TRADES_PAGE_SIZE and prices[-1][0] < fetch_end
+                    fetched_end = int(prices[-1][0]) if truncated else fetch_end
+                    store.add(key, prices, start=fetch_start, end=fetched_end)
+                    if not truncated or fetched_end <= fetch_start:
+                        break
+                    fetch_start = fetched_end
+                if truncated:
+                    # trades nearest the timestamp are still missing, so the last
+                    # stored trade would be older than the actual price at it
+                    logger.warning(f"Too many Kraken trades to fetch up to timestamp {ts}, skipping.")
+                    return None, None
+
+        last = store.last(key, ts, start=start)
+        if last is None:
+            logger.info("No trades found up to 15 minutes before expiry.")
+            return None, None
+        trade_ts, price = last
+        logger.info(f"Price found {int(ts - trade_ts)} seconds before expiry: {price}")
+        return price, dt
 
     async def get_trades(
         self,
@@ -163,7 +169,7 @@ class KrakenHistoricalPriceService(WebPriceService):
 
         req_url = self.get_request_url(asset, currency, period_start)
 
-        d = self.get_url(req_url)
+        d = await self.get_url(req_url)
 
         if "error" in d:
             logger.error(d)
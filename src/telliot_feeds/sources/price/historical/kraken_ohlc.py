@@ -3,10 +3,13 @@ from typing import Any
 from typing import Optional
 from urllib.parse import urlencode
 
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.sources.price.historical.kraken import KrakenHistoricalPriceService
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.stdev_calculator import stdev_calculator
+from telliot_feeds.utils.volatility import get_daily_close_series
 
 logger = get_logger(__name__)
 
@@ -33,27 +36,53 @@ class KrakenHistoricalPriceServiceOHLC(KrakenHistoricalPriceService):
         # Source: https://docs.kraken.com/rest/#operation/getRecentTrades
         return f"/0/public/OHLC?{url_params}"
 
-    def resp_price_parse(self, asset: str, currency: str, resp: dict[Any, Any]) -> Optional[float]:
-        """Gets OHLC prices from Kraken API"""
+    def resp_price_parse(
+        self, asset: str, currency: str, resp: dict[Any, Any], ts: Optional[int] = None
+    ) -> Optional[float]:
+        """Adds daily OHLC candles from a Kraken API response to the cached close series
+        and returns the volatility of closes since ts"""
+        if ts is None:
+            ts = self.ts
         try:
-            # OHLC prices for last thrity days
             pair_key = f"X{asset.upper()}Z{currency.upper()}"
             try:
                 data = resp["result"][pair_key]
-                if len(data) < 30:
-                    logger.warning("Not enough data to calculate volatility")
-                    return None
             except KeyError as e:
                 msg = f"Error parsing Kraken API response: KeyError: {e}"
                 logger.error(msg)
                 return None
-            close_prices = [float(i[4]) for i in data]
+            series = get_daily_close_series("kraken", asset, currency)
+            series.update((int(i[0]), float(i[4])) for i in data)
+            close_prices = series.closes(start=ts)
+            # OHLC prices for last thirty days
+            if len(close_prices) < 30:
+                logger.warning("Not enough data to calculate volatility")
+                return None
             volatility = stdev_calculator(close_prices)
         except Exception as e:
             logger.error(e)
             return None
         return volatility
 
+    async def get_price(self, asset: str, currency: str, ts: Optional[int] = None) -> OptionalDataPoint[float]:
+        """Implement PriceServiceInterface
+
+        This implementation gets the volatility of daily closes since the timestamp
+        from the Kraken API. Only candles since the latest cached one are requested."""
+        if ts is None:
+            ts = self.ts
+
+        since = get_daily_close_series("kraken", asset, currency).fetch_start(ts)
+        d = await self.get_url(self.get_request_url(asset, currency, since))
+
+        if "error" in d:
+            logger.error(d)
+            return None, None
+        elif "response" in d:
+            return self.resp_price_parse(asset, currency, d["response"], ts=ts), datetime_now_utc()
+        else:
+            raise Exception("Invalid response from get_url")
+
 
 @dataclass
 class KrakenHistoricalPriceSourceOHLC(PriceSource):
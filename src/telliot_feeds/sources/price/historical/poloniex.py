@@ -1,15 +1,18 @@
 from dataclasses import dataclass
 from datetime import datetime
+from datetime import timezone
 from typing import Any
 from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.candle_store import get_candle_store
+from telliot_feeds.utils.candle_store import SeriesKey
+from telliot_feeds.utils.candle_store import TRADES
 from telliot_feeds.utils.log import get_logger
 
 
@@ -20,8 +23,16 @@ logger = get_logger(__name__)
 # Poloniex swaps the usual order of asset/currency to currency/asset
 poloniex_pairs = {"DAI_ETH", "TUSD_ETH", "DAI_BTC", "TUSD_BTC"}
 
+#: Maximum number of trades returned by the Poloniex trade history endpoint
+TRADES_PAGE_SIZE = 1000
+
+
+def parse_trade_date(date: str) -> float:
+    """Timestamp of a Poloniex trade date, which is in UTC"""
+    return datetime.strptime(date, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
 
-class PoloniexHistoricalPriceService:
+
+class PoloniexHistoricalPriceService(WebPriceService):
     """Poloniex Historical Price Service"""
 
     def __init__(
@@ -36,33 +47,6 @@ class PoloniexHistoricalPriceService:
         self.ts = ts
         self.timeout = timeout
 
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
-
     async def get_trades(
         self,
         asset: str,
@@ -93,7 +77,7 @@ class PoloniexHistoricalPriceService:
         # Source: https://docs.poloniex.com/#returntradehistory-public
         request_url = f"public?command=returnTradeHistory&{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
         trades = []
 
         if "error" in str(d):
@@ -123,22 +107,40 @@ class PoloniexHistoricalPriceService:
 
         This implementation gets the historical price from
         the Poloniex API using a timestamp."""
-        trades, dt = await self.get_trades(asset=asset, currency=currency, ts=ts, period=period)
+        if ts is None:
+            ts = self.ts
 
-        if trades is not None:
-            try:
-                if len(trades) == 0:
-                    logger.warning(f"No data from Poloniex historical price source for given timestamp: {ts}.")
+        # trades in the period are fetched once and stored, so pools or queries
+        # with the same timestamp don't fetch them again
+        start = ts - period
+        key = SeriesKey("poloniex", f"{asset.lower()}{currency.lower()}", TRADES)
+        store = get_candle_store()
+        dt: Optional[datetime] = datetime_now_utc()
+        async with store.lock(key):
+            for fetch_start, fetch_end in store.missing(key, start, ts):
+                trades, dt = await self.get_trades(
+                    asset=asset, currency=currency, ts=fetch_end, period=fetch_end - fetch_start
+                )
+                if trades is None:
                     return None, None
+                try:
+                    prices = [(parse_trade_date(t["date"]), float(t["rate"])) for t in trades]
+                except (KeyError, ValueError) as e:
+                    msg = f"Error parsing Poloniex API response: {e}"
+                    logger.critical(msg)
+                    return None, None
+                # Poloniex returns at most a page of the latest trades in the period
+                if len(prices) >= TRADES_PAGE_SIZE:
+                    fetch_start = max(fetch_start, int(min(prices)[0]))
+                store.add(key, prices, start=fetch_start, end=fetch_end)
+
+        last = store.last(key, ts, start=start)
+        if last is None:
+            logger.warning(f"No data from Poloniex historical price source for given timestamp: {ts}.")
+            return None, None
 
-                # Price from last trade in period
-                return float(trades[-1]["rate"]), dt
-
-            except KeyError as e:
-                msg = f"Error parsing Poloniex API response: KeyError: {e}"
-                logger.critical(msg)
-
-        return None, None
+        # Price from last trade in period
+        return last[1], dt
 
 
 @dataclass
@@ -146,7 +148,7 @@ class PoloniexHistoricalPriceSource(PriceSource):
     ts: int = 0
     asset: str = ""
     currency: str = ""
-    service: PoloniexHistoricalPriceService = PoloniexHistoricalPriceService(ts=ts)  # type: ignore
+    service: PoloniexHistoricalPriceService = PoloniexHistoricalPriceService(ts=ts)
 
     def __post_init__(self) -> None:
         self.service.ts = self.ts
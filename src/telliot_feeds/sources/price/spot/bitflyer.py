@@ -44,7 +44,7 @@ class BitflyerSpotPriceService(WebPriceService):
         url_params = urlencode({"product_code": asset_currency})
         request_url = f"/v1/getticker?{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             logger.error(d)
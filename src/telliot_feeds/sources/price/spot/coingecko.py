@@ -3,10 +3,6 @@ from dataclasses import field
 from typing import Any
 from urllib.parse import urlencode
 
-from requests import Session
-from requests.exceptions import ConnectionError
-from requests.exceptions import Timeout
-from requests.exceptions import TooManyRedirects
 from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -125,29 +121,27 @@ class CoinGeckoSpotPriceService(WebPriceService):
             raise Exception("Asset not supported: {}".format(asset))
 
         url_params = urlencode({"ids": coin_id, "vs_currencies": currency})
-        request_url = self.url + "/api/v3/simple/price?{}".format(url_params)
+        request_url = "/api/v3/simple/price?{}".format(url_params)
 
-        session = Session()
+        headers = None
         if API_KEY != "":
             headers = {
                 "Accepts": "application/json",
                 "x-cg-pro-api-key": API_KEY,
             }
-            session.headers.update(headers)
-
-        try:
-            response = session.get(request_url)
 
-            if response.status_code >= 400:
-                logger.warning(f"CoinGecko Error Status {response.status_code}: {response}")
-                return None, None
+        d = await self.get_url(request_url, headers=headers)
 
-            res = response.json()
+        if "error" in d:
+            logger.warning(d["exception"])
+            return None, None
 
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
-            logger.warning(e)
+        if d["status"] >= 400:
+            logger.warning(f"CoinGecko Error Status {d['status']}: {d['response']}")
             return None, None
 
+        res = d["response"]
+
         try:
             price = float(res[coin_id][currency])
             return price, datetime_now_utc()
@@ -190,7 +184,7 @@ class CoinGeckoBRC20SpotPriceService(WebPriceService):
         url_params = urlencode({"ids": coin_id, "vs_currencies": currency})
         request_url = "/api/v3/simple/price?{}".format(url_params)
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             if "api.coingecko.com used Cloudflare to restrict access" in str(d["exception"]):
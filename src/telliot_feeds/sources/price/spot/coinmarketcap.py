@@ -1,12 +1,7 @@
-import json
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-from requests import Session
-from requests.exceptions import ConnectionError
-from requests.exceptions import Timeout
-from requests.exceptions import TooManyRedirects
 from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -46,30 +41,24 @@ class CoinMarketCapSpotPriceService(WebPriceService):
         if currency not in coinmarketcap_currencies:
             raise Exception(f"Currency not supported: {currency}")
 
-        request_url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
-
         parameters = {"symbol": asset}
         headers = {
             "Accepts": "application/json",
             "X-CMC_PRO_API_KEY": API_KEY,
         }
 
-        session = Session()
-        session.headers.update(headers)
-
-        try:
-            response = session.get(request_url, params=parameters)
-
-            if response.status_code >= 400:
-                logger.warning(f"CoinMarketCap Error Status {response.status_code}")
-                return None, None
+        d = await self.get_url(headers=headers, params=parameters)
 
-            data = json.loads(response.text)
+        if "error" in d:
+            logger.warning(d["exception"])
+            return None, None
 
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
-            logger.warning(e)
+        if d["status"] >= 400:
+            logger.warning(f"CoinMarketCap Error Status {d['status']}")
             return None, None
 
+        data = d["response"]
+
         try:
             price = data["data"][asset]["quote"][currency]["price"]
             return price, datetime_now_utc()
@@ -39,7 +39,7 @@ class CurveFinanceSpotPriceService(WebPriceService):
 
         request_url = "/api/getPools/ethereum/main"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             logger.error(d)
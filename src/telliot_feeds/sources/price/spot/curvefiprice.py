@@ -51,7 +51,7 @@ class CurveFiUSDPriceService(WebPriceService):
 
         request_url = f"/ethereum/{asset_address}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             logger.error(d)
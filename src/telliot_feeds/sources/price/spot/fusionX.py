@@ -2,8 +2,6 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
@@ -51,24 +49,15 @@ class fusionXPriceService(WebPriceService):
 
         json_data = {"query": query}
 
-        request_url = self.url + "/subgraphs/name/fusionx/exchange-v3"
+        request_path = "/subgraphs/name/fusionx/exchange-v3"
 
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
+        data = await self.post_url(request_path, headers=headers, json_data=json_data)
 
-            except requests.exceptions.ConnectTimeout:
+        if "error" in data:
+            if data["error"] == "Timeout Error":
                 logger.warning("Timeout Error, No prices retrieved from fusionX Finance")
-                return None, None
-
-            except Exception:
+            else:
                 logger.warning("No prices retrieved from fusionX Finance")
-                return None, None
-
-        if "error" in data:
-            logger.error(data)
             return None, None
 
         elif "response" in data:
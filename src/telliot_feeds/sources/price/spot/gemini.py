@@ -48,7 +48,7 @@ class GeminiSpotPriceService(WebPriceService):
 
         request_url = "/v1/pubticker/{}{}".format(asset.lower(), currency.lower())
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
         if d is None:
             logger.warning("No data returned from Gemini")
             return None, None
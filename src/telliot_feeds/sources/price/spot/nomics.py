@@ -57,7 +57,7 @@ class NomicsSpotPriceService(WebPriceService):
             }
         )
         request_url = "/v1/currencies/ticker?{}".format(url_params)
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             logger.error(d)
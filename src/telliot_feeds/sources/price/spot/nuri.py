@@ -2,8 +2,6 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
-from requests import Session
 from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -63,34 +61,23 @@ class nuriPriceService(WebPriceService):
 
         json_data = {"query": query}
 
-        request_url = f"{self.url}/subgraphs/id/Eqr2CueSusTohoTsXCiQgQbaApjuK2ikFvpqkVTPo1y5"
-        logger.info(f"{request_url}")
+        request_path = "/subgraphs/id/Eqr2CueSusTohoTsXCiQgQbaApjuK2ikFvpqkVTPo1y5"
+        logger.info(f"{self.url}{request_path}")
 
-        session = Session()
         if API_KEY != "":
             headers = {"Accepts": "application/json", "Authorization": f"Bearer {API_KEY}"}
-            session.headers.update(headers)
 
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-                logger.info(f"{data}")
+        data = await self.post_url(request_path, headers=headers, json_data=json_data)
 
-            except requests.exceptions.ConnectTimeout:
+        if "error" in data:
+            if data["error"] == "Timeout Error":
                 logger.warning("Timeout Error, No pool prices retrieved from Nuri")
-                return None, None
-
-            except Exception:
+            else:
                 logger.warning("No pool prices retrieved from Nuri")
-                return None, None
-
-        if "error" in data:
-            logger.error(data)
             return None, None
 
         elif "response" in data:
+            logger.info(f"{data}")
             response = data["response"]
             eth_usd_price = None
             token_price = None
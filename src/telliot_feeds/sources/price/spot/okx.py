@@ -30,7 +30,7 @@ class OKXSpotPriceService(WebPriceService):
         market_symbol = f"{format(asset.upper())}-{format(currency.upper())}"
         request_url = f"/v5/market/ticker?instId={market_symbol}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             logger.error(d)
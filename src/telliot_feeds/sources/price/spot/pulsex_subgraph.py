@@ -1,11 +1,9 @@
 import os
-from dotenv import load_dotenv
-
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
+from dotenv import load_dotenv
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
@@ -54,7 +52,6 @@ else:
     raise ValueError("Unsupported pulsexSubgraph NETWORK_ID. Check .env")
 
 
-
 class PulseXSubgraphService(WebPriceService):
     """PulseX Subgraph Price Service for token price"""
 
@@ -87,7 +84,7 @@ class PulseXSubgraphService(WebPriceService):
             "Content-Type": "application/json",
         }
 
-        query = "{ token(id: \"" + token.lower() + "\") { derivedUSD } }"
+        query = '{ token(id: "' + token.lower() + '") { derivedUSD } }'
 
         json_data = {
             "query": query,
@@ -95,24 +92,16 @@ class PulseXSubgraphService(WebPriceService):
             "operationName": None,
         }
 
-        request_url = self.url + "/subgraphs/name/pulsechain/pulsex"
+        request_path = "/subgraphs/name/pulsechain/pulsex"
 
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
+        data = await self.post_url(request_path, headers=headers, json_data=json_data)
 
-            except requests.exceptions.ConnectTimeout:
+        if "error" in data:
+            if data["error"] == "Timeout Error":
                 logger.warning("Timeout Error, No prices retrieved from PulseX Subgraph")
-                return None, None
-
-            except Exception as e:
+            else:
+                e = data["exception"]
                 logger.warning(f"No prices retrieved from PulseX Subgraph with Exception {e}")
-                return None, None
-
-        if "error" in data:
-            logger.error(data)
             return None, None
 
         elif "response" in data:
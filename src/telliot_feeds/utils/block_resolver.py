@@ -0,0 +1,216 @@
+"""Timestamp to block number resolution with a persistent block header cache
+
+Every (number, timestamp) header fetched while resolving a timestamp is kept in a
+per-chain cache that's persisted in the telliot home directory. Lookups bracket the
+target timestamp with the closest cached headers and narrow the bracket using
+interpolation search (i.e. assuming the average block time within the bracket),
+falling back to bisection when block times are too irregular for interpolation
+to converge. Repeated lookups are resolved from the cache without any RPC call
+and nearby lookups only need a few.
+"""
+import bisect
+import json
+import os
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from telliot_core.utils.home import default_homedir
+from web3.types import BlockData
+from web3.types import BlockIdentifier
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Headers this close to the chain tip may still be reorged, so they're not cached
+REORG_DEPTH = 64
+
+#: Maximum number of cached headers per chain
+MAX_CACHED_HEADERS = 50_000
+
+GetBlock = Callable[[BlockIdentifier], Optional[BlockData]]
+Header = Tuple[int, int]
+
+
+class BlockResolver:
+    """Resolve timestamps to block numbers for a single chain"""
+
+    def __init__(self, chain_id: Optional[int] = None, path: Optional[Path] = None) -> None:
+        """
+        Args:
+        - chain_id: chain the headers belong to
+        - path: file the header cache is persisted to, in memory only if None
+        """
+        self.chain_id = chain_id
+        self.path = path
+        # block numbers and their timestamps, both sorted by block number
+        self._numbers: List[int] = []
+        self._timestamps: List[int] = []
+        self._latest_number = 0
+        self._dirty = False
+        #: number of blocks fetched by the resolver, for diagnostics
+        self.rpc_count = 0
+        self.load()
+
+    @classmethod
+    def for_chain(cls, chain_id: int) -> "BlockResolver":
+        """Create a resolver persisted in the telliot home directory for a chain"""
+        return cls(chain_id=chain_id, path=default_homedir() / "block_headers" / f"{chain_id}.json")
+
+    def load(self) -> None:
+        """Load cached headers from disk, if they were persisted"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                headers = json.load(f)["headers"]
+            for number, timestamp in headers:
+                self._insert(int(number), int(timestamp))
+        except Exception as e:
+            logger.warning(f"Unable to load block header cache from {self.path}: {e}")
+            self._numbers, self._timestamps = [], []
+        # cached headers were at least REORG_DEPTH blocks deep when they were saved
+        if self._numbers:
+            self._latest_number = self._numbers[-1] + REORG_DEPTH
+        self._dirty = False
+
+    def save(self) -> None:
+        """Persist cached headers to disk if new headers were added"""
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"chain_id": self.chain_id, "headers": list(zip(self._numbers, self._timestamps))}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Unable to save block header cache to {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def _insert(self, number: int, timestamp: int) -> None:
+        i = bisect.bisect_left(self._numbers, number)
+        if i < len(self._numbers) and self._numbers[i] == number:
+            return
+        self._numbers.insert(i, number)
+        self._timestamps.insert(i, timestamp)
+        self._dirty = True
+        if len(self._numbers) > MAX_CACHED_HEADERS:
+            # thin out evenly so the cache still spans the whole chain
+            self._numbers = self._numbers[::2]
+            self._timestamps = self._timestamps[::2]
+
+    def record(self, number: int, timestamp: int) -> None:
+        """Add a block header to the cache, unless it's too close to the chain tip"""
+        self._latest_number = max(self._latest_number, number)
+        if number <= self._latest_number - REORG_DEPTH:
+            self._insert(number, timestamp)
+
+    def _fetch(self, get_block: GetBlock, block_identifier: BlockIdentifier) -> Optional[Header]:
+        self.rpc_count += 1
+        block = get_block(block_identifier)
+        if not block:
+            return None
+        header = (int(block["number"]), int(block["timestamp"]))
+        self.record(*header)
+        return header
+
+    def _cached_bracket(self, target: int) -> Tuple[Optional[Header], Optional[Header]]:
+        """Closest cached headers at or before, and after, the target timestamp
+
+        Block timestamps are non-decreasing, so the timestamp list is sorted too.
+        """
+        i = bisect.bisect_right(self._timestamps, target)
+        lower = (self._numbers[i - 1], self._timestamps[i - 1]) if i > 0 else None
+        upper = (self._numbers[i], self._timestamps[i]) if i < len(self._numbers) else None
+        return lower, upper
+
+    def block_number_at(self, timestamp: Union[int, float], get_block: GetBlock) -> Optional[int]:
+        """Find the latest block with a timestamp at or before the target timestamp
+
+        Args:
+        - timestamp: target unix timestamp
+        - get_block: function fetching a block by number (or "latest"), returns None on failure
+
+        Returns:
+        - block number, or None if the timestamp is before the first block or a block can't be fetched
+        """
+        target = int(timestamp)
+        try:
+            return self._search(target, get_block)
+        finally:
+            self.save()
+
+    def _search(self, target: int, get_block: GetBlock) -> Optional[int]:
+        lower, upper = self._cached_bracket(target)
+
+        if upper is None:
+            latest = self._fetch(get_block, "latest")
+            if latest is None:
+                return None
+            if latest[1] <= target:
+                return latest[0]
+            upper = latest
+        if lower is None:
+            lower = self._fetch(get_block, 0)
+            if lower is None:
+                return None
+            if lower[1] > target:
+                logger.warning(f"Timestamp {target} is before the first block")
+                return None
+
+        margin = 1
+        interpolate = True
+        while upper[0] - lower[0] > 1:
+            width = upper[0] - lower[0]
+            if interpolate:
+                # estimate the target's distance from the bound nearest to it using the
+                # average block time of the bracket, and overshoot it by a margin so the
+                # probe likely lands on the other side of the target, tightening the bracket
+                blocks_per_second = width / max(upper[1] - lower[1], 1)
+                from_lower = target - lower[1] <= upper[1] - target
+                if from_lower:
+                    guess = lower[0] + int((target - lower[1]) * blocks_per_second) + margin
+                else:
+                    guess = upper[0] - int((upper[1] - target) * blocks_per_second) - margin
+            else:
+                guess = (lower[0] + upper[0]) // 2
+            guess = min(max(guess, lower[0] + 1), upper[0] - 1)
+
+            probe = self._fetch(get_block, guess)
+            if probe is None:
+                return None
+            if probe[1] <= target:
+                lower = probe
+            else:
+                upper = probe
+            if interpolate:
+                # widen the overshoot when the probe fell short of the target
+                fell_short = (probe[1] <= target) == from_lower
+                margin = margin * 2 if fell_short else 1
+            # bisect next if the previous step didn't at least halve the bracket
+            interpolate = not interpolate or (upper[0] - lower[0]) * 2 <= width
+
+        return lower[0]
+
+
+_resolvers: Dict[Any, BlockResolver] = {}
+
+
+def get_block_resolver(chain_id: int) -> BlockResolver:
+    """Get the block resolver shared by all sources for a chain"""
+    resolver = _resolvers.get(chain_id)
+    if resolver is None:
+        resolver = BlockResolver.for_chain(chain_id)
+        _resolvers[chain_id] = resolver
+    return resolver
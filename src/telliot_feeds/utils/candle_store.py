@@ -0,0 +1,185 @@
+"""Local store of historical trades and candles fetched by historical price sources
+
+Prices are kept in a SQLite table keyed by (source, pair, resolution),
+with resolution 0 for trades and the candle length in seconds for candles. Along
+with the prices, the store records which time ranges of each series were already
+fetched, so sources only request the ranges that are missing. Ranges that may still
+get new trades or whose latest candle may not be over yet aren't marked fetched.
+
+Sources fetching the same series hold the series' lock while they check the store
+and fetch, so e.g. settling many DIVA pools with the same expiry costs a single
+request per exchange.
+"""
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Trades younger than this may not have been published by the exchange yet
+SETTLE_DELAY = 60
+
+#: Resolution of trade series
+TRADES = 0
+
+Price = Tuple[float, float]
+
+
+class SeriesKey(NamedTuple):
+    """Key of a series of prices, resolution is 0 for trades or the candle length in seconds"""
+
+    source: str
+    pair: str
+    resolution: int
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    source TEXT NOT NULL,
+    pair TEXT NOT NULL,
+    resolution INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    price REAL NOT NULL,
+    PRIMARY KEY (source, pair, resolution, ts)
+);
+CREATE TABLE IF NOT EXISTS fetched (
+    source TEXT NOT NULL,
+    pair TEXT NOT NULL,
+    resolution INTEGER NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fetched_key ON fetched (source, pair, resolution, start_ts);
+"""
+
+
+class CandleStore:
+    """Trades and candles of historical price sources, with the time ranges already fetched"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Args:
+        - path: SQLite database file, in memory only if None
+        """
+        self.path = path
+        self._locks: Dict[SeriesKey, asyncio.Lock] = {}
+        database = ":memory:"
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            database = str(path)
+        self._db = sqlite3.connect(database)
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def default(cls) -> "CandleStore":
+        """Create a store persisted in the telliot home directory"""
+        path = default_homedir() / "candles.sqlite"
+        try:
+            return cls(path=path)
+        except sqlite3.Error as e:
+            logger.warning(f"Unable to open candle store {path}, keeping candles in memory: {e}")
+            return cls()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def lock(self, key: SeriesKey) -> asyncio.Lock:
+        """Lock to hold while checking and fetching the missing ranges of a series"""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    def _fetched(self, key: SeriesKey) -> List[Tuple[int, int]]:
+        rows = self._db.execute(
+            "SELECT start_ts, end_ts FROM fetched WHERE source = ? AND pair = ? AND resolution = ? ORDER BY start_ts",
+            key,
+        )
+        return [(int(start), int(end)) for start, end in rows]
+
+    def missing(self, key: SeriesKey, start: int, end: int) -> List[Tuple[int, int]]:
+        """Ranges from start to end (inclusive) that weren't fetched yet, oldest first"""
+        gaps = []
+        cursor = start
+        for fetched_start, fetched_end in self._fetched(key):
+            if fetched_end < cursor:
+                continue
+            if fetched_start > end:
+                break
+            if fetched_start > cursor:
+                gaps.append((cursor, fetched_start))
+            cursor = max(cursor, fetched_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def add(self, key: SeriesKey, prices: Iterable[Price], start: Optional[int] = None, end: int = 0) -> None:
+        """Add fetched prices, given as (timestamp, price), and mark start to end fetched
+
+        A later price with the same timestamp replaces the stored one. The end of the
+        fetched range is capped to the latest time whose trades or candles are final.
+        If start is None, prices are added without marking a range fetched.
+        """
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?)",
+                ((*key, float(ts), float(price)) for ts, price in prices),
+            )
+            if start is None:
+                return
+            end = min(end, int(time.time()) - max(key.resolution, SETTLE_DELAY))
+            if end <= start:
+                return
+            # merge with overlapping or adjacent fetched ranges
+            for fetched_start, fetched_end in self._fetched(key):
+                if fetched_end < start or fetched_start > end:
+                    continue
+                self._db.execute(
+                    "DELETE FROM fetched "
+                    "WHERE source = ? AND pair = ? AND resolution = ? AND start_ts = ? AND end_ts = ?",
+                    (*key, fetched_start, fetched_end),
+                )
+                start, end = min(start, fetched_start), max(end, fetched_end)
+            self._db.execute("INSERT INTO fetched VALUES (?, ?, ?, ?, ?)", (*key, start, end))
+
+    def prices(self, key: SeriesKey, start: Optional[float] = None, end: Optional[float] = None) -> List[Price]:
+        """Prices from start to end (inclusive), oldest first"""
+        rows = self._db.execute(
+            "SELECT ts, price FROM prices WHERE source = ? AND pair = ? AND resolution = ? AND ts >= ? AND ts <= ? "
+            "ORDER BY ts",
+            (*key, float("-inf") if start is None else start, float("inf") if end is None else end),
+        )
+        return [(float(ts), float(price)) for ts, price in rows]
+
+    def last(self, key: SeriesKey, end: float, start: Optional[float] = None) -> Optional[Price]:
+        """Latest price at or before end, and not before start"""
+        row = self._db.execute(
+            "SELECT ts, price FROM prices WHERE source = ? AND pair = ? AND resolution = ? AND ts >= ? AND ts <= ? "
+            "ORDER BY ts DESC LIMIT 1",
+            (*key, float("-inf") if start is None else start, end),
+        ).fetchone()
+        return None if row is None else (float(row[0]), float(row[1]))
+
+
+_store: Optional[CandleStore] = None
+
+
+def get_candle_store() -> CandleStore:
+    """Get the candle store shared by all historical price sources"""
+    global _store
+    if _store is None:
+        _store = CandleStore.default()
+    return _store
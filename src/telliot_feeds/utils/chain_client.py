@@ -0,0 +1,289 @@
+"""Shared per-chain JSON-RPC client for EVM data sources
+
+EVM sources (EVMCall, EVMBalance, gas price oracle) reading from the same chain
+share a `ChainClient`, which
+- sends JSON-RPC requests in batches: requests made concurrently by several
+  sources, within `BATCH_WINDOW` seconds, go out in a single HTTP round trip,
+  and identical requests among them are sent once
+- caches block headers by number, once they're too deep to be reorged, and
+  contract bytecode by address
+- remembers whether the chain is a POA chain, so the POA middleware is injected
+  once instead of detecting it again before every request
+
+Batched requests are sent to the node directly, so their results are the raw
+JSON-RPC results (e.g. hex strings) rather than web3's formatted values. Nodes
+that don't accept batches get the requests one by one.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from hexbytes import HexBytes
+from web3 import HTTPProvider
+from web3 import Web3
+from web3._utils.request import make_post_request
+from web3.exceptions import ContractLogicError
+from web3.exceptions import ExtraDataLengthError
+from web3.middleware import geth_poa_middleware
+from web3.types import BlockData
+from web3.types import BlockIdentifier
+
+from telliot_feeds.utils.block_resolver import REORG_DEPTH
+from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import record_rpc_request
+from telliot_feeds.utils.metrics import rpc_errors
+
+
+logger = get_logger(__name__)
+
+#: Seconds requests are collected before a batch is sent
+BATCH_WINDOW = 0.01
+
+#: Maximum number of requests in a batch
+MAX_BATCH_SIZE = 100
+
+#: Maximum number of cached block headers per chain
+MAX_CACHED_HEADERS = 4096
+
+#: A JSON-RPC method and its params
+RPCCall = Tuple[str, Sequence[Any]]
+
+
+class RPCError(ValueError):
+    """Error returned by the node for a JSON-RPC request"""
+
+    def __init__(self, method: str, error: Any) -> None:
+        message = error.get("message", error) if isinstance(error, dict) else error
+        super().__init__(f"{method} failed: {message}")
+        self.method = method
+        self.error = error
+
+
+def _is_block_hash(block: BlockIdentifier) -> bool:
+    return isinstance(block, bytes) or (isinstance(block, str) and block.startswith("0x") and len(block) == 66)
+
+
+def block_param(block: BlockIdentifier) -> Any:
+    """Format a block number, tag or hash as a JSON-RPC block param"""
+    if isinstance(block, int):
+        return hex(block)
+    if _is_block_hash(block):
+        return {"blockHash": HexBytes(block).hex()}
+    return block
+
+
+def get_block_call(block: BlockIdentifier) -> RPCCall:
+    """Request for a block header by number, tag or hash"""
+    if _is_block_hash(block):
+        return ("eth_getBlockByHash", [HexBytes(block).hex(), False])
+    return ("eth_getBlockByNumber", [block_param(block), False])
+
+
+def inject_poa_middleware(w3: Web3) -> None:
+    """Inject the POA middleware, if it wasn't injected yet"""
+    if "geth_poa_middleware" in w3.middleware_onion:
+        return
+    try:
+        w3.middleware_onion.inject(geth_poa_middleware, name="geth_poa_middleware", layer=0)
+    except ValueError as e:
+        logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
+
+
+def result_or_raise(method: str, response: Dict[str, Any]) -> Any:
+    """Result of a JSON-RPC response, raises RPCError (ContractLogicError for reverts) if it's an error"""
+    if "error" in response:
+        error = response["error"]
+        message = str(error.get("message", "")) if isinstance(error, dict) else str(error)
+        if method == "eth_call" and "revert" in message.lower():
+            raise ContractLogicError(message)
+        raise RPCError(method, error)
+    return response.get("result")
+
+
+class ChainClient:
+    """JSON-RPC client for a single chain, shared by its EVM sources"""
+
+    def __init__(self, w3: Web3, chain_id: Optional[int] = None) -> None:
+        self.w3 = w3
+        self.chain_id = chain_id
+        #: whether the chain needs the POA middleware, None until a block was fetched
+        self.poa: Optional[bool] = "geth_poa_middleware" in w3.middleware_onion or None
+        #: whether the node accepts batch requests
+        self.batching = isinstance(w3.provider, HTTPProvider)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._headers: "OrderedDict[int, BlockData]" = OrderedDict()
+        self._latest_number = 0
+        self._code: Dict[str, HexBytes] = {}
+        # requests waiting to be sent in the next batch, with the futures of their responses
+        self._queue: List[Tuple[RPCCall, "asyncio.Future[Dict[str, Any]]"]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def batch(self, calls: Sequence[RPCCall]) -> List[Dict[str, Any]]:
+        """Send requests in a single batch (or one by one if the node doesn't accept batches)
+
+        Returns the JSON-RPC response of each request, in order. Responses may be errors,
+        see `result_or_raise`.
+        """
+        responses: List[Dict[str, Any]] = []
+        for start in range(0, len(calls), MAX_BATCH_SIZE):
+            end = start + MAX_BATCH_SIZE
+            responses += self._send(calls[start:end])
+        return responses
+
+    def _send(self, calls: Sequence[RPCCall]) -> List[Dict[str, Any]]:
+        for method, _ in calls:
+            record_rpc_request(method)
+        try:
+            responses = self._post(calls)
+        except Exception:
+            for method, _ in calls:
+                rpc_errors.inc(method=method)
+            raise
+        for (method, _), response in zip(calls, responses):
+            if "error" in response:
+                rpc_errors.inc(method=method)
+        return responses
+
+    def _post(self, calls: Sequence[RPCCall]) -> List[Dict[str, Any]]:
+        # batched requests bypass web3's middlewares, their results are raw JSON-RPC results
+        if self.batching and len(calls) > 1:
+            with self._lock:
+                ids = [next(self._ids) for _ in calls]
+            payload = [
+                {"jsonrpc": "2.0", "method": method, "params": list(params), "id": i}
+                for i, (method, params) in zip(ids, calls)
+            ]
+            provider = self.w3.provider
+            assert isinstance(provider, HTTPProvider) and provider.endpoint_uri is not None
+            raw = make_post_request(
+                provider.endpoint_uri, json.dumps(payload).encode(), **dict(provider.get_request_kwargs())
+            )
+            responses = json.loads(raw)
+            if isinstance(responses, list):
+                by_id = {r.get("id"): r for r in responses if isinstance(r, dict)}
+                missing = {"error": {"message": "Missing response in batch"}}
+                return [by_id.get(i, missing) for i in ids]
+            logger.info(f"Node for chain {self.chain_id} doesn't accept batch requests, sending them one by one")
+            self.batching = False
+        return [dict(self.w3.provider.make_request(method, list(params))) for method, params in calls]  # type: ignore
+
+    async def request_batch(self, calls: Sequence[RPCCall]) -> List[Dict[str, Any]]:
+        """Send requests in the next batch, together with requests made concurrently by other sources
+
+        Returns the JSON-RPC response of each request, in order.
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for call in calls:
+            future: "asyncio.Future[Dict[str, Any]]" = loop.create_future()
+            self._queue.append((call, future))
+            futures.append(future)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(BATCH_WINDOW, lambda: asyncio.ensure_future(self._flush()))
+        return list(await asyncio.gather(*futures))
+
+    async def request(self, method: str, params: Sequence[Any]) -> Any:
+        """Result of a request sent in the next batch, raises RPCError if the node returned an error"""
+        (response,) = await self.request_batch([(method, params)])
+        return result_or_raise(method, response)
+
+    async def _flush(self) -> None:
+        queue, self._queue = self._queue, []
+        self._flush_handle = None
+        if not queue:
+            return
+        # identical requests, e.g. several sources reading the latest block, are sent once
+        keys = [json.dumps([method, list(params)], sort_keys=True) for (method, params), _ in queue]
+        unique = {key: call for key, (call, _) in zip(keys, queue)}
+        try:
+            responses = await asyncio.to_thread(self.batch, list(unique.values()))
+        except Exception as e:
+            for _, future in queue:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        by_key = dict(zip(unique, responses))
+        for key, (_, future) in zip(keys, queue):
+            if not future.done():
+                future.set_result(by_key[key])
+
+    def get_block(self, block: BlockIdentifier, full_transactions: bool = False) -> Optional[BlockData]:
+        """Get a block through web3, injecting the POA middleware if the chain needs it
+
+        Headers (blocks without full transactions) deeper than `REORG_DEPTH` are cached.
+        Returns None if the block can't be fetched.
+        """
+        if isinstance(block, int) and not full_transactions:
+            with self._lock:
+                header = self._headers.get(block)
+                if header is not None:
+                    self._headers.move_to_end(block)
+                    return header
+        try:
+            try:
+                data = self.w3.eth.get_block(block, full_transactions)
+            except ExtraDataLengthError as e:
+                logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {e}")
+                inject_poa_middleware(self.w3)
+                data = self.w3.eth.get_block(block, full_transactions)
+                self.poa = True
+        except Exception as e:
+            logger.error(f"Error fetching block info: {e}")
+            return None
+        if self.poa is None:
+            self.poa = False
+        self._cache_header(data)
+        return data
+
+    def _cache_header(self, data: BlockData) -> None:
+        number = data.get("number")
+        if number is None:
+            return
+        with self._lock:
+            self._latest_number = max(self._latest_number, number)
+            if number > self._latest_number - REORG_DEPTH:
+                return
+            if data.get("transactions") and not isinstance(data["transactions"][0], (bytes, str)):
+                # keep headers only, without the full transactions
+                data = BlockData({**data, "transactions": [tx["hash"] for tx in data["transactions"]]})  # type: ignore
+            self._headers[number] = data
+            self._headers.move_to_end(number)
+            while len(self._headers) > MAX_CACHED_HEADERS:
+                self._headers.popitem(last=False)
+
+    def cached_header(self, number: int) -> Optional[BlockData]:
+        """Cached header of a block, None if it isn't cached"""
+        with self._lock:
+            return self._headers.get(number)
+
+    def get_code(self, address: str) -> HexBytes:
+        """Bytecode of a contract, cached once it's deployed"""
+        code = self._code.get(address)
+        if code is None:
+            (response,) = self.batch([("eth_getCode", [address, "latest"])])
+            code = HexBytes(result_or_raise("eth_getCode", response) or "0x")
+            if len(code) > 0:
+                self._code[address] = code
+        return code
+
+
+_clients: Dict[Tuple[int, int], ChainClient] = {}
+
+
+def get_chain_client(chain_id: int, w3: Web3) -> ChainClient:
+    """Get the client shared by all sources on a chain, using the chain's web3 instance"""
+    key = (chain_id, id(w3))
+    client = _clients.get(key)
+    if client is None or client.w3 is not w3:
+        client = ChainClient(w3, chain_id=chain_id)
+        _clients[key] = client
+    return client
@@ -2,12 +2,20 @@
 Original code taken from unmaintained package:
 https://github.com/johejo/inputimeout/blob/master/inputimeout/inputimeout.py
 """
+import contextvars
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Optional
 
 DEFAULT_TIMEOUT = 600.0  # 10 mins
 # DEFAULT_TIMEOUT = 10.0  # 10 secs
 INTERVAL = 0.05
+CANCEL_INTERVAL = 0.5
 
 SP = " "
 CR = "\r"
@@ -19,6 +27,53 @@ class TimeoutOccurred(Exception):
     pass
 
 
+class InputCancelled(TimeoutOccurred):
+    """Waiting for input was cancelled, e.g. because a value was staged in the manual inbox"""
+
+
+class StdinClosed(TimeoutOccurred):
+    """No input can be read, stdin is closed (e.g. /dev/null when running as a service)"""
+
+
+class StagedAnswersExhausted(TimeoutOccurred):
+    """All staged answers were used, but the prompts asked for more, e.g. if they rejected an answer"""
+
+
+# answers to prompts staged in the manual inbox, see `staged_answers`
+_staged: contextvars.ContextVar[Optional[Iterator[str]]] = contextvars.ContextVar("staged_answers", default=None)
+# set to stop waiting for input, see `input_cancelled`
+_cancel: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar("input_cancel", default=None)
+
+
+@contextmanager
+def staged_answers(answers: List[str]) -> Iterator[None]:
+    """Answer the prompts in the block with staged answers instead of reading stdin
+
+    The answers are followed by an empty answer to confirm them, manual sources
+    ask for confirmation ("Press [ENTER] to confirm") once they got their values.
+    """
+    token = _staged.set(iter(answers + [""]))
+    try:
+        yield
+    finally:
+        _staged.reset(token)
+
+
+@contextmanager
+def input_cancelled(event: threading.Event) -> Iterator[None]:
+    """Prompts in the block raise InputCancelled once the event is set"""
+    token = _cancel.set(event)
+    try:
+        yield
+    finally:
+        _cancel.reset(token)
+
+
+def _cancelled() -> bool:
+    event = _cancel.get()
+    return event is not None and event.is_set()
+
+
 def echo(string: str) -> None:
     sys.stdout.write(string)
     sys.stdout.flush()
@@ -28,15 +83,28 @@ def posix_inputimeout(prompt: str = "", timeout: float = DEFAULT_TIMEOUT) -> Any
     echo(prompt)
     sel = selectors.DefaultSelector()
     sel.register(sys.stdin, selectors.EVENT_READ)
-    events = sel.select(timeout)
-
-    if events:
-        key, _ = events[0]
-        return key.fileobj.readline().rstrip(LF)  # type: ignore
-    else:
-        echo(LF)
-        termios.tcflush(sys.stdin, termios.TCIFLUSH)
-        raise TimeoutOccurred
+    end = time.monotonic() + timeout
+    try:
+        while True:
+            # wake up regularly to check whether waiting was cancelled
+            events = sel.select(min(max(end - time.monotonic(), 0), CANCEL_INTERVAL))
+            if events:
+                key, _ = events[0]
+                line = key.fileobj.readline()  # type: ignore
+                if not line:
+                    raise StdinClosed
+                return line.rstrip(LF)
+            if _cancelled():
+                echo(LF)
+                raise InputCancelled
+            if time.monotonic() >= end:
+                break
+    finally:
+        sel.close()
+
+    echo(LF)
+    termios.tcflush(sys.stdin, termios.TCIFLUSH)
+    raise TimeoutOccurred
 
 
 def win_inputimeout(prompt: str = "", timeout: float = DEFAULT_TIMEOUT) -> str:
@@ -46,6 +114,9 @@ def win_inputimeout(prompt: str = "", timeout: float = DEFAULT_TIMEOUT) -> str:
     line = ""
 
     while time.monotonic() < end:
+        if _cancelled():
+            echo(CRLF)
+            raise InputCancelled
         if msvcrt.kbhit():  # type: ignore
             c = msvcrt.getwche()  # type: ignore
             if c in (CR, LF):
@@ -75,13 +146,17 @@ except ImportError:
     input_timeout_func = posix_inputimeout
 
 else:
-    import time
-
     input_timeout_func = win_inputimeout
 
 
 class InputTimeout:
     def __call__(self, prompt: str = "", timeout: float = DEFAULT_TIMEOUT) -> Any:
+        staged = _staged.get()
+        if staged is not None:
+            try:
+                return next(staged)
+            except StopIteration:
+                raise StagedAnswersExhausted
         return input_timeout_func(prompt, timeout)
 
 
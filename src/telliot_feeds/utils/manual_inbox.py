@@ -0,0 +1,290 @@
+"""Inbox of manually entered values, staged ahead of time by operators
+
+Manual sources ask the operator for a value on stdin. Instead, operators can
+stage values in the inbox, a directory watched by the reporter (by default
+`~/telliot/manual_inbox`), e.g. with `telliot manual stage`. Each JSON file in
+the directory maps query ids to the answers to a source's prompts, in order:
+
+    {
+        "0x83a7f3d4...": "1234.5",
+        "0x2b563420...": ["1234.5", "1.0"]
+    }
+
+Confirmation prompts ("Press [ENTER] to confirm") are skipped for staged
+values. A staged value stays in the inbox until the report using it is sent
+(see `consume_staged_values`), so it's used again if the report is cancelled
+(e.g. by the reporter lock or a profitability check). A staged value the
+source rejects is removed.
+
+While a manual source waits for the operator, the prompt runs in a worker
+thread, so the reporter keeps serving automated feeds, and the inbox is polled
+for a value staged in the meantime.
+"""
+import asyncio
+import contextvars
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TypeVar
+from typing import Union
+
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.input_timeout import DEFAULT_TIMEOUT
+from telliot_feeds.utils.input_timeout import input_cancelled
+from telliot_feeds.utils.input_timeout import staged_answers
+from telliot_feeds.utils.input_timeout import StagedAnswersExhausted
+from telliot_feeds.utils.input_timeout import StdinClosed
+from telliot_feeds.utils.input_timeout import TimeoutOccurred
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+#: Seconds between checks of the inbox for newly staged values
+POLL_INTERVAL = 1.0
+
+Answers = Union[str, List[str]]
+
+#: Query id (hex) the manual source being fetched answers, None outside of `manual_query`
+current_query_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("manual_query_id", default=None)
+
+
+def normalize_query_id(query_id: Union[str, bytes]) -> str:
+    """Query id as lowercase hex with 0x prefix"""
+    if isinstance(query_id, bytes):
+        return "0x" + query_id.hex()
+    query_id = query_id.lower()
+    return query_id if query_id.startswith("0x") else "0x" + query_id
+
+
+class ManualInbox:
+    """Directory of JSON files with staged answers to manual sources, by query id"""
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None) -> None:
+        self.directory = Path(directory) if directory is not None else Path(default_homedir()) / "manual_inbox"
+        self._lock = threading.Lock()
+        # staged answers used for reports not sent yet, by query id
+        self._used: Dict[str, List[str]] = {}
+
+    def _files(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(p for p in self.directory.glob("*.json") if p.is_file())
+
+    def _read(self, path: Path) -> Dict[str, Answers]:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to read staged values from {path}: {e}")
+            return {}
+        if not isinstance(data, dict):
+            logger.warning(f"Staged values in {path} must be a JSON object mapping query ids to values")
+            return {}
+        return {normalize_query_id(k): v for k, v in data.items()}
+
+    def _write(self, path: Path, values: Dict[str, Answers]) -> None:
+        if not values:
+            path.unlink(missing_ok=True)
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(values, f, indent=2)
+        os.replace(tmp, path)
+
+    def put(self, query_id: Union[str, bytes], answers: Answers) -> None:
+        """Stage answers for a query, replacing answers staged before"""
+        key = normalize_query_id(query_id)
+        with self._lock:
+            for path in self._files():
+                values = self._read(path)
+                if key in values:
+                    del values[key]
+                    self._write(path, values)
+            path = self.directory / f"{key}.json"
+            self._write(path, {key: answers})
+
+    def pending(self) -> Dict[str, Answers]:
+        """All staged answers by query id"""
+        values: Dict[str, Answers] = {}
+        with self._lock:
+            for path in self._files():
+                for key, answers in self._read(path).items():
+                    values.setdefault(key, answers)
+        return values
+
+    def peek(self, query_id: Union[str, bytes]) -> Optional[List[str]]:
+        """Answers staged for a query, without removing them, None if there are none"""
+        key = normalize_query_id(query_id)
+        with self._lock:
+            for path in self._files():
+                values = self._read(path)
+                if key in values:
+                    return _as_list(values[key])
+        return None
+
+    def take(self, query_id: Union[str, bytes], answers: Optional[List[str]] = None) -> Optional[List[str]]:
+        """Remove and return the answers staged for a query, None if there are none
+
+        If `answers` is given, the staged answers are only removed if they're still
+        the same (the operator may have staged new answers meanwhile).
+        """
+        key = normalize_query_id(query_id)
+        with self._lock:
+            for path in self._files():
+                values = self._read(path)
+                if key not in values:
+                    continue
+                staged = _as_list(values[key])
+                if answers is not None and staged != answers:
+                    return None
+                del values[key]
+                self._write(path, values)
+                return staged
+        return None
+
+    def mark_used(self, query_id: Union[str, bytes], answers: List[str]) -> None:
+        """Record the staged answers used for a query's report, removed by `consume`"""
+        with self._lock:
+            self._used[normalize_query_id(query_id)] = answers
+
+    def consume(self, query_id: Union[str, bytes]) -> None:
+        """Remove the staged answers used for a query's report, once the report is sent"""
+        key = normalize_query_id(query_id)
+        with self._lock:
+            answers = self._used.pop(key, None)
+        if answers is not None:
+            self.take(key, answers)
+
+    async def wait_for(
+        self, query_id: Union[str, bytes], timeout: Optional[float] = None, interval: float = POLL_INTERVAL
+    ) -> Optional[List[str]]:
+        """Wait for answers to be staged for a query, None if none were staged before the timeout"""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            answers = await asyncio.to_thread(self.peek, query_id)
+            if answers is not None:
+                return answers
+            if deadline is not None and loop.time() >= deadline:
+                return None
+            delay = interval if deadline is None else min(interval, max(deadline - loop.time(), 0))
+            await asyncio.sleep(delay)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._used.clear()
+            for path in self._files():
+                path.unlink(missing_ok=True)
+
+
+def _as_list(answers: Answers) -> List[str]:
+    return [str(a) for a in answers] if isinstance(answers, list) else [str(answers)]
+
+
+_inboxes: Dict[Path, ManualInbox] = {}
+
+
+def get_manual_inbox() -> ManualInbox:
+    """Get the manual inbox in the telliot home directory"""
+    path = Path(default_homedir()) / "manual_inbox"
+    inbox = _inboxes.get(path)
+    if inbox is None:
+        inbox = ManualInbox(path)
+        _inboxes[path] = inbox
+    return inbox
+
+
+@contextmanager
+def manual_query(query_id: Optional[Union[str, bytes]]) -> Iterator[None]:
+    """Manual sources fetched in the block answer this query, and may use values staged for it"""
+    token = current_query_id.set(None if query_id is None else normalize_query_id(query_id))
+    try:
+        yield
+    finally:
+        current_query_id.reset(token)
+
+
+async def fetch_datapoint(datafeed: DataFeed[Any]) -> OptionalDataPoint[Any]:
+    """Fetch a new datapoint from a feed's source, using values staged for the feed's query"""
+    try:
+        query_id: Optional[bytes] = datafeed.query.query_id
+    except Exception:
+        query_id = None
+    with manual_query(query_id):
+        return await datafeed.source.fetch_new_datapoint()
+
+
+def consume_staged_values(datafeed: DataFeed[Any]) -> None:
+    """Remove the values staged for a feed's query from the inbox, once a report using them was sent"""
+    try:
+        query_id: bytes = datafeed.query.query_id
+    except Exception:
+        return
+    get_manual_inbox().consume(query_id)
+
+
+async def manual_input(parse: Callable[[], T], timeout: float = DEFAULT_TIMEOUT) -> T:
+    """Run a manual source's prompts without blocking the event loop
+
+    If answers are staged for the current query (see `manual_query`), the prompts
+    are answered with them. Otherwise the prompts run in a worker thread, until
+    the operator answers on stdin or answers are staged in the inbox.
+
+    Raises TimeoutOccurred if neither happens within the timeout.
+    """
+    query_id = current_query_id.get()
+    if query_id is None:
+        return await asyncio.to_thread(parse)
+
+    inbox = get_manual_inbox()
+    answers = inbox.peek(query_id)
+    if answers is None:
+        cancel = threading.Event()
+
+        def prompt() -> T:
+            with input_cancelled(cancel):
+                return parse()
+
+        prompting = asyncio.ensure_future(asyncio.to_thread(prompt))
+        waiting = asyncio.ensure_future(inbox.wait_for(query_id, timeout=timeout))
+        try:
+            done, _ = await asyncio.wait({prompting, waiting}, return_when=asyncio.FIRST_COMPLETED)
+            if prompting in done:
+                try:
+                    return prompting.result()
+                except StdinClosed:
+                    logger.info(f"No input on stdin, waiting for a value staged in the manual inbox for {query_id}")
+            answers = await waiting
+        finally:
+            cancel.set()
+            waiting.cancel()
+            await asyncio.gather(prompting, waiting, return_exceptions=True)
+        if answers is None:
+            raise TimeoutOccurred
+        logger.info(f"Using value staged in the manual inbox for query {query_id}")
+
+    try:
+        with staged_answers(answers):
+            value = parse()
+    except StagedAnswersExhausted:
+        logger.warning(f"Value staged in the manual inbox for query {query_id} was rejected, removing it")
+        inbox.take(query_id, answers)
+        raise
+    # removed from the inbox once the report is sent, see consume_staged_values
+    inbox.mark_used(query_id, answers)
+    return value
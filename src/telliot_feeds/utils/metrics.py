@@ -0,0 +1,409 @@
+"""In-process metrics of price sources and reports
+
+Counters, gauges and histograms are kept in the process-wide `metrics`
+registry and can be exposed in the Prometheus text format over HTTP with
+`serve_metrics`, or written to a JSON file with `MetricsRegistry.write_json`.
+
+Recorded metrics:
+- fetch latency, errors and staleness of each price source
+- duration of each report step (see `ReportPipeline`), of sending and of confirming transactions
+- JSON-RPC requests by method, and per report
+"""
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Default histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[str, ...]
+
+
+class Metric:
+    """Base class of metrics, values are kept per combination of label values"""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, labels: Dict[str, Any]) -> Labels:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, values: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, values))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    def samples(self) -> List[Tuple[str, float]]:
+        """Prometheus samples, as (name with labels, value)"""
+        raise NotImplementedError
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """JSON serializable values by labels"""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name} {_format_value(value)}" for name, value in self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._labels(labels), 0)
+
+    def samples(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name + self._format_labels(key), value) for key, value in values]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            values = list(self._values.items())
+        return [{"labels": dict(zip(self.labelnames, key)), "value": value} for key, value in values]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values, counted in buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per labels: count of each bucket (not cumulative, last one is +Inf), sum of values
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._labels(labels)
+        i = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[i] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the number of seconds the block took, also if it raised"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        return sum(self._counts.get(self._labels(labels), ()))
+
+    def sum(self, **labels: Any) -> float:
+        return self._sums.get(self._labels(labels), 0.0)
+
+    def _items(self) -> List[Tuple[Labels, List[int], float]]:
+        with self._lock:
+            return [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+
+    def samples(self) -> List[Tuple[str, float]]:
+        samples = []
+        for key, counts, total in self._items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = _format_value(bound)
+                samples.append((self.name + "_bucket" + self._format_labels(key, ("le", le)), float(cumulative)))
+            samples.append((self.name + "_sum" + self._format_labels(key), total))
+            samples.append((self.name + "_count" + self._format_labels(key), float(cumulative)))
+        return samples
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        snapshot = []
+        for key, counts, total in self._items():
+            count = sum(counts)
+            snapshot.append(
+                {
+                    "labels": dict(zip(self.labelnames, key)),
+                    "count": count,
+                    "sum": total,
+                    "mean": total / count,
+                    "buckets": {_format_value(b): c for b, c in zip(self.buckets + (math.inf,), _cumsum(counts))},
+                }
+            )
+        return snapshot
+
+
+def _cumsum(values: List[int]) -> List[int]:
+    total = 0
+    result = []
+    for v in values:
+        total += v
+        result.append(total)
+    return result
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Metrics by name"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: Callable[..., Metric], name: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)  # type: ignore
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)  # type: ignore
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)  # type: ignore
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() + "\n" for metric in metrics)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as a JSON serializable dict"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            "timestamp": time.time(),
+            "metrics": {m.name: {"type": m.kind, "help": m.help, "values": m.snapshot()} for m in metrics},
+        }
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        """Write a snapshot of all metrics to a JSON file
+
+        The file is replaced atomically, so readers never see a partial snapshot.
+        """
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+
+#: Process-wide metrics registry
+metrics = MetricsRegistry()
+
+source_fetch_seconds = metrics.histogram(
+    "telliot_source_fetch_seconds", "Price source request latency", ("source", "asset", "currency")
+)
+source_errors = metrics.counter(
+    "telliot_source_errors_total", "Price source requests that returned no price", ("source", "asset", "currency")
+)
+source_staleness_seconds = metrics.gauge(
+    "telliot_source_staleness_seconds",
+    "Age of the latest price returned by a price source when it was fetched",
+    ("source", "asset", "currency"),
+)
+report_step_seconds = metrics.histogram(
+    "telliot_report_step_seconds",
+    "Duration of report steps, including sending and confirming transactions",
+    ("step",),
+)
+report_step_errors = metrics.counter("telliot_report_step_errors_total", "Report steps that failed", ("step",))
+rpc_requests = metrics.counter("telliot_rpc_requests_total", "JSON-RPC requests sent to the node", ("method",))
+rpc_errors = metrics.counter(
+    "telliot_rpc_errors_total", "JSON-RPC requests that raised or returned an error", ("method",)
+)
+report_rpc_requests = metrics.histogram(
+    "telliot_report_rpc_requests",
+    "JSON-RPC requests sent per report",
+    buckets=(5, 10, 20, 50, 100, 200, 500),
+)
+
+
+class RPCCount:
+    """Number of JSON-RPC requests sent in a context"""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+
+_rpc_count: contextvars.ContextVar[Optional[RPCCount]] = contextvars.ContextVar("rpc_count", default=None)
+
+
+@contextmanager
+def count_rpc_requests() -> Iterator[RPCCount]:
+    """Count the JSON-RPC requests sent in the block
+
+    Includes requests sent by tasks and threads (`asyncio.to_thread`) started
+    in the block, since they inherit its context.
+    """
+    counter = RPCCount()
+    token = _rpc_count.set(counter)
+    try:
+        yield counter
+    finally:
+        _rpc_count.reset(token)
+
+
+def record_rpc_request(method: str) -> None:
+    """Count a JSON-RPC request, in the metrics and in the current `count_rpc_requests` block"""
+    rpc_requests.inc(method=method)
+    counter = _rpc_count.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def rpc_metrics_middleware(make_request: Callable[[str, Any], Any], w3: Any) -> Callable[[str, Any], Any]:
+    """Web3 middleware counting JSON-RPC requests"""
+
+    def middleware(method: str, params: Any) -> Any:
+        record_rpc_request(method)
+        try:
+            response = make_request(method, params)
+        except Exception:
+            rpc_errors.inc(method=method)
+            raise
+        if isinstance(response, dict) and "error" in response:
+            rpc_errors.inc(method=method)
+        return response
+
+    return middleware
+
+
+def instrument_web3(w3: Any) -> None:
+    """Add the RPC metrics middleware to a web3 instance, if it wasn't added yet"""
+    if "rpc_metrics" not in w3.middleware_onion:
+        w3.middleware_onion.add(rpc_metrics_middleware, "rpc_metrics")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = metrics
+
+    def do_GET(self) -> None:
+        path = self.path.split("?")[0]
+        if path in ("/", "/metrics"):
+            body = self.registry.render().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body = json.dumps(self.registry.snapshot()).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = metrics) -> ThreadingHTTPServer:
+    """Serve metrics over HTTP in a background thread
+
+    Prometheus metrics are served at /metrics and a JSON snapshot at /metrics.json.
+    Call `shutdown()` on the returned server to stop it.
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    logger.info(f"Serving metrics at http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def write_metrics_periodically(
+    path: Union[str, Path], interval: float = 15.0, registry: MetricsRegistry = metrics
+) -> threading.Event:
+    """Write a JSON snapshot of the metrics every `interval` seconds in a background thread
+
+    Set the returned event to stop writing, a last snapshot is written then.
+    """
+    stop = threading.Event()
+
+    def write_until_stopped() -> None:
+        while True:
+            stopped = stop.wait(interval)
+            try:
+                registry.write_json(path)
+            except OSError as e:
+                logger.warning(f"Unable to write metrics to {path}: {e}")
+            if stopped:
+                return
+
+    threading.Thread(target=write_until_stopped, name="metrics-writer", daemon=True).start()
+    logger.info(f"Writing metrics to {path} every {interval} seconds")
+    return stop
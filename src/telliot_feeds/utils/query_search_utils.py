@@ -5,13 +5,13 @@ from typing import Optional
 from clamfig.base import Registry
 from eth_abi import decode_single
 from eth_abi.exceptions import NonEmptyPaddingBytes
-from web3 import Web3 as w3
 
 from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.feeds import DataFeed
 from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
 from telliot_feeds.feeds import MANUAL_FEEDS
 from telliot_feeds.queries.query import OracleQuery
+from telliot_feeds.queries.query import query_id_from_data
 from telliot_feeds.queries.query_catalog import query_catalog
 from telliot_feeds.utils.log import get_logger
 
@@ -62,7 +62,7 @@ def feed_from_catalog_feeds(qdata: bytes) -> Optional[DataFeed[Any]]:
 
     Return: DataFeed
     """
-    qid = w3.keccak(qdata).hex()
+    qid = query_id_from_data(qdata).hex()
     qtag = qtag_from_query_catalog(qid=qid)
     return CATALOG_FEEDS.get(qtag) if qtag else None
 
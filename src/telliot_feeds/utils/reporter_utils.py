@@ -109,13 +109,17 @@ def has_native_token_funds(
     web3: Web3,
     alert: Callable[[str], None] = alert_placeholder,
     min_balance: int = 10**18,
+    balance: Optional[int] = None,
 ) -> bool:
-    """Check if an account has native token funds."""
-    try:
-        balance = web3.eth.get_balance(account)
-    except Exception as e:
-        logger.warning(f"Error fetching native token balance for {account}: {e}")
-        return False
+    """Check if an account has native token funds.
+
+    The balance is fetched unless it was already read (e.g. in a multicall)."""
+    if balance is None:
+        try:
+            balance = web3.eth.get_balance(account)
+        except Exception as e:
+            logger.warning(f"Error fetching native token balance for {account}: {e}")
+            return False
 
     if balance < min_balance:
         str_bal = f"{balance / 10**18:.2f}"
@@ -251,7 +255,6 @@ def fee_history_priority_fee_estimate(fee_history: FeeHistory, priority_fee_max:
     Returns:
         Estimated priority fee in wei
     """
-    priority_fee_min = Wei(1_000_000_000)  # 1 gwei
     # grab only non-zero fees and average against only that list
     non_empty_block_fees = [fee[0] for fee in fee_history["reward"] if fee[0] != 0]
 
@@ -261,12 +264,18 @@ def fee_history_priority_fee_estimate(fee_history: FeeHistory, priority_fee_max:
 
     priority_fee_average_for_percentile = Wei(round(sum(non_empty_block_fees) / divisor))
 
-    if priority_fee_average_for_percentile > priority_fee_max:
+    return clamp_priority_fee(priority_fee_average_for_percentile, priority_fee_max)
+
+
+def clamp_priority_fee(priority_fee: Wei, priority_fee_max: Wei) -> Wei:
+    """Keep an estimated priority fee between 1 gwei and the maximum priority fee willing to pay"""
+    priority_fee_min = Wei(1_000_000_000)  # 1 gwei
+    if priority_fee > priority_fee_max:
         return priority_fee_max
-    elif priority_fee_average_for_percentile < priority_fee_min:
+    elif priority_fee < priority_fee_min:
         return priority_fee_min
     else:
-        return priority_fee_average_for_percentile
+        return priority_fee
 
 
 def current_time() -> int:
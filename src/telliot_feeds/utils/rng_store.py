@@ -0,0 +1,111 @@
+"""Local store of TellorRNG values by timestamp
+
+A TellorRNG value hashes the first Bitcoin block at or after the query's
+timestamp with the Ethereum block at that Bitcoin block's time. Once computed,
+the value and the blockhashes it was computed from are kept in a SQLite table
+keyed by timestamp, so reporting or re-checking a timestamp doesn't query
+blockchain.info, Etherscan and the Ethereum node again.
+"""
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict
+from typing import NamedTuple
+from typing import Optional
+
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class RNGValue(NamedTuple):
+    """TellorRNG value for a timestamp, with the blockhashes it was computed from"""
+
+    timestamp: int
+    value: bytes
+    btc_hash: str
+    btc_timestamp: int
+    eth_hash: str
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rng_values (
+    timestamp INTEGER PRIMARY KEY,
+    value BLOB NOT NULL,
+    btc_hash TEXT NOT NULL,
+    btc_timestamp INTEGER NOT NULL,
+    eth_hash TEXT NOT NULL,
+    computed_at INTEGER NOT NULL
+);
+"""
+
+
+class RNGStore:
+    """TellorRNG values computed so far, by timestamp"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Args:
+        - path: SQLite database file, in memory only if None
+        """
+        self.path = path
+        self._locks: Dict[int, asyncio.Lock] = {}
+        database = ":memory:"
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            database = str(path)
+        self._db = sqlite3.connect(database)
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def default(cls) -> "RNGStore":
+        """Create a store persisted in the telliot home directory"""
+        path = Path(default_homedir()) / "rng_values.sqlite"
+        try:
+            return cls(path=path)
+        except sqlite3.Error as e:
+            logger.warning(f"Unable to open RNG store {path}, keeping values in memory: {e}")
+            return cls()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def lock(self, timestamp: int) -> asyncio.Lock:
+        """Lock to hold while checking and computing the value of a timestamp"""
+        lock = self._locks.get(timestamp)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[timestamp] = lock
+        return lock
+
+    def get(self, timestamp: int) -> Optional[RNGValue]:
+        row = self._db.execute(
+            "SELECT timestamp, value, btc_hash, btc_timestamp, eth_hash FROM rng_values WHERE timestamp = ?",
+            (timestamp,),
+        ).fetchone()
+        return None if row is None else RNGValue(int(row[0]), bytes(row[1]), str(row[2]), int(row[3]), str(row[4]))
+
+    def add(self, rng: RNGValue) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO rng_values VALUES (?, ?, ?, ?, ?, ?)", (*rng, int(time.time())))
+
+    def prune(self, before: int) -> None:
+        """Remove values of timestamps before the given time"""
+        self._locks = {ts: lock for ts, lock in self._locks.items() if ts >= before}
+        with self._db:
+            self._db.execute("DELETE FROM rng_values WHERE timestamp < ?", (before,))
+
+
+_store: Optional[RNGStore] = None
+
+
+def get_rng_store() -> RNGStore:
+    """Get the RNG store shared by TellorRNG sources and the precomputer"""
+    global _store
+    if _store is None:
+        _store = RNGStore.default()
+    return _store
@@ -1,18 +1,13 @@
-from statistics import stdev
-from typing import List
 from typing import Optional
 
+from telliot_feeds.utils.volatility import Closes
+from telliot_feeds.utils.volatility import volatility
 
-def stdev_calculator(close_prices: List[float]) -> Optional[float]:
+
+def stdev_calculator(close_prices: Closes) -> Optional[float]:
     """
     Calculates the percent change(daily returns) for a list of numbers and returns the standard deviation
-    """
 
-    pct_change = []
-    for i, j in zip(close_prices[:-1], close_prices[1:]):
-        try:
-            pct = (j - i) / i
-        except ZeroDivisionError:
-            pct = None
-        pct_change.append(pct)
-    return stdev(pct_change)  # type: ignore
+    Returns next to zero or missing prices are skipped, returns None if fewer than two returns are left.
+    """
+    return volatility(close_prices, kind="simple")
@@ -0,0 +1,228 @@
+"""Historical volatility of daily close prices
+
+Returns are computed over NumPy arrays of closes. Missing closes (gaps, NaN) and
+zero or negative prices make the returns next to them undefined (NaN), and
+undefined returns are left out of the volatility instead of failing it.
+
+Daily closes fetched by historical price sources are cached per source and pair
+(`get_daily_close_series`) and persisted in the candle store, so each volatility
+query only requests the candles since the last cached one.
+"""
+import bisect
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Literal
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+from telliot_feeds.utils.candle_store import CandleStore
+from telliot_feeds.utils.candle_store import get_candle_store
+from telliot_feeds.utils.candle_store import SeriesKey
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+ReturnKind = Literal["simple", "log"]
+Closes = Union[Sequence[Optional[float]], npt.NDArray[np.float64]]
+
+SECONDS_PER_DAY = 86400
+
+
+def as_closes(closes: Closes) -> npt.NDArray[np.float64]:
+    """Convert closes to a float array, with None and non-positive prices as NaN"""
+    array = np.array([np.nan if c is None else c for c in closes], dtype=np.float64)
+    array[~(array > 0)] = np.nan
+    return array
+
+
+def returns(closes: Closes, kind: ReturnKind = "simple") -> npt.NDArray[np.float64]:
+    """Returns between consecutive closes, NaN where either close is missing or not positive
+
+    Args:
+    - closes: close prices, oldest first
+    - kind: "simple" for percent changes, "log" for log returns
+    """
+    prices = as_closes(closes)
+    previous, current = prices[:-1], prices[1:]
+    if kind == "log":
+        result: npt.NDArray[np.float64] = np.log(current / previous)
+    elif kind == "simple":
+        result = np.asarray(current / previous - 1, dtype=np.float64)
+    else:
+        raise ValueError(f"Unknown return kind: {kind}")
+    return result
+
+
+def volatility(
+    closes: Closes, kind: ReturnKind = "simple", window: Optional[int] = None, ddof: int = 1
+) -> Optional[float]:
+    """Standard deviation of returns
+
+    Args:
+    - closes: close prices, oldest first
+    - kind: "simple" or "log" returns
+    - window: number of latest returns to use, all if None
+    - ddof: delta degrees of freedom, 1 for the sample standard deviation
+
+    Returns None if there are not enough defined returns.
+    """
+    r = returns(closes, kind)
+    if window is not None:
+        r = r[-window:]
+    r = r[~np.isnan(r)]
+    if len(r) <= ddof:
+        return None
+    return float(np.std(r, ddof=ddof))
+
+
+def rolling_volatility(
+    closes: Closes, window: int, kind: ReturnKind = "simple", ddof: int = 1
+) -> npt.NDArray[np.float64]:
+    """Volatility over a rolling window of returns
+
+    Element i is the volatility of the `window` returns ending with return i,
+    NaN if those returns don't have enough defined values.
+    """
+    r = returns(closes, kind)
+    defined = ~np.isnan(r)
+    values = np.where(defined, r, 0.0)
+
+    def window_sums(a: npt.NDArray[Any]) -> npt.NDArray[np.float64]:
+        cumulative = np.concatenate([[0.0], np.cumsum(a, dtype=np.float64)])
+        return np.asarray(cumulative[window:] - cumulative[:-window], dtype=np.float64)
+
+    result = np.full(len(r), np.nan)
+    if len(r) < window:
+        return result
+    count = window_sums(defined)
+    total = window_sums(values)
+    total_sq = window_sums(values * values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (total_sq - total * total / count) / (count - ddof)
+    variance = np.where(count > ddof, np.maximum(variance, 0.0), np.nan)
+    first_full_window = window - 1
+    result[first_full_window:] = np.sqrt(variance)
+    return result
+
+
+def ewma_volatility(closes: Closes, decay: float = 0.94, kind: ReturnKind = "log") -> Optional[float]:
+    """Exponentially weighted volatility of returns (RiskMetrics), latest returns weigh most
+
+    Args:
+    - closes: close prices, oldest first
+    - decay: weight of the previous variance, between 0 and 1
+    - kind: "simple" or "log" returns
+
+    Returns None if there are no defined returns.
+    """
+    if not 0 < decay < 1:
+        raise ValueError(f"Decay must be between 0 and 1: {decay}")
+    r = returns(closes, kind)
+    r = r[~np.isnan(r)]
+    if len(r) == 0:
+        return None
+    weights = (1 - decay) * decay ** np.arange(len(r) - 1, -1, -1, dtype=np.float64)
+    return float(np.sqrt(np.sum(weights * r * r) / np.sum(weights)))
+
+
+class DailyCloseSeries:
+    """Daily close prices of a pair from one source, one close per UTC day
+
+    A later candle for a day replaces the cached one, so a day that wasn't over
+    when it was fetched is updated the next time it's fetched.
+    """
+
+    def __init__(self, store: Optional[CandleStore] = None, key: Optional[SeriesKey] = None) -> None:
+        """
+        Args:
+        - store: candle store the series is loaded from and persisted to, in memory only if None
+        - key: key of the series in the store
+        """
+        # UTC day numbers (timestamp // 86400), sorted, and their candle timestamps and closes
+        self._days: List[int] = []
+        self._timestamps: List[int] = []
+        self._closes: List[float] = []
+        self.store = store
+        self.key = key
+        if store is not None and key is not None:
+            self._update(store.prices(key))
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Timestamp of the latest cached candle"""
+        return self._timestamps[-1] if self._timestamps else None
+
+    def fetch_start(self, start: int) -> int:
+        """Timestamp to fetch candles from so the series has all candles since start
+
+        If the cache already reaches back to start, only the latest cached candle and
+        newer ones are needed. The latest one is fetched again as its day may not have
+        been over when it was cached.
+        """
+        if not self._timestamps or self._timestamps[0] > start + SECONDS_PER_DAY or self._timestamps[-1] < start:
+            return start
+        return self._timestamps[-1]
+
+    def update(self, candles: Iterable[Tuple[float, float]]) -> None:
+        """Add or replace candles, given as (timestamp in seconds, close price)"""
+        candles = list(candles)
+        self._update(candles)
+        if self.store is not None and self.key is not None:
+            self.store.add(self.key, candles)
+
+    def _update(self, candles: Iterable[Tuple[float, float]]) -> None:
+        for timestamp, close in candles:
+            day = int(timestamp) // SECONDS_PER_DAY
+            i = bisect.bisect_left(self._days, day)
+            if i < len(self._days) and self._days[i] == day:
+                self._timestamps[i] = int(timestamp)
+                self._closes[i] = float(close)
+            else:
+                self._days.insert(i, day)
+                self._timestamps.insert(i, int(timestamp))
+                self._closes.insert(i, float(close))
+
+    def closes(self, start: Optional[int] = None, end: Optional[int] = None) -> npt.NDArray[np.float64]:
+        """Closes of candles with timestamps from start to end (inclusive), oldest first
+
+        Days without a candle between the first and last one are NaN.
+        """
+        lo = 0 if start is None else bisect.bisect_left(self._timestamps, start)
+        hi = len(self._timestamps) if end is None else bisect.bisect_right(self._timestamps, end)
+        if lo >= hi:
+            return np.empty(0, dtype=np.float64)
+        days = np.asarray(self._days[lo:hi], dtype=np.int64)
+        result = np.full(days[-1] - days[0] + 1, np.nan)
+        result[days - days[0]] = self._closes[lo:hi]
+        return result
+
+    def latest(self, count: int) -> npt.NDArray[np.float64]:
+        """Closes of the latest `count` days with a candle, gaps between them are NaN"""
+        if count <= 0 or not self._days:
+            return np.empty(0, dtype=np.float64)
+        first = self._timestamps[max(len(self._timestamps) - count, 0)]
+        return self.closes(start=first)
+
+
+_series: Dict[SeriesKey, DailyCloseSeries] = {}
+
+
+def get_daily_close_series(source: str, asset: str, currency: str) -> DailyCloseSeries:
+    """Get the daily close series of a pair shared by all sources fetching it from `source`"""
+    key = SeriesKey(source, f"{asset.lower()}{currency.lower()}", SECONDS_PER_DAY)
+    series = _series.get(key)
+    if series is None:
+        series = DailyCloseSeries(store=get_candle_store(), key=key)
+        _series[key] = series
+    return series
@@ -0,0 +1,58 @@
+"""Tests for the lazily resolved feed registries."""
+import subprocess
+import sys
+
+import pytest
+
+import telliot_feeds.feeds as feeds
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.feeds import CATALOG_FEEDS
+from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
+from telliot_feeds.feeds.registry import LazyFeedRegistry
+
+
+def run_python(code: str) -> str:
+    """Run code in a fresh interpreter so module import state starts cold"""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_registry_resolves_feeds():
+    feed = CATALOG_FEEDS["eth-usd-spot"]
+    assert isinstance(feed, DataFeed)
+    assert feed is feeds.eth_usd_median_feed
+    assert CATALOG_FEEDS.get("eth-usd-spot") is feed
+    assert CATALOG_FEEDS.get("not-a-feed") is None
+    assert "not-a-feed" not in CATALOG_FEEDS
+    assert "SpotPrice" in DATAFEED_BUILDER_MAPPING
+
+    with pytest.raises(AttributeError):
+        feeds.not_a_feed
+
+
+def test_lookup_only_imports_requested_feed():
+    registry = LazyFeedRegistry({"a": "eth_usd_median_feed", "b": "not_a_feed"})
+    assert len(registry) == 2 and list(registry) == ["a", "b"]
+    assert registry["a"] is feeds.eth_usd_median_feed
+    with pytest.raises(AttributeError):
+        registry["b"]
+
+    loaded = run_python(
+        "import sys\n"
+        "from telliot_feeds.feeds import CATALOG_FEEDS\n"
+        "assert 'btc-usd-spot' in CATALOG_FEEDS\n"
+        "print(sys.modules.get('telliot_feeds.feeds.btc_usd_feed') is not None)\n"
+        "CATALOG_FEEDS['btc-usd-spot']\n"
+        "print(sys.modules.get('telliot_feeds.feeds.btc_usd_feed') is not None)\n"
+    )
+    assert loaded.split() == ["False", "True"]
+
+
+def test_import_loads_no_feeds():
+    """Importing the feeds package and its registries doesn't import any feed module"""
+    loaded = run_python(
+        "import sys\n"
+        "from telliot_feeds.feeds import CATALOG_FEEDS, DATAFEED_BUILDER_MAPPING\n"
+        "print(' '.join(sorted(m for m in sys.modules if m.startswith('telliot_feeds.feeds.'))))\n"
+    )
+    assert loaded.split() == ["telliot_feeds.feeds.registry"]
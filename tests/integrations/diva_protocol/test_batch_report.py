@@ -0,0 +1,148 @@
+"""
+Report and settle DIVA Protocol pools in batches.
+"""
+import asyncio
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.datasource import DataSource
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.integrations.diva_protocol import report
+from telliot_feeds.integrations.diva_protocol.pool_store import ReportedPoolsStore
+from telliot_feeds.integrations.diva_protocol.report import DIVAProtocolReporter
+from telliot_feeds.integrations.diva_protocol.utils import dict_to_pool
+from telliot_feeds.queries.diva_protocol import DIVAProtocol
+from utils import EXAMPLE_POOLS_FROM_SUBGRAPH
+
+
+DIVA_DIAMOND = "0x2C9c47E7d254e493f02acfB410864b9a86c28e1D"
+
+
+def bare_reporter(batch_size):
+    """Reporter with only the attributes batching uses, no node connection"""
+    r = DIVAProtocolReporter.__new__(DIVAProtocolReporter)
+    r.batch_size = batch_size
+    r.report_queue = deque()
+    r.diva_diamond_address = DIVA_DIAMOND
+    r.endpoint = SimpleNamespace(chain_id=5, network="goerli")
+    r.oracle = None
+    r.tx_manager = SimpleNamespace(pending={})
+    return r
+
+
+def distinct_pools(count):
+    pools = []
+    for i in range(count):
+        pool = dict_to_pool(EXAMPLE_POOLS_FROM_SUBGRAPH[0])
+        pool.pool_id = "0x" + f"{i:064x}"
+        pools.append(pool)
+    return pools
+
+
+@pytest.mark.asyncio
+async def test_report_counts_read_in_one_multicall(monkeypatch):
+    pools = distinct_pools(5)
+    reported = DIVAProtocol(poolId=bytes.fromhex(pools[1].pool_id[2:]), divaDiamond=DIVA_DIAMOND, chainId=5).query_id
+    multicalls = []
+
+    async def fetch_report_counts(oracle, query_ids):
+        multicalls.append(query_ids)
+        return {query_id: 1 if query_id == reported else 0 for query_id in query_ids}, ResponseStatus()
+
+    monkeypatch.setattr(report, "fetch_report_counts", fetch_report_counts)
+    store = ReportedPoolsStore()
+    store.add(pools[0].pool_id, 0, status="settled")
+    monkeypatch.setattr(report, "get_pool_store", lambda: store)
+
+    r = bare_reporter(batch_size=10)
+    unreported = await r.filter_unreported_pools(pools, limit=None)
+
+    assert [p.pool_id for p in unreported] == [p.pool_id for p in pools[2:]]
+    assert len(multicalls) == 1
+    assert len(multicalls[0]) == 4
+
+    assert len(await r.filter_unreported_pools(pools, limit=2)) == 2
+
+
+class CountingSource(DataSource[float]):
+    def __init__(self, started):
+        super().__init__()
+        self.started = started
+
+    async def fetch_new_datapoint(self):
+        self.started.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(0.1)
+        datapoint = (1.0, datetime_now_utc())
+        self.store_datapoint(datapoint)
+        return datapoint
+
+
+@pytest.mark.asyncio
+async def test_pools_queued_with_prices_fetched_together(monkeypatch):
+    pools = distinct_pools(6)
+    started = []
+
+    async def fetch_unreported_pools(limit):
+        return pools[:limit]
+
+    def assemble_diva_datafeed(pool, diva_diamond, chain_id):
+        query = DIVAProtocol(poolId=bytes.fromhex(pool.pool_id[2:]), divaDiamond=diva_diamond, chainId=chain_id)
+        return DataFeed(query=query, source=CountingSource(started))
+
+    monkeypatch.setattr(report, "assemble_diva_datafeed", assemble_diva_datafeed)
+
+    async def get_report_counts(query_ids):
+        return [(0, ResponseStatus()) for _ in query_ids]
+
+    r = bare_reporter(batch_size=4)
+    r.fetch_unreported_pools = fetch_unreported_pools
+    r.get_report_counts = get_report_counts
+
+    feeds = [await r.fetch_datafeed() for _ in range(4)]
+
+    assert [feed.query.poolId.hex() for feed in feeds] == [p.pool_id for p in pools[:4]]
+    # all pools' prices were fetched at once, when the queue was filled
+    assert len(started) == 4
+    assert max(started) - min(started) < 0.05
+    assert not r.report_queue
+
+
+@pytest.mark.asyncio
+async def test_queued_pools_reported_meanwhile_are_dropped(monkeypatch):
+    pools = distinct_pools(4)
+    query_ids = [
+        DIVAProtocol(poolId=bytes.fromhex(p.pool_id[2:]), divaDiamond=DIVA_DIAMOND, chainId=5).query_id for p in pools
+    ]
+    reported = set()
+    checked = []
+
+    async def fetch_unreported_pools(limit):
+        return [p for p, query_id in zip(pools, query_ids) if query_id not in reported][:limit]
+
+    async def get_report_counts(ids):
+        checked.append(ids)
+        return [(1 if query_id in reported else 0, ResponseStatus()) for query_id in ids]
+
+    def assemble_diva_datafeed(pool, diva_diamond, chain_id):
+        query = DIVAProtocol(poolId=bytes.fromhex(pool.pool_id[2:]), divaDiamond=diva_diamond, chainId=chain_id)
+        return DataFeed(query=query, source=CountingSource([]))
+
+    monkeypatch.setattr(report, "assemble_diva_datafeed", assemble_diva_datafeed)
+    r = bare_reporter(batch_size=4)
+    r.fetch_unreported_pools = fetch_unreported_pools
+    r.get_report_counts = get_report_counts
+
+    first = await r.fetch_datafeed()
+    assert first.query.query_id == query_ids[0]
+    # reported by someone else while the batch runs
+    reported.update(query_ids[:3])
+
+    feed = await r.fetch_datafeed()
+    assert feed.query.query_id == query_ids[3]
+    # the queued pools were checked together
+    assert checked[-1] == query_ids[1:]
+    assert not r.report_queue
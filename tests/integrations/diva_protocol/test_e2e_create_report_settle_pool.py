@@ -6,8 +6,6 @@ Call `setFinalReferenceValue` on the DivaOracleTellor contract.
 Ensure it can't be called twice, or if there's no reported value for the pool,
 or if it's too early for the pool to be settled."""
 import json
-import os
-import pickle
 import time
 
 import pytest
@@ -21,8 +19,10 @@ from telliot_core.apps.core import TelliotCore
 from telliot_core.utils.response import ResponseStatus
 
 from telliot_feeds.integrations.diva_protocol.contract import DivaOracleTellorContract
+from telliot_feeds.integrations.diva_protocol.pool_store import get_pool_store
 from telliot_feeds.integrations.diva_protocol.report import DIVAProtocolReporter
 from telliot_feeds.integrations.diva_protocol.utils import get_reported_pools
+from telliot_feeds.integrations.diva_protocol.utils import update_reported_pools
 from tests.utils.utils import passing_bool_w_status
 from utils import EXAMPLE_POOLS_FROM_SUBGRAPH
 
@@ -66,6 +66,7 @@ async def test_create_report_settle_pool(
     mock_diva_contract,
     mock_middleware_contract,
     monkeypatch,
+    tmp_path,
 ):
     """
     Test settling a derivative pool in DIVA Protocol after reporting the value of
@@ -77,12 +78,12 @@ async def test_create_report_settle_pool(
             mock_middleware_contract.updateMinPeriodUndisputed.call(1, {"from": accounts[0]}) == 1
         ), "updateMinPeriodUndisputed failed"
 
-        # mock default_homedir to be current directory
-        monkeypatch.setattr("telliot_feeds.integrations.diva_protocol.utils.default_homedir", lambda: os.getcwd())
+        # mock default_homedir to be a temporary directory, so the store is new and removed after the test
+        monkeypatch.setattr(
+            "telliot_feeds.integrations.diva_protocol.pool_store.default_homedir", lambda: str(tmp_path)
+        )
 
-        if get_reported_pools() != {}:
-            os.remove(os.getcwd() + "/" + "reported_pools.pickle")
-        assert get_reported_pools() == {}, "reported pools pickle file not empty before test"
+        assert get_reported_pools() == {}, "reported pools store not empty before test"
 
         # mock fetch pools from subgraph
         example_pools_updated = EXAMPLE_POOLS_FROM_SUBGRAPH
@@ -148,7 +149,7 @@ async def test_create_report_settle_pool(
         def mock_settle_pools(self):
             reported_pools = get_reported_pools()
             reported_pools[pool_id][0] = int(time.time()) - 90
-            pickle.dump(reported_pools, open(os.getcwd() + "/" + "reported_pools.pickle", "wb"))
+            update_reported_pools(reported_pools)
             print("mock_settle_pools called")
             return original_settle_pools(self)
 
@@ -182,10 +183,10 @@ async def test_create_report_settle_pool(
 
         await r.report(report_count=1)
 
-        # check reported pools pickle file state updated
+        # check reported pools store state updated
         updated_pools_pkl_file = get_reported_pools()
         print("updated_pools_pkl_file", json.dumps(updated_pools_pkl_file, indent=4))
-        assert pool_id in updated_pools_pkl_file, "pool not in reported pools pickle file"
+        assert pool_id in updated_pools_pkl_file, "pool not in reported pools store"
         assert "settled" in updated_pools_pkl_file[pool_id], "pool not marked as settled"
         assert int(time.time()) - 90 - updated_pools_pkl_file[pool_id][0] < 3, "reported time is off"
 
@@ -193,9 +194,8 @@ async def test_create_report_settle_pool(
         # run report again, check no new pools picked up, does not report & settle
         r.datafeed = None
         await r.report(report_count=1)
-        assert len(get_reported_pools()) == 1, "reported pools pickle file state incorrect after second report"
-        assert pool_id in get_reported_pools(), "wrong pool in reported pools pickle file"
+        assert len(get_reported_pools()) == 1, "reported pools store state incorrect after second report"
+        assert pool_id in get_reported_pools(), "wrong pool in reported pools store"
 
-        # clean up temp pickle file
-        adir = os.getcwd()
-        _ = [os.remove(adir + "/" + f) for f in os.listdir(adir) if f.endswith(".pickle")]
+        # close the temp store
+        get_pool_store().close()
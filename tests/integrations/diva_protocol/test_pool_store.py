@@ -0,0 +1,39 @@
+import pickle
+
+from telliot_feeds.integrations.diva_protocol import pool_store
+from telliot_feeds.integrations.diva_protocol.pool_store import get_pool_store
+from telliot_feeds.integrations.diva_protocol.pool_store import ReportedPoolsStore
+from telliot_feeds.integrations.diva_protocol.utils import get_reported_pools
+from telliot_feeds.integrations.diva_protocol.utils import update_reported_pools
+
+
+def test_due_pools(tmp_path):
+    store = ReportedPoolsStore(path=tmp_path / "reported_pools.sqlite")
+    for i in range(1000):
+        store.add(f"0x{i:064x}", 1_000 + i)
+    store.set_status(f"0x{0:064x}", "settled")
+    store.set_status(f"0x{1:064x}", "error")
+    store.close()
+
+    store = ReportedPoolsStore(path=tmp_path / "reported_pools.sqlite")
+    assert len(store) == 1000
+    assert store.count_unsettled() == 998
+    assert store.due(1_005) == [(f"0x{i:064x}", 1_000 + i) for i in range(2, 5)]
+    assert store.get(f"0x{1:064x}") == (1_001, "error")
+    assert store.get("0x1234") is None
+    assert store.reported(["0x1234", f"0x{999:064x}"]) == {f"0x{999:064x}"}
+    assert f"0x{600:064x}" in store
+
+
+def test_pickle_imported(tmp_path, monkeypatch):
+    pools = {"0xab": [1_000, "not settled"], "0xcd": [2_000, "settled"]}
+    with open(tmp_path / "reported_pools.pickle", "wb") as f:
+        pickle.dump(pools, f)
+    monkeypatch.setattr(pool_store, "default_homedir", lambda: tmp_path)
+    monkeypatch.setattr(pool_store, "_stores", {})
+
+    assert get_pool_store().all() == pools
+    assert get_reported_pools() == pools
+
+    update_reported_pools(get_reported_pools(), add=[["0xef", [3_000, "not settled"]]], remove=["0xab"])
+    assert get_pool_store().due(5_000) == [("0xef", 3_000)]
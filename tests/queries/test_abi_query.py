@@ -1,4 +1,6 @@
 from telliot_feeds.queries.abi_query import AbiQuery
+from telliot_feeds.queries.mimicry.macro_market_mash_up import MimicryMacroMarketMashup
+from telliot_feeds.queries.price.spot_price import SpotPrice
 
 
 def test_get_query_from_data():
@@ -21,3 +23,29 @@ def test_generate_query_data():
         == "00000000000000000000000000000000000000000000000000000000000000400000000000000000000000000000000000000000000000000000000000000080000000000000000000000000000000000000000000000000000000000000000d46616b6551756572795479706500000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000004000000000000000000000000000000000000000000000000000000000000000200000000000000000000000000000000000000000000000000000000000000000"  # noqa: E501
     )
     assert q.query_id.hex() == "b0437cc90a5c0e7aab994a16a941b6823d05ef5067b90085fc19f86f464da3de"
+
+
+def test_query_data_cache_follows_parameter_changes():
+    """Memoized query data and id must reflect parameter updates, including in-place ones."""
+    q = SpotPrice(asset="btc", currency="usd")
+    btc_data, btc_id = q.query_data, q.query_id
+    assert q.query_data is btc_data
+
+    q.asset = "eth"
+    assert q.query_data != btc_data
+    assert q.query_id == SpotPrice(asset="eth", currency="usd").query_id
+
+    q.asset = "btc"
+    assert q.query_id == btc_id
+
+    mashup = MimicryMacroMarketMashup(
+        metric="market-cap",
+        currency="usd",
+        collections=[("ethereum-mainnet", "0x50f5474724e0Ee42D9a4e711ccFB275809Fd6d4a")],
+        tokens=[],
+    )
+    before = mashup.query_data
+    mashup.collections.append(("ethereum-mainnet", "0xF87E31492Faf9A91B02Ee0dEAAd50d51d56D5d4d"))
+    assert mashup.query_data != before
+    decoded = MimicryMacroMarketMashup.get_query_from_data(mashup.query_data)
+    assert len(decoded.collections) == 2
@@ -1,3 +1,5 @@
+from telliot_feeds.queries.catalog import Catalog
+from telliot_feeds.queries.price.spot_price import SpotPrice
 from telliot_feeds.queries.query import OracleQuery
 from telliot_feeds.queries.query_catalog import query_catalog
 
@@ -26,3 +28,29 @@ def test_to_markdown():
     md = query_catalog.to_markdown()
     assert isinstance(md, str)
     print(md)
+
+
+def test_find_by_index():
+    """Query id and type lookups match the linear search semantics"""
+    qid = "83a7f3d48786ac2667503a61e8c415438ed2922eb86a2906e4ee66d9a2ce4992"
+    for query_id in (qid, "0x" + qid, "0X" + qid.upper()):
+        entries = query_catalog.find(query_id=query_id)
+        assert [e.tag for e in entries] == ["eth-usd-spot"]
+
+    assert query_catalog.find(query_id="0x" + qid, query_type="twap") == []
+    assert query_catalog.find(query_id="0x" + "00" * 32) == []
+
+    spot_entries = query_catalog.find(query_type="spotprice")
+    expected = [e for e in query_catalog.find() if e.query_type == "SpotPrice"]
+    assert spot_entries == expected
+    assert query_catalog.find(query_type="SpotPrice", tag="eth-usd") == [e for e in expected if "eth-usd" in e.tag]
+
+    assert query_catalog.get("eth-usd-spot") is entries[0]
+    assert query_catalog.get("not-a-tag") is None
+
+
+def test_index_rebuilt_on_restore():
+    catalog = Catalog()
+    catalog.add_entry(tag="btc-usd-spot", title="BTC/USD spot price", q=SpotPrice(asset="btc", currency="usd"))
+    restored = Catalog.from_state(catalog.get_state())
+    assert [e.tag for e in restored.find(query_type="SpotPrice")] == ["btc-usd-spot"]
@@ -0,0 +1,354 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from eth_abi import encode_abi
+from eth_abi import encode_single
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from telliot_core.directory import contract_directory
+from web3 import Web3
+from web3._utils.abi import collapse_if_tuple
+from web3.datastructures import AttributeDict
+
+from telliot_feeds.queries.price.spot_price import SpotPrice
+from telliot_feeds.reporters.tips.listener import autopay_events
+from telliot_feeds.reporters.tips.listener.autopay_events import AutopayEvents
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import get_feed_id
+from telliot_feeds.reporters.tips.listener.one_time_tips import get_funded_one_time_tips
+
+
+AUTOPAY = "0x" + "aa" * 20
+ORACLE = "0x" + "bb" * 20
+QUERY = SpotPrice("eth", "usd")
+QUERY_ID = QUERY.query_id
+# reward, balance, startTime, interval, window, priceThreshold, rewardIncreasePerSecond, feedsWithFundingIndex
+DETAILS = (10**18, 5 * 10**18, 1_700_000_000, 3600, 600, 0, 0, 1)
+FEED_ID = get_feed_id(QUERY_ID, DETAILS[0], *DETAILS[2:7])
+
+
+def contract(name, address):
+    abi = contract_directory.find(name=name)[0].get_abi(chain_id=1)
+    return SimpleNamespace(address=Web3.toChecksumAddress(address), abi=abi)
+
+
+def make_log(listener, name, block, index, **args):
+    """Encode an event log like web3's eth_getLogs results"""
+    abi = next(e for e in listener.events.values() if e["name"] == name)
+    address = listener.oracle.address if name == "NewReport" else listener.autopay.address
+    topics = [HexBytes(event_abi_to_log_topic(abi))]
+    types, values = [], []
+    for arg in abi["inputs"]:
+        if arg["indexed"]:
+            topics.append(HexBytes(encode_single(arg["type"], args[arg["name"]])))
+        else:
+            types.append(collapse_if_tuple(arg))
+            values.append(args[arg["name"]])
+    data = HexBytes(encode_abi(types, values))
+    return AttributeDict(
+        {
+            "address": address,
+            "topics": topics,
+            "data": data,
+            "blockNumber": block,
+            "blockHash": HexBytes(block.to_bytes(32, "big")),
+            "logIndex": index,
+            "transactionIndex": index,
+            "transactionHash": HexBytes(bytes([index]) * 32),
+        }
+    )
+
+
+class FakeEth:
+    def __init__(self, block_number):
+        self.block_number = block_number
+        self.logs = []
+        self.requests = []
+
+    def get_logs(self, params):
+        self.requests.append((params["fromBlock"], params["toBlock"]))
+        return [log for log in self.logs if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]]
+
+
+@pytest.fixture
+def listener(tmp_path):
+    listener = AutopayEvents(
+        Web3(), contract("tellor360-autopay", AUTOPAY), contract("tellor360-oracle", ORACLE), path=tmp_path / "cp"
+    )
+    eth = FakeEth(100)
+    listener.w3 = SimpleNamespace(eth=eth, codec=listener.w3.codec)
+
+    def read_funded_set():
+        listener.cursor = eth.block_number
+        listener.last_full_sync = autopay_events.time.time()
+        listener.updated_at = listener.last_full_sync
+
+    listener.read_funded_set = read_funded_set
+    return listener
+
+
+def test_events_update_funded_set(listener):
+    new_tips = []
+    listener.on_new_tip(lambda: new_tips.append(True))
+    listener.sync()
+    assert listener.synced and listener.cursor == 100
+
+    eth = listener.w3.eth
+    tipper = "0x" + "cc" * 20
+    eth.logs = [
+        make_log(
+            listener,
+            "NewDataFeed",
+            101,
+            0,
+            _queryId=QUERY_ID,
+            _feedId=FEED_ID,
+            _queryData=QUERY.query_data,
+            _feedCreator=tipper,
+        ),
+        make_log(
+            listener,
+            "DataFeedFunded",
+            101,
+            1,
+            _queryId=QUERY_ID,
+            _feedId=FEED_ID,
+            _amount=DETAILS[1],
+            _feedFunder=tipper,
+            _feedDetails=DETAILS,
+        ),
+        make_log(
+            listener, "TipAdded", 102, 0, _queryId=QUERY_ID, _amount=10, _queryData=QUERY.query_data, _tipper=tipper
+        ),
+        make_log(
+            listener, "TipAdded", 2150, 0, _queryId=QUERY_ID, _amount=5, _queryData=QUERY.query_data, _tipper=tipper
+        ),
+    ]
+    eth.block_number = 2200
+    listener.sync()
+
+    # blocks after the cursor are fetched in ranges
+    assert eth.requests == [(101, 2100), (2101, 2200)]
+    assert listener.cursor == 2200
+    assert listener.funded_feeds() == [(DETAILS, QUERY.query_data)]
+    assert listener.funded_one_time_tips() == [(QUERY.query_data, 15)]
+    assert new_tips
+
+    # a report takes the one time tip, claims reduce the feed's balance
+    eth.logs = [
+        make_log(
+            listener,
+            "NewReport",
+            2201,
+            0,
+            _queryId=QUERY_ID,
+            _time=1,
+            _value=b"",
+            _nonce=1,
+            _queryData=QUERY.query_data,
+            _reporter=tipper,
+        ),
+        make_log(
+            listener, "TipClaimed", 2202, 0, _feedId=FEED_ID, _queryId=QUERY_ID, _amount=DETAILS[1], _reporter=tipper
+        ),
+    ]
+    eth.block_number = 2202
+    listener.sync()
+    assert listener.funded_one_time_tips() == []
+    assert listener.funded_feeds() == []
+
+
+def test_subscription_logs_are_applied_once(listener):
+    listener.sync()
+    eth = listener.w3.eth
+    log = make_log(
+        listener, "TipAdded", 101, 0, _queryId=QUERY_ID, _amount=10, _queryData=QUERY.query_data, _tipper=AUTOPAY
+    )
+    # received from the subscription, then fetched again while catching up
+    listener.apply_logs([log])
+    eth.logs = [log]
+    eth.block_number = 101
+    listener.sync()
+    assert listener.funded_one_time_tips() == [(QUERY.query_data, 10)]
+
+
+def test_checkpoint(listener, tmp_path):
+    listener.sync()
+    listener.apply_logs(
+        [
+            make_log(
+                listener,
+                "TipAdded",
+                101,
+                0,
+                _queryId=QUERY_ID,
+                _amount=10,
+                _queryData=QUERY.query_data,
+                _tipper=AUTOPAY,
+            )
+        ]
+    )
+    listener.w3.eth.block_number = 101
+    listener.sync()
+
+    restarted = AutopayEvents(
+        Web3(), contract("tellor360-autopay", AUTOPAY), contract("tellor360-oracle", ORACLE), path=tmp_path / "cp"
+    )
+    assert restarted.cursor == 101
+    assert restarted.funded_one_time_tips() == [(QUERY.query_data, 10)]
+    # not used until caught up with the chain
+    assert not restarted.synced
+
+
+@pytest.mark.asyncio
+async def test_tips_from_events(listener):
+    async def read(*args, **kwargs):
+        raise AssertionError("contract read")
+
+    listener.sync()
+    listener.apply_logs(
+        [
+            make_log(
+                listener,
+                "TipAdded",
+                101,
+                0,
+                _queryId=QUERY_ID,
+                _amount=10,
+                _queryData=QUERY.query_data,
+                _tipper=AUTOPAY,
+            )
+        ]
+    )
+    tips = await get_funded_one_time_tips(SimpleNamespace(read=read), autopay_events=listener)
+    assert tips == {QUERY.query_data: 10}
+
+
+@pytest.mark.asyncio
+async def test_stale_funded_set_not_used(listener):
+    reads = []
+
+    async def read(*args, **kwargs):
+        reads.append(kwargs)
+        return None, SimpleNamespace(ok=False)
+
+    listener.sync()
+    assert listener.synced
+
+    # updates failed for longer than max_age, e.g. the node is unreachable
+    listener.updated_at -= listener.max_age + 1
+    assert not listener.synced
+    await get_funded_one_time_tips(SimpleNamespace(read=read), autopay_events=listener)
+    assert reads
+
+
+def raw_log(log):
+    """Log as received in an eth_subscribe notification"""
+    return {
+        "address": log["address"],
+        "topics": [topic.hex() for topic in log["topics"]],
+        "data": log["data"].hex(),
+        "blockNumber": hex(log["blockNumber"]),
+        "blockHash": log["blockHash"].hex(),
+        "logIndex": hex(log["logIndex"]),
+        "transactionIndex": log["transactionIndex"],
+        "transactionHash": log["transactionHash"].hex(),
+    }
+
+
+class FakeWebsocket:
+    """Websocket sending log notifications, calling `after_each` after every notification"""
+
+    def __init__(self, logs, after_each):
+        self.logs = logs
+        self.after_each = after_each
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def send(self, message):
+        pass
+
+    async def recv(self):
+        return json.dumps({"jsonrpc": "2.0", "id": 1, "result": "0x1"})
+
+    async def __aiter__(self):
+        for log in self.logs:
+            await asyncio.sleep(0.05)
+            yield json.dumps({"jsonrpc": "2.0", "method": "eth_subscription", "params": {"result": log}})
+            self.after_each(log)
+            await asyncio.sleep(0.1)
+
+
+@pytest.mark.asyncio
+async def test_subscription_advances_cursor(listener, tmp_path, monkeypatch):
+    listener.sync()
+    eth = listener.w3.eth
+    full_reads = []
+    read_funded_set = listener.read_funded_set
+    listener.read_funded_set = lambda: full_reads.append(True) or read_funded_set()
+    log = make_log(
+        listener, "TipAdded", 101, 0, _queryId=QUERY_ID, _amount=10, _queryData=QUERY.query_data, _tipper=AUTOPAY
+    )
+    reorged = {**raw_log(log), "removed": True}
+
+    def mined(received):
+        if received is not reorged:
+            # the block is mined, its logs are also returned by eth_getLogs
+            eth.block_number = 101
+            eth.logs = [log]
+
+    monkeypatch.setattr(autopay_events.websockets, "connect", lambda url: FakeWebsocket([raw_log(log), reorged], mined))
+    await listener.subscribe("ws://node", sync_interval=0.02)
+
+    # applied once, the cursor is advanced and checkpointed while subscribed
+    assert listener.funded_one_time_tips() == [(QUERY.query_data, 10)]
+    assert listener.cursor == 101
+    assert listener._applied == set()
+    restarted = AutopayEvents(
+        Web3(), contract("tellor360-autopay", AUTOPAY), contract("tellor360-oracle", ORACLE), path=tmp_path / "cp"
+    )
+    assert restarted.cursor == 101
+    # the funded set is read again after a reorg
+    assert full_reads
+
+
+@pytest.mark.asyncio
+async def test_no_requests_while_paused(listener):
+    listener.sync()
+    eth = listener.w3.eth
+    eth.block_number = 105
+    paused = [True]
+
+    task = asyncio.ensure_future(listener.run(poll_interval=0.01, paused=lambda: paused[0]))
+    await asyncio.sleep(0.05)
+    assert eth.requests == []
+    assert listener.cursor == 100
+
+    # caught up from the cursor once unpaused
+    paused[0] = False
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert eth.requests[0] == (101, 105)
+    assert listener.cursor == 105
+
+
+@pytest.mark.asyncio
+async def test_subscription_ends_when_paused(listener, monkeypatch):
+    listener.sync()
+    log = make_log(
+        listener, "TipAdded", 101, 0, _queryId=QUERY_ID, _amount=10, _queryData=QUERY.query_data, _tipper=AUTOPAY
+    )
+    monkeypatch.setattr(
+        autopay_events.websockets, "connect", lambda url: FakeWebsocket([raw_log(log)], lambda received: None)
+    )
+
+    await asyncio.wait_for(listener.subscribe("ws://node", sync_interval=0.02, paused=lambda: True), timeout=1)
+
+    assert listener.funded_one_time_tips() == []
+    assert listener.w3.eth.requests == []
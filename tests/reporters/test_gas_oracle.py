@@ -0,0 +1,150 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from web3.datastructures import AttributeDict
+
+from telliot_feeds.reporters.gas import GasFees
+from telliot_feeds.reporters.gas_oracle import GasOracle
+
+
+GWEI = 10**9
+
+
+class FakeChain:
+    """Fee history of a chain mining a block per `mine()` call, counting requests"""
+
+    def __init__(self, head=1000):
+        self.head = head
+        self.requests = []
+
+    def mine(self, count=1):
+        self.head += count
+
+    def _max_priority_fee(self):
+        return 2 * GWEI
+
+    def block_reward(self, number):
+        # every 10th block is empty
+        return 0 if number % 10 == 0 else (number % 7 + 1) * GWEI
+
+    def fee_history(self, block_count, newest_block, reward_percentiles):
+        self.requests.append((block_count, newest_block))
+        newest = self.head if newest_block == "latest" else newest_block
+        oldest = newest - block_count + 1
+        numbers = range(oldest, newest + 1)
+        return AttributeDict(
+            {
+                "oldestBlock": oldest,
+                "baseFeePerGas": [n * GWEI for n in range(oldest, newest + 2)],
+                "gasUsedRatio": [0.5 for _ in numbers],
+                "reward": [[self.block_reward(n)] * len(reward_percentiles) for n in numbers],
+            }
+        )
+
+
+@pytest.fixture
+def chain():
+    return FakeChain()
+
+
+@pytest.fixture
+def oracle(chain):
+    return GasOracle(SimpleNamespace(eth=chain), size=64, poll_interval=60)
+
+
+def test_history_is_updated_incrementally(chain, oracle):
+    assert oracle.update().ok
+    assert chain.requests == [(64, "latest")]
+    assert len(oracle.blocks) == 64
+    assert oracle.newest_block == 1000
+    assert oracle.base_fee() == 1001 * GWEI
+
+    chain.mine(3)
+    assert oracle.update().ok
+    assert chain.requests[-1] == (16, "latest")
+    assert [b.number for b in oracle.blocks] == list(range(940, 1004))
+    assert oracle.base_fee() == 1004 * GWEI
+
+    # more blocks than requested per update were mined, the gap is filled
+    chain.mine(40)
+    assert oracle.update().ok
+    assert chain.requests[-2:] == [(16, "latest"), (24, 1027)]
+    assert [b.number for b in oracle.blocks] == list(range(980, 1044))
+
+
+def test_priority_fee_models(oracle):
+    assert oracle.priority_fee() is None
+    oracle.update()
+
+    # median of the non-empty blocks' priority fees
+    fees = sorted(oracle.rewards(window=20))
+    assert len(fees) == 18
+    assert oracle.priority_fee("percentile", window=20) == (fees[8] + fees[9]) // 2
+    assert oracle.priority_fee("percentile", window=20, percentile=100) == 7 * GWEI
+    assert GWEI <= oracle.priority_fee("ewma") <= 7 * GWEI
+    with pytest.raises(ValueError):
+        oracle.priority_fee("average")
+
+
+def test_failed_update(oracle):
+    oracle.w3 = SimpleNamespace(eth=SimpleNamespace(fee_history=lambda *args: None))
+    status = oracle.update()
+    assert not status.ok
+    assert status.error == "unable to fetch fee history from node"
+    assert oracle.base_fee() is None
+
+
+def test_gas_fees_from_oracle(chain, oracle, monkeypatch):
+    monkeypatch.setattr("telliot_feeds.reporters.gas.get_gas_oracle", lambda chain_id, w3: oracle)
+    endpoint = SimpleNamespace(_web3=SimpleNamespace(eth=chain), chain_id=1)
+    account = SimpleNamespace(address="0x" + "11" * 20)
+    gas = GasFees(endpoint, account, transaction_type=2, max_priority_fee_range=10, priority_fee_model="percentile")
+    try:
+        assert gas.update_gas_fees().ok
+        assert gas.gas_info["maxFeePerGas"] == int(1001 * GWEI * 1.125)
+        assert gas.gas_info["maxPriorityFeePerGas"] == oracle.priority_fee("percentile")
+        assert len(chain.requests) == 1
+
+        # the history is fresh, setting fees again doesn't request anything
+        assert gas.update_gas_fees().ok
+        assert len(chain.requests) == 1
+    finally:
+        oracle.stop()
+
+    with pytest.raises(ValueError):
+        GasFees(endpoint, account, transaction_type=2, priority_fee_model="average")
+
+
+def test_empty_blocks_use_node_suggestion(chain, oracle, monkeypatch):
+    chain.block_reward = lambda number: 0
+    monkeypatch.setattr("telliot_feeds.reporters.gas.get_gas_oracle", lambda chain_id, w3: oracle)
+    endpoint = SimpleNamespace(_web3=SimpleNamespace(eth=chain), chain_id=1)
+    account = SimpleNamespace(address="0x" + "11" * 20)
+    gas = GasFees(endpoint, account, transaction_type=2, max_priority_fee_range=10, priority_fee_model="percentile")
+    try:
+        assert gas.update_gas_fees().ok
+        assert oracle.priority_fee("percentile") == 0
+        assert gas.gas_info["maxPriorityFeePerGas"] == 2 * GWEI
+    finally:
+        oracle.stop()
+
+
+def test_background_updates_stop_when_unused(chain):
+    oracle = GasOracle(SimpleNamespace(eth=chain), size=64, poll_interval=0.01, max_age=0.1)
+    try:
+        assert oracle.refresh().ok
+        time.sleep(0.05)
+        assert oracle._thread.is_alive()
+
+        # not refreshed for max_age, e.g. during the reporter lock
+        time.sleep(0.2)
+        assert not oracle._thread.is_alive()
+        requests = len(chain.requests)
+        time.sleep(0.05)
+        assert len(chain.requests) == requests
+
+        assert oracle.refresh().ok
+        assert oracle._thread.is_alive()
+    finally:
+        oracle.stop()
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.queries.price.spot_price import SpotPrice
+from telliot_feeds.reporters.pipeline import PipelineStep
+from telliot_feeds.reporters.pipeline import ReportPipeline
+from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+
+
+def step(name, delay=0.0, value=None, error=None, requires=(), log=None):
+    async def run(results):
+        if log is not None:
+            log.append(("start", name, sorted(results)))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        if error is not None:
+            return None, error_status(error)
+        return value, ResponseStatus()
+
+    return PipelineStep(name, run, requires=requires)
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_overlap():
+    log = []
+    pipeline = ReportPipeline(
+        [
+            step("a", 0.2, value=1, log=log),
+            step("b", 0.2, value=2, log=log),
+            step("c", 0.2, value=3, requires=("a", "b"), log=log),
+        ]
+    )
+    start = time.monotonic()
+    results, status = await pipeline.run()
+    elapsed = time.monotonic() - start
+
+    assert status.ok
+    assert results == {"a": 1, "b": 2, "c": 3}
+    # a and b run together, c only starts once both are done
+    assert elapsed < 0.55
+    assert ("start", "c", ["a", "b"]) in log
+
+
+@pytest.mark.asyncio
+async def test_first_declared_failure_is_returned():
+    log = []
+    pipeline = ReportPipeline(
+        [
+            step("staked", 0.2, error="not staked", log=log),
+            step("datafeed", 0.0, error="no datafeed", log=log),
+            step("params", 0.0, requires=("datafeed",), log=log),
+        ]
+    )
+    results, status = await pipeline.run()
+
+    # the later declared step failed first, but the earlier step's error wins
+    assert not status.ok
+    assert status.error == "not staked"
+    assert ("start", "params", ["datafeed"]) not in log
+
+
+@pytest.mark.asyncio
+async def test_later_steps_cancelled_after_failure():
+    log = []
+    pipeline = ReportPipeline(
+        [
+            step("lock", 0.0, error="reporter lock", log=log),
+            step("datafeed", 1.0, log=log),
+        ]
+    )
+    start = time.monotonic()
+    _, status = await pipeline.run()
+
+    assert status.error == "reporter lock"
+    assert ("end", "datafeed") not in log
+    assert time.monotonic() - start < 0.5
+
+
+def test_invalid_dependency_graph():
+    with pytest.raises(ValueError):
+        ReportPipeline([step("a", requires=("b",)), step("b")])
+    with pytest.raises(ValueError):
+        ReportPipeline([step("a"), step("a")])
+
+
+def offline_reporter(log, lock_error=None):
+    """Reporter whose report steps log when the value is fetched and a datafeed is suggested"""
+
+    async def fetch_new_datapoint():
+        log.append("fetched")
+        return 1.0, None
+
+    datafeed = SimpleNamespace(
+        query=SpotPrice("eth", "usd"), source=SimpleNamespace(fetch_new_datapoint=fetch_new_datapoint)
+    )
+
+    async def wait_all():
+        await asyncio.sleep(0.1)
+        log.append("confirmed")
+
+    async def done(*args):
+        return None, ResponseStatus()
+
+    async def staked():
+        return True, ResponseStatus()
+
+    async def check_reporter_lock():
+        await asyncio.sleep(0.1)
+        return error_status(lock_error) if lock_error else ResponseStatus()
+
+    async def fetch_datafeed():
+        log.append("suggested")
+        return datafeed
+
+    reporter = Tellor360Reporter.__new__(Tellor360Reporter)
+    reporter.check_rewards = False
+    reporter.tx_manager = SimpleNamespace(wait_all=wait_all)
+    reporter.get_reporter_state = done
+    reporter.has_native_token = lambda: True
+    reporter.ensure_staked = staked
+    reporter.check_reporter_lock = check_reporter_lock
+    reporter.fetch_datafeed = fetch_datafeed
+    reporter.update_gas_fees = ResponseStatus
+    return reporter
+
+
+@pytest.mark.asyncio
+async def test_value_not_fetched_while_locked():
+    log = []
+    reporter = offline_reporter(log, lock_error="Currently in reporter lock")
+    _, status = await reporter.report_pipeline().run()
+    assert status.error == "Currently in reporter lock"
+    assert "fetched" not in log
+
+
+@pytest.mark.asyncio
+async def test_datafeed_suggested_after_confirmations():
+    log = []
+    reporter = offline_reporter(log)
+    steps = ("confirmations", "state", "datafeed")
+    pipeline = ReportPipeline([s for s in reporter.report_pipeline().steps if s.name in steps])
+    _, status = await pipeline.run()
+    assert status.ok
+    # tips taken by the previous report's transaction are seen by the suggestion
+    assert log == ["confirmed", "suggested"]
@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+import pytest
+
+from telliot_feeds.reporters import reporter_state
+from telliot_feeds.reporters.reporter_state import fetch_report_counts
+from telliot_feeds.reporters.reporter_state import fetch_reporter_state
+from telliot_feeds.reporters.reporter_state import parse_reporter_state
+from telliot_feeds.reporters.reporter_state import STAKER_INFO_FIELDS
+from telliot_feeds.reporters.rewards.time_based_rewards import calculate_time_based_rewards
+from telliot_feeds.reporters.types import StakerInfo
+
+
+ORACLE = "0xD9157453E2668B2fc45b7A803D3FEF3642430cC0"
+ACCOUNT = "0x39E419bA25196794B595B2a595Ea8E527ddC9856"
+QUERY_ID = b"\x01" * 32
+
+
+class FakeWeb3:
+    def __init__(self, chain_id):
+        self.eth = SimpleNamespace(chain_id=chain_id)
+
+
+def fake_oracle(chain_id):
+    return SimpleNamespace(address=ORACLE, node=SimpleNamespace(_web3=FakeWeb3(chain_id)))
+
+
+def multicall_response(**values):
+    staker_info = dict(zip(STAKER_INFO_FIELDS, [1, 100, 0, 0, 1000, 3, 0, 0, True]))
+    return {
+        "stake_amount": 10,
+        **staker_info,
+        "time_of_last_distribution": 1000,
+        "time_based_reward": 5 * 10**17,
+        "native_balance": 2 * 10**18,
+        **values,
+    }
+
+
+@pytest.fixture
+def multicalls(monkeypatch):
+    """Record multicalls instead of sending them"""
+    sent = []
+
+    class FakeMulticall:
+        def __init__(self, calls, _w3, require_success, gas_limit):
+            self.calls = calls
+            self.require_success = require_success
+            sent.append(self)
+
+        async def coroutine(self):
+            if all(call.function.startswith("getNewValueCountbyQueryId") for call in self.calls):
+                # report count of each query's calls, the second query's call fails
+                names = [call.returns[0][0] for call in self.calls]
+                return {name: None if i == 1 else i + 3 for i, name in enumerate(names)}
+            response = multicall_response()
+            if any(call.function.startswith("getNewValueCountbyQueryId") for call in self.calls):
+                response["report_count"] = 7
+            return response
+
+    monkeypatch.setattr(reporter_state, "Multicall", FakeMulticall)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_state_read_in_one_multicall(multicalls):
+    state, status = await fetch_reporter_state(fake_oracle(1), ACCOUNT, QUERY_ID)
+
+    assert status.ok
+    assert len(multicalls) == 1
+    # a failing call (e.g. no time-based rewards on the chain) doesn't fail the others
+    assert multicalls[0].require_success is False
+    functions = [call.function.split("(")[0] for call in multicalls[0].calls]
+    assert functions == [
+        "getStakeAmount",
+        "getStakerInfo",
+        "timeOfLastDistribution",
+        "timeBasedReward",
+        "getEthBalance",
+        "getNewValueCountbyQueryId",
+    ]
+    # calldata encodes with the call arguments
+    assert all(call.data for call in multicalls[0].calls)
+
+    assert state.stake_amount == 10
+    assert state.staker_info == StakerInfo(1, 100, 0, 0, 1000, 3, 0, 0, True)
+    assert state.native_balance == 2 * 10**18
+    assert state.query_id == QUERY_ID
+    assert state.report_count == 7
+
+
+@pytest.mark.asyncio
+async def test_report_count_only_read_for_query(multicalls):
+    state, status = await fetch_reporter_state(fake_oracle(1), ACCOUNT)
+
+    assert status.ok
+    assert len(multicalls[0].calls) == 5
+    assert state.query_id is None
+    assert state.report_count is None
+
+
+@pytest.mark.asyncio
+async def test_unsupported_chain(multicalls):
+    state, status = await fetch_reporter_state(fake_oracle(123456789), ACCOUNT)
+
+    assert state is None
+    assert not status.ok
+    assert "Multicall not supported on chain 123456789" in status.error
+    assert not multicalls
+
+
+@pytest.mark.asyncio
+async def test_report_counts_read_in_one_multicall(multicalls):
+    query_ids = [bytes([i]) * 32 for i in range(3)]
+    counts, status = await fetch_report_counts(fake_oracle(1), query_ids)
+
+    assert status.ok
+    assert len(multicalls) == 1
+    assert len(multicalls[0].calls) == 3
+    assert counts == {query_ids[0]: 3, query_ids[1]: None, query_ids[2]: 5}
+
+
+def test_failed_calls_are_none():
+    response = multicall_response(stake_amount=None, time_based_reward=None)
+    response[STAKER_INFO_FIELDS[0]] = None
+    state = parse_reporter_state(response)
+
+    assert state.stake_amount is None
+    assert state.staker_info is None
+    assert state.time_based_reward is None
+    assert state.time_of_last_distribution == 1000
+
+
+def test_calculate_time_based_rewards():
+    assert calculate_time_based_rewards(1000, 5 * 10**17, now=1600) == 10**18
+    assert calculate_time_based_rewards(1000, 5 * 10**17, now=1000) == 0
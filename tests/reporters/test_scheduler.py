@@ -0,0 +1,138 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.queries.price.spot_price import SpotPrice
+from telliot_feeds.reporters.pipeline import PipelineStep
+from telliot_feeds.reporters.pipeline import ReportPipeline
+from telliot_feeds.reporters.scheduler import next_window_start
+from telliot_feeds.reporters.scheduler import ReportScheduler
+from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.transactions import TransactionManager
+
+
+NOW = 1_700_000_000
+
+
+def feed(start, interval, window=60):
+    return FeedDetails(
+        reward=1,
+        balance=10,
+        startTime=start,
+        interval=interval,
+        window=window,
+        priceThreshold=0,
+        rewardIncreasePerSecond=0,
+    )
+
+
+def test_next_window_start():
+    assert next_window_start(feed(NOW + 100, 3600), NOW) == NOW + 100
+    assert next_window_start(feed(NOW - 100, 3600), NOW) == NOW + 3500
+    # the current window opened at NOW, the reporter already had the chance to report for it
+    assert next_window_start(feed(NOW - 3600, 3600), NOW) == NOW + 3600
+    assert next_window_start(feed(NOW - 100, 0), NOW) is None
+
+
+def test_next_wakeup():
+    scheduler = ReportScheduler()
+    assert scheduler.next_wakeup(7, 70, NOW) == NOW + 70
+
+    scheduler.set_feed_windows([feed(NOW - 100, 3600), feed(NOW - 100, 60)])
+    scheduler.add_wakeup(NOW + 30)
+    assert scheduler.next_wakeup(7, 70, NOW) == NOW + 20
+    assert scheduler.next_wakeup(7, 70, NOW + 25) == NOW + 30
+
+    scheduler.record_report(True)
+    assert scheduler.next_wakeup(7, 70, NOW) == NOW + 7
+
+    # nothing can be reported during the reporter lock
+    scheduler.set_reporter_lock(NOW - 100, 3600)
+    assert scheduler.next_wakeup(7, 70, NOW) == NOW + 3500
+    # a sent report only starts the lock once it's mined
+    scheduler.record_report(True)
+    assert scheduler.lock_ends == NOW + 3500
+    scheduler.record_mined_report(NOW)
+    assert scheduler.lock_ends == NOW + 3600
+
+
+@pytest.mark.asyncio
+async def test_sleep_wakes_up_on_notify():
+    scheduler = ReportScheduler()
+    asyncio.get_running_loop().call_later(0.05, scheduler.notify)
+    start = time.monotonic()
+    await scheduler.sleep(0, 10)
+    assert time.monotonic() - start < 1
+
+    ready = asyncio.Event()
+    asyncio.get_running_loop().call_later(0.05, ready.set)
+    await asyncio.wait_for(scheduler.sleep(0, 10, wake_on=[ready]), 1)
+
+    # wake-up events are ignored during the reporter lock
+    scheduler.set_reporter_lock(time.time(), 0.2)
+    scheduler.notify()
+    start = time.monotonic()
+    await scheduler.sleep(0, 10, wake_on=[ready])
+    assert time.monotonic() - start >= 0.15
+
+
+def offline_reporter(receipt_status):
+    """Reporter whose report sends a submitValue transaction mined with the given receipt status"""
+    reporter = Tellor360Reporter.__new__(Tellor360Reporter)
+    reporter.scheduler = ReportScheduler()
+    # not locked, the lock lasts an hour
+    reporter.scheduler.set_reporter_lock(NOW, 3600)
+    reporter.wait_period = 7
+    reporter.idle_period = None
+    reporter.listen_autopay_events = False
+    reporter.qtag_selected = True
+    reporter.datafeed = None
+    reporter.reporter_state = None
+    reporter.endpoint = SimpleNamespace(explorer="https://explorer")
+    reporter.discord_notification_data = {"tbrtips": 0.0, "usd_profit": 0.0, "percent_profit": 0.0}
+    eth = SimpleNamespace(get_transaction_receipt=lambda tx_hash: {"status": receipt_status})
+    reporter.tx_manager = TransactionManager(SimpleNamespace(eth=eth), "0xabc", poll_interval=0.01)
+
+    async def datafeed(_):
+        return SimpleNamespace(query=SpotPrice("eth", "usd")), ResponseStatus()
+
+    async def transaction(_):
+        return {}, ResponseStatus()
+
+    async def send_transaction(built_tx, on_receipt=None, context=None):
+        pending = reporter.tx_manager.track(b"\x01" * 32, on_receipt=on_receipt or reporter.on_receipt, context=context)
+        return pending, ResponseStatus()
+
+    async def is_online():
+        return True
+
+    async def wait_for_next_report():
+        pass
+
+    reporter.report_pipeline = lambda: ReportPipeline(
+        [PipelineStep("datafeed", datafeed), PipelineStep("transaction", transaction)]
+    )
+    reporter.send_transaction = send_transaction
+    reporter.is_online = is_online
+    reporter.wait_for_next_report = wait_for_next_report
+    return reporter
+
+
+@pytest.mark.asyncio
+async def test_reverted_report_does_not_start_lock():
+    reporter = offline_reporter(receipt_status=0)
+    await reporter.report(report_count=1)
+    scheduler = reporter.scheduler
+    assert scheduler.reported
+    assert not scheduler.locked()
+    # retried after the wait period instead of sleeping through a lock
+    now = time.time()
+    assert scheduler.next_wakeup(7, 70, now) == now + 7
+
+    reporter = offline_reporter(receipt_status=1)
+    await reporter.report(report_count=1)
+    assert reporter.scheduler.locked()
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from telliot_feeds.reporters.supervisor import ReporterSupervisor
+
+
+class FakeReporter:
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.runs = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def report(self, report_count=None):
+        self.runs += 1
+        if self.runs <= self.fail_times:
+            raise RuntimeError("rpc down")
+        await asyncio.sleep(0.05)
+
+
+class FakeEndpoint:
+    def __init__(self, chain_id):
+        self.chain_id = chain_id
+        self.url = f"http://node-{chain_id}"
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        return True
+
+
+class FakeEndpoints:
+    def __init__(self):
+        self.endpoints = {1: FakeEndpoint(1), 369: FakeEndpoint(369)}
+
+    def find(self, chain_id):
+        return [self.endpoints[chain_id]] if chain_id in self.endpoints else []
+
+
+@pytest.mark.asyncio
+async def test_reporters_run_concurrently():
+    supervisor = ReporterSupervisor(config=SimpleNamespace(endpoints=FakeEndpoints()), restart_delay=0)
+    reporters = [FakeReporter() for _ in range(10)]
+    for i, reporter in enumerate(reporters):
+        supervisor.add(reporter, name=f"acct{i}@1")
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await supervisor.run(report_count=1)
+    # ten 0.05s reporters run side by side
+    assert loop.time() - start < 0.3
+    assert all(r.runs == 1 for r in reporters)
+
+
+@pytest.mark.asyncio
+async def test_crashed_reporter_restarted():
+    supervisor = ReporterSupervisor(config=SimpleNamespace(endpoints=FakeEndpoints()), restart_delay=0)
+    flaky = FakeReporter(fail_times=2)
+    supervisor.add(flaky, name="flaky@1")
+    supervisor.add(FakeReporter(), name="ok@1")
+
+    # only continuously running reporters are restarted
+    task = asyncio.create_task(supervisor.run())
+    await asyncio.sleep(0.02)
+    assert flaky.runs == 3
+    assert supervisor.reporters[0].restarts == 2
+    await asyncio.wait_for(task, timeout=1)
+
+
+def test_endpoint_shared_per_chain():
+    endpoints = FakeEndpoints()
+    supervisor = ReporterSupervisor(config=SimpleNamespace(endpoints=endpoints))
+
+    assert supervisor.endpoint(1) is supervisor.endpoint(1)
+    assert endpoints.endpoints[1].connects == 1
+    assert supervisor.endpoint(369) is not supervisor.endpoint(1)
+    with pytest.raises(ValueError):
+        supervisor.endpoint(5)
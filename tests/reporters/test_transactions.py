@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from telliot_core.utils.response import ResponseStatus
+from web3.exceptions import TransactionNotFound
+
+from telliot_feeds.reporters.transactions import TransactionManager
+
+
+class FakeEth:
+    """Node that mines a sent transaction after a number of receipt requests"""
+
+    def __init__(self, mined_after=2, chain_nonce=5):
+        self.mined_after = mined_after
+        self.chain_nonce = chain_nonce
+        self.receipt_requests = {}
+        self.nonce_requests = 0
+        self.fail_send = False
+
+    def get_transaction_count(self, address, block_identifier="latest"):
+        self.nonce_requests += 1
+        return self.chain_nonce
+
+    def send_raw_transaction(self, raw_transaction):
+        if self.fail_send:
+            raise ValueError("nonce too low")
+        return bytes(raw_transaction).rjust(32, b"\x00")
+
+    def get_transaction_receipt(self, tx_hash):
+        requests = self.receipt_requests.get(tx_hash, 0) + 1
+        self.receipt_requests[tx_hash] = requests
+        if self.mined_after is None or requests <= self.mined_after:
+            raise TransactionNotFound(f"Transaction {tx_hash} not found")
+        return {"status": 1, "transactionHash": tx_hash}
+
+
+def manager(eth, timeout=5):
+    return TransactionManager(SimpleNamespace(eth=eth), "0xabc", timeout=timeout, poll_interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_receipt_tracked_in_background():
+    eth = FakeEth(mined_after=3)
+    txs = manager(eth)
+    handled = []
+
+    def on_receipt(pending):
+        handled.append((pending.receipt["status"], pending.context["pool_id"]))
+        return ResponseStatus()
+
+    pending = await txs.send_raw_transaction(b"\x01", nonce=5, on_receipt=on_receipt, context={"pool_id": "0x01"})
+    # send returns before the transaction is mined
+    assert not pending.done
+    assert pending.tx_hash in txs.pending
+
+    receipt = await pending.wait()
+    assert receipt["status"] == 1
+    assert pending.status.ok
+    assert handled == [(1, "0x01")]
+    assert not txs.pending
+
+
+@pytest.mark.asyncio
+async def test_local_nonce_counter():
+    eth = FakeEth(mined_after=None, chain_nonce=5)
+    txs = manager(eth)
+
+    assert txs.next_nonce() == 5
+    await txs.send_raw_transaction(b"\x01", nonce=5)
+    # node still reports the old nonce while the transaction is pending
+    assert txs.next_nonce() == 6
+    await txs.send_raw_transaction(b"\x02", nonce=6)
+    assert txs.next_nonce() == 7
+    assert eth.nonce_requests == 1
+
+    eth.fail_send = True
+    with pytest.raises(ValueError):
+        await txs.send_raw_transaction(b"\x03", nonce=7)
+    # rejected transaction: nonce is read from the chain again
+    assert txs.next_nonce() == 5
+    assert eth.nonce_requests == 2
+
+    for pending in list(txs.pending.values()):
+        pending.task.cancel()
+    await asyncio.gather(*[p.task for p in txs.pending.values()], return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_confirmation_timeout():
+    eth = FakeEth(mined_after=None)
+    txs = manager(eth, timeout=0.05)
+
+    pending = await txs.send_raw_transaction(b"\x01", nonce=5)
+    assert await pending.wait() is None
+    assert not pending.status.ok
+    assert "not confirmed in time" in pending.status.error
+    assert txs._nonce is None
+
+
+@pytest.mark.asyncio
+async def test_event_loop_not_blocked_while_pending():
+    eth = FakeEth(mined_after=10)
+    txs = manager(eth)
+    ticks = 0
+
+    async def other_work():
+        nonlocal ticks
+        while txs.pending:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    await txs.send_raw_transaction(b"\x01", nonce=5)
+    await asyncio.gather(other_work(), txs.wait_all())
+    assert ticks > 5
+    assert not txs.pending
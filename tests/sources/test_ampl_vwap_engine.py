@@ -0,0 +1,133 @@
+import random
+import time
+
+import pytest
+
+from telliot_feeds.sources.ampleforth import bitfinex
+from telliot_feeds.sources.ampleforth.bitfinex import build_buckets
+from telliot_feeds.sources.ampleforth.bitfinex import retrieve_bitfinex_trades
+from telliot_feeds.sources.ampleforth.bitfinex import THOUSAND_MIN
+from telliot_feeds.sources.ampleforth.bitfinex import volume_weighted_average_price
+from telliot_feeds.sources.ampleforth.vwap import TradeArray
+from telliot_feeds.sources.ampleforth.vwap import trades_vwap
+
+
+START = 1675296000000
+DAY = 86_400_000
+
+
+def random_trades(count, price, seed, start=START):
+    rng = random.Random(seed)
+    timestamps = sorted(rng.randrange(start, start + DAY) for _ in range(count))
+    return [[i, ts, rng.uniform(-50, 50), price * rng.uniform(0.95, 1.05)] for i, ts in enumerate(timestamps)]
+
+
+def reference_cross_vwap(start, from_list, to_list):
+    """Per trade loop the engine replaced"""
+
+    def buckets(trades):
+        per_slot = {}
+        for _, ts, amount, price in trades:
+            bucket = per_slot.setdefault((ts - start) // THOUSAND_MIN, {"trades": 0.0, "volume": 0.0})
+            bucket["trades"] += abs(amount * price)
+            bucket["volume"] += abs(amount)
+        for bucket in per_slot.values():
+            bucket["vwap"] = bucket["trades"] / bucket["volume"] if bucket["volume"] else 0
+        return per_slot
+
+    from_map, to_map = buckets(from_list), buckets(to_list)
+    value = volume = 0.0
+    for slot, from_slot in from_map.items():
+        s, to_slot = slot, None
+        while not to_slot and s >= 0:
+            to_slot = to_map.get(s)
+            s -= 1
+        if to_slot:
+            value += abs(to_slot["vwap"] * from_slot["vwap"] * from_slot["volume"])
+            volume += from_slot["volume"]
+    return value / volume, volume
+
+
+def test_cross_vwap_matches_reference():
+    from_list = random_trades(3000, 0.00005, seed=1)
+    # sparse second leg, so from buckets are converted with earlier to buckets
+    to_list = random_trades(200, 20000, seed=2)
+
+    result = volume_weighted_average_price(START, TradeArray.from_trades(from_list), TradeArray.from_trades(to_list))
+    vwap, volume = reference_cross_vwap(START, from_list, to_list)
+
+    assert result["vwap"] == pytest.approx(vwap, rel=1e-9)
+    assert result["volume"] == pytest.approx(volume, rel=1e-9)
+
+
+def test_build_buckets():
+    trades = [[1, START + 10, 2.0, 1.0], [2, START + 20, -1.0, 4.0], [3, START + THOUSAND_MIN * 3, 1.0, 5.0]]
+    buckets = build_buckets(START, TradeArray.from_trades(trades))
+
+    assert buckets == {
+        0: {"timestamp": START + 10, "trades": 6.0, "volume": 3.0, "vwap": 2.0},
+        3: {"timestamp": START + THOUSAND_MIN * 3, "trades": 5.0, "volume": 1.0, "vwap": 5.0},
+    }
+
+
+def test_trade_array_grows():
+    trades = TradeArray(capacity=2)
+    trades.append([[1, START, 1.0, 2.0]] * 3)
+    trades.append([[2, START + 1, -1.0, 4.0]] * 4)
+
+    assert len(trades) == 7
+    assert list(trades.timestamps) == [START] * 3 + [START + 1] * 4
+    assert trades_vwap(trades) == (22 / 7, 7)
+
+
+def test_day_of_trades_computes_quickly():
+    from_trades = TradeArray.from_trades(random_trades(200_000, 0.00005, seed=3))
+    to_trades = TradeArray.from_trades(random_trades(200_000, 20000, seed=4))
+
+    started = time.perf_counter()
+    volume_weighted_average_price(START, from_trades, to_trades)
+    trades_vwap(from_trades)
+    assert time.perf_counter() - started < 0.5
+
+
+class FakeResponse:
+    def __init__(self, page):
+        self.page = page
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def json(self):
+        return self.page
+
+
+class FakeSession:
+    """Returns pages of at most page_size trades from start, like the Bitfinex trades endpoint"""
+
+    def __init__(self, trades, page_size):
+        self.trades = trades
+        self.page_size = page_size
+        self.requests = []
+
+    def get(self, url, params, timeout):
+        self.requests.append(params["start"])
+        page = [t for t in self.trades if params["start"] <= t[1] <= params["end"]][: self.page_size]
+        return FakeResponse(page)
+
+
+@pytest.mark.asyncio
+async def test_paginated_trades_not_duplicated(monkeypatch):
+    # several trades share the timestamp a page ends on
+    trades = [[i, START + i // 3, 1.0, 1.0 + i] for i in range(10)]
+    session = FakeSession(trades, page_size=4)
+    monkeypatch.setattr(bitfinex, "get_client_session", lambda: session)
+    monkeypatch.setattr(bitfinex, "PAGE_SIZE", 4)
+
+    result = await retrieve_bitfinex_trades("tAMPUSD", START, START + DAY)
+
+    assert len(result) == len(trades)
+    assert list(result.prices) == [t[3] for t in trades]
+    assert len(session.requests) > 1
@@ -1,10 +1,16 @@
+import asyncio
+import json
+
 import pytest
 from eth_abi import decode_single
 from hexbytes import HexBytes
 from telliot_core.apps.telliot_config import TelliotConfig
+from web3 import HTTPProvider
+from web3 import Web3
 
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
 from telliot_feeds.sources.evm_call import EVMCallSource
+from telliot_feeds.utils import chain_client
 from telliot_feeds.utils.source_utils import update_web3
 
 
@@ -165,3 +171,40 @@ def test_evm_call_on_previous_block():
 
     assert current_value != previous_value
     assert current_timestamp != previous_timestamp
+
+
+@pytest.mark.asyncio
+async def test_evm_calls_are_batched(monkeypatch):
+    """Test that the block header and the calls of sources on a chain are sent in one request"""
+    posts = []
+
+    def post(endpoint_uri, data, **kwargs):
+        posts.append(json.loads(data))
+        responses = []
+        for request in json.loads(data):
+            if request["method"] == "eth_getBlockByNumber":
+                result = {"number": "0x10", "timestamp": hex(1_700_000_000)}
+            else:
+                result = "0x" + request["params"][0]["data"][2:10].rjust(64, "0")
+            responses.append({"jsonrpc": "2.0", "id": request["id"], "result": result})
+        return json.dumps(responses)
+
+    monkeypatch.setattr(chain_client, "make_post_request", post)
+    w3 = Web3(HTTPProvider("http://fake-node"))
+    sources = [
+        EVMCallSource(
+            chainId=1,
+            contractAddress="0xD9157453E2668B2fc45b7A803D3FEF3642430cC0",
+            calldata=bytes.fromhex(selector),
+            web3=w3,
+        )
+        for selector in ["73252494", "adf1639d"]
+    ]
+    responses = [await s.get_response_batched() for s in sources[:1]]
+    responses += await asyncio.gather(*[s.get_response_batched() for s in sources])
+
+    # the latest block is requested once for both sources
+    assert [len(p) for p in posts] == [2, 3]
+    for (result, timestamp), selector in zip(responses, ["73252494", "73252494", "adf1639d"]):
+        assert result == HexBytes(bytes.fromhex(selector.rjust(64, "0")))
+        assert timestamp == 1_700_000_000
@@ -0,0 +1,109 @@
+from datetime import datetime
+from datetime import timezone
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from telliot_feeds.sources.mimicry import sales_history
+from telliot_feeds.sources.mimicry.collection_stat import MimicryCollectionStatSource
+from telliot_feeds.sources.mimicry.collection_stat import TransactionList
+from telliot_feeds.sources.mimicry.sales_history import SalesHistory
+from telliot_feeds.sources.mimicry.tami import tami
+from telliot_feeds.sources.mimicry.types import Transaction
+
+
+now = datetime.utcnow().replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def days_ago(days):
+    return now - relativedelta(days=days)
+
+
+first_sales = [
+    Transaction(itemId="Mars", price=612, date=days_ago(40)),
+    Transaction(itemId="Hyacinth", price=700, date=days_ago(30)),
+    Transaction(itemId="Hyacinth", price=400, date=days_ago(3)),
+    Transaction(itemId="Mars", price=1200, date=days_ago(2)),
+]
+
+
+def test_history_persisted_with_cursor(tmp_path):
+    path = tmp_path / "1_0xabc.json"
+    history = SalesHistory(path=path)
+    assert history.cursor == 0
+
+    assert history.add(list(reversed(first_sales))) == 4
+    history.save()
+
+    loaded = SalesHistory(path=path)
+    assert loaded.transactions == first_sales
+    assert loaded.cursor == int(days_ago(2).timestamp())
+    # sales at the cursor are fetched again and skipped
+    assert loaded.add([first_sales[-1]]) == 0
+
+
+def test_tami_resumes_from_checkpoint(tmp_path, monkeypatch):
+    path = tmp_path / "1_0xabc.json"
+    history = SalesHistory(path=path)
+    history.add(first_sales)
+    assert history.tami() == tami(first_sales)
+    history.save()
+
+    added = []
+    original_add = sales_history.TamiIndex.add
+
+    def counting_add(self, transaction):
+        added.append(transaction)
+        return original_add(self, transaction)
+
+    monkeypatch.setattr(sales_history.TamiIndex, "add", counting_add)
+
+    later_sales = [
+        Transaction(itemId="Hyacinth", price=900, date=days_ago(1)),
+        Transaction(itemId="Mars", price=1100, date=days_ago(0)),
+    ]
+    history = SalesHistory(path=path)
+    history.add(later_sales)
+    value = history.tami()
+
+    # only the new sales are processed
+    assert added == later_sales
+    assert value == pytest.approx(tami(first_sales + later_sales))
+
+
+def test_tami_rebuilt_when_valid_items_change(tmp_path):
+    history = SalesHistory(path=tmp_path / "1_0xabc.json")
+    history.add(first_sales)
+    history.tami()
+
+    # Lavender's second sale makes its earlier sale valid too
+    later_sales = [
+        Transaction(itemId="Lavender", price=500, date=days_ago(1)),
+        Transaction(itemId="Lavender", price=550, date=days_ago(0)),
+    ]
+    history.add(later_sales)
+    assert history.tami() == tami(first_sales + later_sales)
+
+
+@pytest.mark.asyncio
+async def test_only_new_sales_requested(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        SalesHistory, "for_collection", classmethod(lambda cls, *_: cls(path=tmp_path / "1_0xabc.json"))
+    )
+    requested = []
+    pages = [first_sales, [first_sales[-1], Transaction(itemId="Mars", price=1100, date=days_ago(0))]]
+
+    async def request(self, contract, all=True, start_timestamp=None):
+        requested.append(start_timestamp)
+        return TransactionList(transactions=pages[len(requested) - 1])
+
+    monkeypatch.setattr(MimicryCollectionStatSource, "request_historical_sales_data", request)
+    source = MimicryCollectionStatSource(chainId=1, collectionAddress="0xabc", metric=0)
+
+    first, _ = await source.fetch_new_datapoint()
+    second, _ = await source.fetch_new_datapoint()
+
+    assert requested == [0, int(days_ago(2).timestamp())]
+    assert first == tami(first_sales)
+    assert second == pytest.approx(tami(first_sales + pages[1][1:]))
+    assert len(source._sales_history.transactions) == 5
@@ -158,7 +158,7 @@ async def test_gemini(caplog, monkeypatch):
         validate_price(v, t)
 
     # mock GeminiSpotPriceService.get_url() to return None
-    def mock_get_url(*args, **kwargs):
+    async def mock_get_url(*args, **kwargs):
         return None
 
     monkeypatch.setattr(GeminiSpotPriceService, "get_url", mock_get_url)
@@ -205,6 +205,23 @@ async def test_uniswap_eth_usd(caplog):
         assert "Uniswap API not included, because price response is 0" in caplog.records[0].msg
 
 
+@pytest.mark.asyncio
+async def test_uniswap_without_api_key(monkeypatch):
+    """Without a Graph API key, the subgraph is queried without authorization instead of failing"""
+    requests = []
+
+    async def mock_post_url(self, url, headers=None, json_data=None):
+        requests.append(headers)
+        return {"error": "Timeout Error"}
+
+    monkeypatch.setattr("telliot_feeds.sources.price.spot.uniswapV3.API_KEY", "")
+    monkeypatch.setattr(UniswapV3PriceService, "post_url", mock_post_url)
+    v, t = await get_price("eth", "usd", service["uniswapV3"])
+    assert v is None
+    assert t is None
+    assert requests == [{"Accepts": "application/json"}]
+
+
 @pytest.mark.skip("Not needed currently")
 @pytest.mark.asyncio
 async def test_pancakeswap_usd():
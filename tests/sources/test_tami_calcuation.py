@@ -1,12 +1,16 @@
+import json
 from datetime import datetime
+from datetime import timedelta
 from datetime import timezone
 
+import pytest
 from dateutil.relativedelta import relativedelta
 
 from telliot_feeds.sources.mimicry.tami import create_index_value_history
 from telliot_feeds.sources.mimicry.tami import get_index_ratios
 from telliot_feeds.sources.mimicry.tami import get_index_value
 from telliot_feeds.sources.mimicry.tami import tami
+from telliot_feeds.sources.mimicry.tami import TamiIndex
 from telliot_feeds.sources.mimicry.types import IndexValueHistoryItem
 from telliot_feeds.sources.mimicry.types import Transaction
 from telliot_feeds.sources.mimicry.utils import filter_valid_transactions
@@ -125,3 +129,38 @@ def test_tami_with_transaction_data():
 def test_tami_empty_transaction_data():
     value = tami([])
     assert value is None
+
+
+def test_index_resumes_from_checkpoint():
+    index = TamiIndex()
+    for transaction in valid_transactions[:2]:
+        index.add(transaction)
+    resumed = TamiIndex.from_checkpoint(json.loads(json.dumps(index.checkpoint())))
+    for transaction in valid_transactions[2:]:
+        resumed.add(transaction)
+
+    assert resumed.count == len(valid_transactions)
+    assert resumed.index_value == expected_values["indexValue"]
+    assert resumed.tami() == expected_values["timeAdjustedMarketIndex"]
+
+
+def test_large_collection_matches_full_recalculation():
+    transactions = [
+        Transaction(itemId=i % 500, price=100 + (i * 7919) % 1000, date=one_month_ago + timedelta(seconds=i))
+        for i in range(5000)
+    ]
+    history = create_index_value_history(transactions)
+
+    # index value from re-summing every item's last sale price at each transaction
+    last_prices = {}
+    divisor = 1.0
+    last_index_value = 0.0
+    for i, transaction in enumerate(transactions):
+        is_first_sale = transaction.itemId not in last_prices
+        last_prices[transaction.itemId] = transaction.price
+        index_value = sum(last_prices.values()) / (len(last_prices) * divisor)
+        if i > 0 and is_first_sale:
+            divisor *= index_value / last_index_value
+            index_value = sum(last_prices.values()) / (len(last_prices) * divisor)
+        last_index_value = index_value
+        assert history[i].indexValue == pytest.approx(index_value)
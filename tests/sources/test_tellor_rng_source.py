@@ -40,9 +40,14 @@ async def test_no_mainnet_configured(caplog, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_rng_failures(caplog):
+async def test_rng_failures(caplog, monkeypatch):
     """Simulate API failures."""
     timestamp = 1649769707
+    # exercise the Etherscan fallback used when the block can't be resolved from headers
+    monkeypatch.setattr(
+        "telliot_feeds.sources.blockhash_aggregator.get_block_resolver",
+        lambda chain_id: mock.Mock(block_number_at=mock.Mock(return_value=None)),
+    )
 
     def conn_timeout(url, *args, **kwargs):
         raise requests.exceptions.ConnectTimeout()
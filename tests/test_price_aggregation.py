@@ -0,0 +1,108 @@
+import statistics
+
+import numpy as np
+import pytest
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.pricing import aggregation as aggregation_module
+from telliot_feeds.pricing.aggregation import Aggregation
+from telliot_feeds.pricing.aggregation import DeviationHistory
+from telliot_feeds.pricing.aggregation import outlier_mask
+from telliot_feeds.pricing.aggregation import weighted_median
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price_aggregator import PriceAggregator
+
+
+@pytest.mark.parametrize("prices", [[3.0, 1.0, 2.0], [4.0, 1.0, 3.0, 2.0], [5.0]])
+def test_unweighted_matches_statistics(prices):
+    assert Aggregation().aggregate(prices) == statistics.median(prices)
+    assert Aggregation(algorithm="mean").aggregate(prices) == pytest.approx(statistics.mean(prices))
+    assert weighted_median(np.array(prices), np.ones(len(prices))) == statistics.median(prices)
+
+
+def test_weighted_median():
+    values = np.array([100.0, 101.0, 110.0])
+    assert weighted_median(values, np.array([1.0, 1.0, 5.0])) == 110.0
+    assert weighted_median(values, np.array([3.0, 1.0, 1.0])) == 100.0
+    assert Aggregation().aggregate([100.0, 101.0, 110.0], weights=[1, 1, 5]) == 110.0
+    assert Aggregation(algorithm="mean").aggregate([100.0, 110.0], weights=[3, 1]) == pytest.approx(102.5)
+
+
+def test_outliers_rejected():
+    prices = [100.0, 100.5, 99.8, 100.2, 150.0]
+    assert not outlier_mask(np.array(prices), "mad")[-1]
+    assert not outlier_mask(np.array(prices), "iqr")[-1]
+    assert outlier_mask(np.array(prices), "mad")[:-1].all()
+    # too few prices to tell which one is the outlier
+    assert outlier_mask(np.array([100.0, 150.0]), "mad").all()
+
+    assert Aggregation(algorithm="mean", outlier_filter="mad").aggregate(prices) == pytest.approx(100.125)
+    with pytest.raises(ValueError):
+        Aggregation(outlier_filter="zscore")
+
+
+def test_outliers_rejected_among_identical_prices():
+    # the MAD and IQR are 0 when most sources return the same price
+    prices = np.array([100.0, 100.0, 100.0, 100.01, 150.0])
+    assert outlier_mask(prices, "mad").tolist() == [True, True, True, True, False]
+    assert outlier_mask(prices, "iqr").tolist() == [True, True, True, True, False]
+    assert outlier_mask(np.array([100.0, 100.0, 100.0]), "mad").all()
+
+
+def test_stale_prices_weighted_down_and_dropped():
+    now = 1_700_000_000.0
+    prices = [100.0, 110.0]
+    timestamps = [now - 300, now]
+
+    half_life = Aggregation(algorithm="mean", staleness_half_life=300)
+    assert half_life.aggregate(prices, timestamps=timestamps, now=now) == pytest.approx((100 * 0.5 + 110) / 1.5)
+    assert Aggregation(max_age=60).aggregate(prices, timestamps=timestamps, now=now) == 110.0
+    assert Aggregation(max_age=60).aggregate([100.0], timestamps=[now - 300], now=now) is None
+    # prices without timestamps count as fresh
+    assert Aggregation(max_age=60).aggregate([100.0], timestamps=[float("nan")], now=now) == 100.0
+
+
+def test_deviating_sources_weighted_down():
+    history = DeviationHistory()
+    aggregation = Aggregation(algorithm="mean", penalize_deviation=True)
+    keys = ["good", "also good", "bad"]
+    for _ in range(20):
+        aggregation.aggregate([100.0, 100.0, 103.0], keys=keys, history=history)
+
+    assert history.get("good") < history.get("bad")
+    weights = history.weights(keys)
+    assert weights[2] < weights[0] / 2
+    assert aggregation.aggregate([100.0, 100.0, 103.0], keys=keys, history=history) < 100.5
+
+
+class FixedPriceService(WebPriceService):
+    def __init__(self, name, price):
+        super().__init__(name=name, url=f"https://{name}.xyz")
+        self.price = price
+
+    async def get_price(self, asset, currency):
+        return self.price, datetime_now_utc()
+
+
+@pytest.mark.asyncio
+async def test_aggregator_weights_and_outliers(monkeypatch):
+    monkeypatch.setattr(aggregation_module, "deviation_history", DeviationHistory())
+    sources = [
+        PriceSource(asset="eth", currency="usd", service=FixedPriceService("a", 1800.0), weight=4),
+        PriceSource(asset="eth", currency="usd", service=FixedPriceService("b", 1810.0)),
+        PriceSource(asset="eth", currency="usd", service=FixedPriceService("c", 1805.0)),
+        PriceSource(asset="eth", currency="usd", service=FixedPriceService("d", 2500.0)),
+    ]
+
+    plain = PriceAggregator(asset="eth", currency="usd", sources=sources)
+    assert (await plain.fetch_new_datapoint())[0] == 1800.0
+
+    robust = PriceAggregator(asset="eth", currency="usd", algorithm="mean", sources=sources, outlier_filter="mad")
+    assert (await robust.fetch_new_datapoint())[0] == pytest.approx((4 * 1800 + 1810 + 1805) / 6)
+
+    key = sources[3].service.cache_key("eth", "usd")
+    assert aggregation_module.deviation_history.get(key) > 0.3
+
+    with pytest.raises(ValueError):
+        PriceAggregator(asset="eth", currency="usd", algorithm="mode")
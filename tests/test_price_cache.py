@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.pricing.price_cache import price_cache
+from telliot_feeds.pricing.price_cache import PriceCache
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+
+
+class CountingPriceService(WebPriceService):
+    """Fake price service that counts requests"""
+
+    def __init__(self, **kwargs):
+        kwargs["name"] = "Counting Price Service"
+        kwargs["url"] = "https://fakeurl.xyz"
+        super().__init__(**kwargs)
+        self.requests = []
+
+    async def get_price(self, asset, currency):
+        self.requests.append((asset, currency))
+        await asyncio.sleep(0.05)
+        return 1234.5, datetime_now_utc()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sources_share_request():
+    """Concurrent sources for the same service, asset & currency send one request"""
+    price_cache.clear()
+    service = CountingPriceService()
+    sources = [PriceSource(asset="eth", currency="usd", service=service) for _ in range(5)]
+
+    datapoints = await asyncio.gather(*[s.fetch_new_datapoint() for s in sources])
+
+    assert len(service.requests) == 1
+    assert all(v == 1234.5 for v, _ in datapoints)
+    assert all(s.latest[0] == 1234.5 for s in sources)
+
+    # within the TTL the cached price is reused
+    await sources[0].fetch_new_datapoint()
+    assert len(service.requests) == 1
+
+    # different asset is a different request
+    await PriceSource(asset="btc", currency="usd", service=service).fetch_new_datapoint()
+    assert len(service.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_expiry_and_failures():
+    """Expired and failed datapoints aren't reused"""
+    cache = PriceCache(ttl=0.05)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return None, None
+
+    assert await cache.fetch("key", fetch) == (None, None)
+    assert await cache.fetch("key", fetch) == (None, None)
+    assert len(calls) == 2
+
+    async def fetch_price():
+        calls.append(1)
+        return 1.0, datetime_now_utc()
+
+    await cache.fetch("key", fetch_price)
+    await cache.fetch("key", fetch_price)
+    assert len(calls) == 3
+
+    await asyncio.sleep(0.06)
+    await cache.fetch("key", fetch_price)
+    assert len(calls) == 4
+
+
+def test_cache_key_includes_service_settings():
+    """Historical services with different timestamps don't share prices"""
+    a = CountingPriceService()
+    b = CountingPriceService()
+    assert a.cache_key("ETH", "USD") == b.cache_key("eth", "usd")
+
+    b.ts = 1650000000
+    assert a.cache_key("eth", "usd") != b.cache_key("eth", "usd")
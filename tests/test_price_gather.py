@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.pricing import gather
+from telliot_feeds.pricing.gather import gather_prices
+from telliot_feeds.pricing.gather import GatherSettings
+from telliot_feeds.pricing.price_cache import price_cache
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price_aggregator import PriceAggregator
+
+
+class DelayedPriceService(WebPriceService):
+    """Fake price service answering after the given delays, one per request
+
+    Counters are lists, so they aren't part of the service's cache key.
+    """
+
+    def __init__(self, name, price, *delays):
+        super().__init__(name=name, url=f"https://{name}.xyz")
+        self.price = price
+        self.delays = list(delays)
+        self.requests = []
+        self.cancelled = []
+
+    async def get_price(self, asset, currency):
+        delay = self.delays[min(len(self.requests), len(self.delays) - 1)]
+        self.requests.append(delay)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(delay)
+            raise
+        return self.price, datetime_now_utc()
+
+
+def source(name, price, *delays):
+    return PriceSource(asset="eth", currency="usd", service=DelayedPriceService(name, price, *delays))
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setattr(price_cache, "ttl", 0)
+    monkeypatch.setattr(gather, "latencies", gather.LatencyTracker())
+
+
+@pytest.mark.asyncio
+async def test_quorum_returns_with_fastest_sources():
+    sources = [source("a", 1.0, 0.01), source("b", 2.0, 0.02), source("c", 3.0, 2.0)]
+
+    start = time.monotonic()
+    datapoints = await gather_prices(sources, GatherSettings(quorum=2))
+
+    assert time.monotonic() - start < 0.5
+    assert [v for v, _ in datapoints] == [1.0, 2.0, None]
+    # the slow source's request was cancelled
+    assert sources[2].service.cancelled == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_deadline_ignores_late_sources():
+    sources = [source("a", 1.0, 0.01), source("b", 2.0, 2.0)]
+
+    start = time.monotonic()
+    datapoints = await gather_prices(sources, GatherSettings(deadline=0.1))
+
+    assert time.monotonic() - start < 0.5
+    assert [v for v, _ in datapoints] == [1.0, None]
+
+
+@pytest.mark.asyncio
+async def test_slow_request_hedged():
+    slow = source("a", 1.0, 0.05, 2.0, 0.05)
+    settings = GatherSettings(hedge_factor=3)
+
+    await gather_prices([slow], settings)
+    start = time.monotonic()
+    datapoints = await gather_prices([slow], settings)
+
+    # the second request was slow, a third request answered instead
+    assert time.monotonic() - start < 0.5
+    assert datapoints[0][0] == 1.0
+    assert slow.service.requests == [0.05, 2.0, 0.05]
+    assert slow.service.cancelled == [2.0]
+    assert slow.latest[0] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_aggregator_uses_default_settings(monkeypatch):
+    monkeypatch.setattr(gather, "default_gather_settings", GatherSettings(quorum=1))
+    monkeypatch.setattr(
+        "telliot_feeds.sources.price_aggregator.default_gather_settings", gather.default_gather_settings
+    )
+    aggregator = PriceAggregator(asset="eth", currency="usd", sources=[source("a", 1.0, 0.01), source("b", 2.0, 2.0)])
+
+    assert aggregator.gather_settings() == GatherSettings(quorum=1)
+    assert (await aggregator.fetch_new_datapoint())[0] == 1.0
+
+    aggregator.quorum = 2
+    aggregator.deadline = 0.1
+    assert aggregator.gather_settings() == GatherSettings(quorum=2, deadline=0.1)
+
+
+@pytest.mark.asyncio
+async def test_all_sources_awaited_by_default():
+    sources = [source("a", 1.0, 0.01), source("b", 2.0, 0.1)]
+    datapoints = await gather_prices(sources, GatherSettings())
+    assert [v for v, _ in datapoints] == [1.0, 2.0]
+
+    with pytest.raises(ValueError):
+        GatherSettings(quorum=0)
@@ -1,28 +1,85 @@
-from unittest import mock
+import asyncio
+import time
 
 import pytest
-import requests
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
+from telliot_feeds.pricing.price_service import close_client_session
+from telliot_feeds.pricing.price_service import get_client_session
 from telliot_feeds.pricing.price_service import WebPriceService
 
 
+class FakePriceService(WebPriceService):
+    """Must implement get_price or NotImplementedError will be raised"""
+
+    async def get_price(self, asset, currency):
+        return None, None
+
+
+async def slow_price(request):
+    await asyncio.sleep(0.2)
+    return web.json_response({"price": 1.0})
+
+
+async def not_json(request):
+    return web.Response(text="<html>rate limited</html>")
+
+
+async def echo_post(request):
+    body = await request.json()
+    return web.json_response({"query": body["query"]})
+
+
+@pytest_asyncio.fixture
+async def fake_server():
+    app = web.Application()
+    app.router.add_get("/price", slow_price)
+    app.router.add_get("/html", not_json)
+    app.router.add_post("/graphql", echo_post)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await close_client_session()
+    await server.close()
+
+
 @pytest.mark.asyncio
-async def test_webpriceservice_errors(caplog):
+async def test_webpriceservice_errors(fake_server):
     """ "Test failures of WebPriceService class"""
+    wsp = FakePriceService(name="FakePriceService", url=str(fake_server.make_url("")))
+
+    result = await wsp.get_url("/html")
+    assert "error" in result
+    assert "JSON Decode Error" == result["error"]
+
+    wsp.timeout = 0.05
+    result = await wsp.get_url("/price")
+    assert "error" in result
+    assert "Timeout Error" == result["error"]
 
-    class FakePriceService(WebPriceService):
-        """Must implement get_price or NotImplementedError will be raised"""
 
-        async def get_price(self, asset, currency):
-            return None, None
+@pytest.mark.asyncio
+async def test_webpriceservice_post(fake_server):
+    """Test posting a JSON body with WebPriceService"""
+    wsp = FakePriceService(name="FakePriceService", url=str(fake_server.make_url("")))
+
+    result = await wsp.post_url("/graphql", json_data={"query": "{ bundles { ethPriceUSD } }"})
+    assert result["status"] == 200
+    assert result["response"] == {"query": "{ bundles { ethPriceUSD } }"}
 
-    def json_decode_error(*args, **kwargs):
-        """Override get method and raise JSONDecodeError"""
-        raise requests.exceptions.JSONDecodeError("JSON Decode Error", "", 0)
 
-    with mock.patch("requests.Session.get", side_effect=json_decode_error):
-        wsp = FakePriceService(name="FakePriceService", url="https://fakeurl.xyz")
-        result = wsp.get_url()
+@pytest.mark.asyncio
+async def test_webpriceservice_concurrent_requests(fake_server):
+    """Requests from different services share one session and run concurrently"""
+    services = [FakePriceService(name=f"Fake{i}", url=str(fake_server.make_url(""))) for i in range(4)]
+
+    start = time.monotonic()
+    results = await asyncio.gather(*[s.get_url("/price") for s in services])
+    elapsed = time.monotonic() - start
 
-        assert "error" in result
-        assert "JSON Decode Error" == result["error"]
+    assert all(r["response"] == {"price": 1.0} for r in results)
+    # each request takes 0.2s, so sequential requests would take at least 0.8s
+    assert elapsed < 0.6
+    assert get_client_session() is get_client_session()
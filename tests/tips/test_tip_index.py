@@ -0,0 +1,104 @@
+import pytest
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.tip_index import get_tip_index
+from telliot_feeds.reporters.tips.listener.tip_index import TipIndex
+from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
+
+QUERY_ID = b"\x01" * 32
+FEED_ID = b"\x02" * 32
+NOW = 1_700_000_000
+MONTH_AGO = NOW - 2_592_000
+
+
+class FakeMulticallAutopay(MulticallAutopay):
+    """Records the calls made and answers them from a fake chain state"""
+
+    def __init__(self, reports, claimed):
+        self.reports = reports
+        self.claimed = claimed
+        self.requests = []
+
+    def get_multiple_values_before(self, query_id, now_timestamp, max_age, max_count=40_000, handler_function=None):
+        return ("getMultipleValuesBefore", query_id, now_timestamp, max_age)
+
+    def get_reward_claimed_status(self, feed_id, query_id, timestamps, handler_function=None):
+        return ("getRewardClaimStatusList", feed_id, query_id, tuple(timestamps))
+
+    async def multi_call(self, calls, success=False):
+        self.requests.append(calls)
+        resp = {}
+        for call in calls:
+            if call[0] == "getMultipleValuesBefore":
+                _, qid, now, max_age = call
+                matches = [(v, t) for v, t in self.reports if now - max_age < t < now]
+                resp[("values_array", qid)] = [v for v, _ in matches]
+                resp[("timestamps_array", qid)] = [t for _, t in matches]
+            else:
+                _, feed_id, qid, timestamps = call
+                resp[(feed_id, qid)] = [t in self.claimed for t in timestamps]
+        return resp, ResponseStatus()
+
+
+def make_feed():
+    params = FeedDetails(
+        reward=1, balance=100, startTime=0, interval=3600, window=600, priceThreshold=0, rewardIncreasePerSecond=0
+    )
+    return QueryIdandFeedDetails(params=params, feed_id=FEED_ID, query_id=QUERY_ID, query_data=b"query")
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync(tmp_path):
+    """After the first sync only new reports and unknown claim statuses are fetched"""
+    reports = [(b"a", NOW - 7200), (b"b", NOW - 3600)]
+    call = FakeMulticallAutopay(reports=reports, claimed={NOW - 7200})
+    index = TipIndex(path=tmp_path / "index.pickle")
+
+    feeds, _ = await call.indexed_timestamps_and_values([make_feed()], NOW, MONTH_AGO, index)
+    assert [v.timestamp for v in feeds[0].queryid_timestamps_values_list] == [NOW - 7200, NOW - 3600]
+    assert feeds[0].current_queryid_value == b"b"
+    # first sync looks back the whole month
+    assert call.requests[-1][0][3] == NOW - MONTH_AGO
+
+    unclaimed, _ = await call.indexed_rewards_claimed_status(feeds, index)
+    assert unclaimed == {(FEED_ID, QUERY_ID): 1}
+    index.save()
+
+    # new report and a new loop a minute later
+    reports.append((b"c", NOW + 30))
+    reloaded = TipIndex(path=tmp_path / "index.pickle")
+    feeds, _ = await call.indexed_timestamps_and_values([make_feed()], NOW + 60, MONTH_AGO + 60, reloaded)
+    # only the last minute is requested
+    assert call.requests[-1][0][3] == 61
+    assert [v.value for v in feeds[0].queryid_timestamps_values_list] == [b"a", b"b", b"c"]
+
+    unclaimed, _ = await call.indexed_rewards_claimed_status(feeds, reloaded)
+    # the claimed timestamp isn't checked again
+    assert call.requests[-1][0][3] == (NOW - 3600, NOW + 30)
+    assert unclaimed == {(FEED_ID, QUERY_ID): 2}
+
+
+def test_prune_and_full_resync():
+    """Reports older than the retention period are dropped"""
+    index = TipIndex(retention=100, resync_period=50)
+    assert index.needs_full_sync(NOW)
+
+    index.update_reports(QUERY_ID, [b"a", b"b"], [NOW - 150, NOW - 10], synced_to=NOW, full=True)
+    index.last_full_sync = NOW
+    assert [r.value for r in index.reports(QUERY_ID)] == [b"b"]
+    assert not index.needs_full_sync(NOW + 10)
+    assert index.needs_full_sync(NOW + 50)
+
+    index.update_claim_status(FEED_ID, QUERY_ID, [NOW - 150, NOW - 10], [True, True])
+    index.prune(NOW)
+    assert index.unknown_claim_status(FEED_ID, QUERY_ID, [NOW - 150, NOW - 10]) == [NOW - 150]
+
+
+def test_tip_index_shared_per_autopay(monkeypatch, tmp_path):
+    monkeypatch.setattr("telliot_feeds.reporters.tips.listener.tip_index.default_homedir", lambda: tmp_path)
+    index = get_tip_index(1, "0xAbC")
+    assert get_tip_index(1, "0xabc") is index
+    assert get_tip_index(137, "0xabc") is not index
+    assert index.path.parent == tmp_path / "tip_index"
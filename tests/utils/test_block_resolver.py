@@ -0,0 +1,77 @@
+import bisect
+import random
+
+from telliot_feeds.utils.block_resolver import BlockResolver
+
+
+class FakeChain:
+    """Chain of blocks with irregular block times"""
+
+    def __init__(self, n_blocks: int = 200_000, seed: int = 1):
+        rng = random.Random(seed)
+        self.timestamps = [1_600_000_000]
+        for _ in range(n_blocks - 1):
+            # mostly 12 second blocks, with missed slots and same-second blocks
+            self.timestamps.append(self.timestamps[-1] + rng.choice([0, 12, 12, 12, 12, 24, 36]))
+        self.calls = 0
+
+    def get_block(self, block_id):
+        self.calls += 1
+        number = len(self.timestamps) - 1 if block_id == "latest" else block_id
+        return {"number": number, "timestamp": self.timestamps[number]}
+
+    def expected(self, timestamp):
+        i = bisect.bisect_right(self.timestamps, timestamp)
+        return i - 1 if i > 0 else None
+
+
+def test_block_number_at_matches_linear_search():
+    chain = FakeChain()
+    resolver = BlockResolver()
+    rng = random.Random(2)
+    first, last = chain.timestamps[0], chain.timestamps[-1]
+
+    for target in [first - 1, first, last, last + 100] + [rng.randint(first, last) for _ in range(200)]:
+        assert resolver.block_number_at(target, chain.get_block) == chain.expected(target)
+
+
+def test_cached_and_nearby_lookups_are_cheap():
+    chain = FakeChain()
+    resolver = BlockResolver()
+    target = chain.timestamps[120_000] + 5
+
+    expected = chain.expected(target)
+    assert resolver.block_number_at(target, chain.get_block) == expected
+    # plain binary search from block 0 takes ~18 calls for this chain
+    assert chain.calls < 12
+
+    chain.calls = 0
+    assert resolver.block_number_at(target, chain.get_block) == expected
+    assert chain.calls == 0
+
+    calls = []
+    for offset in (60, 300, 600, -600, 3600):
+        chain.calls = 0
+        assert resolver.block_number_at(target + offset, chain.get_block) == chain.expected(target + offset)
+        calls.append(chain.calls)
+    assert sum(calls) / len(calls) <= 4
+
+
+def test_header_cache_persisted(tmp_path):
+    chain = FakeChain()
+    path = tmp_path / "headers.json"
+    target = chain.timestamps[50_000]
+
+    BlockResolver(chain_id=1, path=path).block_number_at(target, chain.get_block)
+    assert path.exists()
+
+    resolver = BlockResolver(chain_id=1, path=path)
+    assert len(resolver) > 0
+    chain.calls = 0
+    assert resolver.block_number_at(target, chain.get_block) == chain.expected(target)
+    assert chain.calls == 0
+
+
+def test_failed_block_fetch():
+    resolver = BlockResolver()
+    assert resolver.block_number_at(1_600_000_000, lambda block_id: None) is None
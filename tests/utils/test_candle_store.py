@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from telliot_feeds.sources.price.historical import kraken
+from telliot_feeds.sources.price.historical.kraken import KrakenHistoricalPriceService
+from telliot_feeds.utils import candle_store
+from telliot_feeds.utils.candle_store import CandleStore
+from telliot_feeds.utils.candle_store import SeriesKey
+from telliot_feeds.utils.candle_store import TRADES
+from telliot_feeds.utils.volatility import DailyCloseSeries
+
+
+key = SeriesKey("kraken", "ethusd", TRADES)
+past = 1_600_000_000
+
+
+def test_missing_ranges_and_merging(tmp_path):
+    store = CandleStore(path=tmp_path / "candles.sqlite")
+    assert store.missing(key, past, past + 100) == [(past, past + 100)]
+
+    store.add(key, [(past + 10, 1.0), (past + 20, 2.0)], start=past, end=past + 30)
+    store.add(key, [(past + 60, 3.0)], start=past + 50, end=past + 70)
+    assert store.missing(key, past, past + 100) == [(past + 30, past + 50), (past + 70, past + 100)]
+
+    store.add(key, [], start=past + 30, end=past + 50)
+    assert store.missing(key, past, past + 70) == []
+    assert store._fetched(key) == [(past, past + 70)]
+
+    # a later price with the same timestamp replaces the stored one
+    store.add(key, [(past + 20, 2.5)])
+    store.close()
+
+    store = CandleStore(path=tmp_path / "candles.sqlite")
+    assert store.prices(key) == [(past + 10, 1.0), (past + 20, 2.5), (past + 60, 3.0)]
+    assert store.last(key, past + 59) == (past + 20, 2.5)
+    assert store.last(key, past + 59, start=past + 30) is None
+
+
+def test_recent_ranges_not_marked_fetched():
+    store = CandleStore()
+    now = int(time.time())
+    store.add(key, [(now - 10, 1.0)], start=now - 600, end=now)
+    assert store.missing(key, now - 600, now) == [(now - candle_store.SETTLE_DELAY, now)]
+
+    daily = SeriesKey("kraken", "ethusd", 86400)
+    store.add(daily, [], start=now - 10 * 86400, end=now)
+    assert store.missing(daily, now - 10 * 86400, now) == [(now - 86400, now)]
+
+
+def test_daily_close_series_persisted():
+    store = CandleStore()
+    daily = SeriesKey("kraken", "ethusd", 86400)
+    DailyCloseSeries(store=store, key=daily).update([(0, 1.0), (86400, 2.0)])
+
+    assert list(DailyCloseSeries(store=store, key=daily).closes()) == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_same_expiry_fetched_once(monkeypatch):
+    monkeypatch.setattr(candle_store, "_store", CandleStore())
+    requests = []
+
+    async def get_trades(self, asset, currency, period, ts):
+        requests.append((ts - period, ts))
+        await asyncio.sleep(0)
+        return [["1800.5", "1", past - 120], ["1801.5", "2", past - 30]], None
+
+    monkeypatch.setattr(KrakenHistoricalPriceService, "get_trades", get_trades)
+
+    service = KrakenHistoricalPriceService(ts=past)
+    results = await asyncio.gather(*(service.get_price("eth", "usd") for _ in range(5)))
+
+    assert [price for price, _ in results] == [1801.5] * 5
+    assert requests == [(past - kraken.MAX_PRICE_AGE, past)]
+
+
+@pytest.mark.asyncio
+async def test_truncated_trades_not_used(monkeypatch):
+    monkeypatch.setattr(candle_store, "_store", CandleStore())
+    requests = []
+
+    async def get_trades(self, asset, currency, period, ts):
+        # every page is full and ends well before the expiry
+        start = ts - period
+        requests.append(start)
+        return [["1800.5", "1", start + 1 + i / kraken.TRADES_PAGE_SIZE] for i in range(kraken.TRADES_PAGE_SIZE)], None
+
+    monkeypatch.setattr(KrakenHistoricalPriceService, "get_trades", get_trades)
+
+    service = KrakenHistoricalPriceService(ts=past)
+    price, _ = await service.get_price("eth", "usd")
+
+    assert price is None
+    assert len(requests) == kraken.MAX_PAGES
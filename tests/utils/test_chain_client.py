@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+import pytest
+from web3 import HTTPProvider
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from telliot_feeds.utils import chain_client
+from telliot_feeds.utils.block_resolver import REORG_DEPTH
+from telliot_feeds.utils.chain_client import ChainClient
+from telliot_feeds.utils.chain_client import get_chain_client
+from telliot_feeds.utils.chain_client import result_or_raise
+from telliot_feeds.utils.chain_client import RPCError
+
+
+LATEST = 1000
+
+
+class FakeNode:
+    """JSON-RPC node answering over HTTP, in batches if `batching` is set"""
+
+    def __init__(self, batching=True, poa=False):
+        self.batching = batching
+        self.poa = poa
+        self.posts = []
+        self.requests = []
+
+    def block(self, number):
+        extra_data = "0x" + "00" * (97 if self.poa else 32)
+        return {
+            "number": hex(number),
+            "hash": "0x" + f"{number:064x}",
+            "parentHash": "0x" + f"{max(number - 1, 0):064x}",
+            "timestamp": hex(1_600_000_000 + 12 * number),
+            "extraData": extra_data,
+            "transactions": [],
+        }
+
+    def answer(self, method, params):
+        self.requests.append(method)
+        if method == "eth_blockNumber":
+            return {"result": hex(LATEST)}
+        if method == "eth_getBlockByNumber":
+            number = LATEST if params[0] == "latest" else int(params[0], 16)
+            return {"result": self.block(number)}
+        if method == "eth_getBalance":
+            return {"result": hex(10**18)}
+        if method == "eth_call":
+            return {"error": {"code": 3, "message": "execution reverted"}}
+        return {"error": {"code": -32601, "message": "method not found"}}
+
+    def post(self, endpoint_uri, data, **kwargs):
+        self.posts.append(endpoint_uri)
+        payload = json.loads(data)
+        if not self.batching:
+            return json.dumps({"jsonrpc": "2.0", "id": None, "error": {"message": "batch requests not supported"}})
+        # answer in reverse order, responses are matched by id
+        return json.dumps(
+            [{"jsonrpc": "2.0", "id": r["id"], **self.answer(r["method"], r["params"])} for r in payload][::-1]
+        )
+
+    def make_request(self, method, params):
+        return {"jsonrpc": "2.0", "id": 1, **self.answer(method, params)}
+
+
+@pytest.fixture
+def node(monkeypatch):
+    node = FakeNode()
+    monkeypatch.setattr(chain_client, "make_post_request", node.post)
+    return node
+
+
+def make_client(node):
+    w3 = Web3(HTTPProvider("http://fake-node"))
+    w3.provider.make_request = node.make_request
+    return ChainClient(w3, chain_id=1)
+
+
+def test_batch_sends_one_request(node):
+    client = make_client(node)
+    responses = client.batch(
+        [("eth_blockNumber", []), ("eth_getBalance", ["0x" + "11" * 20, "latest"]), ("eth_call", [{}, "latest"])]
+    )
+
+    assert len(node.posts) == 1
+    assert result_or_raise("eth_blockNumber", responses[0]) == hex(LATEST)
+    assert result_or_raise("eth_getBalance", responses[1]) == hex(10**18)
+    with pytest.raises(ContractLogicError):
+        result_or_raise("eth_call", responses[2])
+
+
+def test_falls_back_to_single_requests(node):
+    node.batching = False
+    client = make_client(node)
+    calls = [("eth_blockNumber", []), ("eth_getBalance", ["0x" + "11" * 20, "latest"])]
+
+    assert [r["result"] for r in client.batch(calls)] == [hex(LATEST), hex(10**18)]
+    assert client.batching is False
+    client.batch(calls)
+    # batching isn't tried again
+    assert len(node.posts) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_a_batch(node):
+    client = make_client(node)
+    address = "0x" + "11" * 20
+
+    results = await asyncio.gather(
+        client.request("eth_blockNumber", []),
+        client.request("eth_getBalance", [address, "latest"]),
+        client.request_batch([("eth_getBlockByNumber", ["0x10", False]), ("eth_getBalance", [address, "0x10"])]),
+    )
+
+    assert len(node.posts) == 1
+    assert results[0] == hex(LATEST)
+    assert results[1] == hex(10**18)
+    assert int(results[2][0]["result"]["timestamp"], 16) == 1_600_000_000 + 12 * 16
+
+    with pytest.raises(RPCError):
+        await client.request("eth_unknown", [])
+
+
+def test_get_block_detects_poa_once(node):
+    node.poa = True
+    client = make_client(node)
+    assert client.poa is None
+
+    block = client.get_block("latest")
+    assert block["number"] == LATEST
+    assert client.poa is True
+    assert "geth_poa_middleware" in client.w3.middleware_onion
+
+    node.requests.clear()
+    client.get_block(LATEST - 1)
+    assert node.requests == ["eth_getBlockByNumber"]
+
+
+def test_caches_deep_headers(node):
+    client = make_client(node)
+    client.get_block("latest")
+    deep, recent = LATEST - REORG_DEPTH, LATEST - 1
+    client.get_block(deep)
+    client.get_block(recent)
+
+    node.requests.clear()
+    assert client.get_block(deep)["number"] == deep
+    assert client.get_block(recent)["number"] == recent
+    assert node.requests == ["eth_getBlockByNumber"]
+    assert client.cached_header(deep) is not None
+    assert client.cached_header(recent) is None
+
+
+def test_get_chain_client_is_shared(node):
+    w3 = Web3(HTTPProvider("http://fake-node"))
+    assert get_chain_client(1, w3) is get_chain_client(1, w3)
+    assert get_chain_client(1, w3) is not get_chain_client(1, Web3(HTTPProvider("http://fake-node")))
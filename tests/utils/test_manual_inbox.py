@@ -0,0 +1,178 @@
+import asyncio
+import json
+import time
+
+import pytest
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.queries.price.spot_price import SpotPrice
+from telliot_feeds.reporters.pipeline import PipelineStep
+from telliot_feeds.reporters.pipeline import ReportPipeline
+from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+from telliot_feeds.sources.manual.diva_manual_source import DivaManualSource
+from telliot_feeds.sources.manual.spot_price_input_source import SpotPriceManualSource
+from telliot_feeds.utils import input_timeout
+from telliot_feeds.utils import manual_inbox
+from telliot_feeds.utils.input_timeout import InputCancelled
+from telliot_feeds.utils.input_timeout import StdinClosed
+from telliot_feeds.utils.manual_inbox import manual_query
+from telliot_feeds.utils.manual_inbox import ManualInbox
+
+
+QUERY_ID = "0x" + "ab" * 32
+
+
+@pytest.fixture
+def inbox(tmp_path, monkeypatch):
+    monkeypatch.setattr(manual_inbox, "default_homedir", lambda: str(tmp_path))
+    monkeypatch.setattr(manual_inbox, "POLL_INTERVAL", 0.05)
+    return manual_inbox.get_manual_inbox()
+
+
+def test_stage_and_take(tmp_path):
+    inbox = ManualInbox(tmp_path)
+    inbox.put(QUERY_ID.upper().replace("0X", ""), "1234.5")
+    # operators can stage values for many queries in one file
+    with open(tmp_path / "bulk.json", "w") as f:
+        json.dump({"0x" + "cd" * 32: ["1", "2"], "0x" + "ef" * 32: 3}, f)
+
+    assert inbox.pending() == {QUERY_ID: "1234.5", "0x" + "cd" * 32: ["1", "2"], "0x" + "ef" * 32: 3}
+    assert inbox.take(QUERY_ID) == ["1234.5"]
+    assert inbox.take(QUERY_ID) is None
+    assert inbox.take(bytes.fromhex("cd" * 32)) == ["1", "2"]
+    assert inbox.take("0x" + "ef" * 32) == ["3"]
+    assert inbox.pending() == {}
+    assert list(tmp_path.glob("*.json")) == []
+
+
+@pytest.mark.asyncio
+async def test_staged_value_skips_prompt(inbox, monkeypatch):
+    def no_stdin(prompt, timeout):
+        raise AssertionError("stdin read")
+
+    monkeypatch.setattr(input_timeout, "input_timeout_func", no_stdin)
+    inbox.put(QUERY_ID, "1234")
+    inbox.put("0x" + "cd" * 32, ["1.5", "2.5"])
+
+    with manual_query(QUERY_ID):
+        price, _ = await SpotPriceManualSource().fetch_new_datapoint()
+    with manual_query("0x" + "cd" * 32):
+        prices, _ = await DivaManualSource().fetch_new_datapoint()
+
+    assert price == 1234.0
+    assert prices == [1.5, 2.5]
+    # staged values are kept until the reports using them are sent
+    assert len(inbox.pending()) == 2
+    inbox.consume(QUERY_ID)
+    inbox.consume("0x" + "cd" * 32)
+    assert inbox.pending() == {}
+
+
+@pytest.mark.asyncio
+async def test_rejected_staged_value(inbox, monkeypatch):
+    monkeypatch.setattr(input_timeout, "input_timeout_func", lambda prompt, timeout: "1")
+    inbox.put(QUERY_ID, "not a price")
+
+    with manual_query(QUERY_ID):
+        assert await SpotPriceManualSource().fetch_new_datapoint() == (None, None)
+    assert inbox.pending() == {}
+
+
+@pytest.mark.asyncio
+async def test_value_staged_while_prompting(inbox, monkeypatch):
+    def wait_for_cancel(prompt, timeout):
+        while not input_timeout._cancelled():
+            time.sleep(0.01)
+        raise InputCancelled
+
+    monkeypatch.setattr(input_timeout, "input_timeout_func", wait_for_cancel)
+    ticks = 0
+
+    async def other_feeds():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    async def operator():
+        await asyncio.sleep(0.2)
+        inbox.put(QUERY_ID, "5678")
+
+    ticker = asyncio.ensure_future(other_feeds())
+    try:
+        with manual_query(QUERY_ID):
+            (price, _), _ = await asyncio.gather(SpotPriceManualSource().fetch_new_datapoint(), operator())
+    finally:
+        ticker.cancel()
+
+    assert price == 5678.0
+    # the event loop kept running while waiting for the value
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_closed_stdin_waits_for_inbox(inbox, monkeypatch):
+    def closed(prompt, timeout):
+        raise StdinClosed
+
+    monkeypatch.setattr(input_timeout, "input_timeout_func", closed)
+    asyncio.get_running_loop().call_later(0.1, inbox.put, QUERY_ID, "42")
+
+    with manual_query(QUERY_ID):
+        price, _ = await SpotPriceManualSource().fetch_new_datapoint()
+    assert price == 42.0
+
+    # without a query to stage values for, closed stdin is a timeout
+    assert await SpotPriceManualSource().fetch_new_datapoint() == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_staged_value_kept_until_report_sent(inbox, monkeypatch):
+    def no_stdin(prompt, timeout):
+        raise AssertionError("stdin read")
+
+    monkeypatch.setattr(input_timeout, "input_timeout_func", no_stdin)
+    datafeed = DataFeed(query=SpotPrice("eth", "usd"), source=SpotPriceManualSource())
+    inbox.put(datafeed.query.query_id, "1234")
+    locked = True
+
+    async def feed(_):
+        return datafeed, ResponseStatus()
+
+    async def params(_):
+        return await reporter.submission_txn_params(datafeed)
+
+    async def lock(_):
+        return None, error_status("Currently in reporter lock") if locked else ResponseStatus()
+
+    async def send_transaction(built_tx, on_receipt=None, context=None):
+        return None, ResponseStatus()
+
+    async def report_count(query_id):
+        return 0, ResponseStatus()
+
+    reporter = Tellor360Reporter.__new__(Tellor360Reporter)
+    reporter.qtag_selected = True
+    reporter.discord_notification_data = {}
+    reporter.get_num_reports_by_id = report_count
+    reporter.send_transaction = send_transaction
+    reporter.report_pipeline = lambda: ReportPipeline(
+        [
+            PipelineStep("datafeed", feed),
+            PipelineStep("params", params, requires=("datafeed",)),
+            PipelineStep("transaction", lock, requires=("params",)),
+        ]
+    )
+
+    # the value was fetched, but the report was cancelled
+    _, status = await reporter.report_once(wait_for_receipt=False)
+    assert not status.ok
+    assert inbox.peek(datafeed.query.query_id) == ["1234"]
+
+    locked = False
+    _, status = await reporter.report_once(wait_for_receipt=False)
+    assert status.ok
+    assert datafeed.source.latest[0] == 1234.0
+    assert inbox.pending() == {}
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import urllib.request
+
+import pytest
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+from web3.providers.base import BaseProvider
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.pricing.price_cache import price_cache
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.reporters.pipeline import PipelineStep
+from telliot_feeds.reporters.pipeline import ReportPipeline
+from telliot_feeds.utils import metrics as metrics_module
+from telliot_feeds.utils.metrics import count_rpc_requests
+from telliot_feeds.utils.metrics import instrument_web3
+from telliot_feeds.utils.metrics import MetricsRegistry
+from telliot_feeds.utils.metrics import serve_metrics
+
+
+def test_prometheus_and_json_formats(tmp_path):
+    registry = MetricsRegistry()
+    latency = registry.histogram("fetch_seconds", "Fetch latency", ("source",), buckets=(0.1, 1.0))
+    errors = registry.counter("errors_total", "Errors", ("source",))
+    latency.observe(0.05, source="kraken")
+    latency.observe(0.5, source="kraken")
+    latency.observe(5.0, source="kraken")
+    errors.inc(source='a"b')
+
+    text = registry.render()
+    assert "# TYPE fetch_seconds histogram" in text
+    assert 'fetch_seconds_bucket{source="kraken",le="0.1"} 1.0' in text
+    assert 'fetch_seconds_bucket{source="kraken",le="1.0"} 2.0' in text
+    assert 'fetch_seconds_bucket{source="kraken",le="+Inf"} 3.0' in text
+    assert 'fetch_seconds_count{source="kraken"} 3.0' in text
+    assert 'errors_total{source="a\\"b"} 1.0' in text
+
+    registry.write_json(tmp_path / "metrics.json")
+    snapshot = json.loads((tmp_path / "metrics.json").read_text())["metrics"]
+    assert snapshot["fetch_seconds"]["values"][0]["count"] == 3
+    assert snapshot["fetch_seconds"]["values"][0]["mean"] == pytest.approx(5.55 / 3)
+    assert snapshot["errors_total"]["values"] == [{"labels": {"source": 'a"b'}, "value": 1}]
+
+    assert registry.counter("errors_total", "Errors", ("source",)) is errors
+    with pytest.raises(ValueError):
+        registry.gauge("errors_total", "Errors", ("source",))
+    with pytest.raises(ValueError):
+        errors.inc(exchange="kraken")
+
+
+def test_metrics_endpoint():
+    registry = MetricsRegistry()
+    registry.counter("reports_total", "Reports").inc()
+    server = serve_metrics(0, registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics") as response:
+            assert "reports_total 1.0" in response.read().decode()
+        with urllib.request.urlopen(url + "/metrics.json") as response:
+            assert json.loads(response.read())["metrics"]["reports_total"]["values"][0]["value"] == 1
+    finally:
+        server.shutdown()
+
+
+class FakeProvider(BaseProvider):
+    def make_request(self, method, params):
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+
+
+@pytest.mark.asyncio
+async def test_rpc_requests_counted_per_context():
+    w3 = Web3(FakeProvider())
+    instrument_web3(w3)
+    instrument_web3(w3)
+    before = metrics_module.rpc_requests.value(method="eth_blockNumber")
+
+    with count_rpc_requests() as rpc_count:
+        w3.eth.block_number
+        await asyncio.to_thread(lambda: w3.eth.block_number)
+    w3.eth.block_number
+
+    assert rpc_count.count == 2
+    assert metrics_module.rpc_requests.value(method="eth_blockNumber") - before == 3
+
+
+class FakeService(WebPriceService):
+    def __init__(self, price):
+        super().__init__(name="FakeExchange", url="")
+        self.price = price
+
+    async def get_price(self, asset, currency):
+        await asyncio.sleep(0.01)
+        return (self.price, datetime_now_utc()) if self.price is not None else (None, None)
+
+
+@pytest.mark.asyncio
+async def test_price_source_metrics(monkeypatch):
+    monkeypatch.setattr(price_cache, "ttl", 0)
+    labels = {"source": "FakeExchange", "asset": "eth", "currency": "usd"}
+    count = metrics_module.source_fetch_seconds.count(**labels)
+    errors = metrics_module.source_errors.value(**labels)
+
+    await PriceSource(asset="eth", currency="usd", service=FakeService(1800.0)).fetch_new_datapoint()
+    await PriceSource(asset="ETH", currency="USD", service=FakeService(None)).fetch_new_datapoint()
+
+    assert metrics_module.source_fetch_seconds.count(**labels) - count == 2
+    assert metrics_module.source_errors.value(**labels) - errors == 1
+    assert 0 <= metrics_module.source_staleness_seconds.value(**labels) < 1
+
+
+@pytest.mark.asyncio
+async def test_report_steps_timed():
+    steps = metrics_module.report_step_seconds
+    before = {name: steps.count(step=name) for name in ("metrics_ok", "metrics_failed")}
+    errors = metrics_module.report_step_errors.value(step="metrics_failed")
+
+    async def ok(_):
+        return None, ResponseStatus()
+
+    async def failed(_):
+        return None, error_status("failed")
+
+    await ReportPipeline([PipelineStep("metrics_ok", ok), PipelineStep("metrics_failed", failed)]).run()
+
+    assert steps.count(step="metrics_ok") - before["metrics_ok"] == 1
+    assert steps.count(step="metrics_failed") - before["metrics_failed"] == 1
+    assert metrics_module.report_step_errors.value(step="metrics_failed") - errors == 1
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from telliot_feeds.reporters import rng_interval
+from telliot_feeds.reporters.rng_interval import RNGPrecomputer
+from telliot_feeds.sources import blockhash_aggregator
+from telliot_feeds.sources.blockhash_aggregator import get_rng_value
+from telliot_feeds.utils import rng_store
+from telliot_feeds.utils.rng_store import RNGStore
+from telliot_feeds.utils.rng_store import RNGValue
+
+
+TIMESTAMP = 1653350400
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = RNGStore()
+    monkeypatch.setattr(rng_store, "_store", store)
+    return store
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    """Fake blockhash APIs, counting requests"""
+    calls = []
+
+    async def get_btc_hash(timestamp):
+        calls.append("btc")
+        return "btc" + str(timestamp), timestamp + 300
+
+    async def get_eth_hash(timestamp):
+        calls.append("eth")
+        return "0xeth" + str(timestamp)
+
+    monkeypatch.setattr(blockhash_aggregator, "get_btc_hash", get_btc_hash)
+    monkeypatch.setattr(blockhash_aggregator, "get_eth_hash", get_eth_hash)
+    return calls
+
+
+def test_store(tmp_path):
+    path = tmp_path / "rng.sqlite"
+    store = RNGStore(path)
+    rng = RNGValue(TIMESTAMP, b"\x01" * 32, "btc", TIMESTAMP + 300, "0xeth")
+    store.add(rng)
+    store.add(rng._replace(timestamp=TIMESTAMP + 1800))
+    store.close()
+
+    store = RNGStore(path)
+    assert store.get(TIMESTAMP) == rng
+    assert store.get(TIMESTAMP + 3600) is None
+    store.prune(TIMESTAMP + 1)
+    assert store.get(TIMESTAMP) is None
+    assert store.get(TIMESTAMP + 1800) is not None
+
+
+@pytest.mark.asyncio
+async def test_value_is_computed_once(store, hashes):
+    values = await asyncio.gather(get_rng_value(TIMESTAMP), get_rng_value(TIMESTAMP))
+
+    assert values[0] == values[1] == store.get(TIMESTAMP)
+    assert values[0].btc_timestamp == TIMESTAMP + 300
+    assert hashes == ["btc", "eth"]
+
+
+@pytest.mark.asyncio
+async def test_precomputer(store, hashes, monkeypatch):
+    mined = False
+
+    async def get_btc_hash(timestamp):
+        hashes.append("btc")
+        return ("btc", timestamp + 300) if mined else (None, None)
+
+    monkeypatch.setattr(blockhash_aggregator, "get_btc_hash", get_btc_hash)
+    monkeypatch.setattr(rng_interval, "get_next_timestamp", lambda: TIMESTAMP)
+    precomputer = RNGPrecomputer(poll_interval=0)
+    task = asyncio.ensure_future(precomputer.run())
+    try:
+        await asyncio.sleep(0.05)
+        assert not precomputer.ready.is_set()
+        assert store.get(TIMESTAMP) is None
+
+        mined = True
+        await asyncio.wait_for(precomputer.ready.wait(), 3)
+        assert store.get(TIMESTAMP) is not None
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,110 @@
+import math
+import statistics
+
+import numpy as np
+import pytest
+
+from telliot_feeds.sources.price.historical import kraken_ohlc
+from telliot_feeds.sources.price.historical.kraken_ohlc import KrakenHistoricalPriceServiceOHLC
+from telliot_feeds.utils import candle_store
+from telliot_feeds.utils import volatility as volatility_module
+from telliot_feeds.utils.candle_store import CandleStore
+from telliot_feeds.utils.stdev_calculator import stdev_calculator
+from telliot_feeds.utils.volatility import DailyCloseSeries
+from telliot_feeds.utils.volatility import ewma_volatility
+from telliot_feeds.utils.volatility import returns
+from telliot_feeds.utils.volatility import rolling_volatility
+from telliot_feeds.utils.volatility import volatility
+
+
+DAY = 86400
+closes = [100.0, 102.0, 99.0, 101.0, 105.0, 104.0, 108.0, 107.0]
+
+
+def test_simple_and_log_volatility():
+    simple = [(j - i) / i for i, j in zip(closes[:-1], closes[1:])]
+    log = [math.log(j / i) for i, j in zip(closes[:-1], closes[1:])]
+
+    assert stdev_calculator(closes) == pytest.approx(statistics.stdev(simple))
+    assert volatility(closes, kind="log") == pytest.approx(statistics.stdev(log))
+    assert volatility(closes, window=3) == pytest.approx(statistics.stdev(simple[-3:]))
+
+
+def test_zero_and_missing_prices_skipped():
+    prices = [100.0, 0.0, 102.0, None, 99.0, 101.0, 103.0]
+    r = returns(prices)
+    assert np.isnan(r[:4]).all()
+
+    assert stdev_calculator(prices) == pytest.approx(statistics.stdev([101 / 99 - 1, 103 / 101 - 1]))
+    assert stdev_calculator([100.0, 0.0, 102.0]) is None
+
+
+def test_rolling_volatility_matches_windows():
+    rng = np.random.default_rng(1)
+    prices = list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 200))))
+    prices[50] = float("nan")
+
+    rolling = rolling_volatility(prices, window=30, kind="log")
+
+    assert np.isnan(rolling[:29]).all()
+    for end in range(31, len(prices) + 1):
+        start = end - 31
+        expected = volatility(prices[start:end], kind="log")
+        assert rolling[end - 2] == pytest.approx(expected, rel=1e-6)
+
+
+def test_ewma_volatility():
+    r = returns(closes, kind="log")
+    weights = 0.06 * 0.94 ** np.arange(len(r) - 1, -1, -1)
+    # normalized weights, so the first return's weight doesn't dominate
+    expected = math.sqrt(np.sum(weights * r * r) / np.sum(weights))
+
+    assert ewma_volatility(closes) == pytest.approx(expected)
+    assert ewma_volatility([100.0]) is None
+    with pytest.raises(ValueError):
+        ewma_volatility(closes, decay=1)
+
+
+def test_daily_close_series():
+    series = DailyCloseSeries()
+    series.update([(0, 1.0), (DAY, 2.0), (3 * DAY, 4.0)])
+    # a later candle of the same day replaces the cached one
+    series.update([(3 * DAY + 600, 5.0)])
+
+    assert len(series) == 3
+    assert series.last_timestamp == 3 * DAY + 600
+    np.testing.assert_array_equal(series.closes(), [1.0, 2.0, np.nan, 5.0])
+    np.testing.assert_array_equal(series.closes(start=DAY, end=DAY), [2.0])
+    np.testing.assert_array_equal(series.latest(2), [2.0, np.nan, 5.0])
+
+    assert series.fetch_start(0) == 3 * DAY + 600
+    assert series.fetch_start(-5 * DAY) == -5 * DAY
+    assert series.fetch_start(4 * DAY) == 4 * DAY
+
+
+@pytest.mark.asyncio
+async def test_kraken_ohlc_only_requests_new_candles(monkeypatch):
+    monkeypatch.setattr(volatility_module, "_series", {})
+    monkeypatch.setattr(candle_store, "_store", CandleStore())
+    start = 1_000 * DAY
+    candles = [[start + i * DAY, "", "", "", str(1000 + 10 * (i % 3))] for i in range(32)]
+    requested = []
+
+    async def get_url(self, url):
+        requested.append(url)
+        since = int(url.split("since=")[1].split("&")[0])
+        return {"response": {"result": {"XETHZUSD": [c for c in candles if c[0] >= since]}}}
+
+    monkeypatch.setattr(kraken_ohlc.KrakenHistoricalPriceServiceOHLC, "get_url", get_url)
+    service = KrakenHistoricalPriceServiceOHLC(ts=start)
+
+    first, _ = await service.get_price("eth", "usd")
+    first_closes = [float(c[4]) for c in candles]
+    candles[-1][4] = "1005"
+    candles.append([start + 32 * DAY, "", "", "", "1015"])
+    second, _ = await service.get_price("eth", "usd", ts=start + DAY)
+
+    assert f"since={start}&" in requested[0]
+    assert f"since={start + 31 * DAY}&" in requested[1]
+    assert first == pytest.approx(stdev_calculator(first_closes))
+    assert second == pytest.approx(stdev_calculator([float(c[4]) for c in candles[1:]]))